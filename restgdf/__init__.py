@@ -7,6 +7,10 @@ from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from . import adapters, compat, utils
+    from ._client._pool import close_pool, pooled_session
+    from ._client._http_cache import ResponseCache
+    from ._client._priority import request_priority
+    from .utils._deadline import deadline
     from ._config import (
         AuthConfig,
         ConcurrencyConfig,
@@ -33,6 +37,7 @@ if TYPE_CHECKING:
         FieldSpec,
         LayerMetadata,
         ObjectIdsResponse,
+        PageFailure,
         RestgdfResponseError,
         ServiceInfo,
         Settings,
@@ -46,7 +51,9 @@ if TYPE_CHECKING:
         ArcGISServiceError,
         AuthNotAttachedError,
         AuthenticationError,
+        CircuitOpenError,
         ConfigurationError,
+        DeadlineExceededError,
         FieldDoesNotExistError,
         InvalidCredentialsError,
         OptionalDependencyError,
@@ -63,6 +70,12 @@ if TYPE_CHECKING:
         TransportError,
     )
     from .featurelayer.featurelayer import FeatureLayer
+    from .utils._cache import MetadataCache
+    from .utils._concurrency import FairScheduler
+    from .utils._hedging import HedgePolicy
+    from .utils._page_retry import PageRetryPolicy
+    from .utils._retry_budget import RetryBudget
+    from .utils._stats import Statistic
     from .utils.token import ArcGISTokenSession
 
 __all__ = [
@@ -72,6 +85,7 @@ __all__ = [
     "AuthConfig",
     "AuthNotAttachedError",
     "AuthenticationError",
+    "CircuitOpenError",
     "ConcurrencyConfig",
     "Config",
     "ConfigurationError",
@@ -79,31 +93,40 @@ __all__ = [
     "CrawlError",
     "CrawlReport",
     "CrawlServiceEntry",
+    "DeadlineExceededError",
     "Directory",
     "ErrorInfo",
     "ErrorResponse",
+    "FairScheduler",
     "Feature",
     "FeatureLayer",
     "FeaturesResponse",
     "FieldDoesNotExistError",
     "FieldSpec",
+    "HedgePolicy",
     "InvalidCredentialsError",
     "LayerMetadata",
     "LimiterConfig",
+    "MetadataCache",
     "ObjectIdsResponse",
     "OptionalDependencyError",
     "OutputConversionError",
+    "PageFailure",
+    "PageRetryPolicy",
     "PaginationInconsistencyWarning",
     "PaginationError",
     "RateLimitError",
     "ResilienceConfig",
+    "ResponseCache",
     "RestgdfError",
     "RestgdfResponseError",
     "RestgdfTimeoutError",
+    "RetryBudget",
     "RetryConfig",
     "SchemaValidationError",
     "ServiceInfo",
     "Settings",
+    "Statistic",
     "TelemetryConfig",
     "TimeoutConfig",
     "TokenExpiredError",
@@ -114,9 +137,13 @@ __all__ = [
     "TransportConfig",
     "TransportError",
     "adapters",
+    "close_pool",
     "compat",
+    "deadline",
     "get_config",
     "get_settings",
+    "pooled_session",
+    "request_priority",
     "reset_config_cache",
     "reset_settings_cache",
     "utils",
@@ -156,6 +183,7 @@ _LAZY_EXPORTS: dict[str, tuple[str, str | None]] = {
             "FieldSpec",
             "LayerMetadata",
             "ObjectIdsResponse",
+            "PageFailure",
             "RestgdfResponseError",
             "ServiceInfo",
             "Settings",
@@ -171,7 +199,9 @@ _LAZY_EXPORTS: dict[str, tuple[str, str | None]] = {
             "ArcGISServiceError",
             "AuthNotAttachedError",
             "AuthenticationError",
+            "CircuitOpenError",
             "ConfigurationError",
+            "DeadlineExceededError",
             "FieldDoesNotExistError",
             "InvalidCredentialsError",
             "OptionalDependencyError",
@@ -191,6 +221,17 @@ _LAZY_EXPORTS: dict[str, tuple[str, str | None]] = {
     "ArcGISTokenSession": ("restgdf.utils.token", "ArcGISTokenSession"),
     "Directory": ("restgdf.directory.directory", "Directory"),
     "FeatureLayer": ("restgdf.featurelayer.featurelayer", "FeatureLayer"),
+    "FairScheduler": ("restgdf.utils._concurrency", "FairScheduler"),
+    "HedgePolicy": ("restgdf.utils._hedging", "HedgePolicy"),
+    "MetadataCache": ("restgdf.utils._cache", "MetadataCache"),
+    "PageRetryPolicy": ("restgdf.utils._page_retry", "PageRetryPolicy"),
+    "ResponseCache": ("restgdf._client._http_cache", "ResponseCache"),
+    "RetryBudget": ("restgdf.utils._retry_budget", "RetryBudget"),
+    "Statistic": ("restgdf.utils._stats", "Statistic"),
+    "deadline": ("restgdf.utils._deadline", "deadline"),
+    "request_priority": ("restgdf._client._priority", "request_priority"),
+    "close_pool": ("restgdf._client._pool", "close_pool"),
+    "pooled_session": ("restgdf._client._pool", "pooled_session"),
     "adapters": ("restgdf.adapters", None),
     "compat": ("restgdf.compat", None),
     "utils": ("restgdf.utils", None),
@@ -0,0 +1,195 @@
+"""Fully-buffered HTTP response.
+
+:class:`BufferedResponse` is what a session hands back once it has already
+read the whole body: status, headers and the raw bytes are captured up front
+and the connection is released. It exposes the subset of
+:class:`aiohttp.ClientResponse` that restgdf call sites use (``status``,
+``headers``, ``read()``, ``text()``, ``json()``, ``release()``,
+``raise_for_status()``, async-context-manager use), so callers cannot tell
+it from a live response.
+
+Used by :class:`restgdf.resilience.ResilientSession` when
+``ResilienceConfig.buffer_responses`` is on, so a body that fails halfway
+through is retried inside the same attempt loop as the request itself.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+_NOT_DECODED = object()
+
+
+class BufferedResponse:
+    """An already-read HTTP response with an :class:`aiohttp.ClientResponse` face.
+
+    Parameters
+    ----------
+    status
+        HTTP status code.
+    headers
+        Response headers; copied into a case-insensitive multidict.
+    body
+        The complete response body.
+    url
+        The final request URL.
+    reason
+        HTTP reason phrase, if known.
+    request_info, history
+        Carried through from the live response so :meth:`raise_for_status`
+        and :meth:`json` raise the same aiohttp error types a live
+        response would.
+    decoded_json
+        An already-decoded JSON payload. The first :meth:`json` call
+        returns it instead of decoding ``body`` again; later calls decode
+        a fresh copy.
+    """
+
+    def __init__(
+        self,
+        *,
+        status: int,
+        headers: Any,
+        body: bytes,
+        url: Any = None,
+        reason: str | None = None,
+        request_info: Any = None,
+        history: tuple[Any, ...] = (),
+        decoded_json: Any = _NOT_DECODED,
+    ) -> None:
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self.url = url
+        self.reason = reason
+        self.request_info = request_info
+        self.history = history
+        self._body = body
+        self._decoded_json = decoded_json
+
+    @classmethod
+    async def from_response(
+        cls,
+        resp: Any,
+        *,
+        decode_json: bool = False,
+    ) -> BufferedResponse:
+        """Read ``resp`` completely and return its buffered copy.
+
+        Body-read failures (``aiohttp.ClientPayloadError`` and friends)
+        propagate unchanged. With ``decode_json=True`` a body whose
+        ``Content-Type`` is JSON is decoded here too, and a body that does
+        not decode raises :class:`aiohttp.ClientPayloadError` -- a JSON
+        response that stops parsing mid-way is a truncated body.
+        """
+        body = await resp.read()
+        buffered = cls(
+            status=resp.status,
+            headers=getattr(resp, "headers", None),
+            body=body,
+            url=getattr(resp, "url", None),
+            reason=getattr(resp, "reason", None),
+            request_info=getattr(resp, "request_info", None),
+            history=tuple(getattr(resp, "history", ()) or ()),
+        )
+        if decode_json and "json" in buffered.content_type and body.strip():
+            try:
+                buffered._decoded_json = json.loads(
+                    body.decode(buffered.get_encoding()),
+                )
+            except ValueError as exc:
+                raise aiohttp.ClientPayloadError(
+                    f"Response body is not complete JSON: {exc}",
+                ) from exc
+        return buffered
+
+    # -- aiohttp.ClientResponse surface ---------------------------------
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def content_type(self) -> str:
+        raw = self.headers.get("Content-Type", "application/octet-stream")
+        return raw.split(";", 1)[0].strip().lower()
+
+    @property
+    def charset(self) -> str | None:
+        raw = self.headers.get("Content-Type", "")
+        for part in raw.split(";")[1:]:
+            key, _, value = part.partition("=")
+            if key.strip().lower() == "charset":
+                return value.strip().strip('"') or None
+        return None
+
+    def get_encoding(self) -> str:
+        return self.charset or "utf-8"
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str | None = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or self.get_encoding(), errors)
+
+    async def json(
+        self,
+        *,
+        encoding: str | None = None,
+        loads: Callable[[str], Any] = json.loads,
+        content_type: str | None = "application/json",
+    ) -> Any:
+        if self._decoded_json is not _NOT_DECODED and loads is json.loads:
+            decoded, self._decoded_json = self._decoded_json, _NOT_DECODED
+            return decoded
+        if content_type and content_type not in self.content_type:
+            raise aiohttp.ContentTypeError(
+                self.request_info,
+                self.history,
+                status=self.status,
+                message=(
+                    "Attempt to decode JSON with unexpected mimetype: "
+                    f"{self.content_type}"
+                ),
+                headers=self.headers,
+            )
+        stripped = self._body.strip()
+        if not stripped:
+            return None
+        return loads(stripped.decode(encoding or self.get_encoding()))
+
+    def raise_for_status(self) -> None:
+        if self.ok:
+            return
+        raise aiohttp.ClientResponseError(
+            self.request_info,
+            self.history,
+            status=self.status,
+            message=self.reason or "",
+            headers=self.headers,
+        )
+
+    def release(self) -> None:
+        """No-op: the connection was released when the body was buffered."""
+
+    def close(self) -> None:
+        """No-op: the connection was released when the body was buffered."""
+
+    async def __aenter__(self) -> BufferedResponse:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"<BufferedResponse({self.url!s}) [{self.status} {self.reason}] "
+            f"{len(self._body)} bytes>"
+        )
+
+
+__all__ = ["BufferedResponse"]
@@ -0,0 +1,420 @@
+"""Persistent on-disk HTTP response cache with conditional revalidation.
+
+Private submodule; :class:`ResponseCache` is re-exported from the top-level
+``restgdf`` package.
+
+ETL jobs re-run the same metadata, count and page queries many times a
+day. While a :class:`ResponseCache` is :meth:`~ResponseCache.activate`'d,
+:func:`restgdf.utils._http._arcgis_request` sends every request of an
+enabled operation class through it:
+
+* a stored response that is still fresh -- per the server's
+  ``Cache-Control: max-age`` (minus ``Age``), or the cache's own
+  ``max_age_s`` -- is served locally, with no request at all;
+* a stale one with an ``ETag`` / ``Last-Modified`` validator is
+  revalidated with ``If-None-Match`` / ``If-Modified-Since``, and a
+  ``304 Not Modified`` is answered from disk;
+* anything else goes to the network and, when it is a successful,
+  storable response, is written to the cache.
+
+Responses are kept in a single SQLite file, keyed by a digest of the
+canonical request: verb, URL, the sorted encoded body without its token,
+and the auth scope (a token digest or the token session's user; see
+:func:`restgdf.utils._http._auth_scope`). ArcGIS ``{"error": ...}``
+envelopes, non-200 responses and ``Cache-Control: no-store`` responses are
+never stored. Once the stored bodies exceed ``max_bytes``, the least
+recently used entries are evicted. Disk I/O runs in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Literal
+
+from restgdf._client._buffered import BufferedResponse
+
+ResponseCacheKind = Literal["metadata", "count", "pages"]
+
+_KINDS: frozenset[str] = frozenset({"metadata", "count", "pages"})
+
+_ACTIVE_RESPONSE_CACHE: ContextVar[ResponseCache | None] = ContextVar(
+    "restgdf_response_cache",
+    default=None,
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        url TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        status INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        fresh_until REAL NOT NULL,
+        used_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)",
+)
+
+
+class _Entry:
+    __slots__ = ("status", "headers", "body", "etag", "last_modified", "fresh_until")
+
+    def __init__(
+        self,
+        status: int,
+        headers: str,
+        body: bytes,
+        etag: str | None,
+        last_modified: str | None,
+        fresh_until: float,
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh_until = fresh_until
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self, url: str) -> BufferedResponse:
+        return BufferedResponse(
+            status=self.status,
+            headers=json.loads(self.headers),
+            body=self.body,
+            url=url,
+            reason="OK",
+        )
+
+
+class ResponseCache:
+    """SQLite-backed HTTP response cache for ArcGIS requests.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        SQLite file to keep responses in; created (with its parent
+        directories) on first use. Several processes may share one file.
+    max_bytes : int
+        Budget for the stored bodies; least recently used entries are
+        evicted past it. Defaults to 256 MiB.
+    kinds : iterable of {"metadata", "count", "pages"}
+        Operation classes to cache (see :mod:`restgdf._client._priority`):
+        layer/service metadata, count/id/statistics queries, and feature
+        pages. Defaults to ``("metadata", "count")``; pages are opt-in.
+    max_age_s : float or None
+        Serve stored responses younger than this without revalidating,
+        whatever the server said. ``None`` (the default) only trusts the
+        server's ``Cache-Control: max-age``.
+
+    Notes
+    -----
+    Activate it for a block with :meth:`activate`; tasks created inside
+    inherit it. :meth:`stats` counts local ``hits``, ``revalidated``
+    (``304``) responses, ``misses``, ``stored`` responses and
+    ``evictions``.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        kinds: Iterable[ResponseCacheKind] = ("metadata", "count"),
+        max_age_s: float | None = None,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1, got {max_bytes!r}")
+        if max_age_s is not None and max_age_s <= 0:
+            raise ValueError(f"max_age_s must be > 0, got {max_age_s!r}")
+        kinds = frozenset(kinds)
+        unknown = kinds - _KINDS
+        if unknown:
+            raise ValueError(
+                f"unknown cache kinds {sorted(unknown)!r}; "
+                f"allowed: {sorted(_KINDS)}",
+            )
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.kinds = kinds
+        self.max_age_s = max_age_s
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+
+    @contextmanager
+    def activate(self) -> Iterator[ResponseCache]:
+        """Route the enclosed block's ArcGIS requests through this cache."""
+        token = _ACTIVE_RESPONSE_CACHE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_RESPONSE_CACHE.reset(token)
+
+    def stats(self) -> dict[str, int]:
+        """Return the counters plus ``entries`` and stored ``bytes``."""
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses",
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def invalidate(self, url_prefix: str | None = None) -> int:
+        """Drop every entry, or those whose URL starts with ``url_prefix``.
+
+        Returns the number of entries dropped.
+        """
+        with self._lock:
+            db = self._db()
+            if url_prefix is None:
+                cursor = db.execute("DELETE FROM responses")
+            else:
+                cursor = db.execute(
+                    "DELETE FROM responses WHERE substr(url, 1, ?) = ?",
+                    (len(url_prefix), url_prefix),
+                )
+            db.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> ResponseCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCache({str(self.path)!r}, max_bytes={self.max_bytes}, "
+            f"kinds={sorted(self.kinds)!r}, max_age_s={self.max_age_s})"
+        )
+
+    # -- request path ---------------------------------------------------
+
+    async def _fetch(
+        self,
+        kind: str,
+        *,
+        verb: str,
+        url: str,
+        canonical_body: str,
+        scope: str | None,
+        send: Callable[[Mapping[str, str]], Awaitable[Any]],
+    ) -> Any:
+        """Answer one request from disk, by revalidation, or from ``send``.
+
+        ``send`` issues the request with extra (conditional) headers.
+        """
+        key = hashlib.sha256(
+            "\n".join((verb, url, canonical_body, scope or "")).encode(),
+        ).hexdigest()
+        entry = await asyncio.to_thread(self._load, key)
+        now = time.time()
+        if entry is not None and entry.fresh_until > now:
+            self.hits += 1
+            await asyncio.to_thread(self._touch, key, now, None)
+            return entry.response(url)
+        resp = await send(entry.validators() if entry is not None else {})
+        if entry is not None and resp.status == 304:
+            release = getattr(resp, "release", None)
+            if release is not None:
+                release()
+            self.revalidated += 1
+            await asyncio.to_thread(
+                self._touch,
+                key,
+                now,
+                self._fresh_until(getattr(resp, "headers", {}), now),
+            )
+            return entry.response(url)
+        self.misses += 1
+        buffered = await BufferedResponse.from_response(resp)
+        if _storable(buffered):
+            await asyncio.to_thread(self._store, key, url, kind, buffered, now)
+        return buffered
+
+    def _fresh_until(self, headers: Mapping[str, str], now: float) -> float:
+        fresh_until = now + _server_max_age(headers)
+        if self.max_age_s is not None:
+            fresh_until = max(fresh_until, now + self.max_age_s)
+        return fresh_until
+
+    # -- storage (worker thread) ----------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self, key: str) -> _Entry | None:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, headers, body, etag, last_modified, fresh_until "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return _Entry(*row) if row is not None else None
+
+    def _touch(self, key: str, now: float, fresh_until: float | None) -> None:
+        with self._lock:
+            db = self._db()
+            if fresh_until is None:
+                db.execute(
+                    "UPDATE responses SET used_at = ? WHERE key = ?",
+                    (now, key),
+                )
+            else:
+                db.execute(
+                    "UPDATE responses SET used_at = ?, fresh_until = ? WHERE key = ?",
+                    (now, fresh_until, key),
+                )
+            db.commit()
+
+    def _store(
+        self,
+        key: str,
+        url: str,
+        kind: str,
+        resp: BufferedResponse,
+        now: float,
+    ) -> None:
+        headers = json.dumps(
+            {
+                name: value
+                for name, value in resp.headers.items()
+                if name.lower() in _KEPT_HEADERS
+            },
+        )
+        body = resp._body
+        size = len(body) + len(headers)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    kind,
+                    resp.status,
+                    headers,
+                    body,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    self._fresh_until(resp.headers, now),
+                    now,
+                    size,
+                ),
+            )
+            self.stored += 1
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses",
+        ).fetchone()
+        while total > self.max_bytes:
+            victims = db.execute(
+                "SELECT key, size FROM responses ORDER BY used_at LIMIT 64",
+            ).fetchall()
+            for key, size in victims:
+                if total <= self.max_bytes:
+                    break
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                self.evictions += 1
+
+
+# Response headers worth replaying from disk.
+_KEPT_HEADERS = frozenset(
+    {
+        "content-type",
+        "cache-control",
+        "etag",
+        "last-modified",
+        "expires",
+        "vary",
+    },
+)
+
+
+def _cache_control(headers: Mapping[str, str]) -> dict[str, str]:
+    directives: dict[str, str] = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _server_max_age(headers: Mapping[str, str]) -> float:
+    """Seconds the server allows the response to be reused unrevalidated."""
+    directives = _cache_control(headers)
+    if "no-cache" in directives or "no-store" in directives:
+        return 0.0
+    try:
+        max_age = float(directives.get("max-age", 0))
+        age = float(headers.get("Age") or 0)
+    except ValueError:
+        return 0.0
+    return max(0.0, max_age - age)
+
+
+def _storable(resp: BufferedResponse) -> bool:
+    if resp.status != 200 or "no-store" in _cache_control(resp.headers):
+        return False
+    # ArcGIS reports most failures as a 200 with an ``error`` envelope.
+    head = resp._body.lstrip()[:16].replace(b" ", b"")
+    return not head.startswith(b'{"error"')
+
+
+__all__ = ["ResponseCache"]
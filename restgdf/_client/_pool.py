@@ -0,0 +1,149 @@
+"""Process-scoped pooled session for library-owned requests.
+
+Without a caller-supplied session, :func:`restgdf.utils.getgdf.get_gdf`
+builds a fresh :class:`aiohttp.ClientSession` per call and closes it
+afterwards: a new DNS lookup, TLS handshake and cold connection pool for
+every layer. :func:`pooled_session` instead hands out one keep-alive
+session per event loop, with a :class:`aiohttp.TCPConnector` tuned from
+:class:`~restgdf._config.TransportConfig`. ``get_gdf`` uses it when
+``TransportConfig.pooled_session`` is on (env
+``RESTGDF_TRANSPORT_POOLED_SESSION``); any other helper can be handed it
+explicitly.
+
+Pooled sessions are closed by :func:`close_pool` or, failing that, at
+interpreter exit. An aiohttp session is bound to the loop it was created
+on, so a pool left behind by a finished ``asyncio.run`` is discarded the
+next time the pool is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import inspect
+import weakref
+from typing import Any
+
+import aiohttp
+
+from restgdf._config import TransportConfig, get_config
+
+# One pooled session per event loop; an aiohttp session is loop-bound.
+_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    aiohttp.ClientSession,
+] = weakref.WeakKeyDictionary()
+# Closes of sessions left behind by closed loops, still being awaited.
+_discarding: set[asyncio.Task[None]] = set()
+
+#: ``TCPConnector(happy_eyeballs_delay=...)`` arrived in aiohttp 3.10.
+_HAS_HAPPY_EYEBALLS = (
+    "happy_eyeballs_delay" in inspect.signature(aiohttp.TCPConnector).parameters
+)
+
+
+def _build_connector(transport: TransportConfig) -> aiohttp.TCPConnector:
+    """Return a keep-alive connector tuned from ``transport``."""
+    options: dict[str, Any] = {}
+    if _HAS_HAPPY_EYEBALLS:
+        options["happy_eyeballs_delay"] = transport.happy_eyeballs_delay_s
+    return aiohttp.TCPConnector(
+        ssl=transport.verify_ssl,
+        limit=transport.pool_limit,
+        limit_per_host=transport.pool_limit_per_host,
+        ttl_dns_cache=transport.dns_cache_ttl_s,
+        keepalive_timeout=transport.keepalive_timeout_s,
+        **options,
+    )
+
+
+async def _discard(sessions: list[aiohttp.ClientSession]) -> None:
+    """Close sessions whose loop has closed.
+
+    Their connections cannot be shut down on a closed loop, so closing the
+    connector only marks it closed and finishes at once, on any loop; it
+    keeps aiohttp from warning about an unclosed session.
+    """
+    for session in sessions:
+        connector = session.connector
+        if connector is not None:
+            await connector.close()
+
+
+def _prune() -> list[aiohttp.ClientSession]:
+    """Forget the pools of closed loops and return their sessions."""
+    stale = []
+    for loop, session in list(_pools.items()):
+        if loop.is_closed():
+            stale.append(session)
+            del _pools[loop]
+    return stale
+
+
+def pooled_session() -> aiohttp.ClientSession:
+    """Return the running loop's shared, pooled :class:`aiohttp.ClientSession`.
+
+    The session is created on first use with a connector tuned from
+    ``get_config().transport`` (``pool_limit``, ``pool_limit_per_host``,
+    ``dns_cache_ttl_s``, ``keepalive_timeout_s``,
+    ``happy_eyeballs_delay_s``, ``verify_ssl``) and reused by every later
+    call on the same loop. Do not close it yourself; call
+    :func:`close_pool`.
+
+    Raises
+    ------
+    RuntimeError
+        If called outside a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    session = _pools.get(loop)
+    if session is None or session.closed:
+        stale = _prune()
+        if stale:
+            task = loop.create_task(_discard(stale))
+            _discarding.add(task)
+            task.add_done_callback(_discarding.discard)
+        session = aiohttp.ClientSession(
+            connector=_build_connector(get_config().transport),
+        )
+        _pools[loop] = session
+    return session
+
+
+async def close_pool() -> None:
+    """Close the pooled session of the running loop, if any.
+
+    Pools left behind by loops that have already closed are discarded.
+    The next :func:`pooled_session` call starts a fresh pool.
+    """
+    loop = asyncio.get_running_loop()
+    session = _pools.pop(loop, None)
+    await _discard(_prune())
+    await asyncio.gather(
+        *(task for task in _discarding if task.get_loop() is loop),
+    )
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _close_at_exit() -> None:
+    stale = []
+    for loop, session in list(_pools.items()):
+        if session.closed:
+            continue
+        if loop.is_closed():
+            stale.append(session)
+        elif loop.is_running():
+            # Running in another thread: hand it the close.
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.run_until_complete(session.close())
+    _pools.clear()
+    if stale:
+        asyncio.run(_discard(stale))
+
+
+atexit.register(_close_at_exit)
+
+
+__all__ = ["close_pool", "pooled_session"]
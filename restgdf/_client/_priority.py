@@ -0,0 +1,126 @@
+"""Request priority classes.
+
+Every ArcGIS request issued through
+:func:`restgdf.utils._http._arcgis_request` belongs to one of four classes,
+served in this order wherever requests queue for a shared resource (a
+:class:`~restgdf.FairScheduler` slot, a
+:class:`~restgdf.resilience.ResilientSession` token bucket):
+
+``"metadata"``
+    Layer/service/directory metadata (``?f=json`` on a non-query URL).
+``"count"``
+    Small query-side control calls: ``returnCountOnly``,
+    ``returnIdsOnly``, ``returnExtentOnly``, ``outStatistics`` and
+    ``returnDistinctValues`` queries.
+``"pages"``
+    Bulk feature-page queries.
+``"crawl"``
+    Directory crawls (``safe_crawl``/``fetch_all_data``), whose metadata
+    calls are background work.
+
+The class is inferred from the request unless code runs inside
+:func:`request_priority`, which pins it for the enclosed block and every
+task created there.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Literal, TypeVar, get_args
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+RequestPriority = Literal["metadata", "count", "pages", "crawl"]
+
+_RANKS: dict[str, int] = {
+    name: rank for rank, name in enumerate(get_args(RequestPriority))
+}
+
+_COUNT_FLAGS = (
+    "returnCountOnly",
+    "returnIdsOnly",
+    "returnExtentOnly",
+    "returnDistinctValues",
+)
+
+# Pinned by ``request_priority``; ``None`` means "infer per request".
+_PINNED: ContextVar[str | None] = ContextVar("restgdf_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Serve every restgdf request in the block at ``priority``.
+
+    Overrides the per-request inference, e.g. to mark an interactive
+    lookup as ``"metadata"`` or a backfill as ``"crawl"``. Tasks created
+    inside the block inherit it.
+    """
+    if priority not in _RANKS:
+        raise ValueError(
+            f"priority must be one of {sorted(_RANKS, key=_RANKS.__getitem__)}, "
+            f"got {priority!r}",
+        )
+    token = _PINNED.set(priority)
+    try:
+        yield
+    finally:
+        _PINNED.reset(token)
+
+
+def _is_set(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1")
+    return bool(value)
+
+
+def _classify(url: str, body: Mapping[str, object] | None) -> str:
+    """Infer the priority class of one ArcGIS request."""
+    body = body or {}
+    if any(_is_set(body.get(flag)) for flag in _COUNT_FLAGS) or body.get(
+        "outStatistics",
+    ):
+        return "count"
+    if urlparse(url).path.rstrip("/").lower().endswith("/query"):
+        return "pages"
+    return "metadata"
+
+
+def _rank(
+    default: str = "metadata",
+    *,
+    url: str | None = None,
+    body: object = None,
+) -> int:
+    """Return the effective rank: pinned class, else inferred, else ``default``.
+
+    ``body`` is only inspected when it is a mapping; form data and raw
+    payloads classify by URL alone.
+    """
+    pinned = _PINNED.get()
+    if pinned is not None:
+        return _RANKS[pinned]
+    if url is not None:
+        return _RANKS[_classify(url, body if isinstance(body, Mapping) else None)]
+    return _RANKS[default]
+
+
+def _default_priority(
+    priority: RequestPriority,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Run a coroutine function under ``priority`` unless one is pinned already."""
+
+    def decorate(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if _PINNED.get() is not None:
+                return await func(*args, **kwargs)
+            with request_priority(priority):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
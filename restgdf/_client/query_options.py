@@ -11,8 +11,10 @@ Design contract
 ---------------
 1. Typed fields always win over :attr:`extra` on key conflict; ``extra``
    can only add non-reserved keys.
-2. Optional typed fields (``token``, ``result_offset``, ``result_record_count``)
-   are omitted from the produced data dict when their value is ``None``.
+2. Optional typed fields (``token``, ``result_offset``, ``result_record_count``,
+   ``geometry_precision``, ``max_allowable_offset``,
+   ``quantization_parameters``) are omitted from the produced data dict
+   when their value is ``None``.
 3. A no-arg :class:`QueryOptions` produces the exact same dict as
    :func:`restgdf.utils._http.default_data`.
 4. :attr:`extra` is stored as an immutable :class:`~types.MappingProxyType`
@@ -24,6 +26,7 @@ Design contract
 
 from __future__ import annotations
 
+import json
 from collections.abc import Mapping
 from dataclasses import dataclass, field
 from types import MappingProxyType
@@ -41,6 +44,9 @@ _RESERVED_KEYS = frozenset(
         "returnIdsOnly",
         "resultOffset",
         "resultRecordCount",
+        "geometryPrecision",
+        "maxAllowableOffset",
+        "quantizationParameters",
         "token",
         "f",
     },
@@ -66,6 +72,9 @@ class QueryOptions:
     token: str | None = None
     result_offset: int | None = None
     result_record_count: int | None = None
+    geometry_precision: int | None = None
+    max_allowable_offset: float | None = None
+    quantization_parameters: Mapping[str, Any] | str | None = None
     extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
 
     def __post_init__(self) -> None:
@@ -73,6 +82,12 @@ class QueryOptions:
         # cannot mutate the options by mutating their original dict, and
         # the user cannot mutate the proxy either.
         object.__setattr__(self, "extra", _freeze(self.extra))
+        if isinstance(self.quantization_parameters, Mapping):
+            object.__setattr__(
+                self,
+                "quantization_parameters",
+                _freeze(self.quantization_parameters),
+            )
 
     def to_data(self) -> dict[str, Any]:
         """Return a fresh POST body dict for an ArcGIS REST query."""
@@ -95,6 +110,18 @@ class QueryOptions:
             data["resultOffset"] = self.result_offset
         if self.result_record_count is not None:
             data["resultRecordCount"] = self.result_record_count
+        if self.geometry_precision is not None:
+            data["geometryPrecision"] = self.geometry_precision
+        if self.max_allowable_offset is not None:
+            data["maxAllowableOffset"] = self.max_allowable_offset
+        if isinstance(self.quantization_parameters, Mapping):
+            # Sent as a JSON string, like every other structured parameter.
+            data["quantizationParameters"] = json.dumps(
+                dict(self.quantization_parameters),
+                separators=(",", ":"),
+            )
+        elif self.quantization_parameters is not None:
+            data["quantizationParameters"] = self.quantization_parameters
         return data
 
     @classmethod
@@ -119,6 +146,9 @@ class QueryOptions:
         return_ids_only = data.get("returnIdsOnly", False)
         result_offset = data.get("resultOffset")
         result_record_count = data.get("resultRecordCount")
+        geometry_precision = data.get("geometryPrecision")
+        max_allowable_offset = data.get("maxAllowableOffset")
+        quantization_parameters = data.get("quantizationParameters")
 
         extras = {k: v for k, v in data.items() if k not in _RESERVED_KEYS}
 
@@ -131,6 +161,9 @@ class QueryOptions:
             token=token,
             result_offset=result_offset,
             result_record_count=result_record_count,
+            geometry_precision=geometry_precision,
+            max_allowable_offset=max_allowable_offset,
+            quantization_parameters=quantization_parameters,
             extra=extras,
         )
 
@@ -108,15 +108,15 @@ _LOG_LEVEL_ALIASES: Mapping[str, str] = {"WARN": "WARNING", "FATAL": "CRITICAL"}
 
 
 class TransportConfig(BaseModel):
-    """HTTP transport knobs (TLS, user agent).
+    """HTTP transport knobs (TLS, user agent, connection pool).
 
     Single source of truth for the **library-owned data-request** transport.
-    These two fields are the one place a caller sets the data-path TLS and
-    User-Agent behavior. The application seams that carry them into requests
-    -- the ``restgdf.utils._http`` request layer and the ``getgdf`` TLS
-    connector -- are the *designated* consumers: they read from these fields
-    (rather than any hardcoded value or separate flag) so a single change
-    here governs the whole data path. Those seams own the wiring; this
+    ``verify_ssl`` and ``user_agent`` are the one place a caller sets the
+    data-path TLS and User-Agent behavior. The application seams that carry
+    them into requests -- the ``restgdf.utils._http`` request layer and the
+    ``getgdf`` TLS connector -- are the *designated* consumers: they read
+    from these fields (rather than any hardcoded value or separate flag) so
+    a single change here governs the whole data path. Those seams own the wiring; this
     config only fixes where they read from.
 
     * ``verify_ssl`` is the authoritative TLS-verification flag for
@@ -133,12 +133,36 @@ class TransportConfig(BaseModel):
       from. Do NOT re-introduce a hardcoded ``User-Agent`` at a leaf call
       site -- change the default here (or ``RESTGDF_TRANSPORT_USER_AGENT``)
       instead.
+    * ``pooled_session`` makes ``get_gdf`` without a session use the
+      process-scoped keep-alive session from :func:`restgdf.pooled_session`
+      instead of a fresh session per call. The remaining ``pool_*``,
+      ``dns_cache_ttl_s``, ``keepalive_timeout_s`` and
+      ``happy_eyeballs_delay_s`` fields tune that session's
+      :class:`aiohttp.TCPConnector` (``limit``, ``limit_per_host``,
+      ``ttl_dns_cache``, ``keepalive_timeout``, ``happy_eyeballs_delay``);
+      ``0`` means unlimited for both limits and ``None`` disables DNS
+      caching / Happy Eyeballs.
+    * ``coalesce_requests`` lets concurrent identical metadata, count and
+      object-id reads share one in-flight request and its decoded result
+      (see :mod:`restgdf.utils._coalesce`).
+    * ``cache_hint`` marks anonymous ``/query`` requests ``cacheHint=true``
+      so ArcGIS Online / Enterprise may answer them from its edge cache,
+      and makes paged reads request full, aligned pages (the last page
+      too), so a page's query string does not change as the layer grows.
     """
 
     model_config = _FROZEN
 
     verify_ssl: bool = True
     user_agent: str = Field(default_factory=_default_user_agent, min_length=1)
+    pooled_session: bool = False
+    pool_limit: int = Field(default=100, ge=0)
+    pool_limit_per_host: int = Field(default=0, ge=0)
+    dns_cache_ttl_s: int | None = Field(default=300, ge=0)
+    keepalive_timeout_s: float = Field(default=30.0, gt=0)
+    happy_eyeballs_delay_s: float | None = Field(default=0.25, ge=0)
+    coalesce_requests: bool = True
+    cache_hint: bool = False
 
 
 class TimeoutConfig(BaseModel):
@@ -334,6 +358,64 @@ class ResilienceConfig(BaseModel):
     config (defaults preserve the historical hardcoded policy exactly). These
     supersede the inert :class:`RetryConfig` knobs (deprecated in 3.3).
 
+    Adaptive rate limiting (``limiter_mode``)
+    -----------------------------------------
+    ``limiter_mode="static"`` (default) applies the one configured
+    ``rate_per_service_root_per_second`` to every key. ``"adaptive"`` learns
+    a rate per ``limiter_key`` instead: each key starts at
+    ``rate_per_service_root_per_second`` (``1.0`` when unset), gains
+    ``adaptive_increase_per_second`` for roughly every second of successful
+    traffic, and is multiplied by ``adaptive_decrease_factor`` on a 429, a
+    503 or a timeout. The rate is kept within
+    ``[adaptive_floor_per_second, adaptive_ceiling_per_second]``. Learned
+    rates can be inspected and exported from the session and used to seed
+    the next run.
+
+    In-flight cap and registry bounds
+    --------------------------------
+    ``max_in_flight_per_key`` caps how many requests run *at the same time*
+    against one ``limiter_key`` (service root or host), alongside the token
+    bucket that caps how often they start. ``None`` (default) leaves
+    concurrency unbounded per key. The slot is held for one attempt: up to
+    *headers received*, or through the body read when ``buffer_responses``
+    is on. Every per-key registry (token buckets, adaptive rates, in-flight
+    slots, cooldowns) keeps at most ``registry_max_keys`` keys and drops keys
+    idle for ``registry_idle_ttl_s``, never evicting an entry still in use.
+
+    Circuit breaker (``breaker_failure_threshold``)
+    -----------------------------------------------
+    Off by default. With ``breaker_failure_threshold=N`` each
+    ``limiter_key`` gets a breaker that opens after ``N`` consecutive
+    transport or 5xx failures (counted per attempt). While open, requests to
+    that key raise :class:`~restgdf.errors.CircuitOpenError` immediately
+    instead of running the retry schedule. After ``breaker_cooldown_s`` one
+    probe request is let through: success closes the breaker, failure
+    re-opens it for another cooldown. Any non-5xx response resets the count.
+
+    Shared retry budget (``retry_budget_ratio``)
+    --------------------------------------------
+    ``max_attempts`` applies to each request on its own. Setting
+    ``retry_budget_ratio`` gives the session one
+    :class:`~restgdf.RetryBudget` shared by all of its requests: retries
+    may not exceed that fraction of first attempts (plus a reserve of
+    ``retry_budget_min_retries``). Once the budget is spent, a failed
+    attempt surfaces at once instead of retrying. A stream's own budget
+    (``FeatureLayer.iter_pages(retry_budget=...)``) takes precedence for
+    that stream's page requests. Unrelated to ``retry_budget_s``, which
+    bounds one request's retry loop in wall-clock time.
+
+    Response buffering (``buffer_responses``)
+    -----------------------------------------
+    Off by default: the retry loop covers the request up to *headers
+    received* and callers read the body themselves. With
+    ``buffer_responses=True`` each retried attempt also reads the body (and
+    decodes JSON bodies) before returning, handing callers a fully buffered
+    :class:`~restgdf._client._buffered.BufferedResponse`. A truncated or
+    reset body (``aiohttp.ClientPayloadError``) is then retried under the
+    same attempts/budget/limiter as a failed request instead of surfacing
+    raw from ``response.json()``. Whole bodies are held in memory, which is
+    what restgdf's JSON call sites do anyway.
+
     Budget / cooldown coherence (H1-N3)
     -----------------------------------
     A 429 ``Retry-After`` cooldown sleep happens *inside* a retried attempt and
@@ -370,8 +452,30 @@ class ResilienceConfig(BaseModel):
     wait_initial_s: float = Field(default=0.5, ge=0)
     wait_max_s: float = Field(default=10.0, gt=0)
     wait_jitter_s: float = Field(default=1.0, ge=0)
+    buffer_responses: bool = False
+    limiter_mode: Literal["static", "adaptive"] = "static"
+    adaptive_floor_per_second: float = Field(default=0.2, gt=0)
+    adaptive_ceiling_per_second: float = Field(default=50.0, gt=0)
+    adaptive_increase_per_second: float = Field(default=0.5, gt=0)
+    adaptive_decrease_factor: float = Field(default=0.5, gt=0, lt=1)
+    max_in_flight_per_key: int | None = Field(default=None, ge=1)
+    registry_max_keys: int = Field(default=4096, ge=1)
+    registry_idle_ttl_s: float = Field(default=3600.0, gt=0)
+    breaker_failure_threshold: int | None = Field(default=None, ge=1)
+    breaker_cooldown_s: float = Field(default=30.0, gt=0)
+    retry_budget_ratio: float | None = Field(default=None, ge=0)
+    retry_budget_min_retries: int = Field(default=10, ge=0)
     backend: str = "stamina"
 
+    @model_validator(mode="after")
+    def _check_adaptive_bounds(self) -> ResilienceConfig:
+        if self.adaptive_floor_per_second > self.adaptive_ceiling_per_second:
+            raise ValueError(
+                "adaptive_floor_per_second must not exceed "
+                "adaptive_ceiling_per_second.",
+            )
+        return self
+
 
 _Caster = Callable[[str], Any]
 
@@ -388,6 +492,26 @@ def _parse_bool(raw: str) -> bool:
 _NEW_ENV_SPEC: tuple[tuple[str, str, _Caster], ...] = (
     ("RESTGDF_TRANSPORT_VERIFY_SSL", "transport.verify_ssl", _parse_bool),
     ("RESTGDF_TRANSPORT_USER_AGENT", "transport.user_agent", str),
+    ("RESTGDF_TRANSPORT_POOLED_SESSION", "transport.pooled_session", _parse_bool),
+    (
+        "RESTGDF_TRANSPORT_COALESCE_REQUESTS",
+        "transport.coalesce_requests",
+        _parse_bool,
+    ),
+    ("RESTGDF_TRANSPORT_CACHE_HINT", "transport.cache_hint", _parse_bool),
+    ("RESTGDF_TRANSPORT_POOL_LIMIT", "transport.pool_limit", int),
+    ("RESTGDF_TRANSPORT_POOL_LIMIT_PER_HOST", "transport.pool_limit_per_host", int),
+    ("RESTGDF_TRANSPORT_DNS_CACHE_TTL_S", "transport.dns_cache_ttl_s", int),
+    (
+        "RESTGDF_TRANSPORT_KEEPALIVE_TIMEOUT_S",
+        "transport.keepalive_timeout_s",
+        float,
+    ),
+    (
+        "RESTGDF_TRANSPORT_HAPPY_EYEBALLS_DELAY_S",
+        "transport.happy_eyeballs_delay_s",
+        float,
+    ),
     ("RESTGDF_TIMEOUT_CONNECT_S", "timeout.connect_s", float),
     ("RESTGDF_TIMEOUT_READ_S", "timeout.read_s", float),
     ("RESTGDF_TIMEOUT_TOTAL_S", "timeout.total_s", float),
@@ -428,6 +552,67 @@ _NEW_ENV_SPEC: tuple[tuple[str, str, _Caster], ...] = (
     ("RESTGDF_RESILIENCE_WAIT_INITIAL_S", "resilience.wait_initial_s", float),
     ("RESTGDF_RESILIENCE_WAIT_MAX_S", "resilience.wait_max_s", float),
     ("RESTGDF_RESILIENCE_WAIT_JITTER_S", "resilience.wait_jitter_s", float),
+    (
+        "RESTGDF_RESILIENCE_BUFFER_RESPONSES",
+        "resilience.buffer_responses",
+        _parse_bool,
+    ),
+    ("RESTGDF_RESILIENCE_LIMITER_MODE", "resilience.limiter_mode", str),
+    (
+        "RESTGDF_RESILIENCE_ADAPTIVE_FLOOR_PER_SECOND",
+        "resilience.adaptive_floor_per_second",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_ADAPTIVE_CEILING_PER_SECOND",
+        "resilience.adaptive_ceiling_per_second",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_ADAPTIVE_INCREASE_PER_SECOND",
+        "resilience.adaptive_increase_per_second",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_ADAPTIVE_DECREASE_FACTOR",
+        "resilience.adaptive_decrease_factor",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_MAX_IN_FLIGHT_PER_KEY",
+        "resilience.max_in_flight_per_key",
+        int,
+    ),
+    (
+        "RESTGDF_RESILIENCE_REGISTRY_MAX_KEYS",
+        "resilience.registry_max_keys",
+        int,
+    ),
+    (
+        "RESTGDF_RESILIENCE_REGISTRY_IDLE_TTL_S",
+        "resilience.registry_idle_ttl_s",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_BREAKER_FAILURE_THRESHOLD",
+        "resilience.breaker_failure_threshold",
+        int,
+    ),
+    (
+        "RESTGDF_RESILIENCE_BREAKER_COOLDOWN_S",
+        "resilience.breaker_cooldown_s",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_RETRY_BUDGET_RATIO",
+        "resilience.retry_budget_ratio",
+        float,
+    ),
+    (
+        "RESTGDF_RESILIENCE_RETRY_BUDGET_MIN_RETRIES",
+        "resilience.retry_budget_min_retries",
+        int,
+    ),
     ("RESTGDF_RESILIENCE_BACKEND", "resilience.backend", str),
 )
 
@@ -12,6 +12,7 @@ Submodules are added slice-by-slice per the v2.0.0 integration plan:
 * :mod:`restgdf._models.responses` — ArcGIS payload envelopes
   (``LayerMetadata``, ``CountResponse``, etc.).
 * :mod:`restgdf._models.crawl` — crawl-report models.
+* :mod:`restgdf._models.pagination` — failed-page records.
 * :mod:`restgdf._models.credentials` — ``AGOLUserPass`` and
   ``TokenSessionConfig``.
 * :mod:`restgdf._models.settings` — process-level runtime settings.
@@ -23,6 +24,7 @@ from restgdf._models._errors import RestgdfResponseError
 from restgdf._models._settings import Settings, get_settings, reset_settings_cache
 from restgdf._models.crawl import CrawlError, CrawlReport, CrawlServiceEntry
 from restgdf._models.credentials import AGOLUserPass, TokenSessionConfig
+from restgdf._models.pagination import PageFailure
 from restgdf._models.responses import (
     CountResponse,
     ErrorInfo,
@@ -49,6 +51,7 @@ __all__ = [
     "FieldSpec",
     "LayerMetadata",
     "ObjectIdsResponse",
+    "PageFailure",
     "RestgdfResponseError",
     "ServiceInfo",
     "Settings",
@@ -0,0 +1,49 @@
+"""Pydantic model for failed pagination batches.
+
+:class:`PageFailure` is the per-batch counterpart of
+:class:`~restgdf._models.crawl.CrawlError`: when a paginated read runs with
+``on_page_error="collect"``, every page whose fetch still fails after the
+page-retry policy is exhausted is recorded as one :class:`PageFailure`
+instead of aborting the whole read. The recorded ``query_data`` is the exact
+query payload of the failed batch, so the batch can be re-fetched cheaply
+without re-planning the layer.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import ConfigDict, Field
+
+from restgdf._models._drift import PermissiveModel
+
+
+class PageFailure(PermissiveModel):
+    """A single page that could not be fetched during a paginated read.
+
+    ``batch_index`` is the zero-based index of the batch in the pagination
+    plan. ``query_data`` is the query payload that was sent for the batch
+    (``where``, ``resultOffset``/``resultRecordCount`` or an OID predicate,
+    ...). Any ``token`` key is removed before the payload is recorded.
+    ``attempts`` is the number of times the page was tried.
+
+    ``exception`` preserves the final :class:`BaseException` so callers can
+    re-raise. Like :attr:`CrawlError.exception`, it is excluded from the
+    default :meth:`~pydantic.BaseModel.model_dump` output for JSON safety.
+    """
+
+    model_config = ConfigDict(
+        extra="allow",
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
+
+    batch_index: int
+    url: str | None = None
+    query_data: dict[str, Any] = Field(default_factory=dict)
+    attempts: int = 1
+    message: str | None = None
+    exception: BaseException | None = Field(default=None, exclude=True)
+
+
+__all__ = ["PageFailure"]
@@ -1,8 +1,9 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from restgdf._client._protocols import AsyncHTTPSession
 from restgdf._models.crawl import CrawlReport, CrawlServiceEntry
 from restgdf._models.responses import LayerMetadata
+from restgdf.errors import DeadlineExceededError
 from restgdf.utils.getinfo import get_metadata
 from restgdf.utils.crawl import fetch_all_data, safe_crawl  # noqa: F401
 
@@ -10,6 +11,13 @@ if TYPE_CHECKING:
     from restgdf._config import Config
 
 
+def _cut_short(report: CrawlReport) -> bool:
+    """Return ``True`` when a deadline stopped the crawl before it finished."""
+    return any(
+        isinstance(error.exception, DeadlineExceededError) for error in report.errors
+    )
+
+
 class Directory:
     """A class for interacting with ArcGIS Server directories.
 
@@ -138,6 +146,8 @@ class Directory:
     async def crawl(
         self,
         return_feature_count: bool = False,
+        *,
+        deadline: float | None = None,
     ) -> list[CrawlServiceEntry]:
         """Discover all services under this directory recursively.
 
@@ -150,6 +160,11 @@ class Directory:
         return_feature_count : bool, default False
             When ``True``, also fetches the feature count for each
             discovered layer (requires extra HTTP requests per layer).
+        deadline : float, optional
+            Wall-clock budget in seconds for the whole crawl; see
+            :func:`restgdf.deadline`. Services not finished in time are
+            recorded in :attr:`report` ``.errors``, and a crawl cut short
+            this way is not cached.
 
         Returns
         -------
@@ -167,6 +182,10 @@ class Directory:
         * :attr:`services_with_feature_count` — same as *services* when
           *return_feature_count* was ``True``.
         """
+        crawl_kwargs: dict[str, Any] = {}
+        if deadline is not None:
+            crawl_kwargs["deadline"] = deadline
+
         if return_feature_count:
             if self.services_with_feature_count is None:
                 report = await safe_crawl(
@@ -174,8 +193,11 @@ class Directory:
                     self.url,
                     self.token,
                     return_feature_count=True,
+                    **crawl_kwargs,
                 )
                 self.report = report
+                if _cut_short(report):
+                    return report.services
                 self.services_with_feature_count = report.services
             self.services = self.services_with_feature_count
             return self.services_with_feature_count
@@ -186,8 +208,11 @@ class Directory:
                 self.url,
                 self.token,
                 return_feature_count=False,
+                **crawl_kwargs,
             )
             self.report = report
+            if _cut_short(report):
+                return report.services
             self.services = report.services
         return self.services
 
@@ -43,7 +43,9 @@ Hierarchy::
     |       +-- AuthNotAttachedError(AuthenticationError)
     +-- TransportError(RestgdfError)
     |   +-- RestgdfTimeoutError(TransportError, TimeoutError)
+    |   |   +-- DeadlineExceededError(RestgdfTimeoutError)
     |   +-- RateLimitError(TransportError)
+    |   +-- CircuitOpenError(TransportError)
     +-- OutputConversionError(RestgdfError)
 """
 
@@ -390,6 +392,36 @@ class RestgdfTimeoutError(TransportError, TimeoutError):
         self.timeout_kind = timeout_kind
 
 
+class DeadlineExceededError(RestgdfTimeoutError):
+    """Raised when an operation's end-to-end deadline has run out.
+
+    Set with :func:`restgdf.deadline` or the ``deadline=`` argument of
+    ``get_gdf``, ``FeatureLayer.iter_pages`` and ``safe_crawl``. Requests
+    are not started, and retries and truncation splits are not scheduled,
+    once the deadline has passed; a request already in flight is cut off
+    when it arrives.
+
+    Attributes
+    ----------
+    budget_s
+        The deadline's total budget in seconds, when known.
+    completed
+        Units of work finished before the deadline (pages yielded by a
+        stream or downloaded by ``get_gdf``), when known.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        url: str | None = None,
+        budget_s: float | None = None,
+        completed: int | None = None,
+    ) -> None:
+        super().__init__(*args, url=url, timeout_kind="deadline")
+        self.budget_s = budget_s
+        self.completed = completed
+
+
 class RateLimitError(TransportError):
     """Raised when the ArcGIS service signals a rate limit / throttle.
 
@@ -412,6 +444,37 @@ class RateLimitError(TransportError):
         self.retry_after = retry_after
 
 
+class CircuitOpenError(TransportError):
+    """Raised without a request when a service's circuit breaker is open.
+
+    :class:`~restgdf.resilience.ResilientSession` opens a per-key breaker
+    after ``ResilienceConfig.breaker_failure_threshold`` consecutive
+    transport/5xx failures and then fails every request to that key fast
+    -- no dispatch, no retry schedule -- until ``breaker_cooldown_s`` has
+    passed and a single probe request succeeds.
+
+    Attributes
+    ----------
+    breaker_key
+        The service root or host (per ``ResilienceConfig.limiter_key``)
+        whose breaker is open.
+    retry_after
+        Seconds until the breaker half-opens and admits a probe; ``0.0``
+        while a probe is already in flight.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        breaker_key: str | None = None,
+        retry_after: float | None = None,
+        url: str | None = None,
+    ) -> None:
+        super().__init__(*args, url=url, status_code=None)
+        self.breaker_key = breaker_key
+        self.retry_after = retry_after
+
+
 class OutputConversionError(RestgdfError):
     """Raised when converting validated ArcGIS data to a GeoDataFrame / DataFrame fails."""
 
@@ -436,7 +499,9 @@ __all__ = [
     "ArcGISServiceError",
     "AuthNotAttachedError",
     "AuthenticationError",
+    "CircuitOpenError",
     "ConfigurationError",
+    "DeadlineExceededError",
     "FieldDoesNotExistError",
     "InvalidCredentialsError",
     "OptionalDependencyError",
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-import random
 import warnings
-from collections.abc import AsyncIterable, AsyncIterator
-from typing import TYPE_CHECKING, Any, Literal
+from array import array
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 
 from restgdf._client._protocols import AsyncHTTPSession
 from restgdf._compat import _warn_deprecated, aclosing
 from restgdf._models.responses import LayerMetadata
-from restgdf.errors import FieldDoesNotExistError
+from restgdf._logging import _scrub_url, build_log_extra, get_logger
+from restgdf.errors import FieldDoesNotExistError, RestgdfResponseError
+from restgdf.utils._cache import _LRUDict
+from restgdf.utils._coalesce import _SingleFlight
+from restgdf.utils._deadline import _with_deadline
 from restgdf.utils._optional import require_geo_stack
+from restgdf.utils._preview import head_gdf as preview_head_gdf
+from restgdf.utils._preview import sample_gdf as preview_sample_gdf
 from restgdf.utils.getgdf import (
     _feature_to_row_dict,
     _iter_pages_raw,
@@ -20,7 +26,17 @@ from restgdf.utils.getgdf import (
     get_gdf,
     row_dict_generator,
 )
+from restgdf.utils._stats import (
+    _LOCAL_ONLY_TYPES,
+    Statistic,
+    StatisticsSpec,
+    _as_statistics,
+    _compact_array,
+    _field_list,
+)
 from restgdf.utils.getinfo import (
+    aggregate,
+    aggregate_batches,
     default_data,
     get_feature_count,
     get_fields,
@@ -28,9 +44,15 @@ from restgdf.utils.getinfo import (
     get_metadata,
     get_name,
     get_object_id_field,
+    get_object_ids,
     get_unique_values,
     get_value_counts,
+    iter_unique_values,
     nested_count,
+    query_geometries,
+    resolution_params,
+    scale_to_tolerance,
+    supports_statistics,
 )
 
 # Deprecated names re-imported at module scope so callers can still patch
@@ -55,13 +77,22 @@ __all__ = [
     "getvaluecounts",
     "nestedcount",
 ]
-from restgdf.utils.utils import where_var_in_list, ends_with_num
+from restgdf.utils._resolution import _RESOLUTION_KEYS
+from restgdf.utils.utils import ends_with_num
 
 if TYPE_CHECKING:
     from geopandas import GeoDataFrame
     from pandas import DataFrame
 
     from restgdf._config import Config
+    from restgdf._models.pagination import PageFailure
+    from restgdf.utils._hedging import HedgePolicy
+    from restgdf.utils._page_retry import PageRetryPolicy
+    from restgdf.utils._retry_budget import RetryBudget
+    from restgdf.utils._spatial import BatchGeometry, GeometryMatches, Prefilter
+
+#: Entries kept by each per-instance result cache (``uniquevalues`` etc.).
+_INSTANCE_CACHE_ENTRIES = 64
 
 
 def _require_featurelayer_geo_support(feature: str) -> None:
@@ -163,15 +194,19 @@ class FeatureLayer:
             self.datadict["token"] = token
         self.kwargs["data"] = self.datadict
 
+        # Bounded, so a long-lived layer asked for many different fields
+        # does not grow without limit.
         self.uniquevalues: dict[
             tuple[str | tuple, str | None],
             list | DataFrame,
-        ] = {}
-        self.valuecounts: dict = {}
-        self.nestedcount: dict = {}
+        ] = _LRUDict(_INSTANCE_CACHE_ENTRIES)
+        self.valuecounts: dict = _LRUDict(_INSTANCE_CACHE_ENTRIES)
+        self.nestedcount: dict = _LRUDict(_INSTANCE_CACHE_ENTRIES)
 
         self.gdf: GeoDataFrame | None = None
         self._fieldtypes_frame: DataFrame | None = None
+        # Concurrent cache misses on this instance share one fetch.
+        self._loading = _SingleFlight()
 
         self.metadata: LayerMetadata
         self.name: str
@@ -314,49 +349,83 @@ class FeatureLayer:
             kwargs.setdefault("token", token)
         return await cls.from_url(url, **kwargs)
 
-    async def get_oids(self) -> list[int]:
+    async def get_oids(self, *, as_array: bool = False) -> list[int] | array:
         """Return all object IDs matching the current WHERE filter.
 
         Delegates to :meth:`get_unique_values` using the resolved
-        :attr:`object_id_field`.
+        :attr:`object_id_field`, which reads them with ``returnIdsOnly``.
+
+        Parameters
+        ----------
+        as_array : bool
+            Return an ``array('q')`` (8 bytes per id) instead of a list.
 
         Returns
         -------
-        list[int]
-            Sorted list of object ID values for the filtered feature set.
+        list[int] or array
+            Sorted object ID values for the filtered feature set.
         """
         object_id_field = getattr(self, "object_id_field", "OBJECTID")
-        return await self.get_unique_values(object_id_field)
+        oids = await self.get_unique_values(object_id_field)
+        return array("q", oids) if as_array else oids
 
-    async def sample_gdf(self, n: int = 10) -> GeoDataFrame:
-        """Get n random features as a GeoDataFrame."""
+    async def sample_gdf(
+        self,
+        n: int = 10,
+        *,
+        seed: int | None = None,
+    ) -> GeoDataFrame:
+        """Get n random features as a GeoDataFrame.
+
+        Random object ids are drawn between the layer's smallest and
+        largest one (a single ``outStatistics`` query) and fetched with
+        ``<oid> IN (...)``, so a sample usually takes two round trips
+        however large the layer is. Layers with sparse ids, or without
+        statistics support, draw from the ``returnIdsOnly`` id list
+        instead.
+
+        Parameters
+        ----------
+        n : int
+            Number of features.
+        seed : int, optional
+            Seed for the draws; the same seed picks the same features
+            while the data is unchanged.
+        """
         _require_featurelayer_geo_support("FeatureLayer.sample_gdf()")
-        oids = await get_unique_values(
+        return await preview_sample_gdf(
             self.url,
-            self.object_id_field,
             self.session,
+            n,
+            object_id_field=self.object_id_field,
+            seed=seed,
+            metadata=getattr(self, "metadata", None),
             **self.kwargs,
         )
-        sample_oids = random.sample(oids, min(n, len(oids)))
-        wherestr = where_var_in_list(self.object_id_field, sample_oids)
-        new_rest = await self.where(wherestr)
-        return await new_rest.get_gdf()
 
     async def head_gdf(self, n: int = 10) -> GeoDataFrame:
-        """Get the n first features as a GeoDataFrame."""
+        """Get the n first features, by object id, as a GeoDataFrame.
+
+        One ``resultRecordCount=n`` query ordered by the object id field
+        while ``n`` fits in ``maxRecordCount``.
+        """
         _require_featurelayer_geo_support("FeatureLayer.head_gdf()")
-        oids = await get_unique_values(
+        return await preview_head_gdf(
             self.url,
-            self.object_id_field,
             self.session,
+            n,
+            object_id_field=self.object_id_field,
+            metadata=getattr(self, "metadata", None),
             **self.kwargs,
         )
-        head_oids = oids[:n]
-        wherestr = where_var_in_list(self.object_id_field, head_oids)
-        new_rest = await self.where(wherestr)
-        return await new_rest.get_gdf()
 
-    async def get_gdf(self) -> GeoDataFrame:
+    async def get_gdf(
+        self,
+        *,
+        on_page_error: Literal["raise", "collect"] = "raise",
+        page_retry: PageRetryPolicy | None = None,
+        deadline: float | None = None,
+    ) -> GeoDataFrame:
         """Get a GeoDataFrame from an ArcGIS FeatureLayer.
 
         The returned ``GeoDataFrame`` carries
@@ -367,15 +436,32 @@ class FeatureLayer:
 
         Each call returns an independent copy of the cached frame (W5-1)
         — mutating the returned ``GeoDataFrame`` in place does not affect
-        the cache or any other call's result. This copy-on-return only
-        protects the *read* side: the cache *population* (``if self.gdf
-        is None: ...``) is not itself concurrency-safe — concurrent
-        awaiters via ``asyncio.gather`` can still both observe a cache
-        miss and double-fetch. Do not rely on this fix for task-safety.
+        the cache or any other call's result. Concurrent calls that miss
+        the cache (e.g. via ``asyncio.gather``) share one download.
+
+        ``page_retry`` and ``on_page_error`` are forwarded to
+        :func:`restgdf.utils.getgdf.get_gdf`. A ``"collect"`` download that
+        skipped pages carries them in ``gdf.attrs["failed_batches"]`` and is
+        returned without being cached, so the next call fetches again.
+        ``deadline`` bounds the whole download to that many seconds; see
+        :func:`restgdf.deadline`.
         """
         if self.gdf is None:
             _require_featurelayer_geo_support("FeatureLayer.get_gdf()")
-            self.gdf = await get_gdf(self.url, self.session, **self.kwargs)
+            page_kwargs: dict[str, Any] = {}
+            if on_page_error != "raise":
+                page_kwargs["on_page_error"] = on_page_error
+            if page_retry is not None:
+                page_kwargs["page_retry"] = page_retry
+            if deadline is not None:
+                page_kwargs["deadline"] = deadline
+            gdf = await self._loading.run(
+                ("gdf", on_page_error, id(page_retry), deadline),
+                lambda: get_gdf(self.url, self.session, **self.kwargs, **page_kwargs),
+            )
+            if gdf.attrs.get("failed_batches"):
+                return gdf
+            self.gdf = gdf
         # W5-1 (ASYNC-02): return a copy so a caller mutating the frame in
         # place cannot corrupt the cached instance a later call returns.
         # ``.copy()`` propagates ``.attrs`` (including R-65's
@@ -394,6 +480,13 @@ class FeatureLayer:
         order: Literal["request", "completion"] = "request",
         max_concurrent_pages: int | None = None,
         on_truncation: Literal["raise", "ignore", "split"] = "raise",
+        hedge: HedgePolicy | None = None,
+        on_page_error: Literal["raise", "collect"] = "raise",
+        page_retry: PageRetryPolicy | None = None,
+        page_failures: list[PageFailure] | None = None,
+        retry_budget: RetryBudget | None = None,
+        deadline: float | None = None,
+        prewarm: bool = False,
         **kwargs: Any,
     ) -> AsyncIterator[dict[str, Any]]:
         """Yield raw ArcGIS query-page envelopes from this FeatureLayer.
@@ -424,6 +517,58 @@ class FeatureLayer:
               yield the truncated page anyway.
             * ``"split"`` — bisect the predicate's OID list and recurse
               (max depth 32; irreducible partitions raise).
+        hedge
+            Optional :class:`restgdf.HedgePolicy`. When set, a page fetch
+            still running after the policy's latency percentile (measured
+            over this stream's earlier pages) is duplicated once and the
+            first successful copy wins. At most ``max_hedge_ratio`` of the
+            stream's page requests are hedged, and hedges go through the
+            same session, so any :class:`restgdf.resilience.ResilientSession`
+            rate limit still applies. ``None`` (the default) disables
+            hedging.
+        on_page_error
+            ``"raise"`` (default) aborts the stream on the first page that
+            cannot be fetched. ``"collect"`` skips that page, logs a
+            ``restgdf.pagination`` warning, appends a
+            :class:`restgdf.PageFailure` (including the batch's query
+            payload) to ``page_failures`` and continues with the rest of
+            the plan.
+        page_retry
+            Optional :class:`restgdf.PageRetryPolicy` retrying each failed
+            page -- request, body read and JSON decode -- before
+            ``on_page_error`` applies. ``None`` (the default) makes one
+            attempt per page.
+        page_failures
+            List that receives one :class:`restgdf.PageFailure` per skipped
+            page when ``on_page_error="collect"``.
+        retry_budget
+            Optional :class:`restgdf.RetryBudget` shared by every page of
+            this stream. Page retries and the transport retries of a
+            :class:`restgdf.resilience.ResilientSession` both draw from it,
+            so retries stay within its fraction of the pages requested.
+            Once it is spent a failing page fails at once and goes to
+            ``on_page_error``. ``None`` (the default) leaves each request's
+            own retry policy unbounded by the others.
+        deadline
+            Optional wall-clock budget in seconds for the whole stream,
+            counted from the first page pulled. Every request gets at most
+            the time remaining, and retries and truncation splits that
+            cannot finish in time are not started. When it runs out the
+            stream raises :class:`restgdf.errors.DeadlineExceededError`
+            whose ``completed`` is the number of pages already yielded; with
+            ``on_page_error="collect"`` the unfinished pages are reported in
+            ``page_failures`` instead. ``None`` (the default) leaves the
+            stream unbounded.
+        prewarm
+            When ``True``, open one keep-alive connection per slot of the
+            page window (``max_concurrent_pages``, or the configured
+            ``max_concurrent_requests`` when unbounded) with lightweight
+            ``f=json`` requests while the count/metadata phase runs. The
+            first page fetches then reuse warm connections instead of all
+            paying for TCP/TLS handshakes at once. The pings are real
+            requests and count against any
+            :class:`restgdf.resilience.ResilientSession` rate limit.
+            Defaults to ``False``.
 
         Yields
         ------
@@ -453,19 +598,26 @@ class FeatureLayer:
         # (which ends the R-61 INTERNAL span) runs when the consumer breaks
         # early or calls ``aclose()``. Without it, GC-deferred cleanup would
         # leak the span until the next event-loop tick.
-        async with aclosing(
-            _iter_pages_raw(
-                self.url,
-                self.session,
-                order=order,
-                max_concurrent_pages=max_concurrent_pages,
-                on_truncation=on_truncation,
-                span_layer_id=layer_id,
-                span_out_fields=out_fields,
-                span_where=span_where,
-                **merged_kwargs,
-            ),
-        ) as pages:
+        raw_pages = _iter_pages_raw(
+            self.url,
+            self.session,
+            order=order,
+            max_concurrent_pages=max_concurrent_pages,
+            on_truncation=on_truncation,
+            hedge=hedge,
+            on_page_error=on_page_error,
+            page_retry=page_retry,
+            page_failures=page_failures,
+            retry_budget=retry_budget,
+            prewarm=prewarm,
+            span_layer_id=layer_id,
+            span_out_fields=out_fields,
+            span_where=span_where,
+            **merged_kwargs,
+        )
+        if deadline is not None:
+            raw_pages = _with_deadline(raw_pages, deadline, url=self.url)
+        async with aclosing(raw_pages) as pages:
             async for page in pages:
                 yield page
 
@@ -508,7 +660,7 @@ class FeatureLayer:
         max_concurrent_pages: int | None = None,
         on_truncation: Literal["raise", "ignore", "split"] = "raise",
         **kwargs: Any,
-    ) -> AsyncIterator[list[dict[str, Any]]]:
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
         """Yield one list of raw feature dicts per page.
 
         See :meth:`iter_pages` for parameter semantics.
@@ -640,11 +792,15 @@ class FeatureLayer:
         self,
         fields: tuple | str,
         sortby: str | None = None,
-    ) -> list | DataFrame:
+        *,
+        as_array: bool = False,
+    ) -> list | array | DataFrame:
         """Get unique values for one or more fields.
 
-        Results are cached per ``(fields, sortby)`` key for the lifetime of
-        this instance.
+        Results are cached on this instance per ``(fields, sortby)`` key,
+        for the 64 most recently used keys. Every distinct value is returned, paging past the
+        server's ``maxRecordCount``; the object-id field is read with
+        ``returnIdsOnly`` instead (and sorted).
 
         Parameters
         ----------
@@ -654,10 +810,14 @@ class FeatureLayer:
         sortby : str or None, optional
             Field name to sort results by.  When ``None``, the server's
             default ordering is used.
+        as_array : bool
+            For a single numeric field, return a compact
+            :class:`array.array` (``"q"`` for integers, ``"d"`` for floats)
+            instead of a list.
 
         Returns
         -------
-        list or DataFrame
+        list, array or DataFrame
             A plain list when *fields* is a single string, or a DataFrame
             when *fields* is a tuple. Each call returns an independent
             copy (W5-1) — mutating the returned value does not affect the
@@ -667,7 +827,14 @@ class FeatureLayer:
         ------
         FieldDoesNotExistError
             If any requested field is not present in the layer schema.
+        ValueError
+            If ``as_array=True`` and *fields* names more than one field.
+        TypeError
+            If ``as_array=True`` and the values are not all ints or floats
+            (nulls included).
         """
+        if as_array and not isinstance(fields, str) and len(fields) > 1:
+            raise ValueError("as_array=True needs a single field")
         cache_key = (fields, sortby)
         if cache_key not in self.uniquevalues:
             if (isinstance(fields, str) and fields not in self.fields) or (
@@ -678,25 +845,83 @@ class FeatureLayer:
                     fields,
                     context="FeatureLayer.get_unique_values",
                 )
-            self.uniquevalues[cache_key] = await get_unique_values(
-                self.url,
-                fields,
-                self.session,
-                sortby,
-                **self.kwargs,
+            if fields == getattr(self, "object_id_field", None):
+                load = self._sorted_object_ids
+            else:
+
+                def load():
+                    return get_unique_values(
+                        self.url,
+                        fields,
+                        self.session,
+                        sortby,
+                        **self.kwargs,
+                    )
+
+            self.uniquevalues[cache_key] = await self._loading.run(
+                ("uniquevalues", cache_key),
+                load,
             )
         # W5-1 (ASYNC-02): copy-on-return so callers cannot mutate the
         # cached value in place. The cache stores either a plain ``list``
         # (single-field) or a ``DataFrame`` (multi-field) — branch on that.
         cached = self.uniquevalues[cache_key]
         if isinstance(cached, list):
-            return list(cached)
+            return _compact_array(cached) if as_array else list(cached)
         return cached.copy()
 
+    async def _sorted_object_ids(self) -> list[int]:
+        _, oids = await get_object_ids(self.url, self.session, **self.kwargs)
+        return sorted(oids)
+
+    async def stream_unique_values(
+        self,
+        fields: tuple | str,
+        *,
+        max_concurrent_pages: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """Yield the distinct values of ``fields`` as pages arrive.
+
+        Unlike :meth:`get_unique_values` nothing is cached or held beyond
+        one server page, and the values come in page order (sorted by
+        ``fields`` once the result spans several pages).
+
+        Parameters
+        ----------
+        fields : str or tuple of str
+            One field (yields values) or several (yields attribute dicts).
+        max_concurrent_pages : int, optional
+            Pages in flight at once.
+
+        Raises
+        ------
+        FieldDoesNotExistError
+            If any requested field is not present in the layer schema.
+        """
+        missing = tuple(f for f in _field_list(fields) if f not in self.fields)
+        if missing:
+            raise FieldDoesNotExistError(
+                missing,
+                context="FeatureLayer.stream_unique_values",
+            )
+        async with aclosing(
+            iter_unique_values(
+                self.url,
+                fields,
+                self.session,
+                max_concurrent_pages=max_concurrent_pages,
+                **self.kwargs,
+            ),
+        ) as pages:
+            async for page in pages:
+                for value in page:
+                    yield value
+
     async def get_value_counts(self, field: str) -> DataFrame:
         """Get value counts for a single field.
 
-        Results are cached per field for the lifetime of this instance.
+        Results are cached on this instance for the 64 most recently used
+        fields.
 
         Parameters
         ----------
@@ -722,11 +947,14 @@ class FeatureLayer:
                     field,
                     context="FeatureLayer.get_value_counts",
                 )
-            self.valuecounts[field] = await get_value_counts(
-                self.url,
-                field,
-                self.session,
-                **self.kwargs,
+            self.valuecounts[field] = await self._loading.run(
+                ("valuecounts", field),
+                lambda: get_value_counts(
+                    self.url,
+                    field,
+                    self.session,
+                    **self.kwargs,
+                ),
             )
         # W5-1 (ASYNC-02): copy-on-return, same rationale as get_gdf above.
         return self.valuecounts[field].copy()
@@ -734,8 +962,8 @@ class FeatureLayer:
     async def get_nested_count(self, fields: tuple) -> DataFrame:
         """Get nested (cross-tabulated) value counts for multiple fields.
 
-        Results are cached per *fields* tuple for the lifetime of this
-        instance.
+        Results are cached on this instance for the 64 most recently used
+        *fields* tuples.
 
         Parameters
         ----------
@@ -772,21 +1000,243 @@ class FeatureLayer:
                     fields,
                     context="FeatureLayer.get_nested_count",
                 )
-            self.nestedcount[fields] = await nested_count(
-                self.url,
-                fields,
-                self.session,
-                **self.kwargs,
+            self.nestedcount[fields] = await self._loading.run(
+                ("nestedcount", fields),
+                lambda: nested_count(
+                    self.url,
+                    fields,
+                    self.session,
+                    **self.kwargs,
+                ),
             )
         # W5-1 (ASYNC-02): copy-on-return, same rationale as get_gdf above.
         return self.nestedcount[fields].copy()
 
+    async def aggregate(
+        self,
+        statistics: StatisticsSpec,
+        group_by: str | tuple[str, ...] | None = None,
+        *,
+        having: str | None = None,
+        order_by: str | tuple[str, ...] | None = None,
+        as_frame: bool = False,
+        max_concurrent_pages: int | None = None,
+        engine: Literal["auto", "server", "local"] = "auto",
+    ) -> list[dict[str, Any]] | DataFrame:
+        """Compute grouped statistics, on the server when it can.
+
+        The layer's ``where`` applies. Server results with more groups than
+        the server returns per request are paged (see
+        :func:`restgdf.utils.getinfo.aggregate`). Nothing is cached on the
+        instance; an active :class:`~restgdf.MetadataCache` caches the
+        pages as ``"stats"``.
+
+        The local engine streams only the fields involved through
+        :meth:`stream_feature_batches` and folds each page into per-group
+        accumulators (see :func:`restgdf.utils.getinfo.aggregate_batches`),
+        so memory grows with the number of groups, not features.
+
+        Parameters
+        ----------
+        statistics : iterable of Statistic, or mapping
+            :class:`~restgdf.Statistic` objects, or a mapping of output
+            column to ``(statistic, field[, percentile])``, e.g.
+            ``{"total": ("sum", "POP"), "n": ("count", "OBJECTID")}``.
+            Types are ``count``, ``sum``, ``min``, ``max``, ``avg``,
+            ``stddev``, ``var``, ``percentile_cont``, ``percentile_disc``
+            and (local only) ``count_distinct``.
+        group_by : str or tuple of str, optional
+            Fields to group by; any number. Without them the result is a
+            single row.
+        having : str, optional
+            Filter on the groups, e.g. ``"SUM(POP) > 1000"``. Server only.
+        order_by : str or tuple of str, optional
+            ``orderByFields``, e.g. ``"total DESC"``. The local engine
+            accepts output columns with ``ASC``/``DESC``.
+        as_frame : bool
+            Return a :class:`~pandas.DataFrame` instead of a list of dicts.
+        max_concurrent_pages : int, optional
+            Pages of a multi-page result in flight at once.
+        engine : {"auto", "server", "local"}
+            ``"auto"`` (default) aggregates locally when the layer does not
+            advertise ``supportsStatistics`` (or
+            ``supportsPercentileStatistics`` for percentiles), when a
+            statistic is local-only, or when the statistics query fails
+            with an ArcGIS error or a timeout; otherwise on the server.
+
+        Returns
+        -------
+        list of dict or DataFrame
+            One row per group: the group-by fields, then the statistics.
+            Local groups come in first-seen order unless ``order_by``.
+
+        Raises
+        ------
+        FieldDoesNotExistError
+            If a group-by or statistic field is not in the layer schema.
+        ValueError
+            If a statistic is malformed, two share an output name, or the
+            local engine is asked for ``having``.
+        """
+        if engine not in ("auto", "server", "local"):
+            raise ValueError(
+                f"engine must be 'auto', 'server' or 'local', got {engine!r}",
+            )
+        specs = _as_statistics(statistics)
+        group_fields = _field_list(group_by)
+        missing = [
+            field
+            for field in (*group_fields, *(spec.field for spec in specs))
+            if field not in self.fields
+        ]
+        if missing:
+            raise FieldDoesNotExistError(
+                tuple(missing),
+                context="FeatureLayer.aggregate",
+            )
+        if engine == "auto" and not self._aggregates_on_server(specs):
+            engine = "local"
+        if engine != "local":
+            try:
+                return await aggregate(
+                    self.url,
+                    specs,
+                    self.session,
+                    group_fields,
+                    having=having,
+                    order_by=order_by,
+                    as_frame=as_frame,
+                    max_concurrent_pages=max_concurrent_pages,
+                    **self.kwargs,
+                )
+            except (RestgdfResponseError, TimeoutError) as exc:
+                if engine == "server" or having:
+                    raise
+                get_logger("pagination").warning(
+                    "statistics query on url=%s failed (%s); aggregating "
+                    "locally instead",
+                    _scrub_url(self.url),
+                    type(exc).__name__,
+                    extra=build_log_extra(
+                        operation="aggregate_fallback",
+                        exception_type=type(exc).__name__,
+                    ),
+                )
+        if having:
+            raise ValueError(
+                "having is only supported by the server engine; filter the "
+                "returned rows instead",
+            )
+        out_fields = dict.fromkeys([*group_fields, *(spec.field for spec in specs)])
+        async with aclosing(
+            self.stream_feature_batches(
+                max_concurrent_pages=max_concurrent_pages,
+                data={"outFields": ",".join(out_fields), "returnGeometry": False},
+            ),
+        ) as batches:
+            return await aggregate_batches(
+                batches,
+                specs,
+                group_fields,
+                order_by=order_by,
+                as_frame=as_frame,
+            )
+
+    def _aggregates_on_server(self, specs: list[Statistic]) -> bool:
+        """Return whether the server can compute ``specs``."""
+        if any(spec.statistic in _LOCAL_ONLY_TYPES for spec in specs):
+            return False
+        metadata = getattr(self, "metadata", None)
+        if metadata is None:
+            return True
+        percentiles = any(spec.percentile is not None for spec in specs)
+        return supports_statistics(metadata, percentiles=percentiles)
+
+    async def query_geometries(
+        self,
+        geometries: Any,
+        *,
+        spatial_rel: str = "esriSpatialRelIntersects",
+        in_sr: int | str | dict[str, Any] | None = None,
+        batch_geometry: BatchGeometry = "union",
+        max_batch_bytes: int = 100_000,
+        max_batch_size: int = 500,
+        max_concurrent_batches: int | None = None,
+        prefilter: Prefilter | None = None,
+        tolerance: float | None = None,
+    ) -> GeometryMatches:
+        """Find the features related to each of many filter geometries.
+
+        Instead of one query per geometry, nearby inputs are packed into
+        batches under a payload budget and each batch is sent as one
+        covering geometry (a multipoint, or the union or envelope of its
+        lines or polygons). The batches run concurrently, every candidate
+        is tested locally against each input of its batch with the exact
+        ``spatial_rel``, and features returned by several batches are kept
+        once. Needs ``shapely`` (``restgdf[geo]``).
+
+        Parameters
+        ----------
+        geometries : iterable or FeatureCollection
+            Shapely geometries, ``__geo_interface__`` objects, GeoJSON or
+            ArcGIS JSON mappings; or a FeatureCollection, GeoSeries or
+            GeoDataFrame.
+        spatial_rel : str
+            ArcGIS ``spatialRel`` relating each input to the features.
+        in_sr : int, str or dict, optional
+            Spatial reference of the inputs; features are returned in it.
+        batch_geometry : {"union", "envelope"}
+            Query geometry of a multi-input batch.
+        max_batch_bytes : int
+            Approximate geometry budget per request body.
+        max_batch_size : int
+            Most inputs per batch.
+        max_concurrent_batches : int, optional
+            Batches in flight at once.
+        prefilter : {"simplify", "envelope", "convex_hull"}, optional
+            Send a small cover of each batch geometry -- a simplification
+            buffered by ``tolerance``, the convex hull or the envelope --
+            and test every candidate locally. Use it for very detailed
+            inputs (a county boundary with 200,000 vertices) that make
+            multi-megabyte requests or slow server-side evaluation.
+        tolerance : float, optional
+            ``"simplify"`` tolerance in ``in_sr`` units; defaults to 1/1000
+            of the batch geometry's extent.
+
+        Returns
+        -------
+        GeometryMatches
+            ``features`` by object id, and ``matches[i]``, the object ids
+            matching input ``i``; ``pairs()`` yields ``(i, feature)`` for a
+            spatial join.
+
+        See Also
+        --------
+        restgdf.utils.getinfo.query_geometries : The module-level function.
+        """
+        return await query_geometries(
+            self.url,
+            geometries,
+            self.session,
+            object_id_field=getattr(self, "object_id_field", "OBJECTID"),
+            spatial_rel=spatial_rel,
+            in_sr=in_sr,
+            batch_geometry=batch_geometry,
+            max_batch_bytes=max_batch_bytes,
+            max_batch_size=max_batch_size,
+            max_concurrent_batches=max_concurrent_batches,
+            prefilter=prefilter,
+            tolerance=tolerance,
+            metadata=getattr(self, "metadata", None),
+            **self.kwargs,
+        )
+
     # -----------------------------------------------------------------
     # Deprecated legacy method names (Phase 6). Emit DeprecationWarning
     # and delegate to the canonical implementation. Kept for backward
     # compatibility; will be removed in a future release.
     # -----------------------------------------------------------------
-    async def getoids(self) -> list[int]:
+    async def getoids(self) -> list[int] | array:
         """Deprecated alias for :meth:`get_oids`."""
         warnings.warn(
             "`FeatureLayer.getoids` is deprecated; use `get_oids` instead.",
@@ -901,6 +1351,83 @@ class FeatureLayer:
         )
         return refined
 
+    async def with_resolution(
+        self,
+        *,
+        scale: float | None = None,
+        tolerance: float | None = None,
+        dpi: float = 96,
+        quantize: bool = True,
+    ) -> FeatureLayer:
+        """Create a ``FeatureLayer`` whose queries drop sub-pixel detail.
+
+        Sets ``maxAllowableOffset`` and ``geometryPrecision`` from one
+        tolerance and, with ``quantize``, asks for quantized, delta-encoded
+        geometry over the layer extent. Quantized pages are decoded before
+        they reach :meth:`iter_pages`, the feature streams or
+        :meth:`get_gdf`; at ``DEBUG`` the ``restgdf.pagination`` logger
+        reports the bytes saved per stream. Metadata and count are reused
+        from this layer (which is prepped first if needed).
+
+        Parameters
+        ----------
+        scale : float, optional
+            Map scale denominator the data is drawn at; the tolerance is
+            one pixel at that scale (degrees for geographic layers, meters
+            otherwise).
+        tolerance : float, optional
+            Largest acceptable coordinate error, in output units. Pass
+            exactly one of ``scale`` and ``tolerance``.
+        dpi : float
+            Screen resolution for ``scale``.
+        quantize : bool
+            Request quantized geometry. Skipped when an ``outSR`` is set,
+            as the layer extent would be in the wrong units.
+
+        Returns
+        -------
+        FeatureLayer
+            A layer with the same ``where`` and request options.
+        """
+        if (scale is None) == (tolerance is None):
+            raise ValueError("pass exactly one of scale= or tolerance=")
+        if not hasattr(self, "metadata"):
+            await self.prep()
+        extent = (self.metadata.model_extra or {}).get("extent")
+        if not isinstance(extent, dict):
+            extent = None
+        spatial_reference = self.datadict.get("outSR")
+        if spatial_reference is not None:
+            extent = None
+        elif extent is not None:
+            spatial_reference = extent.get("spatialReference")
+        if tolerance is None:
+            # Exactly one of the two was given, so ``scale`` is set.
+            pixel_scale = cast(float, scale)
+            tolerance = scale_to_tolerance(pixel_scale, spatial_reference, dpi=dpi)
+        params = resolution_params(tolerance, extent=extent, quantize=quantize)
+
+        refined_kwargs = {k: v for k, v in self.kwargs.items() if k != "data"}
+        refined_data = {
+            k: v
+            for k, v in self.kwargs.get("data", {}).items()
+            if k != "where" and k not in _RESOLUTION_KEYS
+        }
+        refined = FeatureLayer(
+            self.url,
+            session=self.session,
+            where=self.wherestr,
+            data={**refined_data, **params},
+            **refined_kwargs,
+        )
+        refined.metadata = self.metadata
+        refined.name = self.name
+        refined.fields = self.fields
+        refined._fieldtypes_frame = None
+        refined.object_id_field = self.object_id_field
+        refined.count = self.count
+        return refined
+
     def __repr__(self) -> str:
         """Return a string representation of the Rest object."""
         kwargstr = ", ".join(f"{k}={v}" for k, v in self.kwargs.items())
@@ -10,6 +10,8 @@ Retry contract (must match the inline fallback byte-for-byte semantically):
 * Retry ONLY on timeout exceptions:
   :class:`asyncio.TimeoutError`, :class:`TimeoutError`,
   :class:`aiohttp.ServerTimeoutError`.
+* :class:`~restgdf.errors.DeadlineExceededError` is a timeout but is
+  never retried: the caller's deadline has passed.
 * Every other exception — in particular :class:`aiohttp.ClientConnectionError`
   (R-69) and :class:`~restgdf.errors.RestgdfResponseError` — propagates
   unchanged on the first attempt.
@@ -28,7 +30,7 @@ from collections.abc import Awaitable
 import aiohttp
 import stamina
 
-from restgdf.errors import RestgdfTimeoutError
+from restgdf.errors import DeadlineExceededError, RestgdfTimeoutError
 
 __all__ = ["bounded_retry_timeout"]
 
@@ -41,6 +43,13 @@ _TIMEOUT_EXCS: tuple[type[Exception], ...] = (
 )
 
 
+def _is_retryable_timeout(exc: Exception) -> bool:
+    return isinstance(exc, _TIMEOUT_EXCS) and not isinstance(
+        exc,
+        DeadlineExceededError,
+    )
+
+
 async def bounded_retry_timeout(
     func: Callable[[], Awaitable[T]],
     *,
@@ -60,7 +69,7 @@ async def bounded_retry_timeout(
     """
 
     @stamina.retry(
-        on=_TIMEOUT_EXCS,
+        on=_is_retryable_timeout,
         attempts=max_attempts,
         timeout=None,
         wait_initial=0.1,
@@ -73,6 +82,8 @@ async def bounded_retry_timeout(
 
     try:
         return await _attempt()
+    except DeadlineExceededError:
+        raise
     except _TIMEOUT_EXCS as exc:
         raise RestgdfTimeoutError(
             f"feature_count for {url} timed out after {max_attempts} attempts",
@@ -0,0 +1,176 @@
+"""Per-service-root circuit breakers for :class:`ResilientSession`.
+
+A breaker is keyed like the limiter (``ResilienceConfig.limiter_key``). It
+counts consecutive transport/5xx failures and, at the threshold, *opens*:
+every request to the key then fails immediately with
+:class:`~restgdf.errors.CircuitOpenError` instead of running the full retry
+schedule against a service that is down. After the cooldown the breaker
+*half-opens* and admits exactly one probe; the probe's outcome closes the
+breaker again or re-opens it for another cooldown.
+
+Any answer from the server other than a 5xx (including a 4xx or a 429)
+counts as the key being reachable and resets the failure count.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Literal
+
+from restgdf._logging import build_log_extra, get_logger
+from restgdf.errors import CircuitOpenError
+from restgdf.resilience._limiter import (
+    _DEFAULT_IDLE_TTL_S,
+    _DEFAULT_MAX_KEYS,
+    _KeyEviction,
+)
+
+
+_log = get_logger("retry")
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """One key's consecutive-failure circuit breaker."""
+
+    def __init__(self, key: str, threshold: int, cooldown_s: float) -> None:
+        self.key = key
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.state: BreakerState = "closed"
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_request(self, url: str) -> None:
+        """Admit a request or raise :class:`CircuitOpenError`.
+
+        An open breaker whose cooldown has elapsed moves to half-open and
+        admits the caller as its single probe.
+        """
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            remaining = self._opened_at + self.cooldown_s - time.monotonic()
+            if remaining > 0:
+                self._reject(url, remaining)
+            self._transition("half_open")
+        if self._probing:
+            self._reject(url, 0.0)
+        self._probing = True
+
+    def record_success(self) -> None:
+        """Record a response that proves the key reachable."""
+        self.consecutive_failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self, cause: str) -> None:
+        """Record a transport or 5xx failure; may open the breaker."""
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == "half_open" or (
+            self.state == "closed" and self.consecutive_failures >= self.threshold
+        ):
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            self._transition("open", cause=cause)
+
+    def release(self) -> None:
+        """Forget a probe that ended without an outcome (e.g. cancelled)."""
+        self._probing = False
+
+    @property
+    def in_use(self) -> bool:
+        return self.state != "closed" or self.consecutive_failures > 0
+
+    def _reject(self, url: str, retry_after: float) -> None:
+        self.rejected += 1
+        raise CircuitOpenError(
+            f"Circuit open for {self.key}; request to {url} not sent",
+            breaker_key=self.key,
+            retry_after=retry_after,
+            url=url,
+        )
+
+    def _transition(self, state: BreakerState, *, cause: str | None = None) -> None:
+        previous, self.state = self.state, state
+        extra = build_log_extra(
+            limit_key=self.key,
+            operation=f"circuit_{state}",
+            exception_type=cause,
+        )
+        if state == "open":
+            _log.warning(
+                "circuit opened: key=%s failures=%d cooldown=%.1fs cause=%s",
+                self.key,
+                self.consecutive_failures,
+                self.cooldown_s,
+                cause,
+                extra=extra,
+            )
+        else:
+            _log.info(
+                "circuit %s: key=%s (was %s)",
+                state.replace("_", "-"),
+                self.key,
+                previous,
+                extra=extra,
+            )
+
+
+class CircuitBreakerRegistry:
+    """Lazy per-key :class:`CircuitBreaker` cache.
+
+    LRU/idle-TTL bounded like the limiter registries. A breaker that is
+    open, half-open or counting failures is never evicted; a closed,
+    healthy one simply starts fresh on the key's next request.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown_s: float,
+        *,
+        max_keys: int = _DEFAULT_MAX_KEYS,
+        idle_ttl_s: float | None = _DEFAULT_IDLE_TTL_S,
+    ) -> None:
+        self._threshold = threshold
+        self._cooldown_s = cooldown_s
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        self._eviction = _KeyEviction(max_keys, idle_ttl_s)
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Return (or create) the breaker for *key*."""
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(
+                key,
+                self._threshold,
+                self._cooldown_s,
+            )
+        self._eviction.touch(self._breakers, key)
+        self._eviction.evict(self._breakers, in_use=lambda b: b.in_use)
+        return breaker
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return ``{key: {"state", "consecutive_failures", "trips", "rejected"}}``."""
+        return {
+            key: {
+                "state": b.state,
+                "consecutive_failures": b.consecutive_failures,
+                "trips": b.trips,
+                "rejected": b.rejected,
+            }
+            for key, b in self._breakers.items()
+        }
+
+    def reset(self) -> None:
+        """Drop all breakers."""
+        self._breakers.clear()
+        self._eviction.clear()
@@ -1,10 +1,27 @@
-"""Per-service-root token-bucket and cooldown registries (BL-52)."""
+"""Per-service-root token-bucket, in-flight and cooldown registries (BL-52).
+
+``limiter_mode="adaptive"`` swaps the static :class:`LimiterRegistry` for
+:class:`AdaptiveLimiterRegistry`, whose per-key rate is learned AIMD-style
+from response outcomes. aiolimiter's ``max_rate`` is fixed at construction,
+so the adaptive limiter paces requests itself.
+
+Every per-key registry is bounded by :class:`_KeyEviction`: least recently
+used keys beyond ``max_keys``, and keys idle for longer than ``idle_ttl_s``,
+are dropped -- except entries that are still in use -- so a crawler touching
+thousands of hosts keeps flat memory.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import re
 import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
 from urllib.parse import urlparse
 
 from aiolimiter import AsyncLimiter
@@ -45,16 +62,85 @@ def _service_root(url: str) -> str:
     return _host(url)
 
 
+_V = TypeVar("_V")
+
+# Registry bounds used when a registry is built without explicit limits.
+_DEFAULT_MAX_KEYS = 4096
+_DEFAULT_IDLE_TTL_S = 3600.0
+
+
+class _KeyEviction:
+    """LRU + idle-TTL bookkeeping for one per-key registry.
+
+    The registry keeps its entries in an :class:`~collections.OrderedDict`;
+    :meth:`touch` moves a key to the most-recently-used end and
+    :meth:`evict` drops entries from the least-recently-used end while the
+    map exceeds ``max_keys`` or the entry has been idle past
+    ``idle_ttl_s``. ``in_use`` vetoes evicting a live entry (a semaphore
+    with holders, a cooldown still in force).
+    """
+
+    def __init__(self, max_keys: int, idle_ttl_s: float | None) -> None:
+        self.max_keys = max_keys
+        self.idle_ttl_s = idle_ttl_s
+        self._touched: dict[str, float] = {}
+
+    def touch(self, entries: OrderedDict[str, Any], key: str) -> None:
+        entries.move_to_end(key)
+        self._touched[key] = time.monotonic()
+
+    def evict(
+        self,
+        entries: OrderedDict[str, _V],
+        *,
+        in_use: Callable[[_V], bool] = lambda _value: False,
+        on_evict: Callable[[str, _V], None] | None = None,
+    ) -> None:
+        now = time.monotonic()
+        for key in list(entries):
+            over_size = len(entries) > self.max_keys
+            idle = (
+                self.idle_ttl_s is not None
+                and now - self._touched.get(key, now) > self.idle_ttl_s
+            )
+            if not (over_size or idle):
+                # Oldest-first order: every later key is fresher.
+                break
+            value = entries[key]
+            if in_use(value):
+                continue
+            del entries[key]
+            self._touched.pop(key, None)
+            if on_evict is not None:
+                on_evict(key, value)
+
+    def forget(self, key: str) -> None:
+        """Drop *key*'s bookkeeping after the registry removed it itself."""
+        self._touched.pop(key, None)
+
+    def clear(self) -> None:
+        self._touched.clear()
+
+
 class LimiterRegistry:
     """Lazy per-service-root :class:`AsyncLimiter` cache.
 
     Each unique *service_root* key gets its own token-bucket limiter
-    capped at *rate_per_second* requests/s.
+    capped at *rate_per_second* requests/s. The cache is LRU/idle-TTL
+    bounded (``max_keys`` / ``idle_ttl_s``); an evicted key simply gets a
+    fresh bucket on its next request.
     """
 
-    def __init__(self, rate_per_second: float) -> None:
+    def __init__(
+        self,
+        rate_per_second: float,
+        *,
+        max_keys: int = _DEFAULT_MAX_KEYS,
+        idle_ttl_s: float | None = _DEFAULT_IDLE_TTL_S,
+    ) -> None:
         self._rate = rate_per_second
-        self._limiters: dict[str, AsyncLimiter] = {}
+        self._limiters: OrderedDict[str, AsyncLimiter] = OrderedDict()
+        self._eviction = _KeyEviction(max_keys, idle_ttl_s)
 
     def get(self, service_root: str) -> AsyncLimiter:
         """Return (or create) the limiter for *service_root*.
@@ -73,11 +159,118 @@ class LimiterRegistry:
             else:
                 lim = AsyncLimiter(max_rate=1, time_period=1 / self._rate)
             self._limiters[service_root] = lim
+        self._eviction.touch(self._limiters, service_root)
+        self._eviction.evict(self._limiters)
         return lim
 
     def reset(self) -> None:
         """Drop all cached limiters."""
         self._limiters.clear()
+        self._eviction.clear()
+
+
+class PrioritySemaphore:
+    """Semaphore whose waiters are admitted lowest ``priority`` first.
+
+    Waiters of equal priority are admitted in arrival order. A released
+    permit is handed straight to the next waiter, so a later, more urgent
+    arrival can never be overtaken by a request that was merely woken
+    first.
+    """
+
+    def __init__(self, value: int) -> None:
+        self._value = value
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int = 0) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted and cancelled in the same tick: pass the permit on.
+                self.release()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _priority, _seq, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+
+class _InFlightSlot:
+    __slots__ = ("semaphore", "holders")
+
+    def __init__(self, limit: int) -> None:
+        self.semaphore = PrioritySemaphore(limit)
+        self.holders = 0
+
+
+class InFlightRegistry:
+    """Per-key cap on simultaneous in-flight requests.
+
+    Complements the token bucket: the bucket bounds how *often* requests
+    start, this bounds how many run *at once* against one service root or
+    host. Waiters are admitted lowest ``priority`` first (see
+    :mod:`restgdf._client._priority`). Keys with holders or waiters are
+    never evicted.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        *,
+        max_keys: int = _DEFAULT_MAX_KEYS,
+        idle_ttl_s: float | None = _DEFAULT_IDLE_TTL_S,
+    ) -> None:
+        self._limit = limit
+        self._slots: OrderedDict[str, _InFlightSlot] = OrderedDict()
+        self._eviction = _KeyEviction(max_keys, idle_ttl_s)
+
+    def in_flight(self, key: str) -> int:
+        """Return how many requests currently hold (or wait for) *key*'s slot."""
+        slot = self._slots.get(key)
+        return slot.holders if slot is not None else 0
+
+    @asynccontextmanager
+    async def slot(self, key: str, *, priority: int = 0) -> AsyncIterator[None]:
+        """Hold one of *key*'s in-flight slots for the duration of the block."""
+        entry = self._slots.get(key)
+        if entry is None:
+            entry = self._slots[key] = _InFlightSlot(self._limit)
+        entry.holders += 1
+        self._eviction.touch(self._slots, key)
+        self._eviction.evict(self._slots, in_use=lambda s: s.holders > 0)
+        try:
+            await entry.semaphore.acquire(priority)
+            try:
+                yield
+            finally:
+                entry.semaphore.release()
+        finally:
+            entry.holders -= 1
+
+    def reset(self) -> None:
+        """Drop all idle slots."""
+        for key in [k for k, s in self._slots.items() if s.holders == 0]:
+            del self._slots[key]
+            self._eviction.forget(key)
 
 
 class CooldownRegistry:
@@ -88,12 +281,28 @@ class CooldownRegistry:
     limiter — we do NOT drain ``AsyncLimiter`` tokens on 429.
     """
 
-    def __init__(self) -> None:
-        self._deadlines: dict[str, float] = {}
+    def __init__(self, *, max_keys: int = _DEFAULT_MAX_KEYS) -> None:
+        self._deadlines: OrderedDict[str, float] = OrderedDict()
+        # No idle TTL: an expired deadline is dead weight and is purged below,
+        # a live one must never be dropped.
+        self._eviction = _KeyEviction(max_keys, None)
 
     def set_cooldown(self, key: str, seconds: float) -> None:
-        """Park *key* for *seconds* from now."""
-        self._deadlines[key] = time.monotonic() + seconds
+        """Park *key* for *seconds* from now.
+
+        Also purges every deadline that has already passed, and trims the
+        registry to ``max_keys`` without dropping a cooldown still in force.
+        """
+        now = time.monotonic()
+        self._deadlines[key] = now + seconds
+        self._eviction.touch(self._deadlines, key)
+        for stale in [k for k, d in self._deadlines.items() if d <= now]:
+            del self._deadlines[stale]
+            self._eviction.forget(stale)
+        self._eviction.evict(
+            self._deadlines,
+            in_use=lambda deadline: deadline > time.monotonic(),
+        )
 
     async def wait_if_cooling(self, key: str) -> None:
         """Sleep until *key*'s cooldown expires (no-op if none set).
@@ -140,3 +349,142 @@ class CooldownRegistry:
             return
         # Unchanged — this call waited it out, so clear it.
         self._deadlines.pop(key, None)
+        self._eviction.forget(key)
+
+
+class AdaptiveLimiter:
+    """One key's AIMD-paced limiter.
+
+    Requests are paced one every ``1 / rate`` seconds (a leaky bucket, no
+    burst). :meth:`on_success` raises the rate additively -- by ``increase``
+    req/s per ``rate`` successes, i.e. about ``increase`` per second of
+    sustained traffic -- and :meth:`on_throttle` multiplies it by
+    ``decrease_factor``. The rate always stays within ``[floor, ceiling]``.
+
+    A burst of in-flight requests that all see the same 429 would otherwise
+    cut the rate once per request; throttle signals arriving within one
+    pacing interval (at least ``1 s``) of the previous decrease are ignored.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        floor: float,
+        ceiling: float,
+        increase: float,
+        decrease_factor: float,
+    ) -> None:
+        self._floor = floor
+        self._ceiling = ceiling
+        self._increase = increase
+        self._decrease_factor = decrease_factor
+        self.rate = min(max(rate, floor), ceiling)
+        self.successes = 0
+        self.throttles = 0
+        self._next_slot = 0.0
+        self._last_decrease = float("-inf")
+
+    async def acquire(self) -> None:
+        """Wait for this key's next pacing slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self.rate = min(self._ceiling, self.rate + self._increase / self.rate)
+
+    def on_throttle(self) -> bool:
+        """Cut the rate; return ``False`` when the signal was debounced."""
+        self.throttles += 1
+        now = time.monotonic()
+        if now - self._last_decrease < max(1.0, 1 / self.rate):
+            return False
+        self._last_decrease = now
+        self.rate = max(self._floor, self.rate * self._decrease_factor)
+        # Re-space the schedule at the new, slower rate.
+        self._next_slot = max(self._next_slot, now + 1 / self.rate)
+        return True
+
+
+class AdaptiveLimiterRegistry:
+    """Lazy per-key :class:`AdaptiveLimiter` cache (``limiter_mode="adaptive"``).
+
+    Same ``get(key)`` / ``reset()`` shape as :class:`LimiterRegistry`, plus
+    :meth:`snapshot` for inspection and :meth:`export_state` /
+    ``seed=`` for carrying learned rates into the next run.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_rate: float,
+        floor: float,
+        ceiling: float,
+        increase: float,
+        decrease_factor: float,
+        seed: Mapping[str, float] | None = None,
+        max_keys: int = _DEFAULT_MAX_KEYS,
+        idle_ttl_s: float | None = _DEFAULT_IDLE_TTL_S,
+    ) -> None:
+        self._initial_rate = initial_rate
+        self._floor = floor
+        self._ceiling = ceiling
+        self._increase = increase
+        self._decrease_factor = decrease_factor
+        self._seed: OrderedDict[str, float] = OrderedDict(seed or {})
+        self._limiters: OrderedDict[str, AdaptiveLimiter] = OrderedDict()
+        self._eviction = _KeyEviction(max_keys, idle_ttl_s)
+        # Learned rates outlive their limiter: an evicted key's rate is kept
+        # as a seed (LRU-bounded on its own) so it resumes where it left off.
+        self._seed_eviction = _KeyEviction(max_keys, None)
+
+    def get(self, key: str) -> AdaptiveLimiter:
+        """Return (or create) the limiter for *key*, starting from its seed."""
+        lim = self._limiters.get(key)
+        if lim is None:
+            lim = AdaptiveLimiter(
+                self._seed.get(key, self._initial_rate),
+                floor=self._floor,
+                ceiling=self._ceiling,
+                increase=self._increase,
+                decrease_factor=self._decrease_factor,
+            )
+            self._limiters[key] = lim
+        self._eviction.touch(self._limiters, key)
+        self._eviction.evict(self._limiters, on_evict=self._remember)
+        return lim
+
+    def _remember(self, key: str, lim: AdaptiveLimiter) -> None:
+        self._seed[key] = lim.rate
+        self._seed_eviction.touch(self._seed, key)
+        self._seed_eviction.evict(self._seed)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Return ``{key: {"rate", "successes", "throttles"}}`` for every key seen."""
+        return {
+            key: {
+                "rate": lim.rate,
+                "successes": lim.successes,
+                "throttles": lim.throttles,
+            }
+            for key, lim in self._limiters.items()
+        }
+
+    def export_state(self) -> dict[str, float]:
+        """Return ``{key: rate}``, suitable as ``seed=`` for a later registry.
+
+        Seeded keys that were never used in this run are carried through
+        unchanged, so a partial run does not forget what earlier runs learned.
+        """
+        state = dict(self._seed)
+        state.update({key: lim.rate for key, lim in self._limiters.items()})
+        return state
+
+    def reset(self) -> None:
+        """Drop all cached limiters (seeds are kept)."""
+        self._limiters.clear()
+        self._eviction.clear()
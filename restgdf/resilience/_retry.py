@@ -2,27 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
+from collections.abc import Mapping
 from typing import Any
 
 import aiohttp
 import stamina
 
+from restgdf._client._buffered import BufferedResponse
+from restgdf._client._priority import _rank
 from restgdf._config import ResilienceConfig
 from restgdf._logging import build_log_extra, get_logger
 from restgdf.errors import (
+    DeadlineExceededError,
     RateLimitError,
     RestgdfResponseError,
     RestgdfTimeoutError,
     TransportError,
 )
+from restgdf.resilience._breaker import CircuitBreakerRegistry
 from restgdf.resilience._errors import _parse_retry_after
 from restgdf.resilience._limiter import (
+    AdaptiveLimiterRegistry,
     CooldownRegistry,
+    InFlightRegistry,
     LimiterRegistry,
     _host,
     _service_root,
 )
+from restgdf.utils._deadline import (
+    _check_deadline,
+    _clamped_timeout,
+    _deadline_error,
+    _expired,
+    _remaining,
+)
+from restgdf.utils._retry_budget import RetryBudget, _stream_retry_budget
 
 
 _log = get_logger("retry")
@@ -50,19 +66,110 @@ class _ResponseCtx:
 
 
 class ResilientSession:
-    """Retry + rate-limit adapter wrapping an inner AsyncHTTPSession."""
+    """Retry + rate-limit adapter wrapping an inner AsyncHTTPSession.
+
+    ``limiter_state`` seeds the per-key rates of an adaptive limiter
+    (``ResilienceConfig.limiter_mode="adaptive"``), typically the
+    :meth:`export_limiter_state` of a previous run. It is ignored in static
+    mode.
+    """
 
     def __init__(
         self,
         inner: Any,
         config: ResilienceConfig,
+        *,
+        limiter_state: Mapping[str, float] | None = None,
     ) -> None:
         self._inner = inner
         self._config = config
-        self._cooldown = CooldownRegistry()
-        self._limiter: LimiterRegistry | None = None
-        if config.rate_per_service_root_per_second is not None:
-            self._limiter = LimiterRegistry(config.rate_per_service_root_per_second)
+        max_keys = config.registry_max_keys
+        idle_ttl_s = config.registry_idle_ttl_s
+        self._cooldown = CooldownRegistry(max_keys=max_keys)
+        self._limiter: LimiterRegistry | AdaptiveLimiterRegistry | None = None
+        if config.limiter_mode == "adaptive":
+            self._limiter = AdaptiveLimiterRegistry(
+                initial_rate=config.rate_per_service_root_per_second or 1.0,
+                floor=config.adaptive_floor_per_second,
+                ceiling=config.adaptive_ceiling_per_second,
+                increase=config.adaptive_increase_per_second,
+                decrease_factor=config.adaptive_decrease_factor,
+                seed=limiter_state,
+                max_keys=max_keys,
+                idle_ttl_s=idle_ttl_s,
+            )
+        elif config.rate_per_service_root_per_second is not None:
+            self._limiter = LimiterRegistry(
+                config.rate_per_service_root_per_second,
+                max_keys=max_keys,
+                idle_ttl_s=idle_ttl_s,
+            )
+        # Token waiters queue here in priority order; aiolimiter itself
+        # serves them first come, first served.
+        self._turnstile: InFlightRegistry | None = None
+        if self._limiter is not None:
+            self._turnstile = InFlightRegistry(
+                1,
+                max_keys=max_keys,
+                idle_ttl_s=idle_ttl_s,
+            )
+        self._in_flight: InFlightRegistry | None = None
+        if config.max_in_flight_per_key is not None:
+            self._in_flight = InFlightRegistry(
+                config.max_in_flight_per_key,
+                max_keys=max_keys,
+                idle_ttl_s=idle_ttl_s,
+            )
+        self._breaker: CircuitBreakerRegistry | None = None
+        if config.breaker_failure_threshold is not None:
+            self._breaker = CircuitBreakerRegistry(
+                config.breaker_failure_threshold,
+                config.breaker_cooldown_s,
+                max_keys=max_keys,
+                idle_ttl_s=idle_ttl_s,
+            )
+        self._retry_budget: RetryBudget | None = None
+        if config.retry_budget_ratio is not None:
+            self._retry_budget = RetryBudget(
+                config.retry_budget_ratio,
+                min_retries=config.retry_budget_min_retries,
+            )
+
+    @property
+    def retry_budget(self) -> RetryBudget | None:
+        """The session-wide :class:`~restgdf.RetryBudget`, if configured."""
+        return self._retry_budget
+
+    def limiter_snapshot(self) -> dict[str, dict[str, float]]:
+        """Return the adaptive limiter's per-key state.
+
+        Maps each limiter key seen so far to ``{"rate", "successes",
+        "throttles"}``. Empty in static mode.
+        """
+        if isinstance(self._limiter, AdaptiveLimiterRegistry):
+            return self._limiter.snapshot()
+        return {}
+
+    def export_limiter_state(self) -> dict[str, float]:
+        """Return learned ``{limiter_key: rate}`` for seeding a later session.
+
+        Pass the result (e.g. after a JSON round-trip) as ``limiter_state=``
+        to the next run's :class:`ResilientSession`. Empty in static mode.
+        """
+        if isinstance(self._limiter, AdaptiveLimiterRegistry):
+            return self._limiter.export_state()
+        return {}
+
+    def breaker_snapshot(self) -> dict[str, dict[str, object]]:
+        """Return each circuit breaker's state.
+
+        Maps each key seen so far to ``{"state", "consecutive_failures",
+        "trips", "rejected"}``, where ``state`` is ``"closed"``, ``"open"``
+        or ``"half_open"``. Empty when the breaker is off.
+        """
+        if self._breaker is None:
+            return {}
+        return self._breaker.snapshot()
 
     @property
     def closed(self) -> bool:
@@ -86,9 +193,15 @@ class ResilientSession:
 
     def _reset_limiters(self) -> None:
         """Reset all limiter and cooldown state (for testing)."""
-        self._cooldown = CooldownRegistry()
+        self._cooldown = CooldownRegistry(max_keys=self._config.registry_max_keys)
         if self._limiter is not None:
             self._limiter.reset()
+        if self._turnstile is not None:
+            self._turnstile.reset()
+        if self._in_flight is not None:
+            self._in_flight.reset()
+        if self._breaker is not None:
+            self._breaker.reset()
 
 
 class _RetriedCtx:
@@ -129,6 +242,10 @@ class _RetriedCtx:
             self._kwargs,
             limiter=self._session._limiter,
             cooldown=self._session._cooldown,
+            in_flight=self._session._in_flight,
+            turnstile=self._session._turnstile,
+            breaker=self._session._breaker,
+            retry_budget=self._session._retry_budget,
         )
         return self._resp
 
@@ -158,8 +275,12 @@ async def _do_retried_request(
     url: str,
     kwargs: dict[str, Any],
     *,
-    limiter: LimiterRegistry | None = None,
+    limiter: LimiterRegistry | AdaptiveLimiterRegistry | None = None,
     cooldown: CooldownRegistry | None = None,
+    in_flight: InFlightRegistry | None = None,
+    turnstile: InFlightRegistry | None = None,
+    breaker: CircuitBreakerRegistry | None = None,
+    retry_budget: RetryBudget | None = None,
 ) -> tuple[Any, Any]:
     """Execute request with stamina retry, token-bucket, and cooldown."""
     # Select the rate-limit/cooldown key granularity once from config, and use
@@ -168,6 +289,9 @@ async def _do_retried_request(
     # "service_root" preserves the historical per-service keying exactly.
     key_fn = _host if config.limiter_key == "host" else _service_root
     limit_key = key_fn(url)
+    # Queue position for the token bucket and in-flight cap: metadata and
+    # count calls are admitted ahead of bulk page fetches.
+    priority = _rank(url=url, body=kwargs.get("params") or kwargs.get("data"))
     # ``ClientConnectionError`` is the common base for every connection-shaped
     # aiohttp failure — ``ClientConnectorError`` (DNS/connect), ``ClientOSError``
     # (incl. ECONNRESET), ``ClientConnectionResetError``, ``ServerDisconnectedError``,
@@ -175,16 +299,16 @@ async def _do_retried_request(
     # resets that a bulk crawl routinely hits, not just connect-time and read-timeout
     # failures.
     #
-    # SCOPE (verified): this wrapper covers the request only up to *headers
-    # received* — ``_enter_request(dispatch(...))``. Callers read the body after
-    # ``_do_retried_request`` has returned (``restgdf.utils._query`` awaits
-    # ``response.json(...)``), and aiohttp raises ``ClientPayloadError`` on the
-    # payload stream, not from the request await. A truncated/mid-body failure
-    # therefore surfaces raw at the read, outside this retry loop; the
-    # ``ClientPayloadError`` entry below only covers inner sessions that surface
-    # it from dispatch itself (a wrapping session, or aiohttp draining a redirect
-    # body). Extending retry across the body read needs ``_RetriedCtx`` to own
-    # response consumption — a deliberate design item, not done here.
+    # SCOPE: by default this wrapper covers the request only up to *headers
+    # received* -- ``_enter_request(dispatch(...))``. Callers read the body
+    # after ``_do_retried_request`` has returned (``restgdf.utils._query``
+    # awaits ``response.json(...)``), and aiohttp raises ``ClientPayloadError``
+    # on the payload stream, not from the request await, so a truncated body
+    # surfaces raw at the caller's read. With ``config.buffer_responses`` the
+    # attempt also owns response consumption: it reads (and, for JSON
+    # content types, decodes) the body and returns a ``BufferedResponse``, so
+    # a mid-body failure is retried under the same policy, limiter and
+    # cooldown as the request itself.
     retry_on = (
         _RetryableHTTPError,
         aiohttp.ClientConnectionError,
@@ -195,20 +319,112 @@ async def _do_retried_request(
     # and exhaustion-mapping DEBUG logs (H1-N4).
     last_cause: dict[str, str] = {}
 
+    # Adaptive (AIMD) mode: response outcomes feed back into the key's rate.
+    adaptive = (
+        limiter.get(limit_key)
+        if isinstance(limiter, AdaptiveLimiterRegistry)
+        else None
+    )
+
+    def _throttled(reason: str) -> None:
+        if adaptive is not None and adaptive.on_throttle():
+            _log.debug(
+                "adaptive rate decreased: key=%s rate=%.3f cause=%s",
+                limit_key,
+                adaptive.rate,
+                reason,
+                extra=build_log_extra(
+                    limit_key=limit_key,
+                    operation="adaptive_decrease",
+                    exception_type=reason,
+                ),
+            )
+
     async def _attempt() -> tuple[Any, Any]:
+        # Under a ``restgdf.deadline`` scope no attempt starts once the
+        # deadline has passed; DeadlineExceededError is not in ``retry_on``.
+        _check_deadline(url)
+        if breaker is None:
+            return await _admitted()
+        # Circuit breaker: an open breaker raises CircuitOpenError here, which
+        # is not in ``retry_on``, so the request fails fast without waiting
+        # out the remaining retry schedule.
+        gate = breaker.get(limit_key)
+        gate.before_request(url)
+        try:
+            result = await _admitted()
+        except _RetryableHTTPError as exc:
+            if exc.status >= 500:
+                gate.record_failure(f"status={exc.status}")
+            else:
+                gate.record_success()
+            raise
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as exc:
+            gate.record_failure(last_cause.get("cause", type(exc).__name__))
+            raise
+        except DeadlineExceededError:
+            # The caller ran out of time; says nothing about the host.
+            gate.release()
+            raise
+        except asyncio.TimeoutError:
+            gate.record_failure("TimeoutError")
+            raise
+        except RestgdfResponseError:
+            gate.record_success()
+            raise
+        except BaseException:
+            gate.release()
+            raise
+        gate.record_success()
+        return result
+
+    async def _admitted() -> tuple[Any, Any]:
         # 429 cooldown: wait if a previous 429 set a deadline for this service
         if cooldown is not None:
             await cooldown.wait_if_cooling(limit_key)
         # Token-bucket rate limit
         if limiter is not None:
-            await limiter.get(limit_key).acquire()
+            if turnstile is None:
+                await limiter.get(limit_key).acquire()
+            else:
+                async with turnstile.slot(limit_key, priority=priority):
+                    await limiter.get(limit_key).acquire()
+        # Per-key in-flight cap: held for this attempt only, never across the
+        # stamina backoff sleep between attempts.
+        if in_flight is None:
+            return await _send()
+        async with in_flight.slot(limit_key, priority=priority):
+            return await _send()
+
+    async def _send() -> tuple[Any, Any]:
         dispatch = getattr(inner, method)
+        # Admission may have waited; clamp this attempt to what is left.
+        send_kwargs = kwargs
+        if _check_deadline(url) is not None:
+            send_kwargs = {
+                **kwargs,
+                "timeout": _clamped_timeout(kwargs.get("timeout")),
+            }
         try:
-            ctx, resp = await _enter_request(dispatch(url, **kwargs))
+            ctx, resp = await _enter_request(dispatch(url, **send_kwargs))
         except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as exc:
+            if _expired():
+                raise _deadline_error(url) from exc
             last_cause["cause"] = type(exc).__name__
+            if isinstance(exc, aiohttp.ServerTimeoutError):
+                _throttled(type(exc).__name__)
+            raise
+        except asyncio.TimeoutError as exc:
+            if isinstance(exc, DeadlineExceededError):
+                raise
+            if _expired():
+                raise _deadline_error(url) from exc
+            _throttled("TimeoutError")
             raise
 
+        if resp.status in (429, 503):
+            _throttled(f"status={resp.status}")
+
         if resp.status in _RETRYABLE_STATUS:
             headers = dict(getattr(resp, "headers", {}))
             # Set cooldown on 429 so the next retry waits
@@ -245,8 +461,61 @@ async def _do_retried_request(
                 status_code=resp.status,
             )
 
+        if config.buffer_responses:
+            # The context exits on every outcome, or the connection leaks;
+            # body failures map like the same failures while connecting.
+            exit_exc: BaseException | None = None
+            try:
+                buffered = await BufferedResponse.from_response(
+                    resp,
+                    decode_json=True,
+                )
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as exc:
+                exit_exc = exc
+                if _expired():
+                    raise _deadline_error(url) from exc
+                last_cause["cause"] = f"body:{type(exc).__name__}"
+                if isinstance(exc, aiohttp.ServerTimeoutError):
+                    _throttled(type(exc).__name__)
+                raise
+            except asyncio.TimeoutError as exc:
+                exit_exc = exc
+                if isinstance(exc, DeadlineExceededError):
+                    raise
+                if _expired():
+                    raise _deadline_error(url) from exc
+                last_cause["cause"] = "body:TimeoutError"
+                _throttled("TimeoutError")
+                raise
+            except BaseException as exc:
+                exit_exc = exc
+                raise
+            finally:
+                if exit_exc is None:
+                    await ctx.__aexit__(None, None, None)
+                else:
+                    await ctx.__aexit__(
+                        type(exit_exc),
+                        exit_exc,
+                        exit_exc.__traceback__,
+                    )
+            if adaptive is not None:
+                adaptive.on_success()
+            return _ResponseCtx(buffered), buffered
+
+        if adaptive is not None:
+            adaptive.on_success()
         return ctx, resp
 
+    # Shared retry budget: a stream's budget (set per page-fetch task by
+    # ``_iter_pages_raw``) wins over the session's. A stream budget is
+    # already credited once per page, so only the session budget is credited
+    # per request here; both must grant every retry.
+    stream_budget = _stream_retry_budget()
+    budget = stream_budget or retry_budget
+    if budget is not None and stream_budget is None:
+        budget.record_attempt()
+
     # ``retry_context`` is the equivalent of the ``@stamina.retry`` decorator
     # (same kwargs) but exposes each attempt's number and backoff, so the
     # per-retry DEBUG log can name them (H1-N4). ``prev_wait`` carries the
@@ -255,6 +524,8 @@ async def _do_retried_request(
     # (5 / 60.0 / 0.5 / 10.0 / 1.0) preserve the historical hardcoded values
     # byte-for-byte, and ``config.enabled`` remains the sole retry gate.
     prev_wait = 0.0
+    denied: BaseException | None = None
+    denied_by = "retry budget"
     try:
         async for attempt in stamina.retry_context(
             on=retry_on,
@@ -279,7 +550,38 @@ async def _do_retried_request(
                 )
             prev_wait = attempt.next_wait
             with attempt:
-                return await _attempt()
+                try:
+                    return await _attempt()
+                except retry_on as exc:
+                    if attempt.num >= config.max_attempts:
+                        raise
+                    # Under a ``restgdf.deadline`` scope, a retry whose
+                    # backoff ends past the deadline is not scheduled.
+                    remaining = _remaining()
+                    if remaining is not None and attempt.next_wait >= remaining:
+                        denied, denied_by = exc, "deadline"
+                    elif budget is None or budget.try_retry(
+                        cause=last_cause.get("cause"),
+                    ):
+                        raise
+                    else:
+                        # Budget spent: end the loop now and map ``exc`` below
+                        # exactly as if the attempts had run out.
+                        denied = exc
+            if denied is not None:
+                _log.debug(
+                    "retry denied by %s: attempt=%d caused_by=%s",
+                    denied_by,
+                    attempt.num,
+                    last_cause.get("cause", "unknown"),
+                    extra=build_log_extra(
+                        limit_key=limit_key,
+                        operation=denied_by.replace(" ", "_"),
+                        retry_attempt=attempt.num,
+                        exception_type=last_cause.get("cause"),
+                    ),
+                )
+                raise denied
         raise AssertionError(  # pragma: no cover - retry_context always returns or raises
             "stamina.retry_context exited without returning or raising",
         )
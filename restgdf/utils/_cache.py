@@ -0,0 +1,313 @@
+"""Shared LRU + TTL cache for layer metadata, counts and statistics.
+
+Private submodule; :class:`MetadataCache` is re-exported from the
+top-level ``restgdf`` package.
+
+``get_metadata`` and ``get_feature_count`` are otherwise re-sent by every
+``FeatureLayer`` that touches a layer: ``prep``, each ``where``
+refinement, ``service_metadata`` in a crawl, and the stats helpers
+(``get_unique_values``, ``get_value_counts``, ``nested_count``) each go to
+the network. While a :class:`MetadataCache` is :meth:`~MetadataCache.activate`'d,
+those reads are served from it. Entries are the decoded JSON payloads,
+keyed by operation kind, URL, canonical query and auth scope, so every
+caller still parses (and copies) its own result.
+
+The auth scope keeps credentials apart: a ``token`` in the request body
+contributes its SHA-256 digest, and a token session
+(:class:`~restgdf.ArcGISTokenSession`, also behind wrappers) contributes
+its token URL and user name. Anonymous requests share one scope.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Literal, TypeVar
+
+from restgdf.utils._canonical import _canonical_query_string
+from restgdf.utils._coalesce import _SingleFlight, _coalesced_json
+from restgdf.utils._http import _auth_scope
+
+CacheKind = Literal["metadata", "count", "stats"]
+
+_KINDS: frozenset[str] = frozenset({"metadata", "count", "stats"})
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_ACTIVE_CACHE: ContextVar[MetadataCache | None] = ContextVar(
+    "restgdf_metadata_cache",
+    default=None,
+)
+
+
+class MetadataCache:
+    """In-memory LRU + TTL cache for metadata, count and statistics reads.
+
+    While :meth:`activate`'d, ``get_metadata``, ``get_feature_count`` and
+    the stats helpers (and so ``FeatureLayer.prep``, ``where``,
+    ``get_unique_values``, ``get_value_counts``, ``get_nested_count`` and
+    ``service_metadata``) answer from the cache. Concurrent misses for the
+    same key are populated by one request. Error envelopes are never
+    stored.
+
+    Parameters
+    ----------
+    max_entries : int
+        Entries kept before the least recently used one is evicted.
+    ttl_s : float or None
+        Seconds an entry stays fresh. ``None`` keeps entries until they
+        are evicted.
+    max_bytes : int or None
+        Optional cap on the cached payloads' total JSON-encoded size; the
+        least recently used entries are evicted to stay under it. A
+        payload larger than the cap is not cached.
+    kinds : iterable of {"metadata", "count", "stats"}
+        Operation classes to cache. Defaults to all three.
+
+    Notes
+    -----
+    :meth:`get` and :meth:`put` are the storage hooks; a subclass may
+    override them to back the cache with another store, for example on
+    disk. Instances are safe to share between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        *,
+        ttl_s: float | None = 300.0,
+        max_bytes: int | None = None,
+        kinds: Iterable[CacheKind] = ("metadata", "count", "stats"),
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries!r}")
+        if ttl_s is not None and ttl_s <= 0:
+            raise ValueError(f"ttl_s must be > 0, got {ttl_s!r}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1, got {max_bytes!r}")
+        kinds = frozenset(kinds)
+        unknown = kinds - _KINDS
+        if unknown:
+            raise ValueError(
+                f"unknown cache kinds {sorted(unknown)!r}; "
+                f"allowed: {sorted(_KINDS)}",
+            )
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.kinds = kinds
+        # key -> (expires_at, size, value); most recently used last.
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = _SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def activate(self) -> Iterator[MetadataCache]:
+        """Make this the cache for the enclosed block.
+
+        Tasks created inside the block inherit it. Wrap a job's entry
+        point, or the body of ``main()``, to share it process-wide.
+        """
+        token = _ACTIVE_CACHE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_CACHE.reset(token)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the fresh value stored under ``key``, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting as needed."""
+        size = _weigh(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = (
+            time.monotonic() + self.ttl_s if self.ttl_s is not None else float("inf")
+        )
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, url_prefix: str | None = None) -> int:
+        """Drop every entry, or those whose URL starts with ``url_prefix``.
+
+        Returns the number of entries dropped.
+        """
+        with self._lock:
+            if url_prefix is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return dropped
+            stale = [
+                key
+                for key in self._entries
+                if isinstance(key, tuple)
+                and len(key) > 1
+                and str(key[1]).startswith(url_prefix)
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.invalidate()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return ``{"hits", "misses", "evictions", "entries", "bytes"}``.
+
+        ``bytes`` is only tracked when ``max_bytes`` is set.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    async def _get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        value = self.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        async def _populate() -> Any:
+            value = await load()
+            if _cacheable(value):
+                self.put(key, value)
+            return value
+
+        return await self._loading.run(key, _populate)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"MetadataCache(max_entries={self.max_entries}, ttl_s={self.ttl_s}, "
+            f"max_bytes={self.max_bytes}, entries={len(self._entries)})"
+        )
+
+
+class _LRUDict(OrderedDict[K, V]):
+    """A dict holding its ``max_entries`` most recently used entries.
+
+    The LRU half of :class:`MetadataCache`, without expiry or locking, for
+    caches owned by a single object (``FeatureLayer.uniquevalues`` etc.).
+    Reads and writes mark an entry used; a write past the bound evicts the
+    least recently used one.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries!r}")
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __getitem__(self, key: K) -> V:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+def _weigh(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def _cacheable(value: Any) -> bool:
+    # ArcGIS reports most failures as a 200 with an ``error`` envelope.
+    return value is not None and not (isinstance(value, Mapping) and "error" in value)
+
+
+def _cache_key(
+    kind: str,
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+) -> tuple[Any, ...]:
+    body = dict(body or {})
+    token = body.pop("token", None)
+    return (
+        kind,
+        url,
+        _canonical_query_string(body),
+        _auth_scope(session, token),
+    )
+
+
+async def _cached_json(
+    kind: CacheKind,
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+    **kwargs: Any,
+) -> Any:
+    """Return the JSON for a read-only request, via the active cache if any.
+
+    Misses (and calls with no active cache) go through
+    :func:`~restgdf.utils._coalesce._coalesced_json` with
+    ``token_safe=True``.
+    """
+    cache = _ACTIVE_CACHE.get()
+    if cache is None or kind not in cache.kinds:
+        return await _coalesced_json(session, url, body, token_safe=True, **kwargs)
+    return await cache._get_or_load(
+        _cache_key(kind, session, url, body),
+        lambda: _coalesced_json(session, url, body, token_safe=True, **kwargs),
+    )
+
+
+__all__ = ["MetadataCache"]
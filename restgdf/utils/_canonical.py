@@ -0,0 +1,78 @@
+"""Canonical wire encoding for ArcGIS query strings.
+
+Private submodule; consumed by :mod:`restgdf.utils._http`.
+
+A CDN in front of ArcGIS Online / Enterprise (and any HTTP cache) keys on
+the full request URL, so two requests that ask the same question must
+produce the same query string byte for byte. Bodies built by different
+call sites do not: key order follows whoever assembled the ``dict``,
+booleans may be Python ``True`` or ``"true"``, and an ``outFields`` list
+or a geometry mapping has no wire form of its own.
+:func:`_canonical_query` fixes all of that:
+
+* keys are sorted;
+* booleans become ``"true"`` / ``"false"`` and ``None`` an empty string;
+* integral numbers (including integral floats) are written without a
+  fraction, other floats with :func:`repr`;
+* sequences of scalars are comma-joined, ArcGIS's list convention
+  (``outFields``, ``objectIds``);
+* mappings and sequences of mappings are compact JSON with sorted keys
+  (``geometry``, ``outStatistics``, ``quantizationParameters``).
+"""
+
+from __future__ import annotations
+
+import json
+import numbers
+from collections.abc import Mapping, Sequence
+from urllib.parse import urlencode
+
+
+def _canonical_value(value: object) -> str:
+    """Return the wire form of one query parameter value."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        number = float(value)
+        return str(int(number)) if number.is_integer() else repr(number)
+    if isinstance(value, Mapping) or (
+        isinstance(value, Sequence)
+        and any(
+            isinstance(item, Mapping)
+            or (isinstance(item, Sequence) and not isinstance(item, str))
+            for item in value
+        )
+    ):
+        return json.dumps(
+            value,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+    if isinstance(value, (Sequence, set, frozenset)):
+        items = sorted(value, key=str) if isinstance(value, (set, frozenset)) else value
+        return ",".join(_canonical_value(item) for item in items)
+    return str(value)
+
+
+def _canonical_query(body: Mapping[str, object] | None) -> dict[str, str]:
+    """Return ``body`` as sorted string pairs (see the module docstring)."""
+    if not body:
+        return {}
+    return {str(key): _canonical_value(body[key]) for key in sorted(body, key=str)}
+
+
+def _canonical_query_string(body: Mapping[str, object] | None) -> str:
+    """Return the URL-encoded form of :func:`_canonical_query`."""
+    return urlencode(_canonical_query(body))
+
+
+__all__: list[str] = []
@@ -0,0 +1,200 @@
+"""Single-flight coalescing of identical in-flight ArcGIS reads.
+
+Private submodule; consumed by the read helpers in
+:mod:`restgdf.utils._query` (``get_metadata``, ``get_feature_count``,
+``get_object_ids``).
+
+Concurrent code paths often ask for the same thing at the same moment:
+several ``FeatureLayer.from_url`` calls on one layer,
+``get_query_data_batches`` and ``_apply_spatial_reference_attr`` both
+fetching the layer metadata, a crawl's ``service_metadata`` tasks.
+:func:`_coalesced_json` sends the first such request (the *leader*) and
+hands every identical request that arrives while it is in flight the same
+decoded JSON. Nothing is cached: once the leader has finished, the next
+identical request goes to the network again.
+
+Two requests are identical when they share the verb, URL, canonical body
+and headers (:mod:`restgdf.utils._canonical`, so ``True`` and ``"true"``
+match), the auth identity -- the session object, which may attach its
+own credentials, plus a digest of any ``token`` in the body -- and the
+:func:`restgdf.deadline` scope they run under. Token-bearing requests (a
+``token`` in the body, or a session that injects one there) are only
+coalesced when the caller marks them ``token_safe`` -- i.e. read-only.
+
+The shared request runs in its own task, so one waiter being cancelled
+does not fail the others; it is cancelled only once every waiter has
+gone. Waiters share the decoded payload and must treat it as read-only.
+
+Turn it off with ``TransportConfig.coalesce_requests`` (env
+``RESTGDF_TRANSPORT_COALESCE_REQUESTS=false``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from functools import partial
+from typing import Any, TypeVar
+
+from restgdf._config import get_config
+from restgdf._logging import build_log_extra, get_logger
+from restgdf.utils._canonical import _canonical_query_string
+from restgdf.utils._deadline import _DEADLINE
+from restgdf.utils._http import (
+    _arcgis_request,
+    _request_verb,
+    _session_requires_body_transport,
+)
+
+_LOG = get_logger("transport")
+_T = TypeVar("_T")
+
+# Request kwargs that may differ between coalesced callers. The leader's
+# timeout applies to everyone; anything else opts the request out.
+_COALESCABLE_KWARGS = frozenset({"headers", "timeout"})
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _SingleFlight:
+    """Share one in-flight call per key between concurrent callers.
+
+    The call runs in its own task: a waiter that is cancelled leaves the
+    others waiting, and the task is cancelled only once every waiter has
+    gone. Keys are scoped to the running loop, so a key in flight on one
+    loop is never joined from another.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[tuple[Any, Hashable], _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[_T]],
+        *,
+        joined: Callable[[], None] | None = None,
+    ) -> _T:
+        """Await ``factory()``, or the call already in flight for ``key``.
+
+        ``joined`` is called when an in-flight call is joined.
+        """
+        scoped = (asyncio.get_running_loop(), key)
+        flight = self._flights.get(scoped)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[scoped] = flight
+            flight.task.add_done_callback(partial(self._land, scoped, flight))
+        elif joined is not None:
+            joined()
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _land(
+        self,
+        scoped: tuple[Any, Hashable],
+        flight: _Flight,
+        task: asyncio.Future[Any],
+    ) -> None:
+        if self._flights.get(scoped) is flight:
+            del self._flights[scoped]
+        if not task.cancelled():
+            # Retrieved here so an error nobody awaited any more is not
+            # reported as "never retrieved".
+            task.exception()
+
+
+_in_flight = _SingleFlight()
+
+
+def _flight_key(
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+    *,
+    headers: Mapping[str, object] | None,
+    token_safe: bool,
+) -> tuple[Any, ...] | None:
+    """Return the coalescing key for a request, or ``None`` to opt out."""
+    body = dict(body or {})
+    token = body.pop("token", None)
+    if not token_safe and (
+        token is not None or _session_requires_body_transport(session)
+    ):
+        return None
+    return (
+        # The session is alive for as long as its flight, so its id
+        # cannot be reused by another session meanwhile.
+        id(session),
+        _request_verb(session, url, {**body, "token": token} if token else body),
+        url,
+        _canonical_query_string(body),
+        _canonical_query_string(headers),
+        hashlib.sha256(str(token).encode()).hexdigest() if token else None,
+        _DEADLINE.get(),
+    )
+
+
+async def _fetch_json(
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+    **kwargs: Any,
+) -> Any:
+    response = await _arcgis_request(session, url, body, **kwargs)
+    return await response.json(content_type=None)
+
+
+async def _coalesced_json(
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+    *,
+    token_safe: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """Send ``body`` to ``url`` via :func:`_arcgis_request`; return its JSON.
+
+    An identical request already in flight is joined instead of sent again
+    (see the module docstring). ``token_safe`` marks a read-only request
+    whose token-bearing body may be shared between callers holding the
+    same token.
+    """
+    key = None
+    if get_config().transport.coalesce_requests and set(kwargs) <= (
+        _COALESCABLE_KWARGS
+    ):
+        key = _flight_key(
+            session,
+            url,
+            body,
+            headers=kwargs.get("headers"),
+            token_safe=token_safe,
+        )
+    if key is None:
+        return await _fetch_json(session, url, body, **kwargs)
+
+    return await _in_flight.run(
+        key,
+        lambda: _fetch_json(session, url, body, **kwargs),
+        joined=lambda: _LOG.debug(
+            "coalesced request for url=%s with one in flight",
+            url,
+            extra=build_log_extra(operation="coalesce"),
+        ),
+    )
@@ -1,21 +1,39 @@
 """Internal concurrency primitives for restgdf.
 
-Private submodule. The only public entry point today is
-:func:`bounded_gather`, a drop-in replacement for
-:func:`asyncio.gather` that caps concurrent execution via an
-``asyncio.BoundedSemaphore`` (plan.md §3c R-18).
+Private submodule. Three entry points:
+
+* :func:`bounded_map` / :func:`bounded_as_completed`, the streaming
+  fan-out used by every restgdf fan-out site: work is pulled lazily from
+  an iterable, at most ``limit`` calls are in flight, and results are
+  yielded as they finish, so memory stays proportional to the concurrency
+  rather than to the size of the plan.
+* :func:`bounded_gather`, a drop-in replacement for :func:`asyncio.gather`
+  that caps concurrent execution via an ``asyncio.BoundedSemaphore``
+  (plan.md §3c R-18). It creates every awaitable up front; prefer the
+  streaming helpers for large or unbounded work lists.
+* :class:`FairScheduler`, re-exported from the top-level ``restgdf``
+  package: an opt-in, context-scoped global cap shared by every restgdf
+  fan-out site, with weighted round-robin fairness across layers and
+  optional per-host caps and priorities.
 
 Threading contract (plan.md §3c R-44, kickoff phase-1a §10.3): each
 top-level restgdf orchestration entry point (``service_metadata``,
 ``fetch_all_data``, ``safe_crawl``) constructs **one**
 ``asyncio.BoundedSemaphore`` at call time using
 ``Settings.max_concurrent_requests`` from :func:`get_settings`. That
-semaphore is consumed at the three enumerated ``asyncio.gather`` fan-out
-sites (``utils/getinfo.py:143``, ``utils/crawl.py:83``,
-``utils/crawl.py:179``) via :func:`bounded_gather`. Leaf HTTP helpers
+semaphore is consumed at the enumerated fan-out sites
+(``service_metadata``'s per-layer fan-out and the crawl directory calls)
+via the ``semaphore=`` of the streaming helpers. Leaf HTTP helpers
 (e.g. ``get_metadata``) do NOT accept ``semaphore=`` kwargs; the cap is
 enforced where fan-out actually happens.
 
+Those per-call semaphores bound *one* call: ``asyncio.gather`` over 40
+``FeatureLayer.get_gdf`` calls runs up to 40 x the configured cap, and
+whichever layer queued first is served first. An active
+:class:`FairScheduler` adds one slot per unit of fan-out work *inside* the
+per-call semaphore, so the process-wide total is capped and the slots are
+shared out between layers in turn.
+
 Saturation semantics = wait (plan.md §3c R-19): ``asyncio.gather``'s
 normal failure modes propagate; there is no ``ConcurrencySaturatedError``.
 """
@@ -23,16 +41,189 @@ normal failure modes propagate; there is no ``ConcurrencySaturatedError``.
 from __future__ import annotations
 
 import asyncio
-from typing import Any
-from collections.abc import Awaitable
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
+from contextvars import ContextVar
+from typing import Any, TypeVar
+from urllib.parse import urlparse
+
+from restgdf._client._priority import _rank
+
+__all__ = (
+    "FairScheduler",
+    "bounded_as_completed",
+    "bounded_gather",
+    "bounded_map",
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_as_completed(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    limit: int,
+    semaphore: asyncio.Semaphore | None = None,
+    flow: str | None = None,
+    priority: int | None = None,
+) -> AsyncGenerator[tuple[int, R], None]:
+    """Return an async generator of ``(index, func(item))`` as calls complete.
+
+    ``items`` is consumed lazily: a call is started only when one of the
+    ``limit`` in-flight calls finishes, so neither the work list nor the
+    pending tasks are ever materialised in full. Calls that finish in the
+    same tick are yielded in input order.
+
+    Parameters
+    ----------
+    func
+        Coroutine function applied to each item.
+    items
+        Any iterable, including a generator of unknown length.
+    limit
+        Maximum number of calls in flight at once.
+    semaphore
+        Optional semaphore shared with other fan-outs of the same
+        orchestration call (BL-01); each call also holds it while it runs.
+    flow, priority
+        Fairness key and priority for the active :class:`FairScheduler`,
+        if any. Each call then also holds one scheduler slot.
+
+    Notes
+    -----
+    The first exception raised by a call propagates out of the iteration.
+    Leaving the iteration early cancels every call still in flight: a
+    failed call and cancellation do so directly; when the loop body itself
+    can raise or ``break``, wrap the generator in
+    :func:`contextlib.aclosing` so it is closed on the way out.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be >= 1, got {limit!r}")
+    return _bounded_stream(
+        func,
+        items,
+        limit=limit,
+        ordered=False,
+        semaphore=semaphore,
+        flow=flow,
+        priority=priority,
+    )
 
-__all__ = ("bounded_gather",)
+
+def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    limit: int,
+    ordered: bool = True,
+    semaphore: asyncio.Semaphore | None = None,
+    flow: str | None = None,
+    priority: int | None = None,
+) -> AsyncGenerator[R, None]:
+    """Return an async generator of ``func(item)`` with ``limit`` calls in flight.
+
+    With ``ordered=True`` (the default) results come out in input order:
+    in-flight calls plus finished-but-unyielded results never exceed
+    ``limit``, so one slow call holds back later submissions rather than
+    letting the reorder buffer grow. With ``ordered=False`` results are
+    yielded as they complete, as :func:`bounded_as_completed` does.
+
+    The remaining parameters and the error/cancellation behaviour are those
+    of :func:`bounded_as_completed`.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be >= 1, got {limit!r}")
+    return _bounded_stream(
+        func,
+        items,
+        limit=limit,
+        ordered=ordered,
+        semaphore=semaphore,
+        flow=flow,
+        priority=priority,
+        with_index=False,
+    )
+
+
+async def _bounded_stream(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    limit: int,
+    ordered: bool,
+    semaphore: asyncio.Semaphore | None,
+    flow: str | None,
+    priority: int | None,
+    with_index: bool = True,
+) -> AsyncGenerator[Any, None]:
+    source = enumerate(items)
+    in_flight: dict[asyncio.Task[R], int] = {}
+    in_order: deque[asyncio.Task[R]] = deque()
+
+    async def _run(item: T) -> R:
+        async with semaphore or nullcontext():
+            if flow is None:
+                return await func(item)
+            async with _scheduled(flow, priority=priority):
+                return await func(item)
+
+    def _submit() -> None:
+        try:
+            index, item = next(source)
+        except StopIteration:
+            return
+        task = asyncio.create_task(_run(item))
+        in_flight[task] = index
+        if ordered:
+            in_order.append(task)
+
+    try:
+        for _ in range(limit):
+            _submit()
+        if ordered:
+            while in_order:
+                task = in_order.popleft()
+                result = await task
+                index = in_flight.pop(task)
+                _submit()
+                yield (index, result) if with_index else result
+            return
+        while in_flight:
+            done, _pending = await asyncio.wait(
+                in_flight,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in sorted(done, key=in_flight.__getitem__):
+                index = in_flight.pop(task)
+                _submit()
+                yield (index, task.result()) if with_index else task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
 
 
 async def bounded_gather(
     *aws: Awaitable[Any],
     semaphore: asyncio.Semaphore,
     return_exceptions: bool = False,
+    flow: str | None = None,
 ) -> list[Any]:
     """Gather awaitables while holding ``semaphore`` for each task.
 
@@ -55,6 +246,10 @@ async def bounded_gather(
         Forwarded to :func:`asyncio.gather`. When ``True``, exceptions
         raised by any awaitable are collected into the result list at
         the corresponding index instead of propagating.
+    flow
+        Fairness key (a layer or service URL) for the active
+        :class:`FairScheduler`, if any. Each awaitable then also holds one
+        scheduler slot while it runs. Ignored when no scheduler is active.
 
     Returns
     -------
@@ -75,9 +270,281 @@ async def bounded_gather(
 
     async def _run(aw: Awaitable[Any]) -> Any:
         async with semaphore:
-            return await aw
+            if flow is None:
+                return await aw
+            async with _scheduled(flow):
+                return await aw
 
     return await asyncio.gather(
         *(_run(aw) for aw in aws),
         return_exceptions=return_exceptions,
     )
+
+
+class _Waiter:
+    __slots__ = ("future", "host")
+
+    def __init__(self, future: asyncio.Future[None], host: str) -> None:
+        self.future = future
+        self.host = host
+
+
+class _Flow:
+    __slots__ = ("key", "weight", "credit", "waiters")
+
+    def __init__(self, key: str, weight: int) -> None:
+        self.key = key
+        self.weight = weight
+        self.credit = weight
+        self.waiters: deque[_Waiter] = deque()
+
+
+# The scheduler active for the current task (and every task it creates).
+_ACTIVE_SCHEDULER: ContextVar[FairScheduler | None] = ContextVar(
+    "restgdf_fair_scheduler",
+    default=None,
+)
+# True inside a held slot. Child tasks inherit it, so nested fan-out under
+# a held slot never queues for a second one -- a nested acquire could
+# otherwise deadlock once every slot is held by an outer task.
+_HOLDING_SLOT: ContextVar[bool] = ContextVar("restgdf_holding_slot", default=False)
+
+
+class FairScheduler:
+    """Process- or job-wide concurrency cap shared fairly between layers.
+
+    While :meth:`activate`'d, every restgdf fan-out site (page fetches of
+    ``get_gdf``/``iter_pages``/``chunk_generator``, ``service_metadata``
+    layer lookups, directory metadata calls) takes one slot of this
+    scheduler per unit of work, on top of its own per-call cap. Slots are
+    handed out by weighted round-robin over *flows* (one flow per layer or
+    service URL), so one huge layer cannot starve the others, and
+    ``max_per_host`` keeps a single host from taking every slot.
+
+    Parameters
+    ----------
+    max_concurrent : int
+        Slots across every flow and host.
+    max_per_host : int or None
+        Slots any one ``scheme://host`` may hold at once. ``None`` (the
+        default) applies no per-host cap.
+    weights : Mapping[str, int] or None
+        Optional per-flow weights: a flow of weight ``w`` is granted up to
+        ``w`` slots per round-robin turn. Flows not listed weigh ``1``.
+
+    Notes
+    -----
+    Waiters with a lower ``priority`` are always served first; flows of
+    equal priority share by round-robin. Nested fan-out inside a held slot
+    does not take another one.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        *,
+        max_per_host: int | None = None,
+        weights: dict[str, int] | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError(
+                f"max_concurrent must be >= 1, got {max_concurrent!r}",
+            )
+        if max_per_host is not None and max_per_host < 1:
+            raise ValueError(f"max_per_host must be >= 1, got {max_per_host!r}")
+        for key, weight in (weights or {}).items():
+            if weight < 1:
+                raise ValueError(f"weight for {key!r} must be >= 1, got {weight!r}")
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self._weights = dict(weights or {})
+        self._active = 0
+        self._host_active: dict[str, int] = {}
+        # priority -> round-robin order of flows with waiters
+        self._rotation: dict[int, deque[_Flow]] = {}
+        self._flows: dict[tuple[int, str], _Flow] = {}
+        self.granted = 0
+
+    @contextmanager
+    def activate(self) -> Iterator[FairScheduler]:
+        """Make this the scheduler for the enclosed block.
+
+        Tasks created inside the block (``asyncio.gather``,
+        ``create_task``) inherit it. Wrap a job's entry point, or the body
+        of ``main()``, to scope it process-wide.
+        """
+        token = _ACTIVE_SCHEDULER.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_SCHEDULER.reset(token)
+
+    @property
+    def active(self) -> int:
+        """Slots currently held."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently queued for a slot."""
+        return sum(len(flow.waiters) for flow in self._flows.values())
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return ``{"active", "waiting", "granted", "hosts", "flows"}``.
+
+        ``hosts`` maps each host to its held slots; ``flows`` maps each
+        flow with waiters to its queue length.
+        """
+        return {
+            "active": self._active,
+            "waiting": self.waiting,
+            "granted": self.granted,
+            "hosts": dict(self._host_active),
+            "flows": {key: len(f.waiters) for (_, key), f in self._flows.items()},
+        }
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        flow: str,
+        *,
+        host: str | None = None,
+        priority: int = 0,
+    ) -> AsyncIterator[None]:
+        """Hold one slot for the enclosed block.
+
+        ``flow`` is the fairness key; ``host`` defaults to its
+        ``scheme://netloc``. Re-entrant within a task: inside a held slot
+        this is a no-op.
+        """
+        if _HOLDING_SLOT.get():
+            yield
+            return
+        host = host if host is not None else _host_key(flow)
+        await self._acquire(flow, host, priority)
+        token = _HOLDING_SLOT.set(True)
+        try:
+            yield
+        finally:
+            _HOLDING_SLOT.reset(token)
+            self._release(host)
+
+    async def _acquire(self, key: str, host: str, priority: int) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), host)
+        flow = self._flows.get((priority, key))
+        if flow is None:
+            flow = _Flow(key, self._weights.get(key, 1))
+            self._flows[(priority, key)] = flow
+            self._rotation.setdefault(priority, deque()).append(flow)
+        flow.waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we were cancelled: hand the slot back.
+                self._release(host)
+            else:
+                self._discard(priority, flow, waiter)
+            raise
+
+    def _release(self, host: str) -> None:
+        self._active -= 1
+        remaining = self._host_active.get(host, 1) - 1
+        if remaining:
+            self._host_active[host] = remaining
+        else:
+            self._host_active.pop(host, None)
+        self._dispatch()
+
+    def _discard(self, priority: int, flow: _Flow, waiter: _Waiter) -> None:
+        try:
+            flow.waiters.remove(waiter)
+        except ValueError:
+            return
+        if not flow.waiters:
+            self._drop_flow(priority, flow)
+
+    def _drop_flow(self, priority: int, flow: _Flow) -> None:
+        if self._flows.get((priority, flow.key)) is flow:
+            del self._flows[(priority, flow.key)]
+        rotation = self._rotation.get(priority)
+        if rotation is not None:
+            try:
+                rotation.remove(flow)
+            except ValueError:
+                pass
+            if not rotation:
+                del self._rotation[priority]
+
+    def _host_full(self, host: str) -> bool:
+        return (
+            self.max_per_host is not None
+            and self._host_active.get(host, 0) >= self.max_per_host
+        )
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrent:
+            if not self._grant_next():
+                return
+
+    def _grant_next(self) -> bool:
+        for priority in sorted(self._rotation):
+            rotation = self._rotation[priority]
+            for _ in range(len(rotation)):
+                flow = rotation[0]
+                # A waiter cancelled while queued removes itself once its
+                # task resumes; never grant to one in the meantime.
+                waiter = next(
+                    (
+                        w
+                        for w in flow.waiters
+                        if not w.future.done() and not self._host_full(w.host)
+                    ),
+                    None,
+                )
+                if waiter is None:
+                    # Host-capped (or only cancelled waiters) for now: let
+                    # the next flow take its turn.
+                    flow.credit = flow.weight
+                    rotation.rotate(-1)
+                    continue
+                flow.waiters.remove(waiter)
+                flow.credit -= 1
+                if not flow.waiters:
+                    self._drop_flow(priority, flow)
+                elif flow.credit <= 0:
+                    flow.credit = flow.weight
+                    rotation.rotate(-1)
+                self._active += 1
+                self._host_active[waiter.host] = (
+                    self._host_active.get(waiter.host, 0) + 1
+                )
+                self.granted += 1
+                waiter.future.set_result(None)
+                return True
+        return False
+
+
+def _host_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _scheduled(
+    flow: str,
+    *,
+    priority: int | None = None,
+) -> AbstractAsyncContextManager[Any]:
+    """Return the active scheduler's slot for ``flow``, or a no-op context.
+
+    ``priority`` defaults to the rank of the pinned
+    :func:`~restgdf.request_priority`, else ``"metadata"``.
+    """
+    scheduler = _ACTIVE_SCHEDULER.get()
+    if scheduler is None:
+        return nullcontext()
+    if priority is None:
+        priority = _rank()
+    return scheduler.slot(flow, priority=priority)
@@ -0,0 +1,197 @@
+"""End-to-end deadlines for downloads, streams and crawls.
+
+Private submodule. :func:`deadline` is re-exported from the top-level
+``restgdf`` package.
+
+``TimeoutConfig.total_s`` bounds one request. A download is many requests
+plus the retries, backoffs and truncation splits between them, so a
+per-request timeout alone does not bound how long it runs. A deadline
+bounds the whole operation: it is an absolute ``time.monotonic()``
+instant carried by a :class:`~contextvars.ContextVar`, so every task
+created inside its scope -- page fetches, crawl fan-outs -- inherits it
+without any change to the session protocol. Inside the scope:
+
+* every request's ``timeout`` is clamped to the time remaining
+  (:func:`restgdf.utils._http._arcgis_request` and, per attempt,
+  :class:`~restgdf.resilience.ResilientSession`);
+* no request, retry or split sub-fetch is started once it has run out;
+* the failure surfaces as :class:`~restgdf.errors.DeadlineExceededError`,
+  which is never retried.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+import aiohttp
+
+from restgdf._logging import build_log_extra, get_logger
+from restgdf.errors import DeadlineExceededError
+
+_LOG = get_logger("pagination")
+
+T = TypeVar("T")
+
+# Absolute ``time.monotonic()`` deadline and the budget it was built from.
+_DEADLINE: ContextVar[tuple[float, float] | None] = ContextVar(
+    "restgdf_deadline",
+    default=None,
+)
+
+
+def _check_seconds(seconds: float) -> None:
+    if seconds <= 0:
+        raise ValueError(f"deadline must be > 0 seconds, got {seconds!r}")
+
+
+@contextmanager
+def _deadline_at(at: float, budget_s: float) -> Iterator[None]:
+    """Make ``at`` the current deadline unless an earlier one is active."""
+    current = _DEADLINE.get()
+    if current is not None and current[0] <= at:
+        yield
+        return
+    token = _DEADLINE.set((at, budget_s))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Bound every restgdf request in the block to ``seconds`` from now.
+
+    Requests issued inside the block, including those of tasks it
+    creates, get ``min(per-request timeout, time remaining)``; retries,
+    page retries and truncation splits that would start after the
+    deadline are not started, and the operation fails with
+    :class:`~restgdf.errors.DeadlineExceededError`. A nested deadline can
+    only shorten an outer one. ``None`` leaves the block unbounded.
+
+    Parameters
+    ----------
+    seconds : float or None
+        Wall-clock budget for the whole block.
+    """
+    if seconds is None:
+        yield
+        return
+    _check_seconds(seconds)
+    with _deadline_at(time.monotonic() + seconds, float(seconds)):
+        yield
+
+
+def _remaining() -> float | None:
+    """Seconds left before the current deadline; ``None`` when unbounded."""
+    current = _DEADLINE.get()
+    if current is None:
+        return None
+    return current[0] - time.monotonic()
+
+
+def _budget() -> float | None:
+    current = _DEADLINE.get()
+    return None if current is None else current[1]
+
+
+def _deadline_error(url: str | None = None) -> DeadlineExceededError:
+    budget_s = _budget()
+    return DeadlineExceededError(
+        f"deadline of {budget_s:g}s exceeded" + (f" before {url}" if url else ""),
+        url=url,
+        budget_s=budget_s,
+    )
+
+
+def _check_deadline(url: str | None = None) -> float | None:
+    """Return the seconds remaining, raising once the deadline has passed."""
+    remaining = _remaining()
+    if remaining is not None and remaining <= 0:
+        raise _deadline_error(url)
+    return remaining
+
+
+def _expired() -> bool:
+    remaining = _remaining()
+    return remaining is not None and remaining <= 0
+
+
+def _clamped_timeout(timeout: Any) -> Any:
+    """Return ``timeout`` with its total bounded by the time remaining.
+
+    :class:`aiohttp.ClientTimeout` totals and plain numbers are clamped;
+    ``None`` becomes a ``ClientTimeout`` bounded by the deadline. Outside a
+    deadline ``timeout`` is returned unchanged.
+    """
+    remaining = _remaining()
+    if remaining is None:
+        return timeout
+    remaining = max(remaining, 0.0)
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=remaining)
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        if timeout.total is not None and timeout.total <= remaining:
+            return timeout
+        return aiohttp.ClientTimeout(
+            total=remaining,
+            connect=timeout.connect,
+            sock_read=timeout.sock_read,
+            sock_connect=timeout.sock_connect,
+            ceil_threshold=timeout.ceil_threshold,
+        )
+    if isinstance(timeout, (int, float)):
+        return min(float(timeout), remaining)
+    return timeout
+
+
+async def _with_deadline(
+    stream: AsyncIterator[T],
+    seconds: float,
+    *,
+    url: str | None = None,
+) -> AsyncGenerator[T, None]:
+    """Yield from ``stream`` with a deadline ``seconds`` after the first pull.
+
+    The deadline scope is entered around each pull only, never across a
+    ``yield``, so the consumer's own context is left untouched. A
+    :class:`~restgdf.errors.DeadlineExceededError` leaving the stream
+    carries the number of items yielded before it in ``completed``.
+    """
+    _check_seconds(seconds)
+    at = time.monotonic() + seconds
+    completed = 0
+    try:
+        while True:
+            with _deadline_at(at, float(seconds)):
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+            completed += 1
+    except DeadlineExceededError as exc:
+        if exc.completed is None:
+            exc.completed = completed
+        _LOG.warning(
+            "deadline of %gs exceeded for url=%s after %d page(s)",
+            seconds,
+            url,
+            completed,
+            extra=build_log_extra(
+                operation="deadline",
+                exception_type=type(exc).__name__,
+            ),
+        )
+        raise
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+__all__ = ["deadline"]
@@ -9,9 +9,18 @@ from __future__ import annotations
 from collections.abc import Iterable
 from collections.abc import Mapping
 from collections.abc import Sequence
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from restgdf.utils._metadata import normalize_spatial_reference
+from restgdf.utils._spatial import (
+    _check_prefilter,
+    _prefilter,
+    _server_relation,
+    _to_shape,
+)
+
+if TYPE_CHECKING:
+    from restgdf.utils._spatial import Prefilter
 
 
 def _is_arcgis_geometry_mapping(geometry: Mapping[str, object]) -> bool:
@@ -199,13 +208,36 @@ def build_spatial_filter_payload(
     *,
     in_sr: int | str | Mapping[str, Any] | None = None,
     spatial_rel: str = "esriSpatialRelIntersects",
+    prefilter: Prefilter | None = None,
+    tolerance: float | None = None,
 ) -> dict[str, object]:
     """Build an ArcGIS REST spatial-filter payload fragment.
 
     Accepts ArcGIS JSON mappings directly, GeoJSON-style mappings, or any
     object that exposes ``__geo_interface__`` such as shapely geometries.
+
+    ``prefilter`` (``"simplify"``, ``"convex_hull"`` or ``"envelope"``)
+    sends a small cover of a large geometry instead: a simplification of
+    the geometry buffered by ``tolerance`` (default: 1/1000 of its extent),
+    its convex hull or its envelope. ``spatial_rel`` falls back to
+    intersects where the cover could miss matches, so the query returns a
+    superset of the exact matches; test the candidates locally, or use
+    :meth:`restgdf.FeatureLayer.query_geometries`, which does. Needs
+    ``shapely``.
     """
     geometry_payload, geometry_type = _coerce_geometry_mapping(geometry)
+    if prefilter is not None:
+        _check_prefilter(prefilter, tolerance)
+        coarse = _prefilter(
+            _to_shape(geometry),
+            {"geometry": geometry_payload, "geometryType": geometry_type},
+            prefilter,
+            tolerance,
+        )
+        if coarse["geometry"] is not geometry_payload:
+            geometry_payload = coarse["geometry"]
+            geometry_type = coarse["geometryType"]
+            spatial_rel = _server_relation(spatial_rel)
     sr_input = dict(in_sr) if isinstance(in_sr, Mapping) else in_sr
     epsg, raw_sr = normalize_spatial_reference(sr_input)
 
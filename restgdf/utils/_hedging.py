@@ -0,0 +1,188 @@
+"""Hedged page requests for long pagination streams.
+
+Private submodule. :class:`HedgePolicy` is re-exported from the top-level
+``restgdf`` package; the per-stream :class:`_HedgeState` and the
+:func:`_hedged_call` executor are consumed by
+:func:`restgdf.utils.getgdf._iter_pages_raw` only.
+
+A hedge is a *duplicate* of a slow, idempotent page request. When a page
+fetch has not completed after the policy's latency percentile (computed
+over the pages already observed in the same stream), one duplicate is
+issued and whichever copy succeeds first wins; the loser is cancelled.
+The fraction of hedged requests is capped so a uniformly slow server
+never sees its load doubled.
+
+Politeness: the duplicate is dispatched through the *same* session as the
+original, so a :class:`restgdf.resilience.ResilientSession` token bucket
+and 429 cooldown gate it exactly like any other request. Hedging never
+bypasses a configured rate limit -- a hedge that cannot get a token simply
+waits for one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import deque
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from restgdf._logging import build_log_extra, get_logger
+
+_LOG = get_logger("pagination")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Opt-in hedging policy for :meth:`restgdf.FeatureLayer.iter_pages`.
+
+    Attributes
+    ----------
+    percentile : float
+        Latency percentile (``0 < percentile < 1``) of the pages observed so
+        far in the stream after which a still-running page is hedged.
+        Defaults to ``0.95``.
+    max_hedge_ratio : float
+        Upper bound on ``hedged_requests / page_requests`` for one stream
+        (``0 < max_hedge_ratio <= 1``). Defaults to ``0.05``.
+    min_samples : int
+        Completed pages required before the percentile is trusted; no page
+        is hedged until then. Defaults to ``20``.
+    window : int
+        Number of most recent page latencies the percentile is computed
+        over. Defaults to ``256``.
+    min_delay_s : float
+        Floor on the hedge delay, so a stream of very fast pages does not
+        hedge on scheduler jitter. Defaults to ``0.05``.
+    """
+
+    percentile: float = 0.95
+    max_hedge_ratio: float = 0.05
+    min_samples: int = 20
+    window: int = 256
+    min_delay_s: float = 0.05
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 1:
+            raise ValueError(
+                f"percentile must be in (0, 1), got {self.percentile!r}",
+            )
+        if not 0 < self.max_hedge_ratio <= 1:
+            raise ValueError(
+                f"max_hedge_ratio must be in (0, 1], got {self.max_hedge_ratio!r}",
+            )
+        if self.min_samples < 1:
+            raise ValueError(f"min_samples must be >= 1, got {self.min_samples!r}")
+        if self.window < self.min_samples:
+            raise ValueError(
+                f"window must be >= min_samples, got {self.window!r}",
+            )
+        if self.min_delay_s < 0:
+            raise ValueError(f"min_delay_s must be >= 0, got {self.min_delay_s!r}")
+
+
+class _HedgeState:
+    """Per-stream latency window and hedge counters for one :class:`HedgePolicy`."""
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self._latencies: deque[float] = deque(maxlen=policy.window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, elapsed_s: float) -> None:
+        """Add one completed page latency to the window."""
+        self._latencies.append(elapsed_s)
+
+    def hedge_delay(self) -> float | None:
+        """Return the current hedge delay, or ``None`` while warming up."""
+        if len(self._latencies) < self.policy.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        idx = max(0, math.ceil(self.policy.percentile * len(ordered)) - 1)
+        return max(self.policy.min_delay_s, ordered[idx])
+
+    def may_hedge(self) -> bool:
+        """Return ``True`` while one more hedge stays within ``max_hedge_ratio``."""
+        return self.hedged + 1 <= self.policy.max_hedge_ratio * self.requests
+
+
+def _consume_outcome(task: asyncio.Future) -> None:
+    """Mark a losing copy's outcome as retrieved (no 'never retrieved' noise)."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def _hedged_call(
+    call: Callable[[], Coroutine[Any, Any, T]],
+    state: _HedgeState,
+) -> T:
+    """Run ``call`` and hedge it once if it outlives the stream's latency percentile.
+
+    ``call`` must be a zero-argument factory returning a *fresh* coroutine on
+    every invocation (it is invoked a second time for the hedge). The first
+    copy to complete successfully wins. When one copy fails while the other
+    is still running, the survivor is awaited; when both fail, the
+    original's exception is raised.
+    """
+    loop = asyncio.get_running_loop()
+    state.requests += 1
+    delay = state.hedge_delay()
+    started = loop.time()
+    primary = asyncio.create_task(call())
+    if delay is None:
+        result = await primary
+        state.record(loop.time() - started)
+        return result
+
+    copies: dict[asyncio.Task[T], float] = {primary: started}
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not state.may_hedge():
+            result = await primary
+            state.record(loop.time() - started)
+            return result
+
+        state.hedged += 1
+        _LOG.debug(
+            "hedging slow page request after %.3fs (hedged=%d requests=%d)",
+            delay,
+            state.hedged,
+            state.requests,
+            extra=build_log_extra(operation="hedge", retry_delay_s=delay),
+        )
+        hedge = asyncio.create_task(call())
+        copies[hedge] = loop.time()
+        pending: set[asyncio.Task[T]] = {primary, hedge}
+        primary_exc: BaseException | None = None
+        hedge_exc: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            # Prefer the original when both copies land in the same tick.
+            for task in sorted(done, key=lambda t: t is not primary):
+                exc = task.exception()
+                if exc is None:
+                    if task is hedge:
+                        state.hedge_wins += 1
+                    state.record(loop.time() - copies[task])
+                    return task.result()
+                if task is primary:
+                    primary_exc = exc
+                else:
+                    hedge_exc = exc
+        raise primary_exc or hedge_exc  # type: ignore[misc]
+    finally:
+        for task in copies:
+            if not task.done():
+                task.cancel()
+                task.add_done_callback(_consume_outcome)
+
+
+__all__ = ["HedgePolicy"]
@@ -7,13 +7,27 @@ Private submodule; all public names are re-exported by
 from __future__ import annotations
 
 from collections.abc import Mapping
+import hashlib
 import inspect
-from typing import Any, Literal
-from urllib.parse import urlencode
+from typing import TYPE_CHECKING, Any, Literal
 
 import aiohttp
 
+from restgdf._client._http_cache import _ACTIVE_RESPONSE_CACHE, ResponseCache
+from restgdf._client._priority import _classify, _rank
 from restgdf._config import get_config
+from restgdf.errors import DeadlineExceededError
+from restgdf.utils._canonical import _canonical_query, _canonical_query_string
+from restgdf.utils._concurrency import _scheduled
+from restgdf.utils._deadline import (
+    _check_deadline,
+    _clamped_timeout,
+    _deadline_error,
+    _expired,
+)
+
+if TYPE_CHECKING:
+    from restgdf.utils._template import RequestTemplate
 
 DEFAULT_METADATA_HEADERS = {
     "Accept": "application/json,text/plain,*/*",
@@ -66,13 +80,6 @@ def default_data(
 _ARCGIS_URL_BODY_LIMIT: int = 8192
 
 
-def _encoded_body_length(body: Mapping[str, object] | None) -> int:
-    """Return the byte length of ``body`` as it would be URL-encoded."""
-    if not body:
-        return 0
-    return len(urlencode(dict(body), doseq=True))
-
-
 def _choose_verb(
     url: str,
     body: Mapping[str, object] | None = None,
@@ -84,16 +91,17 @@ def _choose_verb(
     practical ceiling ArcGIS Server / IIS / common WAFs enforce for
     ``GET`` query strings):
 
-    * ``len(url) + len(urlencode(body)) <= limit`` → ``GET`` — idempotent,
-      cache-friendly, byte-for-byte equivalent to today's short-body GETs.
+    * ``len(url) + len(canonical query string) <= limit`` → ``GET`` — idempotent,
+      cache-friendly.
     * Anything larger → ``POST`` — restgdf will never emit a request that
       a real server will refuse with 414 URI Too Long.
 
     ``body`` is accepted as any mapping (or ``None``). The helper never
-    mutates the mapping; it only measures its encoded size. A ``None``
-    or empty body short-circuits to ``GET`` immediately.
+    mutates the mapping; it only measures the size of its canonical
+    encoding (:mod:`restgdf.utils._canonical`), which is what a ``GET``
+    sends. A ``None`` or empty body short-circuits to ``GET`` immediately.
     """
-    encoded_len = _encoded_body_length(body)
+    encoded_len = len(_canonical_query_string(body)) if body else 0
     # Account for the "?" separator that aiohttp would add between the
     # URL path and the query string in a GET request.
     separator = 1 if encoded_len else 0
@@ -106,6 +114,8 @@ async def _arcgis_request(
     session: Any,
     url: str,
     body: Mapping[str, object] | None,
+    *,
+    template: RequestTemplate | None = None,
     **kwargs: Any,
 ) -> Any:
     """Issue an ArcGIS request using the verb selected by :func:`_choose_verb`.
@@ -113,13 +123,16 @@ async def _arcgis_request(
     T8 (R-74): centralizes the GET-vs-POST decision so every ArcGIS call
     site participates in length-based routing.
 
-    * ``GET`` → ``session.get(url, params=body, **kwargs)``
+    * ``GET`` → ``session.get(url, params=_canonical_query(body), **kwargs)``
     * ``POST`` → ``session.post(url, data=body, **kwargs)``
 
-    ``body`` is forwarded untouched; the helper never injects or removes
-    keys. Any extra ``kwargs`` (``headers``, ``timeout``, ``ssl`` …) are
-    passed through to the underlying session call verbatim so request
-    semantics stay byte-for-byte identical below the verb switch.
+    A ``GET`` query string is canonical (sorted keys, normalized values;
+    see :mod:`restgdf.utils._canonical`), so the same question always
+    produces the same URL for CDNs and HTTP caches. Apart from
+    ``cacheHint`` (below) the helper never injects or removes keys. Any
+    extra ``kwargs`` (``headers``, ``timeout``, ``ssl`` …) are passed
+    through to the underlying session call verbatim so request semantics
+    stay byte-for-byte identical below the verb switch.
 
     **Credential safety (Gate-3 fix).** ``ArcGISTokenSession`` configured
     with ``transport="body"`` or ``transport="query"`` injects the
@@ -140,16 +153,146 @@ async def _arcgis_request(
     forces ``POST`` whenever the outgoing ``body`` carries a ``token``
     key, regardless of session transport. This complements (does not
     replace) the session-transport guard.
+
+    **Priority.** Under an active :class:`~restgdf.FairScheduler` the call
+    takes a slot at its :mod:`priority class <restgdf._client._priority>`
+    rank, so metadata and count requests are served ahead of queued page
+    fetches. Inside a fan-out slot already held this is a no-op.
+
+    **Deadline.** Inside a :func:`restgdf.deadline` scope the request is
+    not started once the deadline has passed, its ``timeout`` is clamped
+    to the time remaining, and a timeout that fires at the deadline
+    surfaces as :class:`~restgdf.errors.DeadlineExceededError`.
+
+    **cacheHint.** With ``TransportConfig.cache_hint`` (env
+    ``RESTGDF_TRANSPORT_CACHE_HINT``), anonymous ``/query`` requests --
+    no ``token`` in the body and no credentials on the session -- carry
+    ``cacheHint=true``, which lets ArcGIS Online / Enterprise serve them
+    from its edge cache. Authenticated requests are never marked.
+
+    **Templates.** A page sent by a
+    :class:`~restgdf.utils._template.RequestTemplate` takes its priority,
+    verb and pre-encoded ``GET`` URL from the template, which settled the
+    ``cacheHint``, token-transport and shared-body work once per stream.
+
+    **Response cache.** Under an active :class:`~restgdf.ResponseCache`,
+    requests of its enabled operation classes are answered from disk when
+    fresh, revalidated with ``If-None-Match`` / ``If-Modified-Since`` when
+    stale, and stored when new; the caller then gets a
+    :class:`~restgdf._client._buffered.BufferedResponse`.
     """
-    if _session_requires_body_transport(session) or (body and "token" in body):
-        return await session.post(url, data=body, **kwargs)
-    verb = _choose_verb(url, body=body)
+    _check_deadline(url)
+    priority = template.priority if template is not None else _rank(url=url, body=body)
+    try:
+        async with _scheduled(url, priority=priority):
+            # Re-checked after the scheduler slot: the wait may have used
+            # up what was left.
+            if _check_deadline(url) is not None:
+                kwargs["timeout"] = _clamped_timeout(kwargs.get("timeout"))
+            target = None
+            if template is not None:
+                verb, target = template._prepare(body or {})
+            else:
+                if get_config().transport.cache_hint:
+                    body = _with_cache_hint(session, url, body)
+                verb = _request_verb(session, url, body)
+            cache = _ACTIVE_RESPONSE_CACHE.get()
+            if cache is not None:
+                kind = _classify(url, body)
+                if kind in cache.kinds:
+                    return await _through_cache(
+                        cache,
+                        kind,
+                        session,
+                        verb,
+                        url,
+                        body,
+                        kwargs,
+                    )
+            if target is not None:
+                return await session.get(target, **kwargs)
+            return await _send(session, verb, url, body, **kwargs)
+    except TimeoutError as exc:
+        if isinstance(exc, DeadlineExceededError) or not _expired():
+            raise
+        raise _deadline_error(url) from exc
+
+
+async def _send(
+    session: Any,
+    verb: str,
+    url: str,
+    body: Mapping[str, object] | None,
+    **kwargs: Any,
+) -> Any:
     if verb == "GET":
-        params = _coerce_params_for_get(body) if body else body
+        params = _canonical_query(body) if body else body
         return await session.get(url, params=params, **kwargs)
     return await session.post(url, data=body, **kwargs)
 
 
+async def _through_cache(
+    cache: ResponseCache,
+    kind: str,
+    session: Any,
+    verb: str,
+    url: str,
+    body: Mapping[str, object] | None,
+    kwargs: dict[str, Any],
+) -> Any:
+    """Send one request through ``cache`` (see :mod:`restgdf._client._http_cache`)."""
+    public_body = dict(body or {})
+    token = public_body.pop("token", None)
+
+    async def send(conditional: Mapping[str, str]) -> Any:
+        send_kwargs = kwargs
+        if conditional:
+            send_kwargs = {
+                **kwargs,
+                "headers": {**(kwargs.get("headers") or {}), **conditional},
+            }
+        return await _send(session, verb, url, body, **send_kwargs)
+
+    return await cache._fetch(
+        kind,
+        verb=verb,
+        url=url,
+        canonical_body=_canonical_query_string(public_body),
+        scope=_auth_scope(session, token),
+        send=send,
+    )
+
+
+def _with_cache_hint(
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+) -> Mapping[str, object] | None:
+    """Return ``body`` with ``cacheHint=true`` if it is an anonymous query."""
+    if (
+        not url.rstrip("/").endswith("/query")
+        or (body and ("cacheHint" in body or "token" in body))
+        or _auth_scope(session, None) is not None
+    ):
+        return body
+    return {**(body or {}), "cacheHint": True}
+
+
+def _request_verb(
+    session: Any,
+    url: str,
+    body: Mapping[str, object] | None,
+) -> Literal["POST", "GET"]:
+    """Return the verb :func:`_arcgis_request` sends ``body`` to ``url`` with.
+
+    ``POST`` whenever a token would otherwise reach the URL (see the
+    credential-safety notes there), else :func:`_choose_verb`.
+    """
+    if _session_requires_body_transport(session) or (body and "token" in body):
+        return "POST"
+    return _choose_verb(url, body=body)
+
+
 def _session_requires_body_transport(session: Any) -> bool:
     """Return ``True`` if ``session`` (or any wrapped inner session)
     injects an auth token into the request payload rather than the
@@ -173,6 +316,33 @@ def _session_requires_body_transport(session: Any) -> bool:
     return False
 
 
+def _digest(secret: Any) -> str:
+    return hashlib.sha256(str(secret).encode()).hexdigest()
+
+
+def _auth_scope(session: Any, token: Any) -> str | None:
+    """Return who a request is made as, without exposing any credential."""
+    parts: list[str] = []
+    if token:
+        parts.append(f"token:{_digest(token)}")
+    current: Any = session
+    seen: set[int] = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        credentials = _safe_static_attr_value(current, "credentials")
+        if credentials is not None:
+            token_url = _safe_static_attr_value(current, "token_url")
+            username = getattr(credentials, "username", None)
+            parts.append(f"user:{username}@{token_url}")
+            break
+        session_token = _safe_static_attr_value(current, "token")
+        if isinstance(session_token, str) and session_token:
+            parts.append(f"session-token:{_digest(session_token)}")
+            break
+        current = _safe_static_attr_value(current, "_inner")
+    return "|".join(parts) or None
+
+
 def _safe_static_attr_value(obj: Any, name: str) -> Any:
     """Read an attribute without fabricating mock children.
 
@@ -192,31 +362,6 @@ def _safe_static_attr_value(obj: Any, name: str) -> Any:
     return value
 
 
-def _coerce_params_for_get(
-    body: Mapping[str, object],
-) -> dict[str, Any]:
-    """Return ``body`` with values normalized for ``session.get(params=...)``.
-
-    ``yarl`` (aiohttp's URL builder) rejects :class:`bool` and ``None``
-    values in query params with :class:`TypeError`, while the equivalent
-    ``session.post(data=...)`` path serializes them happily via
-    :func:`urllib.parse.urlencode`. T8 (R-74) routes the same ArcGIS
-    payloads through either verb, so this helper keeps the GET path
-    byte-for-byte equivalent to what ArcGIS Server sees today:
-    booleans become lowercase ``"true"``/``"false"`` (ArcGIS's own wire
-    convention) and ``None`` becomes an empty string.
-    """
-    coerced: dict[str, Any] = {}
-    for key, value in body.items():
-        if isinstance(value, bool):
-            coerced[key] = "true" if value else "false"
-        elif value is None:
-            coerced[key] = ""
-        else:
-            coerced[key] = value
-    return coerced
-
-
 def default_timeout(settings: Any | None = None) -> aiohttp.ClientTimeout:
     """Return an :class:`aiohttp.ClientTimeout` driven by restgdf config.
 
@@ -0,0 +1,318 @@
+"""Streaming client-side aggregation for :meth:`FeatureLayer.aggregate`.
+
+Private submodule; :func:`aggregate_batches` is re-exported by
+``restgdf.utils.getinfo``.
+
+Computes the same :class:`~restgdf.Statistic` results as a server-side
+``outStatistics`` query, from feature batches as they stream in (e.g.
+:meth:`~restgdf.FeatureLayer.stream_feature_batches`). Rows are folded
+into one accumulator per group and statistic and then dropped, so memory
+grows with the number of groups, never with the number of rows:
+
+* ``count``, ``sum``, ``min``, ``max`` and ``avg`` are exact.
+* ``stddev`` and ``var`` are exact sample statistics (Welford's method).
+* ``percentile_cont`` / ``percentile_disc`` come from a
+  :class:`~restgdf.utils._sketches.TDigest`: exact up to 500 values per
+  group, approximate beyond.
+* ``count_distinct`` (local only) comes from a
+  :class:`~restgdf.utils._sketches.HyperLogLog`, ~1.6% standard error.
+
+Nulls are skipped, as in SQL aggregates.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import AsyncIterable, Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from restgdf.utils._optional import require_pandas_dataframe
+from restgdf.utils._sketches import HyperLogLog, TDigest
+from restgdf.utils._stats import (
+    Statistic,
+    StatisticsSpec,
+    _as_statistics,
+    _field_list,
+    _records_to_frame,
+)
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class _Accumulator:
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+
+    def result(self) -> Any:
+        return self.count
+
+
+class _Sum(_Accumulator):
+    __slots__ = ("total",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.total = 0
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        self.total += value
+
+    def result(self) -> Any:
+        return self.total if self.count else None
+
+
+class _Mean(_Sum):
+    __slots__ = ()
+
+    def result(self) -> Any:
+        return self.total / self.count if self.count else None
+
+
+class _Extreme(_Accumulator):
+    __slots__ = ("largest", "value")
+
+    def __init__(self, largest: bool) -> None:
+        super().__init__()
+        self.largest = largest
+        self.value: Any = None
+
+    def add(self, value: Any) -> None:
+        if not self.count:
+            self.value = value
+        elif value > self.value if self.largest else value < self.value:
+            self.value = value
+        self.count += 1
+
+    def result(self) -> Any:
+        return self.value
+
+
+class _Spread(_Accumulator):
+    """Welford's running variance."""
+
+    __slots__ = ("m2", "mean", "root")
+
+    def __init__(self, root: bool) -> None:
+        super().__init__()
+        self.root = root
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def result(self) -> Any:
+        if self.count < 2:
+            return None
+        variance = self.m2 / (self.count - 1)
+        return math.sqrt(variance) if self.root else variance
+
+
+class _Percentile(_Accumulator):
+    __slots__ = ("digest", "discrete", "q")
+
+    def __init__(self, spec: Statistic) -> None:
+        super().__init__()
+        self.digest = TDigest()
+        self.discrete = spec.statistic == "percentile_disc"
+        percentile = spec.percentile or 0.0
+        self.q = 1 - percentile if spec.descending else percentile
+
+    def add(self, value: Any) -> None:
+        self.digest.add(value)
+
+    def result(self) -> Any:
+        return self.digest.quantile(self.q, discrete=self.discrete)
+
+
+class _Distinct(_Accumulator):
+    __slots__ = ("sketch",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sketch = HyperLogLog()
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        self.sketch.add(value)
+
+    def result(self) -> Any:
+        return self.sketch.estimate() if self.count else 0
+
+
+def _accumulator(spec: Statistic) -> _Accumulator:
+    kind = spec.statistic
+    if kind == "count":
+        return _Accumulator()
+    if kind == "sum":
+        return _Sum()
+    if kind == "avg":
+        return _Mean()
+    if kind in ("min", "max"):
+        return _Extreme(largest=kind == "max")
+    if kind in ("stddev", "var"):
+        return _Spread(root=kind == "stddev")
+    if kind == "count_distinct":
+        return _Distinct()
+    return _Percentile(spec)
+
+
+def _parse_order_by(
+    order_by: str | Sequence[str] | None,
+    columns: Sequence[str],
+) -> list[tuple[str, bool]]:
+    """Parse ``"col [ASC|DESC], ..."`` against the output ``columns``."""
+    lookup = {column.lower(): column for column in columns}
+    terms: list[tuple[str, bool]] = []
+    for term in _field_list(order_by):
+        for part in term.split(","):
+            name, _, direction = part.strip().partition(" ")
+            direction = direction.strip().upper() or "ASC"
+            if name.lower() not in lookup or direction not in ("ASC", "DESC"):
+                raise ValueError(
+                    f"order_by term {part.strip()!r} must be an output column "
+                    f"({', '.join(columns)}) optionally followed by ASC or DESC",
+                )
+            terms.append((lookup[name.lower()], direction == "DESC"))
+    return terms
+
+
+def _sort_rows(
+    rows: list[dict[str, Any]],
+    terms: list[tuple[str, bool]],
+) -> list[dict[str, Any]]:
+    # Stable sorts from the last key to the first; nulls sort last.
+    for column, descending in reversed(terms):
+        present = [row for row in rows if row[column] is not None]
+        missing = [row for row in rows if row[column] is None]
+        present.sort(key=lambda row: row[column], reverse=descending)
+        rows = present + missing
+    return rows
+
+
+class LocalAggregator:
+    """Fold feature attributes into grouped :class:`~restgdf.Statistic` results.
+
+    Parameters
+    ----------
+    statistics : iterable of Statistic, or mapping
+        As for :meth:`restgdf.FeatureLayer.aggregate`.
+    group_by : str or sequence of str, optional
+        Group-by fields.
+    """
+
+    __slots__ = ("_groups", "group_fields", "statistics")
+
+    def __init__(
+        self,
+        statistics: StatisticsSpec,
+        group_by: str | Sequence[str] | None = None,
+    ) -> None:
+        self.statistics = _as_statistics(statistics)
+        self.group_fields = _field_list(group_by)
+        self._groups: dict[tuple, list[_Accumulator]] = {}
+        if not self.group_fields:
+            self._groups[()] = [_accumulator(spec) for spec in self.statistics]
+
+    def add(self, features: Iterable[Mapping[str, Any]]) -> None:
+        """Fold a batch of features (or plain attribute dicts) in."""
+        groups = self._groups
+        group_fields = self.group_fields
+        fields = [spec.field for spec in self.statistics]
+        for feature in features:
+            attributes = feature.get("attributes", feature)
+            key = tuple(attributes.get(field) for field in group_fields)
+            accumulators = groups.get(key)
+            if accumulators is None:
+                accumulators = [_accumulator(spec) for spec in self.statistics]
+                groups[key] = accumulators
+            for field, accumulator in zip(fields, accumulators):
+                value = attributes.get(field)
+                if value is not None:
+                    accumulator.add(value)
+
+    def rows(
+        self,
+        order_by: str | Sequence[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return one row per group, in first-seen order unless ``order_by``.
+
+        ``order_by`` takes output columns with an optional ``ASC``/``DESC``,
+        as in ``orderByFields``.
+        """
+        names = [spec.out_name for spec in self.statistics]
+        rows = [
+            {
+                **dict(zip(self.group_fields, key)),
+                **{
+                    name: accumulator.result()
+                    for name, accumulator in zip(names, accumulators)
+                },
+            }
+            for key, accumulators in self._groups.items()
+        ]
+        terms = _parse_order_by(order_by, [*self.group_fields, *names])
+        return _sort_rows(rows, terms) if terms else rows
+
+
+async def aggregate_batches(
+    batches: AsyncIterable[Iterable[Mapping[str, Any]]]
+    | Iterable[Iterable[Mapping[str, Any]]],
+    statistics: StatisticsSpec,
+    group_by: str | Sequence[str] | None = None,
+    *,
+    order_by: str | Sequence[str] | None = None,
+    as_frame: bool = False,
+) -> list[dict[str, Any]] | DataFrame:
+    """Aggregate streamed feature batches locally.
+
+    Parameters
+    ----------
+    batches : async iterable or iterable of feature lists
+        E.g. :meth:`restgdf.FeatureLayer.stream_feature_batches`. Features
+        may be ArcGIS feature dicts or plain attribute dicts.
+    statistics, group_by, order_by, as_frame
+        As for :meth:`restgdf.FeatureLayer.aggregate`; ``order_by`` names
+        output columns. There is no ``having``: filter the returned rows.
+
+    Returns
+    -------
+    list of dict or DataFrame
+        One row per group: the group-by fields, then the statistics.
+    """
+    if as_frame:
+        require_pandas_dataframe("aggregate_batches(as_frame=True)")
+    aggregator = LocalAggregator(statistics, group_by)
+    columns = [
+        *aggregator.group_fields,
+        *(spec.out_name for spec in aggregator.statistics),
+    ]
+    # Validate order_by before consuming the stream.
+    _parse_order_by(order_by, columns)
+    if isinstance(batches, AsyncIterable):
+        async for batch in batches:
+            aggregator.add(batch)
+    else:
+        for batch in batches:
+            aggregator.add(batch)
+    rows = aggregator.rows(order_by)
+    if not as_frame:
+        return rows
+    return _records_to_frame(
+        rows,
+        feature="aggregate_batches(as_frame=True)",
+        columns=columns,
+    )
+
+
+__all__ = ["LocalAggregator", "aggregate_batches"]
@@ -84,6 +84,43 @@ def supports_pagination_explicitly(metadata: LayerMetadataLike) -> bool:
     return metadata.get("supportsPagination") is True
 
 
+def supports_statistics(
+    metadata: LayerMetadataLike,
+    *,
+    percentiles: bool = False,
+) -> bool:
+    """Return whether the layer answers ``outStatistics`` queries.
+
+    With ``percentiles=True``, also require ``supportsPercentileStatistics``.
+    Layers that do not advertise a flag are assumed to support it.
+    """
+    metadata = _as_dict(metadata)
+    advanced_query_capabilities = metadata.get("advancedQueryCapabilities") or {}
+    keys = ["supportsStatistics"]
+    if percentiles:
+        keys.append("supportsPercentileStatistics")
+    for key in keys:
+        if key in advanced_query_capabilities:
+            if advanced_query_capabilities[key] is False:
+                return False
+        elif metadata.get(key) is False:
+            return False
+    return True
+
+
+def supports_advanced_queries(metadata: LayerMetadataLike) -> bool:
+    """Return whether the layer honours ``orderByFields`` on queries.
+
+    Layers that do not advertise ``supportsAdvancedQueries`` are assumed
+    to support it.
+    """
+    metadata = _as_dict(metadata)
+    advanced_query_capabilities = metadata.get("advancedQueryCapabilities") or {}
+    if "supportsAdvancedQueries" in advanced_query_capabilities:
+        return advanced_query_capabilities["supportsAdvancedQueries"] is not False
+    return metadata.get("supportsAdvancedQueries") is not False
+
+
 def get_object_id_field(metadata: LayerMetadataLike) -> str:
     """Get the object id field name for a layer."""
     metadata = _as_dict(metadata)
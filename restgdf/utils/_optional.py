@@ -50,6 +50,11 @@ def require_pyogrio(feature: str) -> ModuleType:
     return _import_optional_module("pyogrio", feature)
 
 
+def require_shapely(feature: str) -> ModuleType:
+    """Return the optional ``shapely`` module for local geometry predicates."""
+    return _import_optional_module("shapely", feature)
+
+
 def require_geo_stack(feature: str) -> None:
     """Validate that the full geo dependency stack is importable."""
     require_pandas(feature)
@@ -0,0 +1,202 @@
+"""Page-granular retry for paginated reads.
+
+Private submodule. :class:`PageRetryPolicy` is re-exported from the
+top-level ``restgdf`` package; :func:`_run_page_attempts` is consumed by
+:mod:`restgdf.utils.getgdf` only.
+
+The transport retry in :class:`restgdf.resilience.ResilientSession` retries
+the *request*; this layer retries the *page*. A page attempt covers the
+whole unit of work -- dispatch, body read and decode -- so a connection
+reset halfway through a large ``f=json`` body, or a truncated body that no
+longer parses, is retried here even though the transport layer already
+handed back a ``200``. It has its own attempt count and wall-clock budget
+and needs no optional dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import aiohttp
+
+from restgdf._logging import build_log_extra, get_logger
+from restgdf.utils._deadline import _deadline_error, _expired, _remaining
+from restgdf.utils._retry_budget import RetryBudget
+from restgdf.errors import (
+    AuthenticationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RateLimitError,
+    RestgdfResponseError,
+    TransportError,
+)
+
+_LOG = get_logger("pagination")
+
+# Same retryable set as the resilience layer's transport retry.
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageRetryPolicy:
+    """Retry policy for individual pages of a paginated read.
+
+    Attributes
+    ----------
+    max_attempts : int
+        Total attempts per page, including the first. Defaults to ``3``.
+    budget_s : float
+        Wall-clock budget per page across all attempts. A retry whose
+        backoff would end past the budget is not started. Defaults to
+        ``120.0``.
+    wait_initial_s : float
+        Backoff before the second attempt; doubles per attempt. Defaults
+        to ``1.0``.
+    wait_max_s : float
+        Upper bound on a single backoff. Defaults to ``30.0``.
+    wait_jitter_s : float
+        Uniform random jitter added to each backoff. Defaults to ``0.5``.
+    """
+
+    max_attempts: int = 3
+    budget_s: float = 120.0
+    wait_initial_s: float = 1.0
+    wait_max_s: float = 30.0
+    wait_jitter_s: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError(
+                f"max_attempts must be >= 1, got {self.max_attempts!r}",
+            )
+        for name in ("budget_s", "wait_initial_s", "wait_max_s", "wait_jitter_s"):
+            value = getattr(self, name)
+            if value < 0:
+                raise ValueError(f"{name} must be >= 0, got {value!r}")
+
+    def backoff(self, attempt: int) -> float:
+        """Return the wait before attempt ``attempt + 1`` (``attempt`` >= 1)."""
+        base = min(self.wait_max_s, self.wait_initial_s * 2 ** (attempt - 1))
+        return base + random.uniform(0, self.wait_jitter_s)
+
+
+def _is_retryable_page_error(exc: BaseException) -> bool:
+    """Return ``True`` when a failed page is worth fetching again.
+
+    Retryable: transport failures (including exhausted resilience retries),
+    aiohttp connection/payload errors raised while reading the body,
+    timeouts, bodies that do not decode as JSON (truncated or HTML error
+    pages), and response errors carrying a 429/5xx status. Authentication
+    failures, validated ArcGIS error envelopes,
+    :class:`~restgdf.errors.CircuitOpenError` (the service is known to be
+    down; fail the page fast) and
+    :class:`~restgdf.errors.DeadlineExceededError` are not retried.
+    """
+    if isinstance(
+        exc,
+        (AuthenticationError, CircuitOpenError, DeadlineExceededError),
+    ):
+        return False
+    if isinstance(
+        exc,
+        (TransportError, aiohttp.ClientError, TimeoutError, json.JSONDecodeError),
+    ):
+        return True
+    if isinstance(exc, RestgdfResponseError):
+        return exc.status_code in _RETRYABLE_STATUS
+    return False
+
+
+async def _run_page_attempts(
+    call: Callable[[], Awaitable[T]],
+    policy: PageRetryPolicy | None,
+    *,
+    url: str,
+    batch_index: int,
+    budget: RetryBudget | None = None,
+) -> tuple[T | None, Exception | None, int]:
+    """Run ``call`` under ``policy`` and return ``(result, error, attempts)``.
+
+    ``call`` must return a fresh awaitable per invocation. Exactly one of
+    ``result``/``error`` is meaningful: ``error`` is ``None`` on success.
+    A ``None`` policy makes a single attempt. Non-:class:`Exception`
+    failures (cancellation) propagate unchanged. A shared ``budget`` is
+    credited with the page's first attempt and must grant every retry.
+    Under a :func:`restgdf.deadline` scope a retry whose backoff would end
+    past the deadline is not started, and a body read that timed out at
+    the deadline is reported as :class:`~restgdf.errors.DeadlineExceededError`.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    attempt = 0
+    if budget is not None:
+        budget.record_attempt()
+    while True:
+        attempt += 1
+        try:
+            return await call(), None, attempt
+        except Exception as exc:
+            if (
+                isinstance(exc, TimeoutError)
+                and not isinstance(exc, DeadlineExceededError)
+                and _expired()
+            ):
+                deadline_exc = _deadline_error(url)
+                deadline_exc.__cause__ = exc
+                exc = deadline_exc
+            if (
+                policy is None
+                or attempt >= policy.max_attempts
+                or not _is_retryable_page_error(exc)
+            ):
+                return None, exc, attempt
+            delay = policy.backoff(attempt)
+            if isinstance(exc, RateLimitError) and exc.retry_after:
+                delay = max(delay, min(exc.retry_after, policy.wait_max_s))
+            remaining = _remaining()
+            if loop.time() - started + delay > policy.budget_s or (
+                remaining is not None and delay >= remaining
+            ):
+                _LOG.debug(
+                    "page retry budget exhausted for batch %d of url=%s",
+                    batch_index,
+                    url,
+                    extra=build_log_extra(
+                        operation="page_retry",
+                        page_index=batch_index,
+                        retry_attempt=attempt,
+                        exception_type=type(exc).__name__,
+                    ),
+                )
+                return None, exc, attempt
+            if budget is not None and not budget.try_retry(
+                cause=type(exc).__name__,
+            ):
+                return None, exc, attempt
+            _LOG.debug(
+                "retrying page %d of url=%s in %.2fs after %s (attempt %d/%d)",
+                batch_index,
+                url,
+                delay,
+                type(exc).__name__,
+                attempt,
+                policy.max_attempts,
+                extra=build_log_extra(
+                    operation="page_retry",
+                    page_index=batch_index,
+                    retry_attempt=attempt,
+                    retry_delay_s=delay,
+                    exception_type=type(exc).__name__,
+                ),
+            )
+            await asyncio.sleep(delay)
+
+
+__all__ = ["PageRetryPolicy"]
@@ -51,7 +51,8 @@ class PaginationPlan:
     batches : tuple
         Tuple of ``(resultOffset, resultRecordCount)`` pairs. Empty
         when ``total_records == 0``. Last pair's count may be less
-        than ``effective_page_size`` (partial tail page).
+        than ``effective_page_size`` (partial tail page) unless the plan
+        was built ``aligned``.
     """
 
     total_records: int
@@ -67,6 +68,7 @@ def build_pagination_plan(
     *,
     factor: float = _DEFAULT_FACTOR,
     advertised_factor: float | None = None,
+    aligned: bool = False,
 ) -> PaginationPlan:
     """Compute a :class:`PaginationPlan` for ``total_records`` rows.
 
@@ -86,6 +88,12 @@ def build_pagination_plan(
         bound. When provided and ``factor > advertised_factor``, the
         factor is clamped down and a single warning is logged under
         ``restgdf.pagination``.
+    aligned : bool, optional
+        Request ``effective_page_size`` records in every batch, the tail
+        included (the server returns what is left). Each batch's
+        ``(resultOffset, resultRecordCount)`` then depends only on its
+        position, not on ``total_records``, so its request stays
+        identical -- and cacheable -- while the layer grows.
 
     Raises
     ------
@@ -117,7 +125,14 @@ def build_pagination_plan(
         batches: tuple[tuple[int, int], ...] = ()
     else:
         batches = tuple(
-            (offset, min(effective_page_size, total_records - offset))
+            (
+                offset,
+                (
+                    effective_page_size
+                    if aligned
+                    else min(effective_page_size, total_records - offset)
+                ),
+            )
             for offset in range(0, total_records, effective_page_size)
         )
 
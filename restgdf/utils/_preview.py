@@ -0,0 +1,404 @@
+"""Cheap previews of a layer for :meth:`FeatureLayer.head_gdf` / ``sample_gdf``.
+
+Private submodule; consumed by :mod:`restgdf.featurelayer.featurelayer`.
+
+Neither preview lists the layer's object ids up front, which is a scan of
+the whole layer:
+
+* :func:`head_gdf` is one ``resultRecordCount=n`` query ordered by object
+  id.
+* :func:`sample_gdf` reads the object id range with one ``outStatistics``
+  query, draws random ids inside it and fetches the ones that exist with
+  ``<oid> IN (...)`` probes. Object ids are usually dense, so a sample
+  costs two round trips however large the layer is. Sparse ids take a few
+  more probes; after :data:`_PROBE_ROUNDS` of them the remaining draws come
+  from the ``returnIdsOnly`` id list instead.
+
+Every feature is equally likely to be sampled either way, and a ``seed``
+makes the draws reproducible.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from restgdf._compat import aclosing
+from restgdf._config import get_config
+from restgdf._client._priority import _rank
+from restgdf._logging import _scrub_url, build_log_extra, get_logger
+from restgdf.errors import FieldDoesNotExistError, RestgdfResponseError
+from restgdf.utils._concurrency import bounded_map
+from restgdf.utils._http import default_data
+from restgdf.utils._stats import Statistic
+from restgdf.utils.getgdf import (
+    _apply_spatial_reference_attr,
+    _extract_raw_spatial_reference,
+    combine_where_clauses,
+    concat_gdfs,
+    get_sub_gdf,
+)
+from restgdf.utils.getinfo import (
+    aggregate,
+    get_max_record_count,
+    get_object_ids,
+    supports_pagination,
+    supports_statistics,
+)
+from restgdf.utils.utils import where_var_in_list
+
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+
+    from restgdf._client._protocols import AsyncHTTPSession
+    from restgdf._models.responses import LayerMetadata
+
+#: Random-probe rounds before sampling falls back to ``returnIdsOnly``.
+_PROBE_ROUNDS = 3
+#: Extra ids drawn per probe, on top of the expected hit rate.
+_OVERSAMPLE = 1.25
+#: Page size when the layer metadata does not advertise one.
+_DEFAULT_PAGE = 1000
+
+
+def _page_size(metadata: LayerMetadata | Mapping[str, Any] | None) -> int:
+    if metadata is None:
+        return _DEFAULT_PAGE
+    try:
+        return get_max_record_count(metadata) or _DEFAULT_PAGE
+    except FieldDoesNotExistError:
+        return _DEFAULT_PAGE
+
+
+def _check_n(n: int) -> None:
+    if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+        raise ValueError(f"n must be a positive integer, got {n!r}")
+
+
+def _ordered_by(data: dict[str, Any], object_id_field: str) -> dict[str, Any]:
+    # A caller-supplied order (any key casing) wins, as for paged reads.
+    if any(key.lower() == "orderbyfields" for key in data):
+        return data
+    return {**data, "orderByFields": f"{object_id_field} ASC"}
+
+
+async def _fetch_all(
+    url: str,
+    session: AsyncHTTPSession,
+    batches: list[dict[str, Any]],
+    **kwargs,
+) -> list[GeoDataFrame]:
+    """Fetch ``batches`` concurrently, in order, tolerating short pages."""
+    if len(batches) == 1:
+        return [
+            await get_sub_gdf(
+                url,
+                session,
+                batches[0],
+                allow_truncated=True,
+                **kwargs,
+            ),
+        ]
+    async with aclosing(
+        bounded_map(
+            lambda query_data: get_sub_gdf(
+                url,
+                session,
+                query_data,
+                allow_truncated=True,
+                **kwargs,
+            ),
+            batches,
+            limit=get_config().concurrency.max_concurrent_requests,
+            flow=url,
+            priority=_rank("pages"),
+        ),
+    ) as pages:
+        return [page async for page in pages]
+
+
+async def _fetch_ids(
+    url: str,
+    session: AsyncHTTPSession,
+    object_ids: list[int],
+    *,
+    object_id_field: str,
+    page_size: int,
+    **kwargs,
+) -> list[GeoDataFrame]:
+    """Fetch the features whose object id is in ``object_ids``."""
+    data = default_data(kwargs.get("data"))
+    base_where = data.get("where")
+    batches = [
+        {
+            **data,
+            "where": combine_where_clauses(
+                base_where,
+                where_var_in_list(object_id_field, object_ids[i : i + page_size]),
+            ),
+        }
+        for i in range(0, len(object_ids), page_size)
+    ]
+    return await _fetch_all(url, session, batches, **kwargs)
+
+
+async def _finish(
+    frames: list[GeoDataFrame],
+    url: str,
+    session: AsyncHTTPSession,
+    metadata: LayerMetadata | Mapping[str, Any] | None,
+    **kwargs,
+) -> GeoDataFrame:
+    """Concatenate the non-empty ``frames`` and stamp the spatial reference."""
+    gdf = await concat_gdfs([frame for frame in frames if len(frame)] or frames[:1])
+    if metadata is None:
+        await _apply_spatial_reference_attr(gdf, url, session, **kwargs)
+    else:
+        raw_sr = _extract_raw_spatial_reference(metadata)
+        if raw_sr is not None:
+            gdf.attrs["spatial_reference"] = raw_sr
+    return gdf
+
+
+async def head_gdf(
+    url: str,
+    session: AsyncHTTPSession,
+    n: int,
+    *,
+    object_id_field: str,
+    metadata: LayerMetadata | Mapping[str, Any] | None = None,
+    **kwargs,
+) -> GeoDataFrame:
+    """Return the first ``n`` features by object id.
+
+    Parameters
+    ----------
+    url : str
+        Layer URL.
+    session : AsyncHTTPSession
+        HTTP session.
+    n : int
+        Number of features.
+    object_id_field : str
+        The layer's object id field.
+    metadata : LayerMetadata or mapping, optional
+        Layer metadata, for ``maxRecordCount``, pagination support and the
+        spatial reference; fetched for the spatial reference when omitted.
+    **kwargs
+        Request kwargs; ``data`` supplies ``where``, ``outFields`` etc.
+
+    Returns
+    -------
+    GeoDataFrame
+        Up to ``n`` features. ``n <= maxRecordCount`` costs one query;
+        larger heads fetch ``ceil(n / maxRecordCount)`` pages concurrently.
+    """
+    _check_n(n)
+    data = _ordered_by(default_data(kwargs.get("data")), object_id_field)
+    page_size = _page_size(metadata)
+    if n <= page_size:
+        frames = await _fetch_all(
+            url,
+            session,
+            [{**data, "resultRecordCount": n}],
+            **kwargs,
+        )
+        # Servers without pagination ignore resultRecordCount.
+        frames = [frames[0].iloc[:n]]
+    elif metadata is None or supports_pagination(metadata):
+        batches = [
+            {
+                **data,
+                "resultOffset": offset,
+                "resultRecordCount": min(page_size, n - offset),
+            }
+            for offset in range(0, n, page_size)
+        ]
+        frames = await _fetch_all(url, session, batches, **kwargs)
+    else:
+        _, object_ids = await get_object_ids(url, session, **kwargs)
+        frames = await _fetch_ids(
+            url,
+            session,
+            sorted(object_ids)[:n],
+            object_id_field=object_id_field,
+            page_size=page_size,
+            **kwargs,
+        )
+    return await _finish(frames, url, session, metadata, **kwargs)
+
+
+def _draw(
+    rng: random.Random,
+    low: int,
+    high: int,
+    k: int,
+    tried: set[int],
+) -> list[int]:
+    """Draw ``k`` ids from ``[low, high]`` not yet in ``tried``; mark them."""
+    untried = high - low + 1 - len(tried)
+    if 2 * k >= untried:
+        picks = rng.sample(
+            [oid for oid in range(low, high + 1) if oid not in tried],
+            min(k, untried),
+        )
+        tried.update(picks)
+        return picks
+    picks = []
+    while len(picks) < k:
+        oid = rng.randint(low, high)
+        if oid not in tried:
+            tried.add(oid)
+            picks.append(oid)
+    return picks
+
+
+async def _object_id_bounds(
+    url: str,
+    session: AsyncHTTPSession,
+    object_id_field: str,
+    metadata: LayerMetadata | Mapping[str, Any] | None,
+    **kwargs,
+) -> tuple[int, int, int] | None:
+    """Return ``(min, max, count)`` of the matching object ids, or ``None``."""
+    if metadata is not None and not supports_statistics(metadata):
+        return None
+    try:
+        rows = await aggregate(
+            url,
+            [
+                Statistic("min", object_id_field, "low"),
+                Statistic("max", object_id_field, "high"),
+                Statistic("count", object_id_field, "count"),
+            ],
+            session,
+            **kwargs,
+        )
+    except (RestgdfResponseError, TimeoutError) as exc:
+        get_logger("pagination").warning(
+            "object id statistics on url=%s failed (%s); sampling from the "
+            "object id list instead",
+            _scrub_url(url),
+            type(exc).__name__,
+            extra=build_log_extra(
+                operation="sample_fallback",
+                exception_type=type(exc).__name__,
+            ),
+        )
+        return None
+    row = rows[0] if rows else {}
+    count = int(row.get("count") or 0)
+    if not count:
+        return 0, 0, 0
+    return int(row["low"]), int(row["high"]), count
+
+
+async def sample_gdf(
+    url: str,
+    session: AsyncHTTPSession,
+    n: int,
+    *,
+    object_id_field: str,
+    seed: int | None = None,
+    metadata: LayerMetadata | Mapping[str, Any] | None = None,
+    **kwargs,
+) -> GeoDataFrame:
+    """Return ``n`` features drawn uniformly at random without replacement.
+
+    Parameters
+    ----------
+    url, session, object_id_field, metadata, **kwargs
+        As for :func:`head_gdf`.
+    n : int
+        Number of features.
+    seed : int, optional
+        Seed for the id draws. The same seed against the same data picks
+        the same features.
+
+    Returns
+    -------
+    GeoDataFrame
+        ``min(n, <matching features>)`` features.
+    """
+    _check_n(n)
+    rng = random.Random(seed)
+    page_size = _page_size(metadata)
+    bounds = await _object_id_bounds(
+        url,
+        session,
+        object_id_field,
+        metadata,
+        **kwargs,
+    )
+    tried: set[int] = set()
+    frames: list[GeoDataFrame] = []
+    found = 0
+    if bounds is not None:
+        low, high, count = bounds
+        if not count or n >= count:
+            # Nothing to choose between: the head is the whole selection.
+            return await head_gdf(
+                url,
+                session,
+                max(count, 1),
+                object_id_field=object_id_field,
+                metadata=metadata,
+                **kwargs,
+            )
+        span = high - low + 1
+        density = count / span
+        for _ in range(_PROBE_ROUNDS):
+            need = n - found
+            if need <= 0 or len(tried) == span:
+                break
+            want = min(
+                math.ceil(need / density * _OVERSAMPLE),
+                max(need, page_size),
+            )
+            picks = _draw(rng, low, high, want, tried)
+            probed = await _fetch_ids(
+                url,
+                session,
+                picks,
+                object_id_field=object_id_field,
+                page_size=page_size,
+                **kwargs,
+            )
+            frames.extend(probed)
+            found += sum(len(frame) for frame in probed)
+            density = max(found, 1) / len(tried)
+    if found < n and (bounds is None or len(tried) < bounds[1] - bounds[0] + 1):
+        _, object_ids = await get_object_ids(url, session, **kwargs)
+        remaining = [oid for oid in object_ids if oid not in tried]
+        picks = rng.sample(remaining, min(n - found, len(remaining)))
+        if picks:
+            frames.extend(
+                await _fetch_ids(
+                    url,
+                    session,
+                    picks,
+                    object_id_field=object_id_field,
+                    page_size=page_size,
+                    **kwargs,
+                ),
+            )
+    if not frames:
+        # An empty selection; the head query still returns the schema.
+        return await head_gdf(
+            url,
+            session,
+            1,
+            object_id_field=object_id_field,
+            metadata=metadata,
+            **kwargs,
+        )
+    gdf = await _finish(frames, url, session, metadata, **kwargs)
+    if len(gdf) > n:
+        keep = sorted(rng.sample(range(len(gdf)), n))
+        gdf = gdf.iloc[keep].reset_index(drop=True)
+    return gdf
+
+
+__all__ = ["head_gdf", "sample_gdf"]
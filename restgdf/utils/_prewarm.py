@@ -0,0 +1,83 @@
+"""Connection pre-warming for paginated reads.
+
+Private submodule; consumed by :func:`restgdf.utils.getgdf._iter_pages_raw`
+only.
+
+Without pre-warming, the first ``K`` page fetches of a stream open their
+TCP and TLS connections at the moment the pagination plan is released, so
+the handshakes land on the critical path all at once. :func:`_prewarm`
+instead sends ``K`` concurrent lightweight ``f=json`` requests to the layer
+while the count/metadata phase is still running. Each one leaves a
+keep-alive connection in the session's pool, which the page fetches then
+reuse.
+
+The pings are ``POST`` requests so a token-injecting session never puts a
+credential in a URL. Their responses are read and discarded. A ping that
+fails only means one connection is opened later, so failures are logged
+at ``DEBUG`` and otherwise ignored.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from restgdf._logging import build_log_extra, get_logger
+from restgdf.utils._http import default_headers, default_timeout
+
+_LOG = get_logger("pagination")
+
+
+async def _ping(session: Any, url: str, token: str | None) -> bool:
+    data: dict[str, str] = {"f": "json"}
+    if token is not None:
+        data["token"] = token
+    try:
+        resp = await session.post(
+            url,
+            data=data,
+            headers=default_headers(),
+            timeout=default_timeout(),
+        )
+        await resp.read()
+        release = getattr(resp, "release", None)
+        if release is not None:
+            release()
+    except Exception as exc:
+        _LOG.debug(
+            "connection pre-warm ping failed for url=%s: %s",
+            url,
+            type(exc).__name__,
+            extra=build_log_extra(
+                operation="prewarm",
+                exception_type=type(exc).__name__,
+            ),
+        )
+        return False
+    return True
+
+
+async def _prewarm(
+    session: Any,
+    url: str,
+    connections: int,
+    *,
+    token: str | None = None,
+) -> int:
+    """Open up to ``connections`` pooled connections to ``url``'s host.
+
+    All pings are in flight at once, so each needs its own connection.
+    Returns how many succeeded.
+    """
+    results = await asyncio.gather(
+        *(_ping(session, url, token) for _ in range(connections)),
+    )
+    warmed = sum(results)
+    _LOG.debug(
+        "pre-warmed %d of %d connections for url=%s",
+        warmed,
+        connections,
+        url,
+        extra=build_log_extra(operation="prewarm"),
+    )
+    return warmed
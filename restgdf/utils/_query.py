@@ -19,7 +19,9 @@ from restgdf._models.responses import (
     LayerMetadata,
     ObjectIdsResponse,
 )
-from restgdf.utils._http import _arcgis_request, default_headers, default_timeout
+from restgdf.utils._cache import _cached_json
+from restgdf.utils._coalesce import _coalesced_json
+from restgdf.utils._http import default_headers, default_timeout
 
 
 async def get_feature_count(
@@ -41,14 +43,14 @@ async def get_feature_count(
     xkwargs: dict = {k: v for k, v in kwargs.items() if k != "data"}
     xkwargs.setdefault("timeout", default_timeout())
     query_url = f"{url}/query"
-    response = await _arcgis_request(
+    response_json = await _cached_json(
+        "count",
         session,
         query_url,
         datadict,
         headers=default_headers(xkwargs.pop("headers", None)),
         **xkwargs,
     )
-    response_json = await response.json(content_type=None)
     envelope = _parse_response(CountResponse, response_json, context=query_url)
     return envelope.count
 
@@ -69,17 +71,25 @@ async def get_metadata(
     data = {"f": "json"}
     if token is not None:
         data["token"] = token
-    response = await _arcgis_request(
+    raw = await _cached_json(
+        "metadata",
         session,
         url,
         data,
         headers=default_headers(),
         timeout=default_timeout(),
     )
-    raw = await response.json(content_type=None)
     return _parse_response(LayerMetadata, raw, context=url)
 
 
+def _exceeded(response_json: object) -> bool:
+    # Read off the raw payload: ObjectIdsResponse (strict tier) pins its
+    # dumped shape to the two id keys.
+    return isinstance(response_json, dict) and bool(
+        response_json.get("exceededTransferLimit"),
+    )
+
+
 async def get_object_ids(
     url: str,
     session: AsyncHTTPSession,
@@ -92,6 +102,12 @@ async def get_object_ids(
     :class:`~restgdf._models.RestgdfResponseError` before the caller can
     misuse them. ArcGIS returns ``objectIds: null`` for zero-row
     matches; the model coerces that to ``[]``.
+
+    Most servers return every id in one response. Those that cap it set
+    ``exceededTransferLimit``; the ids then come back in ascending order,
+    and the next request continues past the largest one
+    (``(<where>) AND <oid field> > <max id>``) until a response is
+    complete.
     """
     datadict = build_conservative_query_data(
         {"where": "1=1", "returnIdsOnly": True, "f": "json"},
@@ -99,14 +115,36 @@ async def get_object_ids(
     )
     xkwargs: dict = {k: v for k, v in kwargs.items() if k != "data"}
     xkwargs.setdefault("timeout", default_timeout())
+    headers = default_headers(xkwargs.pop("headers", None))
     query_url = f"{url}/query"
-    response = await _arcgis_request(
+    response_json = await _coalesced_json(
         session,
         query_url,
         datadict,
-        headers=default_headers(xkwargs.pop("headers", None)),
+        token_safe=True,
+        headers=headers,
         **xkwargs,
     )
-    response_json = await response.json(content_type=None)
     envelope = _parse_response(ObjectIdsResponse, response_json, context=query_url)
-    return envelope.object_id_field_name, envelope.object_ids
+    object_ids = envelope.object_ids
+    where = datadict.get("where") or "1=1"
+    while _exceeded(response_json) and envelope.object_ids:
+        last = max(envelope.object_ids)
+        response_json = await _coalesced_json(
+            session,
+            query_url,
+            {
+                **datadict,
+                "where": f"({where}) AND {envelope.object_id_field_name} > {last}",
+            },
+            token_safe=True,
+            headers=headers,
+            **xkwargs,
+        )
+        envelope = _parse_response(
+            ObjectIdsResponse,
+            response_json,
+            context=query_url,
+        )
+        object_ids = [*object_ids, *envelope.object_ids]
+    return envelope.object_id_field_name, object_ids
@@ -0,0 +1,243 @@
+"""Display-resolution query parameters and quantized geometry decoding.
+
+Private submodule; :func:`resolution_params`, :func:`scale_to_tolerance`
+and :func:`decode_quantized` are re-exported by ``restgdf.utils.getinfo``.
+
+A map drawn at 1:72,000 shows about 19 m per pixel, yet a query returns
+every vertex at full double precision. Three ArcGIS query parameters trim
+that:
+
+* ``maxAllowableOffset`` generalizes geometries to the given deviation;
+* ``geometryPrecision`` rounds coordinates to that many decimals;
+* ``quantizationParameters`` snaps coordinates to a grid and sends each
+  vertex as small integer deltas from the previous one (``f=json`` only).
+
+:func:`resolution_params` derives all three from one tolerance (a pixel's
+size in layer units); :func:`scale_to_tolerance` gets that from a map scale.
+Quantized responses carry a top-level ``transform``;
+:func:`decode_quantized` turns their geometries back into plain
+coordinates, so the page, feature and GeoDataFrame paths never see the
+encoded form.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Mapping
+from typing import Any
+
+from restgdf.utils._metadata import normalize_spatial_reference
+
+#: Meters per inch, for map scale -> ground size.
+_METERS_PER_INCH = 0.0254
+#: Meters per degree of latitude (and of longitude at the equator).
+_METERS_PER_DEGREE = 111_320.0
+#: Decimals kept past the tolerance's own order of magnitude.
+_EXTRA_DECIMALS = 1
+#: Query parameters :func:`resolution_params` may set.
+_RESOLUTION_KEYS = frozenset(
+    {"maxAllowableOffset", "geometryPrecision", "quantizationParameters"},
+)
+
+
+def _is_geographic(spatial_reference: Any) -> bool:
+    """Whether ``spatial_reference`` has coordinates in degrees."""
+    epsg, raw = normalize_spatial_reference(
+        dict(spatial_reference)
+        if isinstance(spatial_reference, Mapping)
+        else spatial_reference,
+    )
+    if epsg is not None:
+        # The EPSG geographic 2D range (4326, 4269, 4258, ...).
+        return 4000 <= epsg < 5000
+    wkt = str((raw or {}).get("wkt", "")).lstrip().upper()
+    return wkt.startswith(("GEOGCS", "GEOGCRS"))
+
+
+def scale_to_tolerance(
+    scale: float,
+    spatial_reference: Any = None,
+    *,
+    dpi: float = 96,
+) -> float:
+    """Return the size of one screen pixel at ``scale``, in layer units.
+
+    Parameters
+    ----------
+    scale : float
+        Map scale denominator (``72_224`` for 1:72,224).
+    spatial_reference : int, str or mapping, optional
+        Spatial reference of the coordinates. Geographic references give
+        degrees; anything else is assumed to be in meters, so pass a
+        tolerance directly for feet-based references.
+    dpi : float
+        Screen resolution.
+
+    Returns
+    -------
+    float
+        Ground size of one pixel.
+    """
+    if not scale > 0 or not dpi > 0:
+        raise ValueError("scale and dpi must be > 0")
+    meters = scale * _METERS_PER_INCH / dpi
+    if _is_geographic(spatial_reference):
+        return meters / _METERS_PER_DEGREE
+    return meters
+
+
+def geometry_precision(tolerance: float) -> int:
+    """Decimals that resolve ``tolerance`` with one digit to spare."""
+    return max(0, math.ceil(-math.log10(tolerance)) + _EXTRA_DECIMALS)
+
+
+def resolution_params(
+    tolerance: float,
+    *,
+    extent: Mapping[str, Any] | None = None,
+    quantize: bool = True,
+) -> dict[str, Any]:
+    """Return query parameters that drop detail finer than ``tolerance``.
+
+    Parameters
+    ----------
+    tolerance : float
+        Largest acceptable coordinate error, in output units -- typically
+        one pixel (see :func:`scale_to_tolerance`).
+    extent : mapping, optional
+        Extent for ``quantizationParameters``, with its
+        ``spatialReference``; usually the layer's. Quantization is skipped
+        without one.
+    quantize : bool
+        Request quantized, delta-encoded geometry.
+
+    Returns
+    -------
+    dict
+        ``maxAllowableOffset``, ``geometryPrecision`` and, when quantizing,
+        JSON-encoded ``quantizationParameters``.
+    """
+    if not tolerance > 0:
+        raise ValueError(f"tolerance must be > 0, got {tolerance!r}")
+    params: dict[str, Any] = {
+        "maxAllowableOffset": tolerance,
+        "geometryPrecision": geometry_precision(tolerance),
+    }
+    if (
+        quantize
+        and extent is not None
+        and all(
+            extent.get(key) is not None for key in ("xmin", "ymin", "xmax", "ymax")
+        )
+    ):
+        params["quantizationParameters"] = json.dumps(
+            {
+                "mode": "view",
+                "originPosition": "upperLeft",
+                "tolerance": tolerance,
+                "extent": dict(extent),
+            },
+            separators=(",", ":"),
+        )
+    return params
+
+
+class _QuantizedStats:
+    """Per-stream totals for quantized pages, for the stream stats log."""
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.vertices = 0
+        self.received_bytes = 0
+        self.decoded_bytes = 0
+
+    def record(self, encoded: list[Any], decoded: list[Any], vertices: int) -> None:
+        """Add one page's geometries before and after decoding."""
+        self.pages += 1
+        self.vertices += vertices
+        self.received_bytes += len(json.dumps(encoded, separators=(",", ":")))
+        self.decoded_bytes += len(json.dumps(decoded, separators=(",", ":")))
+
+    @property
+    def saved_fraction(self) -> float:
+        """Share of the full-precision geometry bytes quantization saved."""
+        if not self.decoded_bytes:
+            return 0.0
+        return 1 - self.received_bytes / self.decoded_bytes
+
+
+def decode_quantized(
+    raw: dict[str, Any],
+    stats: _QuantizedStats | None = None,
+) -> dict[str, Any]:
+    """Return ``raw`` with quantized geometries decoded to coordinates.
+
+    A response without a ``transform`` is returned unchanged. Otherwise a
+    copy comes back without the ``transform`` and with every geometry in
+    plain coordinates: points are grid positions, and each multipoint, path
+    and ring starts at a grid position followed by deltas. Ordinates past
+    ``x, y`` pass through untouched.
+    """
+    transform = raw.get("transform")
+    if not isinstance(transform, Mapping):
+        return raw
+    scale_x, scale_y = transform["scale"][:2]
+    origin_x, origin_y = transform["translate"][:2]
+    sign_y = -1 if transform.get("originPosition", "upperLeft") == "upperLeft" else 1
+    vertices = 0
+
+    def run(coordinates: list[list[float]]) -> list[list[float]]:
+        nonlocal vertices
+        vertices += len(coordinates)
+        x = y = 0.0
+        decoded = []
+        for dx, dy, *rest in coordinates:
+            x += dx
+            y += dy
+            decoded.append(
+                [origin_x + x * scale_x, origin_y + sign_y * y * scale_y, *rest],
+            )
+        return decoded
+
+    def geometry(encoded: dict[str, Any]) -> dict[str, Any]:
+        nonlocal vertices
+        if encoded.get("x") is not None and encoded.get("y") is not None:
+            vertices += 1
+            return {
+                **encoded,
+                "x": origin_x + encoded["x"] * scale_x,
+                "y": origin_y + sign_y * encoded["y"] * scale_y,
+            }
+        if "points" in encoded:
+            return {**encoded, "points": run(encoded["points"])}
+        for key in ("paths", "rings"):
+            if key in encoded:
+                return {**encoded, key: [run(part) for part in encoded[key]]}
+        return encoded
+
+    encoded_geometries = []
+    decoded_geometries = []
+    features = []
+    for feature in raw.get("features") or []:
+        encoded = feature.get("geometry")
+        if not encoded:
+            features.append(feature)
+            continue
+        decoded = geometry(encoded)
+        encoded_geometries.append(encoded)
+        decoded_geometries.append(decoded)
+        features.append({**feature, "geometry": decoded})
+    if stats is not None:
+        stats.record(encoded_geometries, decoded_geometries, vertices)
+    result = {key: value for key, value in raw.items() if key != "transform"}
+    if "features" in raw:
+        result["features"] = features
+    return result
+
+
+__all__ = [
+    "decode_quantized",
+    "resolution_params",
+    "scale_to_tolerance",
+]
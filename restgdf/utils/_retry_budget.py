@@ -0,0 +1,145 @@
+"""Shared retry budget for a session or a single stream.
+
+Private submodule. :class:`RetryBudget` is re-exported from the top-level
+``restgdf`` package.
+
+Per-request retry policies (``ResilienceConfig.max_attempts``,
+:class:`~restgdf.PageRetryPolicy`) are independent: when a server degrades
+under a long stream, every in-flight page retries on its own and the load
+on the struggling server multiplies. A :class:`RetryBudget` is shared by
+every request in its scope and caps retries at a fraction of first
+attempts, so once the budget is spent further failures surface at once.
+
+The stream scope is carried by a :class:`~contextvars.ContextVar` set inside
+each page-fetch task, so :class:`~restgdf.resilience.ResilientSession`
+draws transport retries from the stream's budget without any change to the
+session protocol.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from restgdf._logging import build_log_extra, get_logger
+
+_LOG = get_logger("retry")
+
+
+class RetryBudget:
+    """Token bucket bounding retries to a fraction of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one; a retry is allowed only while a whole token is available. The
+    bucket starts with ``min_retries`` tokens and holds at most
+    ``max(min_retries, 1)``, so a long healthy run cannot bank an unbounded
+    allowance for a later outage: under sustained failure, retries settle
+    at ``ratio`` per first attempt.
+
+    One instance is meant to be shared. Pass it as
+    ``FeatureLayer.iter_pages(retry_budget=...)`` to scope it to one stream,
+    or set ``ResilienceConfig.retry_budget_ratio`` to give a
+    :class:`~restgdf.resilience.ResilientSession` its own. The counters are
+    plain attributes, readable at any time.
+
+    Parameters
+    ----------
+    ratio : float
+        Retries allowed per first attempt. Defaults to ``0.1``.
+    min_retries : int
+        Retries allowed before any first attempt has been made, and the
+        bucket's capacity. Defaults to ``10``.
+    """
+
+    def __init__(self, ratio: float = 0.1, *, min_retries: int = 10) -> None:
+        if ratio < 0:
+            raise ValueError(f"ratio must be >= 0, got {ratio!r}")
+        if min_retries < 0:
+            raise ValueError(f"min_retries must be >= 0, got {min_retries!r}")
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.first_attempts = 0
+        self.retries = 0
+        self.denied = 0
+        self._capacity = float(max(min_retries, 1))
+        self._balance = float(min_retries)
+        self._exhausted = False
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket."""
+        return self._balance
+
+    def record_attempt(self) -> None:
+        """Count a first attempt and deposit ``ratio`` tokens."""
+        self.first_attempts += 1
+        self._balance = min(self._capacity, self._balance + self.ratio)
+
+    def try_retry(self, *, cause: str | None = None) -> bool:
+        """Withdraw one token for a retry; ``False`` when the budget is spent.
+
+        The first denial of an exhaustion episode logs a ``WARNING`` on
+        ``restgdf.retry``; later denials log at ``DEBUG``.
+        """
+        if self._balance >= 1:
+            self._balance -= 1
+            self.retries += 1
+            self._exhausted = False
+            return True
+        self.denied += 1
+        log = _LOG.debug if self._exhausted else _LOG.warning
+        self._exhausted = True
+        log(
+            "retry budget exhausted: retries=%d first_attempts=%d denied=%d "
+            "caused_by=%s",
+            self.retries,
+            self.first_attempts,
+            self.denied,
+            cause,
+            extra=build_log_extra(
+                operation="retry_budget",
+                exception_type=cause,
+            ),
+        )
+        return False
+
+    def snapshot(self) -> dict[str, float]:
+        """Return ``{"first_attempts", "retries", "denied", "available"}``."""
+        return {
+            "first_attempts": self.first_attempts,
+            "retries": self.retries,
+            "denied": self.denied,
+            "available": self._balance,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryBudget(ratio={self.ratio!r}, min_retries={self.min_retries!r}, "
+            f"retries={self.retries}, first_attempts={self.first_attempts}, "
+            f"denied={self.denied})"
+        )
+
+
+_STREAM_RETRY_BUDGET: ContextVar[RetryBudget | None] = ContextVar(
+    "restgdf_stream_retry_budget",
+    default=None,
+)
+
+
+def _stream_retry_budget() -> RetryBudget | None:
+    """Return the retry budget of the stream the current task belongs to."""
+    return _STREAM_RETRY_BUDGET.get()
+
+
+@contextmanager
+def _scoped_retry_budget(budget: RetryBudget | None) -> Iterator[None]:
+    """Make ``budget`` the current stream budget for the enclosed block."""
+    token = _STREAM_RETRY_BUDGET.set(budget)
+    try:
+        yield
+    finally:
+        _STREAM_RETRY_BUDGET.reset(token)
+
+
+__all__ = ["RetryBudget"]
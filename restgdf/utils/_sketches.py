@@ -0,0 +1,217 @@
+"""Fixed-size streaming sketches for local aggregation.
+
+Private submodule; consumed by :mod:`restgdf.utils._local_stats`.
+
+:class:`HyperLogLog` estimates the number of distinct values and
+:class:`TDigest` estimates quantiles. Both take values one at a time and
+hold a bounded amount of state however many values they see, so a
+grouped aggregation over a stream costs memory per group, not per row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import numbers
+from bisect import bisect_left
+from collections.abc import Hashable
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    """Spread ``value`` over 64 bits (splitmix64 finalizer).
+
+    ``hash()`` of an ``int`` is the int itself, far too regular for
+    HyperLogLog's leading-zero counts.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _hash64(value: Hashable) -> int:
+    """Return a 64-bit hash of ``value`` that is the same in every process.
+
+    ``hash()`` of ``str`` and ``bytes`` is salted per process, so those
+    (and anything else that is not a number) are hashed from a byte
+    encoding instead. Numbers keep ``hash()``, which is unsalted and equal
+    for equal values of different types.
+    """
+    if isinstance(value, numbers.Number):
+        return _mix64(hash(value) & _MASK64)
+    if isinstance(value, str):
+        data = b"s" + value.encode("utf-8", "surrogatepass")
+    elif isinstance(value, bytes):
+        data = b"b" + value
+    else:
+        data = b"r" + repr(value).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Approximate distinct counter (Flajolet et al., 2007).
+
+    Parameters
+    ----------
+    precision : int
+        ``2 ** precision`` one-byte registers; the standard error is about
+        ``1.04 / sqrt(2 ** precision)`` (1.6% at the default of 12).
+
+    Numbers are hashed with :func:`hash`, so values that compare equal
+    (``1``, ``1.0`` and ``True``) count once, as in Python sets. Strings,
+    bytes and other values are hashed from their encoding, so an estimate
+    does not change from one process to the next.
+    """
+
+    __slots__ = ("_registers", "precision")
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be in [4, 16], got {precision!r}")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Hashable) -> None:
+        """Count ``value``."""
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        rest = (hashed << self.precision) & _MASK64
+        rank = 64 - self.precision + 1 if not rest else 65 - rest.bit_length()
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def estimate(self) -> int:
+        """Return the estimated number of distinct values added."""
+        registers = self._registers
+        size = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0**-rank for rank in registers)
+        zeros = registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            # Linear counting is more accurate while registers are empty.
+            return round(size * math.log(size / zeros))
+        return round(raw)
+
+
+class TDigest:
+    """Approximate quantiles with a merging t-digest (Dunning, 2019).
+
+    Parameters
+    ----------
+    compression : int
+        Roughly the number of centroids kept. Accuracy is best near the
+        tails; the default of 100 keeps mid-range errors well under 1%
+        of the rank.
+
+    Until ``5 * compression`` values have been added nothing is merged
+    and :meth:`quantile` is exact.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_means",
+        "_weights",
+        "compression",
+        "count",
+        "max",
+        "min",
+    )
+
+    def __init__(self, compression: int = 100) -> None:
+        if compression < 10:
+            raise ValueError(f"compression must be >= 10, got {compression!r}")
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: list[float] = []
+        self._weights: list[int] = []
+        self._buffer: list[float] = []
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self._buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._merge()
+
+    def _scale(self, q: float) -> float:
+        # k1 scale function: small centroids near q=0 and q=1.
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(
+            [*zip(self._means, self._weights), *((v, 1) for v in self._buffer)],
+        )
+        self._buffer = []
+        total = self.count
+        means: list[float] = []
+        weights: list[int] = []
+        mean, weight = items[0]
+        before = 0
+        k_lower = self._scale(0.0)
+        for next_mean, next_weight in items[1:]:
+            if self._scale((before + weight + next_weight) / total) - k_lower <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                k_lower = self._scale(before / total)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q: float, *, discrete: bool = False) -> float | None:
+        """Return the ``q`` quantile, or ``None`` when nothing was added.
+
+        ``discrete=False`` interpolates like SQL ``PERCENTILE_CONT``
+        (rank ``q * (count - 1)``); ``discrete=True`` returns the value at
+        rank ``ceil(q * count) - 1`` like ``PERCENTILE_DISC``.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be in [0, 1], got {q!r}")
+        if not self.count:
+            return None
+        self._merge()
+        cumulative = 0
+        if discrete:
+            rank = max(math.ceil(q * self.count) - 1, 0)
+            if rank == self.count - 1:
+                return self.max
+            for mean, weight in zip(self._means, self._weights):
+                cumulative += weight
+                if rank < cumulative:
+                    return self.min if rank == 0 else mean
+            return self.max  # pragma: no cover - ranks end at count - 1
+        # Centroid i sits at the middle of the ranks it covers; min and max
+        # anchor ranks 0 and count - 1.
+        positions = [0.0]
+        values = [self.min]
+        for mean, weight in zip(self._means, self._weights):
+            positions.append(cumulative + (weight - 1) / 2)
+            values.append(mean)
+            cumulative += weight
+        positions.append(self.count - 1.0)
+        values.append(self.max)
+        target = q * (self.count - 1)
+        right = min(max(bisect_left(positions, target), 1), len(positions) - 1)
+        left = right - 1
+        span = positions[right] - positions[left]
+        if span <= 0:
+            return values[right]
+        share = (target - positions[left]) / span
+        return values[left] + (values[right] - values[left]) * share
+
+
+__all__ = ["HyperLogLog", "TDigest"]
@@ -0,0 +1,689 @@
+"""Batched spatial queries for many filter geometries at once.
+
+Private submodule; :func:`query_geometries` and :class:`GeometryMatches`
+are re-exported by ``restgdf.utils.getinfo``.
+
+One query per input geometry turns a spatial join against 20,000 parcels
+into 20,000 round trips. :func:`query_geometries` instead:
+
+1. orders the inputs along a Z-order curve, so neighbours share a batch;
+2. packs them into batches under a vertex (payload) and count budget, one
+   geometry family per batch;
+3. sends each batch as one query geometry that covers all of its inputs --
+   a multipoint for points, the union (or the envelope) of the lines or
+   polygons -- with ``esriSpatialRelIntersects``;
+4. pages every batch by object id and runs the batches concurrently;
+5. tests the returned candidates against each input locally with the
+   exact relation, since the batch geometry was a superset, and keeps each
+   feature once however many batches returned it.
+
+A batch holding one input is sent as-is with the requested relation and
+needs no local test, unless ``prefilter`` is set. A ``prefilter`` swaps each
+batch geometry for a much smaller cover -- a buffered simplification, the
+convex hull or the envelope -- so a 200,000-vertex boundary costs a
+few-kilobyte request; every candidate is then tested locally. The vertex
+counts and body sizes before and after are logged on
+``restgdf.normalization``. Local tests use :mod:`shapely` (installed with
+``restgdf[geo]``); features come back in ``in_sr`` so both sides compare
+in the same spatial reference.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
+
+from restgdf._compat import aclosing
+from restgdf._config import get_config
+from restgdf._client._priority import _rank
+from restgdf._logging import build_log_extra, get_logger
+from restgdf._models._drift import _parse_response
+from restgdf._models.responses import FeaturesResponse, ObjectIdsResponse
+from restgdf.errors import RestgdfResponseError
+from restgdf.utils._coalesce import _coalesced_json
+from restgdf.utils._concurrency import bounded_map
+from restgdf.utils._http import default_data, default_headers, default_timeout
+from restgdf.utils._metadata import (
+    LayerMetadataLike,
+    normalize_spatial_reference,
+    supports_advanced_queries,
+)
+from restgdf.utils._optional import require_shapely
+from restgdf.utils._resolution import decode_quantized
+from restgdf.utils.utils import where_var_in_list
+
+if TYPE_CHECKING:
+    from shapely.geometry.base import BaseGeometry
+
+    from restgdf._client._protocols import AsyncHTTPSession
+
+BatchGeometry = Literal["union", "envelope"]
+Prefilter = Literal["simplify", "envelope", "convex_hull"]
+
+_PREFILTERS: tuple[str, ...] = ("simplify", "envelope", "convex_hull")
+
+#: ``spatialRel`` -> the ``STRtree.query`` predicate testing it with the
+#: tree holding the inputs. ArcGIS relates the query geometry to the
+#: feature ("query geometry contains feature"); the tree tests the feature
+#: against the inputs, so the asymmetric pairs swap.
+_TREE_PREDICATES: dict[str, str | None] = {
+    "esriSpatialRelIntersects": "intersects",
+    "esriSpatialRelContains": "within",
+    "esriSpatialRelWithin": "contains",
+    "esriSpatialRelCrosses": "crosses",
+    "esriSpatialRelTouches": "touches",
+    "esriSpatialRelOverlaps": "overlaps",
+    # Bounding boxes only: the tree's own query.
+    "esriSpatialRelEnvelopeIntersects": None,
+    "esriSpatialRelIndexIntersects": None,
+}
+
+#: Rough bytes per vertex of a JSON-encoded coordinate pair.
+_BYTES_PER_VERTEX = 40
+_DEFAULT_BATCH_BYTES = 100_000
+_DEFAULT_BATCH_SIZE = 500
+#: ``prefilter="simplify"`` tolerance when none is given: this fraction of
+#: the larger side of the geometry's bounding box.
+_DEFAULT_TOLERANCE_RATIO = 1000
+
+#: Relations a covering (superset) query geometry still answers with a
+#: superset of the exact matches. The others are sent as intersects.
+_SUPERSET_RELATIONS = frozenset(
+    {
+        "esriSpatialRelIntersects",
+        "esriSpatialRelContains",
+        "esriSpatialRelEnvelopeIntersects",
+        "esriSpatialRelIndexIntersects",
+    },
+)
+
+
+@dataclass(frozen=True)
+class GeometryMatches:
+    """Result of :meth:`restgdf.FeatureLayer.query_geometries`.
+
+    Attributes
+    ----------
+    features : dict[int, dict]
+        Every matching feature once, as a raw ArcGIS feature dict, keyed by
+        object id.
+    matches : list[list[int]]
+        ``matches[i]`` holds the ascending object ids matching input
+        geometry ``i``.
+    batches : int
+        Number of batch queries issued (pages not counted).
+    """
+
+    features: dict[int, dict[str, Any]] = field(default_factory=dict)
+    matches: list[list[int]] = field(default_factory=list)
+    batches: int = 0
+
+    def pairs(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield ``(input index, feature)`` for every match, for joins."""
+        for index, object_ids in enumerate(self.matches):
+            for object_id in object_ids:
+                yield index, self.features[object_id]
+
+
+def _arcgis_rings_to_shape(rings: list[list[list[float]]]) -> BaseGeometry:
+    """Assemble ArcGIS rings: clockwise outer rings, counter-clockwise holes."""
+    shapely = require_shapely("query_geometries()")
+    outers: list[BaseGeometry] = []
+    holes: list[BaseGeometry] = []
+    for ring in rings:
+        polygon = shapely.Polygon([point[:2] for point in ring])
+        # Shoelace sign: negative for clockwise rings with y pointing up.
+        signed = sum(
+            x0 * y1 - x1 * y0
+            for (x0, y0, *_), (x1, y1, *_) in zip(ring, ring[1:])
+        )
+        (outers if signed <= 0 else holes).append(polygon)
+    if not outers:
+        outers, holes = holes, []
+    shape = shapely.union_all(outers)
+    return shape.difference(shapely.union_all(holes)) if holes else shape
+
+
+def _arcgis_to_shape(geometry: Mapping[str, Any] | None) -> BaseGeometry | None:
+    """Convert ArcGIS geometry JSON to shapely; ``None`` for no geometry."""
+    if not geometry:
+        return None
+    shapely = require_shapely("query_geometries()")
+    if "x" in geometry:
+        if geometry.get("x") is None or geometry.get("y") is None:
+            return None
+        return shapely.Point(geometry["x"], geometry["y"])
+    if "points" in geometry:
+        return shapely.MultiPoint([point[:2] for point in geometry["points"]])
+    if "paths" in geometry:
+        return shapely.MultiLineString(
+            [[point[:2] for point in path] for path in geometry["paths"]],
+        )
+    if "rings" in geometry:
+        return _arcgis_rings_to_shape(geometry["rings"])
+    if {"xmin", "ymin", "xmax", "ymax"}.issubset(geometry):
+        if geometry["xmin"] is None:
+            return None
+        return shapely.box(
+            geometry["xmin"],
+            geometry["ymin"],
+            geometry["xmax"],
+            geometry["ymax"],
+        )
+    raise ValueError(
+        "curve geometries cannot be tested locally; densify them first",
+    )
+
+
+def _to_shape(geometry: object) -> BaseGeometry:
+    """Coerce a shapely, ``__geo_interface__``, GeoJSON or ArcGIS geometry."""
+    shapely = require_shapely("query_geometries()")
+    if geometry is None:
+        return shapely.GeometryCollection()
+    if isinstance(geometry, shapely.Geometry):
+        return geometry
+    candidate = getattr(geometry, "__geo_interface__", geometry)
+    if not isinstance(candidate, Mapping):
+        raise TypeError(
+            "geometries must be shapely geometries, ArcGIS JSON mappings or "
+            f"expose __geo_interface__; got {type(geometry).__name__}",
+        )
+    if candidate.get("type") == "Feature":
+        candidate = candidate.get("geometry") or {}
+    if "type" in candidate:
+        return shapely.geometry.shape(candidate)
+    shape = _arcgis_to_shape(candidate)
+    if shape is None:
+        return shapely.GeometryCollection()
+    return shape
+
+
+def _iter_inputs(geometries: Any) -> Iterable[object]:
+    """Unpack FeatureCollections and GeoDataFrames into single geometries."""
+    if hasattr(geometries, "geometry") and hasattr(geometries, "crs"):
+        # GeoDataFrame / GeoSeries
+        return geometries.geometry
+    if isinstance(geometries, Mapping):
+        if geometries.get("type") != "FeatureCollection":
+            raise TypeError(
+                "pass an iterable of geometries or a FeatureCollection, not a "
+                "single geometry mapping",
+            )
+        return geometries.get("features") or []
+    return geometries
+
+
+def _family(shape: BaseGeometry) -> int:
+    """0 for points, 1 for lines, 2 for polygons (and mixed collections)."""
+    kind = shape.geom_type
+    if kind in ("Point", "MultiPoint"):
+        return 0
+    if kind in ("LineString", "LinearRing", "MultiLineString"):
+        return 1
+    return 2
+
+
+def _morton(x: int, y: int) -> int:
+    code = 0
+    for bit in range(16):
+        code |= ((x >> bit) & 1) << (2 * bit) | ((y >> bit) & 1) << (2 * bit + 1)
+    return code
+
+
+def _plan_batches(
+    shapes: list[BaseGeometry],
+    *,
+    max_batch_bytes: int,
+    max_batch_size: int,
+) -> list[list[int]]:
+    """Group input indexes into spatially compact, size-bounded batches."""
+    shapely = require_shapely("query_geometries()")
+    present = [index for index, shape in enumerate(shapes) if not shape.is_empty]
+    if not present:
+        return []
+    bounds = [shapes[index].bounds for index in present]
+    xmin = min(b[0] for b in bounds)
+    ymin = min(b[1] for b in bounds)
+    width = max(b[2] for b in bounds) - xmin or 1.0
+    height = max(b[3] for b in bounds) - ymin or 1.0
+
+    def key(item: tuple[int, tuple[float, ...]]) -> tuple[int, int]:
+        index, (x0, y0, x1, y1) = item
+        x = int(((x0 + x1) / 2 - xmin) / width * 0xFFFF)
+        y = int(((y0 + y1) / 2 - ymin) / height * 0xFFFF)
+        return _family(shapes[index]), _morton(x, y)
+
+    ordered = [index for index, _ in sorted(zip(present, bounds), key=key)]
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_bytes = 0
+    for index in ordered:
+        size = int(shapely.get_num_coordinates(shapes[index])) * _BYTES_PER_VERTEX
+        if batch and (
+            len(batch) >= max_batch_size
+            or batch_bytes + size > max_batch_bytes
+            or _family(shapes[batch[0]]) != _family(shapes[index])
+        ):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(index)
+        batch_bytes += size
+    batches.append(batch)
+    return batches
+
+
+def _coords(coordinates: Iterable[Any]) -> list[list[float]]:
+    return [list(point) for point in coordinates]
+
+
+def _polygons_filter(polygons: Iterable[BaseGeometry]) -> dict[str, Any]:
+    shapely = require_shapely("query_geometries()")
+    rings: list[list[list[float]]] = []
+    for polygon in polygons:
+        # ArcGIS wants clockwise outer rings and counter-clockwise holes.
+        polygon = shapely.geometry.polygon.orient(polygon, sign=-1.0)
+        rings.append(_coords(polygon.exterior.coords))
+        rings.extend(_coords(hole.coords) for hole in polygon.interiors)
+    return {"geometry": {"rings": rings}, "geometryType": "esriGeometryPolygon"}
+
+
+def _envelope_filter(shape: BaseGeometry) -> dict[str, Any]:
+    xmin, ymin, xmax, ymax = shape.bounds
+    return {
+        "geometry": {"xmin": xmin, "ymin": ymin, "xmax": xmax, "ymax": ymax},
+        "geometryType": "esriGeometryEnvelope",
+    }
+
+
+def _vertex_count(geometry: Mapping[str, Any]) -> int:
+    if "x" in geometry:
+        return 1
+    if "points" in geometry:
+        return len(geometry["points"])
+    for key in ("paths", "rings", "curvePaths", "curveRings"):
+        if key in geometry:
+            return sum(len(part) for part in geometry[key])
+    return 4
+
+
+def _check_prefilter(prefilter: Prefilter | None, tolerance: float | None) -> None:
+    if prefilter is not None and prefilter not in _PREFILTERS:
+        raise ValueError(
+            f"prefilter must be one of {list(_PREFILTERS)} or None, "
+            f"got {prefilter!r}",
+        )
+    if tolerance is not None and not tolerance > 0:
+        raise ValueError(f"tolerance must be > 0, got {tolerance!r}")
+
+
+def _coarsen(
+    shape: BaseGeometry,
+    prefilter: Prefilter,
+    tolerance: float | None,
+) -> dict[str, Any]:
+    """Return a small ``geometry`` / ``geometryType`` that covers ``shape``."""
+    shapely = require_shapely("prefilter")
+    xmin, ymin, xmax, ymax = shape.bounds
+    if prefilter == "simplify" and _family(shape) == 0:
+        # Buffering points only adds vertices; their hull is the cover.
+        prefilter = "convex_hull"
+    if prefilter == "simplify":
+        if tolerance is None:
+            tolerance = max(xmax - xmin, ymax - ymin) / _DEFAULT_TOLERANCE_RATIO
+        if tolerance > 0:
+            # Simplifying alone can cut corners off the input. Growing it
+            # first keeps the input at least ~0.7 * tolerance inside the
+            # outline, which simplifying by tolerance / 2 cannot cross.
+            coarse = shape.buffer(tolerance, quad_segs=1).simplify(tolerance / 2)
+            if coarse.covers(shape):
+                return _polygons_filter(
+                    part
+                    for part in shapely.get_parts(coarse)
+                    if part.geom_type == "Polygon"
+                )
+        prefilter = "convex_hull"
+    if prefilter == "convex_hull":
+        hull = shape.convex_hull
+        if hull.geom_type == "Polygon":
+            return _polygons_filter([hull])
+    return _envelope_filter(shape)
+
+
+def _prefilter(
+    shape: BaseGeometry,
+    exact: dict[str, Any],
+    prefilter: Prefilter,
+    tolerance: float | None,
+) -> dict[str, Any]:
+    """Swap the ``exact`` filter for its coarse cover, logging the savings."""
+    if exact["geometryType"] in ("esriGeometryPoint", "esriGeometryEnvelope"):
+        return exact
+    coarse = _coarsen(shape, prefilter, tolerance)
+    get_logger("normalization").info(
+        "prefilter=%s reduced a query geometry from %d vertices (%d bytes) "
+        "to %d vertices (%d bytes); exact matches are tested locally",
+        prefilter,
+        _vertex_count(exact["geometry"]),
+        len(_dumps(exact["geometry"])),
+        _vertex_count(coarse["geometry"]),
+        len(_dumps(coarse["geometry"])),
+        extra=build_log_extra(operation="spatial_prefilter"),
+    )
+    return coarse
+
+
+def _server_relation(spatial_rel: str) -> str:
+    """The relation a superset query geometry can still send to the server."""
+    if spatial_rel in _SUPERSET_RELATIONS:
+        return spatial_rel
+    return "esriSpatialRelIntersects"
+
+
+def _dumps(geometry: Mapping[str, Any]) -> str:
+    return json.dumps(geometry, separators=(",", ":"))
+
+
+def _batch_filter(
+    shapes: list[BaseGeometry],
+    batch_geometry: BatchGeometry,
+    prefilter: Prefilter | None = None,
+    tolerance: float | None = None,
+) -> dict[str, Any]:
+    """Return ``geometry`` / ``geometryType`` covering every shape."""
+    shapely = require_shapely("query_geometries()")
+    union = shapely.union_all(shapes)
+    parts = shapely.get_parts(union)
+    family = _family(shapes[0])
+    if family == 0 and batch_geometry == "union":
+        exact = {
+            "geometry": {"points": [[p.x, p.y] for p in parts]},
+            "geometryType": "esriGeometryMultipoint",
+        }
+    elif family == 1 and batch_geometry == "union":
+        exact = {
+            "geometry": {"paths": [_coords(line.coords) for line in parts]},
+            "geometryType": "esriGeometryPolyline",
+        }
+    elif batch_geometry == "union" and all(
+        part.geom_type == "Polygon" for part in parts
+    ):
+        exact = _polygons_filter(parts)
+    else:
+        exact = _envelope_filter(union)
+    if prefilter is None:
+        return exact
+    return _prefilter(union, exact, prefilter, tolerance)
+
+
+def _object_id(url: str, feature: Mapping[str, Any], object_id_field: str) -> int:
+    object_id = (feature.get("attributes") or {}).get(object_id_field)
+    if object_id is None:
+        raise RestgdfResponseError(
+            f"{url}/query returned a feature without {object_id_field!r}",
+            context="query_geometries",
+            url=f"{url}/query",
+        )
+    return object_id
+
+
+async def _query_batch(
+    url: str,
+    session: AsyncHTTPSession,
+    body: dict[str, Any],
+    *,
+    object_id_field: str,
+    keyset: bool = True,
+    **kwargs,
+) -> list[dict[str, Any]]:
+    """Fetch every feature matching ``body``, paging past ``maxRecordCount``.
+
+    Capped answers continue after the largest object id seen
+    (``(<where>) AND <oid> > <max>``, ordered by object id), which needs
+    no pagination support from the server. Without ``keyset`` -- layers
+    that do not support advanced queries ignore ``orderByFields`` -- the
+    matching ids are read with ``returnIdsOnly`` instead and the missing
+    ones fetched in ``<oid> IN (...)`` chunks the size of the first page.
+    """
+    kwargs = {k: v for k, v in kwargs.items() if k != "data"}
+    kwargs.setdefault("timeout", default_timeout())
+    headers = default_headers(kwargs.pop("headers", None))
+
+    async def fetch(data: dict[str, Any]) -> Any:
+        return await _coalesced_json(
+            session,
+            f"{url}/query",
+            data,
+            token_safe=True,
+            headers=headers,
+            **kwargs,
+        )
+
+    async def fetch_features(data: dict[str, Any]) -> FeaturesResponse:
+        raw = await fetch(data)
+        if isinstance(raw, dict):
+            raw = decode_quantized(raw)
+        return _parse_response(FeaturesResponse, raw, context=f"{url}/query")
+
+    features: list[dict[str, Any]] = []
+    where = body.get("where") or "1=1"
+    data = body
+    while True:
+        envelope = await fetch_features(data)
+        page = envelope.features
+        features.extend(page)
+        if not envelope.exceeded_transfer_limit or not page:
+            return features
+        if not keyset:
+            break
+        last = max(_object_id(url, feature, object_id_field) for feature in page)
+        data = {**body, "where": f"({where}) AND {object_id_field} > {last}"}
+    ids = _parse_response(
+        ObjectIdsResponse,
+        await fetch({**body, "returnIdsOnly": True}),
+        context=f"{url}/query",
+    )
+    seen = {_object_id(url, feature, object_id_field) for feature in page}
+    missing = sorted(set(ids.object_ids) - seen)
+    # The ids already satisfy the spatial filter; only the ids are sent.
+    rest = {
+        key: value
+        for key, value in body.items()
+        if key not in ("geometry", "geometryType", "spatialRel", "inSR")
+    }
+    for start in range(0, len(missing), len(page)):
+        chunk = missing[start : start + len(page)]
+        envelope = await fetch_features(
+            {**rest, "where": where_var_in_list(object_id_field, chunk)},
+        )
+        features.extend(envelope.features)
+    return features
+
+
+async def query_geometries(
+    url: str,
+    geometries: Any,
+    session: AsyncHTTPSession,
+    *,
+    object_id_field: str,
+    spatial_rel: str = "esriSpatialRelIntersects",
+    in_sr: int | str | Mapping[str, Any] | None = None,
+    batch_geometry: BatchGeometry = "union",
+    max_batch_bytes: int = _DEFAULT_BATCH_BYTES,
+    max_batch_size: int = _DEFAULT_BATCH_SIZE,
+    max_concurrent_batches: int | None = None,
+    prefilter: Prefilter | None = None,
+    tolerance: float | None = None,
+    metadata: LayerMetadataLike | None = None,
+    **kwargs,
+) -> GeometryMatches:
+    """Find the features related to each of many filter geometries.
+
+    Parameters
+    ----------
+    url : str
+        Layer URL.
+    geometries : iterable or FeatureCollection
+        Shapely geometries, ``__geo_interface__`` objects, GeoJSON or
+        ArcGIS JSON mappings; or a GeoJSON FeatureCollection, GeoSeries or
+        GeoDataFrame.
+    session : AsyncHTTPSession
+        HTTP session.
+    object_id_field : str
+        The layer's object id field, for deduplication and paging.
+    spatial_rel : str
+        ArcGIS ``spatialRel`` relating each input to the features.
+    in_sr : int, str or mapping, optional
+        Spatial reference of the inputs; features are returned in it too.
+        Defaults to the layer's.
+    batch_geometry : {"union", "envelope"}
+        Query geometry of a multi-input batch: the union of its inputs
+        (fewer false candidates) or their envelope (smallest body). Points
+        are always sent as one multipoint under ``"union"``.
+    max_batch_bytes : int
+        Approximate geometry budget per batch body, at ~40 bytes per
+        vertex. An input over the budget is queried alone.
+    max_batch_size : int
+        Most inputs per batch.
+    max_concurrent_batches : int, optional
+        Batches in flight at once. Defaults to
+        ``ConcurrencyConfig.max_concurrent_requests``.
+    prefilter : {"simplify", "envelope", "convex_hull"}, optional
+        Send a coarse cover of each batch geometry instead of the exact
+        one and test every candidate locally. ``"simplify"`` buffers by
+        ``tolerance`` and then simplifies, which always covers the input.
+    tolerance : float, optional
+        ``"simplify"`` tolerance, in ``in_sr`` units. Defaults to 1/1000 of
+        the larger side of the batch geometry's bounding box.
+    metadata : LayerMetadata or mapping, optional
+        Layer metadata. Layers that do not support advanced queries are
+        paged by ``returnIdsOnly`` and object id chunks rather than by
+        ``orderByFields``; without metadata, support is assumed.
+    **kwargs
+        Request kwargs; ``data`` supplies ``where``, ``outFields`` etc.
+        Geometry is always returned, as the local test needs it.
+
+    Returns
+    -------
+    GeometryMatches
+        Deduplicated features and the input-to-feature matches.
+    """
+    if spatial_rel not in _TREE_PREDICATES:
+        raise ValueError(
+            f"spatial_rel must be one of {sorted(_TREE_PREDICATES)}, "
+            f"got {spatial_rel!r}",
+        )
+    if batch_geometry not in ("union", "envelope"):
+        raise ValueError(
+            f"batch_geometry must be 'union' or 'envelope', got {batch_geometry!r}",
+        )
+    if max_batch_bytes < 1 or max_batch_size < 1:
+        raise ValueError("max_batch_bytes and max_batch_size must be >= 1")
+    _check_prefilter(prefilter, tolerance)
+    shapely = require_shapely("query_geometries()")
+    inputs = list(_iter_inputs(geometries))
+    shapes = [_to_shape(geometry) for geometry in inputs]
+    batches = _plan_batches(
+        shapes,
+        max_batch_bytes=max_batch_bytes,
+        max_batch_size=max_batch_size,
+    )
+
+    keyset = metadata is None or supports_advanced_queries(metadata)
+    base = {**default_data(kwargs.get("data")), "returnGeometry": True}
+    if keyset:
+        base["orderByFields"] = object_id_field
+    out_fields = str(base.get("outFields") or "*")
+    if out_fields != "*" and object_id_field not in out_fields.split(","):
+        base["outFields"] = f"{out_fields},{object_id_field}"
+    epsg, raw_sr = normalize_spatial_reference(
+        dict(in_sr) if isinstance(in_sr, Mapping) else in_sr,
+    )
+    sr = epsg if epsg is not None else raw_sr
+    if sr is not None:
+        base["inSR"] = base["outSR"] = sr if epsg is not None else json.dumps(sr)
+    envelope_rel = _TREE_PREDICATES[spatial_rel] is None
+
+    def exact(batch: list[int]) -> bool:
+        """Whether the server alone answers ``batch`` exactly."""
+        return len(batch) == 1 and prefilter is None
+
+    def body_for(batch: list[int]) -> dict[str, Any]:
+        batch_shapes = [shapes[i] for i in batch]
+        if exact(batch):
+            # Sent as is: the server applies the exact relation.
+            payload = _batch_filter(batch_shapes, "union")
+            payload["spatialRel"] = spatial_rel
+        elif envelope_rel:
+            payload = _batch_filter(batch_shapes, "envelope")
+            payload["spatialRel"] = spatial_rel
+        elif len(batch) == 1:
+            payload = _batch_filter(batch_shapes, "union", prefilter, tolerance)
+            payload["spatialRel"] = _server_relation(spatial_rel)
+        else:
+            payload = _batch_filter(
+                batch_shapes,
+                batch_geometry,
+                prefilter,
+                tolerance,
+            )
+            payload["spatialRel"] = "esriSpatialRelIntersects"
+        payload["geometry"] = _dumps(payload["geometry"])
+        return {**base, **payload}
+
+    async def run(batch: list[int]) -> tuple[list[int], list[dict[str, Any]]]:
+        features = await _query_batch(
+            url,
+            session,
+            body_for(batch),
+            object_id_field=object_id_field,
+            keyset=keyset,
+            **kwargs,
+        )
+        return batch, features
+
+    features: dict[int, dict[str, Any]] = {}
+    matched: list[set[int]] = [set() for _ in inputs]
+    async with aclosing(
+        bounded_map(
+            run,
+            batches,
+            limit=max_concurrent_batches
+            or get_config().concurrency.max_concurrent_requests,
+            ordered=False,
+            flow=url,
+            priority=_rank("pages"),
+        ),
+    ) as results:
+        async for batch, page in results:
+            object_ids = [_object_id(url, feature, object_id_field) for feature in page]
+            if exact(batch):
+                # The server applied the exact relation to the input itself.
+                hits = [(position, batch[0]) for position in range(len(page))]
+            else:
+                candidates = [
+                    _arcgis_to_shape(feature.get("geometry")) for feature in page
+                ]
+                kept = [i for i, shape in enumerate(candidates) if shape is not None]
+                found = (
+                    shapely.STRtree([shapes[index] for index in batch]).query(
+                        [candidates[i] for i in kept],
+                        predicate=_TREE_PREDICATES[spatial_rel],
+                    )
+                    if kept
+                    else ((), ())
+                )
+                hits = [(kept[c], batch[m]) for c, m in zip(*found)]
+            for position, index in hits:
+                object_id = object_ids[position]
+                features.setdefault(object_id, page[position])
+                matched[index].add(object_id)
+    return GeometryMatches(
+        features=features,
+        matches=[sorted(object_ids) for object_ids in matched],
+        batches=len(batches),
+    )
+
+
+__all__ = ["GeometryMatches", "query_geometries"]
@@ -1,26 +1,180 @@
 """Async statistics/aggregation helpers for ArcGIS REST endpoints.
 
 Private submodule; all public names are re-exported by
-``restgdf.utils.getinfo`` to preserve import paths.
+``restgdf.utils.getinfo`` to preserve import paths, and :class:`Statistic`
+from the top-level ``restgdf`` package.
+
+Grouped statistics and distinct-value queries are paged like feature
+queries: a server answers at most ``maxRecordCount`` rows per request and
+sets ``exceededTransferLimit`` when there are more. :func:`_iter_record_pages`
+then pages through the rest with ``resultOffset``/``resultRecordCount``
+(ordered by ``orderByFields``: the group-by or distinct fields unless the
+caller sorted) until a page comes back complete. The number of pages is
+not known up front, so the offsets go out in rounds of 1, 2, 4, ... pages,
+at most ``max_concurrent_pages`` at a time: a short result costs few
+requests past its end, and a long one soon runs at full concurrency.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import json
+import warnings
+from array import array
+from collections.abc import AsyncGenerator, Iterable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Literal, get_args
 
 
 from restgdf._client._protocols import AsyncHTTPSession
 from restgdf._client.request import build_conservative_query_data
+from restgdf._compat import aclosing
+from restgdf._config import get_config
 from restgdf._models._drift import _parse_response
 from restgdf._models.responses import FeaturesResponse
+from restgdf.errors import PaginationInconsistencyWarning
+from restgdf.utils._concurrency import bounded_map
 from restgdf.utils._deprecations import deprecated_alias
-from restgdf.utils._http import _arcgis_request, default_headers, default_timeout
+from restgdf.utils._cache import _cached_json
+from restgdf.utils._http import default_headers, default_timeout
 from restgdf.utils._optional import require_pandas_dataframe
 
 if TYPE_CHECKING:
     from pandas import DataFrame
 
 
+StatisticType = Literal[
+    "count",
+    "sum",
+    "min",
+    "max",
+    "avg",
+    "stddev",
+    "var",
+    "percentile_cont",
+    "percentile_disc",
+    "count_distinct",
+]
+
+_STATISTIC_TYPES: frozenset[str] = frozenset(get_args(StatisticType))
+_PERCENTILE_TYPES: frozenset[str] = frozenset({"percentile_cont", "percentile_disc"})
+# No ArcGIS ``statisticType``; computed by the local engine only.
+_LOCAL_ONLY_TYPES: frozenset[str] = frozenset({"count_distinct"})
+
+
+@dataclass(frozen=True)
+class Statistic:
+    """One server-side statistic for :meth:`restgdf.FeatureLayer.aggregate`.
+
+    Attributes
+    ----------
+    statistic : {"count", "sum", "min", "max", "avg", "stddev", "var", \
+"percentile_cont", "percentile_disc", "count_distinct"}
+        ArcGIS ``statisticType``. ``"count_distinct"`` (approximate) has no
+        server equivalent and is only computed by the local engine.
+    field : str
+        Field the statistic is computed over (``onStatisticField``).
+    name : str or None
+        Output column (``outStatisticFieldName``). Defaults to
+        ``"<field>_<statistic>"``, or ``"<field>_p<percent>"`` for
+        percentiles (``"INCOME_p90"``).
+    percentile : float or None
+        Required for the percentile types, in ``[0, 1]``.
+    descending : bool
+        Rank percentile values in descending order. Defaults to ``False``.
+    """
+
+    statistic: StatisticType
+    field: str
+    name: str | None = None
+    percentile: float | None = None
+    descending: bool = False
+
+    def __post_init__(self) -> None:
+        if self.statistic not in _STATISTIC_TYPES:
+            raise ValueError(
+                f"statistic must be one of {sorted(_STATISTIC_TYPES)}, "
+                f"got {self.statistic!r}",
+            )
+        if not self.field:
+            raise ValueError("field must be a non-empty field name")
+        if self.statistic in _PERCENTILE_TYPES:
+            if self.percentile is None or not 0 <= self.percentile <= 1:
+                raise ValueError(
+                    f"{self.statistic} needs a percentile in [0, 1], "
+                    f"got {self.percentile!r}",
+                )
+        elif self.percentile is not None:
+            raise ValueError(f"percentile only applies to {sorted(_PERCENTILE_TYPES)}")
+
+    @property
+    def out_name(self) -> str:
+        """The output column name."""
+        if self.name is not None:
+            return self.name
+        if self.percentile is not None:
+            return f"{self.field}_p{self.percentile * 100:g}"
+        return f"{self.field}_{self.statistic}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the ``outStatistics`` entry for this statistic."""
+        spec: dict[str, Any] = {
+            "statisticType": self.statistic,
+            "onStatisticField": self.field,
+            "outStatisticFieldName": self.out_name,
+        }
+        if self.percentile is not None:
+            spec["statisticParameters"] = {
+                "value": self.percentile,
+                "orderBy": "DESC" if self.descending else "ASC",
+            }
+        return spec
+
+
+StatisticsSpec = Iterable[Statistic] | Mapping[str, "Statistic | tuple"]
+
+
+def _as_statistics(statistics: StatisticsSpec) -> list[Statistic]:
+    """Normalize ``statistics`` to a list of uniquely named :class:`Statistic`.
+
+    A mapping names each statistic by its key; its values are
+    :class:`Statistic` objects or ``(statistic, field[, percentile])``
+    tuples.
+    """
+    if isinstance(statistics, Mapping):
+        resolved = [
+            (
+                replace(spec, name=name)
+                if isinstance(spec, Statistic)
+                else Statistic(
+                    spec[0],
+                    spec[1],
+                    name=name,
+                    percentile=spec[2] if len(spec) > 2 else None,
+                )
+            )
+            for name, spec in statistics.items()
+        ]
+    else:
+        resolved = list(statistics)
+        for spec in resolved:
+            if not isinstance(spec, Statistic):
+                raise TypeError(
+                    f"statistics must be Statistic objects, got {spec!r}",
+                )
+    if not resolved:
+        raise ValueError("at least one statistic is required")
+    names = [spec.out_name.lower() for spec in resolved]
+    if len(set(names)) != len(names):
+        raise ValueError(f"statistic names must be unique, got {names!r}")
+    return resolved
+
+
+def _field_list(fields: str | Sequence[str] | None) -> list[str]:
+    if not fields:
+        return []
+    return [fields] if isinstance(fields, str) else list(fields)
+
+
 def _feature_attributes(feature: dict[str, Any]) -> dict[str, Any]:
     """Normalize a feature payload to its attributes dict."""
     return dict(feature.get("attributes") or {})
@@ -46,57 +200,351 @@ def _sorted_scalar_values(values: list[Any | None]) -> list[Any | None]:
         return sorted(raw_values, key=lambda value: (value is None, repr(value)))
 
 
-async def get_unique_values(
+async def _aggregate_records(
+    url: str,
+    statistics: Sequence[Statistic],
+    session: AsyncHTTPSession,
+    *,
+    group_by: Sequence[str] = (),
+    having: str | None = None,
+    order_by: str | Sequence[str] | None = None,
+    max_concurrent_pages: int | None = None,
+    **kwargs,
+) -> list[dict[str, Any]]:
+    """Run a statistics query and return every group's attributes.
+
+    See the module docstring for the paging. Only ``where`` and ``token``
+    are taken from ``kwargs["data"]`` (see
+    :func:`~restgdf._client.request.build_conservative_query_data`).
+    """
+    base: dict[str, Any] = {
+        "where": "1=1",
+        "f": "json",
+        "returnGeometry": False,
+    }
+    if group_by:
+        base["outFields"] = ",".join(group_by)
+    base["outStatistics"] = json.dumps(
+        [spec.to_dict() for spec in statistics],
+        separators=(",", ":"),
+    )
+    if group_by:
+        base["groupByFieldsForStatistics"] = ",".join(group_by)
+    if having:
+        base["havingClause"] = having
+    if order_by:
+        base["orderByFields"] = ",".join(_field_list(order_by))
+    data = build_conservative_query_data(base, kwargs.pop("data", None))
+    pages = _iter_record_pages(
+        url,
+        session,
+        data,
+        order_fields=group_by,
+        max_concurrent_pages=max_concurrent_pages,
+        **kwargs,
+    )
+    async with aclosing(pages):
+        return [record async for page in pages for record in page]
+
+
+async def _iter_record_pages(
+    url: str,
+    session: AsyncHTTPSession,
+    data: dict[str, Any],
+    *,
+    order_fields: Sequence[str],
+    max_concurrent_pages: int | None = None,
+    **kwargs,
+) -> AsyncGenerator[list[dict[str, Any]], None]:
+    """Yield the attributes of every page of a statistics or distinct query.
+
+    The first request is ``data`` as is. If the server flags it
+    ``exceededTransferLimit`` (and ``order_fields`` can order the rest),
+    the remaining pages are fetched as described in the module docstring.
+    """
+    if max_concurrent_pages is not None and max_concurrent_pages < 1:
+        raise ValueError(
+            f"max_concurrent_pages must be >= 1, got {max_concurrent_pages!r}",
+        )
+    kwargs.setdefault("timeout", default_timeout())
+    headers = default_headers(kwargs.pop("headers", None))
+
+    async def fetch(body: dict[str, Any]) -> FeaturesResponse:
+        raw = await _cached_json(
+            "stats",
+            session,
+            f"{url}/query",
+            body,
+            headers=headers,
+            **kwargs,
+        )
+        return _parse_response(FeaturesResponse, raw, context=f"{url}/query")
+
+    first = await fetch(data)
+    records = [_feature_attributes(feature) for feature in first.features or []]
+    if not first.exceeded_transfer_limit or not order_fields:
+        yield records
+        return
+    page_size = len(records)
+    if page_size == 0:
+        _warn_stalled(url)
+        return
+    start = page_size
+    if "orderByFields" in data:
+        yield records
+    else:
+        # Offsets are only stable under an explicit order, which the first
+        # page did not have: page from the start again in field order.
+        data = {**data, "orderByFields": ",".join(order_fields)}
+        start = 0
+    del records
+
+    async def fetch_page(offset: int) -> FeaturesResponse:
+        return await fetch(
+            {**data, "resultOffset": offset, "resultRecordCount": page_size},
+        )
+
+    limit = max_concurrent_pages or get_config().concurrency.max_concurrent_requests
+    # The page count is unknown, and a page past the end is a wasted
+    # request: each round fetches twice the pages of the last one.
+    window = 1
+    while True:
+        offsets = range(start, start + window * page_size, page_size)
+        pages = bounded_map(fetch_page, offsets, limit=min(window, limit))
+        async with aclosing(pages):
+            async for page in pages:
+                features = page.features or []
+                yield [_feature_attributes(feature) for feature in features]
+                if not page.exceeded_transfer_limit:
+                    return
+                if not features:
+                    _warn_stalled(url)
+                    return
+        start += window * page_size
+        window *= 2
+
+
+def _warn_stalled(url: str) -> None:
+    warnings.warn(
+        f"{url}/query returned an empty statistics page with "
+        "exceededTransferLimit=true; the grouped result is incomplete.",
+        PaginationInconsistencyWarning,
+        stacklevel=3,
+    )
+
+
+def _named_columns(
+    records: list[dict[str, Any]],
+    names: Sequence[str],
+) -> list[dict[str, Any]]:
+    """Rename keys that match ``names`` case-insensitively to ``names``.
+
+    Some backends return ``outStatisticFieldName`` (and group fields) in a
+    different case than requested.
+    """
+    canonical = {name.lower(): name for name in names}
+    return [
+        {canonical.get(key.lower(), key): value for key, value in record.items()}
+        for record in records
+    ]
+
+
+async def aggregate(
+    url: str,
+    statistics: StatisticsSpec,
+    session: AsyncHTTPSession,
+    group_by: str | Sequence[str] | None = None,
+    *,
+    having: str | None = None,
+    order_by: str | Sequence[str] | None = None,
+    as_frame: bool = False,
+    max_concurrent_pages: int | None = None,
+    **kwargs,
+) -> list[dict[str, Any]] | DataFrame:
+    """Compute grouped statistics on the server.
+
+    Parameters
+    ----------
+    url : str
+        Layer URL.
+    statistics : iterable of Statistic, or mapping
+        The statistics to compute. A mapping names each output column by
+        its key, e.g. ``{"total": ("sum", "POP"), "p90": ("percentile_cont",
+        "INCOME", 0.9)}``.
+    session : AsyncHTTPSession
+        HTTP session.
+    group_by : str or sequence of str, optional
+        Group-by fields (``groupByFieldsForStatistics``). Without them the
+        result is one row over all matching features.
+    having : str, optional
+        ``havingClause`` filtering the groups, e.g. ``"SUM(POP) > 1000"``.
+    order_by : str or sequence of str, optional
+        ``orderByFields``, e.g. ``"total DESC"``. Defaults to the group-by
+        fields once the result needs more than one page.
+    as_frame : bool
+        Return a :class:`pandas.DataFrame` instead of a list of dicts.
+    max_concurrent_pages : int, optional
+        Pages of a multi-page result in flight at once. Defaults to
+        ``ConcurrencyConfig.max_concurrent_requests``.
+    **kwargs
+        Request kwargs; ``data`` contributes its ``where`` and ``token``.
+
+    Returns
+    -------
+    list of dict or DataFrame
+        One row per group: the group-by fields, then the statistics.
+
+    Raises
+    ------
+    ValueError
+        If a statistic is local-only (``count_distinct``); use
+        :meth:`restgdf.FeatureLayer.aggregate` or
+        :func:`~restgdf.utils.getinfo.aggregate_batches` for those.
+    """
+    specs = _as_statistics(statistics)
+    local_only = [
+        spec.out_name for spec in specs if spec.statistic in _LOCAL_ONLY_TYPES
+    ]
+    if local_only:
+        raise ValueError(
+            f"statistics {local_only!r} have no server-side equivalent; "
+            "aggregate them locally",
+        )
+    group_fields = _field_list(group_by)
+    if as_frame:
+        require_pandas_dataframe("aggregate(as_frame=True)")
+    records = await _aggregate_records(
+        url,
+        specs,
+        session,
+        group_by=group_fields,
+        having=having,
+        order_by=order_by,
+        max_concurrent_pages=max_concurrent_pages,
+        **kwargs,
+    )
+    columns = [*group_fields, *(spec.out_name for spec in specs)]
+    rows = _named_columns(records, columns)
+    if not as_frame:
+        return rows
+    return _records_to_frame(rows, feature="aggregate(as_frame=True)", columns=columns)
+
+
+async def iter_unique_values(
     url: str,
     fields: tuple | str,
     session: AsyncHTTPSession,
-    sortby: str | None = None,
+    *,
+    max_concurrent_pages: int | None = None,
     **kwargs,
-) -> list | DataFrame:
-    """Get the unique values for a field."""
-    if not isinstance(fields, str) and len(fields) > 1:
-        require_pandas_dataframe("get_unique_values() with multiple fields")
+) -> AsyncGenerator[list, None]:
+    """Yield the distinct values of ``fields`` one server page at a time.
 
+    A ``returnDistinctValues`` query stops at the server's
+    ``maxRecordCount``; the rest is paged like a grouped statistics query
+    (see the module docstring), ordered by ``fields``.
+
+    Parameters
+    ----------
+    url : str
+        Layer URL.
+    fields : str or tuple of str
+        One field, or several for distinct combinations.
+    session : AsyncHTTPSession
+        HTTP session.
+    max_concurrent_pages : int, optional
+        Pages in flight at once. Defaults to
+        ``ConcurrencyConfig.max_concurrent_requests``.
+    **kwargs
+        Request kwargs; ``data`` contributes its ``where`` and ``token``.
+
+    Yields
+    ------
+    list
+        Values for a single field (or a 1-tuple), attribute dicts for
+        several fields.
+    """
+    field_list = _field_list(fields)
     datadict = build_conservative_query_data(
         {
             "where": "1=1",
             "f": "json",
             "returnGeometry": False,
             "returnDistinctValues": True,
-            "outFields": fields if isinstance(fields, str) else ",".join(fields),
+            "outFields": ",".join(field_list),
         },
         kwargs.get("data"),
     )
-
     xkwargs: dict = {k: v for k, v in kwargs.items() if k != "data"}
-    xkwargs.setdefault("timeout", default_timeout())
-
-    response = await _arcgis_request(
+    pages = _iter_record_pages(
+        url,
         session,
-        f"{url}/query",
         datadict,
-        headers=default_headers(xkwargs.pop("headers", None)),
+        order_fields=field_list,
+        max_concurrent_pages=max_concurrent_pages,
         **xkwargs,
     )
-    raw = await response.json(content_type=None)
-    envelope = _parse_response(FeaturesResponse, raw, context=f"{url}/query")
-    features = envelope.features or []
-    records = [_feature_attributes(feature) for feature in features]
-
-    if isinstance(fields, str):
-        res_l = [record.get(fields) for record in records]
-        if sortby and sortby == fields:
-            res_l = _sorted_scalar_values(res_l)
-        return res_l
-
-    if len(fields) == 1:
-        res_l = [record.get(fields[0]) for record in records]
-        if sortby and sortby == fields[0]:
-            res_l = _sorted_scalar_values(res_l)
-        return res_l
+    async with aclosing(pages):
+        async for records in pages:
+            if len(field_list) == 1:
+                yield [record.get(field_list[0]) for record in records]
+            else:
+                yield records
+
+
+def _compact_array(values: Sequence[Any]) -> array:
+    """Pack numeric ``values`` into an ``array('q')`` or ``array('d')``."""
+    if all(type(value) is int for value in values):
+        return array("q", values)
+    if all(type(value) in (int, float) for value in values):
+        return array("d", values)
+    raise TypeError(
+        "as_array=True needs int or float values without nulls; use the "
+        "default list for other field types",
+    )
+
+
+async def get_unique_values(
+    url: str,
+    fields: tuple | str,
+    session: AsyncHTTPSession,
+    sortby: str | None = None,
+    *,
+    as_array: bool = False,
+    max_concurrent_pages: int | None = None,
+    **kwargs,
+) -> list | array | DataFrame:
+    """Get the unique values for a field.
+
+    Every distinct value is returned, paging past ``maxRecordCount`` (see
+    :func:`iter_unique_values`). With ``as_array=True`` a single numeric
+    field comes back as a compact :class:`array.array` (``"q"`` for
+    integers, ``"d"`` for floats) instead of a list.
+    """
+    multiple = not isinstance(fields, str) and len(fields) > 1
+    if multiple:
+        require_pandas_dataframe("get_unique_values() with multiple fields")
+        if as_array:
+            raise ValueError("as_array=True needs a single field")
+
+    pages = iter_unique_values(
+        url,
+        fields,
+        session,
+        max_concurrent_pages=max_concurrent_pages,
+        **kwargs,
+    )
+    async with aclosing(pages):
+        results = [value async for page in pages for value in page]
+
+    if not multiple:
+        field = fields if isinstance(fields, str) else fields[0]
+        if sortby and sortby == field:
+            results = _sorted_scalar_values(results)
+        return _compact_array(results) if as_array else results
 
     res_df = _records_to_frame(
-        records,
+        results,
         feature="get_unique_values() with multiple fields",
         columns=list(fields),
     )
@@ -113,37 +561,18 @@ async def get_value_counts(
 ) -> DataFrame:
     """Get the value counts for a field."""
     require_pandas_dataframe("get_value_counts()")
-    statstr = f'[{{"statisticType":"count","onStatisticField":"{field}","outStatisticFieldName":"{field}_count"}}]'
     # W5-2 (API-01): conservative merge -- forward ONLY ``where``+``token``
     # from the caller data so the instance ``datadict`` (returnGeometry=True /
     # outFields="*" / returnCountOnly=False) cannot clobber the stats flags,
     # while the user's WHERE filter is preserved.
-    data = build_conservative_query_data(
-        {
-            "where": "1=1",
-            "f": "json",
-            "returnGeometry": False,
-            "outFields": field,
-            "outStatistics": statstr,
-            "groupByFieldsForStatistics": field,
-        },
-        kwargs.pop("data", None),
-    )
-    kwargs.setdefault("timeout", default_timeout())
-    response = await _arcgis_request(
+    records = await _aggregate_records(
+        url,
+        [Statistic("count", field, name=f"{field}_count")],
         session,
-        f"{url}/query",
-        data,
-        headers=default_headers(kwargs.pop("headers", None)),
+        group_by=[field],
         **kwargs,
     )
-    raw = await response.json(content_type=None)
-    envelope = _parse_response(FeaturesResponse, raw, context=f"{url}/query")
-    features = envelope.features or []
-    cc = _records_to_frame(
-        [_feature_attributes(feature) for feature in features],
-        feature="get_value_counts()",
-    )
+    cc = _records_to_frame(records, feature="get_value_counts()")
     if cc.empty:
         return cc.reindex(columns=[field, f"{field}_count"])
     return cc.sort_values(f"{field}_count", ascending=False).reset_index(drop=True)
@@ -169,43 +598,15 @@ async def nested_count(
             "nested_count requires exactly two field names; got "
             f"{len(field_list)}: {field_list!r}",
         )
-    statstr = "".join(
-        (
-            "[",
-            ",".join(
-                f'{{"statisticType":"count","onStatisticField":"{f}","outStatisticFieldName":"{f}_count"}}'
-                for f in fields
-            ),
-            "]",
-        ),
-    )
     # W5-2 (API-01): conservative merge -- see get_value_counts above.
-    data = build_conservative_query_data(
-        {
-            "where": "1=1",
-            "f": "json",
-            "returnGeometry": False,
-            "outFields": ",".join(fields),
-            "outStatistics": statstr,
-            "groupByFieldsForStatistics": ",".join(fields),
-        },
-        kwargs.pop("data", None),
-    )
-    kwargs.setdefault("timeout", default_timeout())
-    response = await _arcgis_request(
+    records = await _aggregate_records(
+        url,
+        [Statistic("count", f, name=f"{f}_count") for f in field_list],
         session,
-        f"{url}/query",
-        data,
-        headers=default_headers(kwargs.pop("headers", None)),
+        group_by=field_list,
         **kwargs,
     )
-    raw = await response.json(content_type=None)
-    envelope = _parse_response(FeaturesResponse, raw, context=f"{url}/query")
-    features = envelope.features or []
-    cc = _records_to_frame(
-        [_feature_attributes(feature) for feature in features],
-        feature="nested_count()",
-    )
+    cc = _records_to_frame(records, feature="nested_count()")
     if cc.empty:
         return cc.reindex(columns=[*fields, "Count"])
     dropcol = [c for c in cc.columns if c.startswith(f"{fields[0]}_count")][0]
@@ -0,0 +1,161 @@
+"""Compiled per-stream request template for paged ``/query`` reads.
+
+Private submodule; consumed by :func:`restgdf.utils.getgdf._iter_pages_raw`
+and :func:`restgdf.utils._http._arcgis_request`.
+
+Every page of a stream is the same request with a different
+``resultOffset`` (or OID predicate), yet a plain
+:func:`~restgdf.utils._http._arcgis_request` call redoes all of the
+per-request work for each one: merging the default headers (which reads
+:func:`~restgdf.get_config`), building an :class:`aiohttp.ClientTimeout`,
+walking the session's ``_inner`` chain for its token transport and auth
+scope, and canonically encoding the whole body -- once to measure it for
+the ``GET``/``POST`` decision and again to send it.
+
+A :class:`RequestTemplate` does that work once per stream. It snapshots
+the headers, timeout and remaining request kwargs, the verb policy and
+the ``cacheHint`` decision, and pre-encodes the keys every page shares.
+Each page then only encodes the keys that differ from the shared part,
+appends them to the pre-encoded shared query string and sends the
+finished URL, so ``aiohttp`` has no params mapping to encode again. Within
+a stream a page's URL is stable: shared keys first, then its own, each
+part in canonical order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Literal
+
+from restgdf._client._priority import _classify, _rank
+from restgdf._config import get_config
+from restgdf.utils._canonical import _canonical_query_string
+from restgdf.utils._http import (
+    _ARCGIS_URL_BODY_LIMIT,
+    _arcgis_request,
+    _session_requires_body_transport,
+    _with_cache_hint,
+    default_headers,
+    default_timeout,
+)
+
+_MISSING = object()
+
+
+class RequestTemplate:
+    """What every page request of one stream has in common.
+
+    Parameters
+    ----------
+    session : AsyncHTTPSession
+        The stream's session.
+    url : str
+        The ``/query`` endpoint.
+    bodies : sequence of mapping
+        The stream's page bodies; keys with the same value in every body
+        form the pre-encoded shared part.
+    **kwargs
+        Request kwargs as passed to ``_fetch_page_dict`` (``headers``,
+        ``timeout``, ...); ``data`` is ignored.
+    """
+
+    __slots__ = (
+        "_encoded",
+        "_extra",
+        "_kind",
+        "_kwargs",
+        "_post",
+        "_shared",
+        "session",
+        "url",
+    )
+
+    def __init__(
+        self,
+        session: Any,
+        url: str,
+        bodies: Sequence[Mapping[str, Any]],
+        **kwargs: Any,
+    ) -> None:
+        kwargs = {k: v for k, v in kwargs.items() if k != "data"}
+        kwargs.setdefault("timeout", default_timeout())
+        kwargs["headers"] = default_headers(kwargs.pop("headers", None))
+        self.session = session
+        self.url = url
+        self._kwargs = kwargs
+
+        shared = dict(bodies[0]) if bodies else {}
+        for body in bodies[1:]:
+            for key in [k for k in shared if body.get(k, _MISSING) != shared[k]]:
+                del shared[key]
+        self._extra: dict[str, Any] = {}
+        if get_config().transport.cache_hint:
+            hinted = _with_cache_hint(session, url, shared)
+            if hinted is not shared:
+                self._extra = {"cacheHint": True}
+                shared = {**shared, **self._extra}
+        self._shared = shared
+        self._encoded = _canonical_query_string(shared)
+        self._post = _session_requires_body_transport(session) or "token" in shared
+        self._kind = _classify(url, shared)
+
+    @property
+    def priority(self) -> int:
+        """The pages' priority rank (a pinned class still wins)."""
+        return _rank(self._kind)
+
+    async def send(self, body: Mapping[str, Any]) -> Any:
+        """Send one page ``body`` through :func:`_arcgis_request`.
+
+        ``body`` is one of the compiled bodies; any other body is encoded
+        in full.
+        """
+        if self._extra:
+            body = {**body, **self._extra}
+        return await _arcgis_request(
+            self.session,
+            self.url,
+            body,
+            template=self,
+            **self._kwargs,
+        )
+
+    def _prepare(
+        self,
+        body: Mapping[str, Any],
+    ) -> tuple[Literal["POST", "GET"], str | None]:
+        """Return the verb for ``body`` and, for ``GET``, its encoded URL.
+
+        A compiled body is the pre-encoded shared part plus its own keys,
+        encoded here; any other body is encoded in full.
+        """
+        if self._post or "token" in body:
+            return "POST", None
+        varying: dict[str, Any] = {}
+        present = 0
+        for key, value in body.items():
+            shared = self._shared.get(key, _MISSING)
+            if shared is _MISSING:
+                varying[key] = value
+            elif shared == value:
+                present += 1
+            else:
+                break
+        else:
+            if present == len(self._shared):
+                tail = _canonical_query_string(varying)
+                query = "&".join(part for part in (self._encoded, tail) if part)
+                return self._target(query)
+        return self._target(_canonical_query_string(body))
+
+    def _target(self, query: str) -> tuple[Literal["POST", "GET"], str | None]:
+        target = f"{self.url}?{query}" if query else self.url
+        if len(target) > _ARCGIS_URL_BODY_LIMIT:
+            return "POST", None
+        return "GET", target
+
+    def __repr__(self) -> str:
+        return f"RequestTemplate(url={self.url!r}, shared={sorted(self._shared)!r})"
+
+
+__all__ = ["RequestTemplate"]
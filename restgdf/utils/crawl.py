@@ -12,10 +12,13 @@ from typing import Any
 
 from pydantic import BaseModel
 
+from restgdf._client._priority import _default_priority
 from restgdf._client._protocols import AsyncHTTPSession
 from restgdf._models.crawl import CrawlError, CrawlReport, CrawlServiceEntry
 from restgdf._models.responses import LayerMetadata
 from restgdf._config import get_config
+from restgdf.utils._concurrency import _scheduled, bounded_as_completed
+from restgdf.utils._deadline import deadline as _deadline_scope
 from restgdf.utils.getinfo import service_metadata, get_metadata
 
 
@@ -26,6 +29,7 @@ def _to_plain_dict(value: Any) -> dict:
     return dict(value)
 
 
+@_default_priority("crawl")
 async def fetch_all_data(
     session: AsyncHTTPSession,
     base_url: str,
@@ -36,17 +40,17 @@ async def fetch_all_data(
     # BL-01: one BoundedSemaphore per top-level orchestration call, shared
     # with every nested ``service_metadata`` call so the cap is truly global
     # per request (plan.md §3c R-18/R-44, kickoff §10.3). The outer
-    # fan-out uses plain ``asyncio.gather`` because the cap is enforced at
-    # the nested ``service_metadata`` fan-out and at the directory-level
-    # ``get_metadata`` calls below — wrapping outer tasks in the same sem
-    # would double-acquire (``asyncio.Semaphore`` is not re-entrant).
-    _sem = asyncio.BoundedSemaphore(
-        get_config().concurrency.max_concurrent_requests,
-    )
+    # fan-out only bounds how many services are in progress at once, because
+    # the cap is enforced at the nested ``service_metadata`` fan-out and at
+    # the directory-level ``get_metadata`` calls below — wrapping outer tasks
+    # in the same sem would double-acquire (``asyncio.Semaphore`` is not
+    # re-entrant).
+    max_concurrent = get_config().concurrency.max_concurrent_requests
+    _sem = asyncio.BoundedSemaphore(max_concurrent)
 
     # Retrieve the initial list of folders and services
     try:
-        async with _sem:
+        async with _sem, _scheduled(base_url):
             base_metadata = _to_plain_dict(
                 await get_metadata(base_url, session, token),
             )
@@ -68,7 +72,7 @@ async def fetch_all_data(
     for folder in base_metadata.get("folders") or []:
         folder_url = f"{base_url}/{folder}"
         try:
-            async with _sem:
+            async with _sem, _scheduled(folder_url):
                 folder_metadata = _to_plain_dict(
                     await get_metadata(folder_url, session, token),
                 )
@@ -92,20 +96,18 @@ async def fetch_all_data(
         except Exception as e:
             return {"error": e}
 
-    # Fetch all layers concurrently
-    service_metadata_tasks = [
-        _service_metadata(
+    # Fetch all layers concurrently, at most ``max_concurrent`` services at a
+    # time, storing each result as it arrives.
+    async for i, service_data in bounded_as_completed(
+        lambda service: _service_metadata(
             session,
             service["url"],
             token,
             return_feature_count=return_feature_count,
-        )
-        for service in services_list
-    ]
-    service_metadata_results = await asyncio.gather(*service_metadata_tasks)
-
-    # Combine service_metadata_results with service names
-    for i, service_data in enumerate(service_metadata_results):
+        ),
+        services_list,
+        limit=max_concurrent,
+    ):
         services_list[i]["metadata"] = service_data
 
     return {
@@ -124,11 +126,14 @@ def _as_layer_metadata(raw: Any) -> LayerMetadata:
     return LayerMetadata.model_validate(raw)
 
 
+@_default_priority("crawl")
 async def safe_crawl(
     session: AsyncHTTPSession,
     base_url: str,
     token: str | None = None,
     return_feature_count: bool = False,
+    *,
+    deadline: float | None = None,
 ) -> CrawlReport:
     """Crawl an ArcGIS REST directory and aggregate results + errors.
 
@@ -144,6 +149,22 @@ async def safe_crawl(
     ``service_metadata`` call). When a folder's metadata fails, services
     discovered in earlier folders (and the base) are still returned.
 
+    With a :class:`~restgdf.resilience.ResilientSession` whose circuit
+    breaker is on (``ResilienceConfig.breaker_failure_threshold``), services
+    on a host that has gone down are recorded as ``CrawlError`` entries
+    carrying a :class:`~restgdf.errors.CircuitOpenError` as soon as the
+    breaker opens, instead of each waiting out the full retry schedule.
+
+    Crawl requests run in the ``"crawl"`` priority class, behind metadata,
+    count and page requests sharing the same session, unless the caller
+    pinned another class with :func:`~restgdf.request_priority`.
+
+    ``deadline`` bounds the whole crawl to that many seconds (see
+    :func:`restgdf.deadline`). Services still unfinished when it runs out
+    are recorded as ``CrawlError`` entries carrying a
+    :class:`~restgdf.errors.DeadlineExceededError`; the services finished
+    before it are returned as usual.
+
     **Per-layer failures are NOT ``CrawlError`` entries.** Since 3.3, a
     layer whose metadata call fails is contained *inside*
     ``service_metadata`` (H2-1) so its siblings survive: the service still
@@ -162,20 +183,29 @@ async def safe_crawl(
             if getattr(layer, "layer_error", None)
         ]
     """
+    with _deadline_scope(deadline):
+        return await _safe_crawl(session, base_url, token, return_feature_count)
+
+
+async def _safe_crawl(
+    session: AsyncHTTPSession,
+    base_url: str,
+    token: str | None,
+    return_feature_count: bool,
+) -> CrawlReport:
     errors: list[CrawlError] = []
     services_raw: list[dict[str, Any]] = []
 
     # BL-01: one BoundedSemaphore per top-level orchestration call, shared
     # with every nested ``service_metadata`` call so the cap is truly global
     # per request (plan.md §3c R-18/R-44, kickoff §10.3). The outer
-    # ``asyncio.gather`` below is NOT wrapped in this sem because nested
+    # ``bounded_as_completed`` below is NOT wrapped in this sem because nested
     # orchestrators re-acquire it; ``asyncio.Semaphore`` is not re-entrant.
-    _sem = asyncio.BoundedSemaphore(
-        get_config().concurrency.max_concurrent_requests,
-    )
+    max_concurrent = get_config().concurrency.max_concurrent_requests
+    _sem = asyncio.BoundedSemaphore(max_concurrent)
 
     try:
-        async with _sem:
+        async with _sem, _scheduled(base_url):
             base_metadata: dict[str, Any] = _to_plain_dict(
                 await get_metadata(base_url, session, token),
             )
@@ -197,7 +227,7 @@ async def safe_crawl(
     for folder in base_metadata.get("folders") or []:
         folder_url = f"{base_url}/{folder}"
         try:
-            async with _sem:
+            async with _sem, _scheduled(folder_url):
                 folder_metadata = _to_plain_dict(
                     await get_metadata(folder_url, session, token),
                 )
@@ -228,7 +258,13 @@ async def safe_crawl(
             errors.append(_make_error("service_metadata", url, exc))
             return None
 
-    results = await asyncio.gather(*(_svc(svc["url"]) for svc in services_raw))
+    results: list[Any] = [None] * len(services_raw)
+    async for index, result in bounded_as_completed(
+        lambda svc: _svc(svc["url"]),
+        services_raw,
+        limit=max_concurrent,
+    ):
+        results[index] = result
     service_entries: list[CrawlServiceEntry] = []
     for entry, result in zip(services_raw, results):
         service_entries.append(
@@ -5,21 +5,26 @@ from __future__ import annotations
 import asyncio
 import io
 import json
+import logging
 import math
 import warnings
-from asyncio import gather
 from collections.abc import AsyncGenerator, Mapping
 from functools import reduce
 from typing import TYPE_CHECKING, Any, Literal, cast
 
 from aiohttp import ClientSession, TCPConnector
 
+from restgdf._client._pool import pooled_session
+from restgdf._client._priority import _rank
+from restgdf._compat import aclosing
 from restgdf._client._protocols import AsyncHTTPSession
 from restgdf._config import get_config
-from restgdf._logging import get_logger
+from restgdf._logging import build_log_extra, get_logger
 from restgdf._models._drift import _parse_response
+from restgdf._models.pagination import PageFailure
 from restgdf._models.responses import FeaturesResponse, LayerMetadata
 from restgdf.errors import (
+    DeadlineExceededError,
     FieldDoesNotExistError,
     PaginationError,
     PaginationInconsistencyWarning,
@@ -36,7 +41,15 @@ from restgdf.utils.getinfo import (
     get_object_ids,
     supports_pagination,
 )
+from restgdf.utils._concurrency import bounded_as_completed, bounded_map
+from restgdf.utils._deadline import deadline as _deadline_scope
+from restgdf.utils._hedging import HedgePolicy, _hedged_call, _HedgeState
 from restgdf.utils._http import _arcgis_request, default_timeout
+from restgdf.utils._page_retry import (
+    PageRetryPolicy,
+    _run_page_attempts,
+)
+from restgdf.utils._retry_budget import RetryBudget, _scoped_retry_budget
 from restgdf.utils._metadata import (
     normalize_spatial_reference,
     supports_pagination_explicitly,
@@ -49,6 +62,9 @@ from restgdf.utils._optional import (
     require_pyogrio_list_drivers,
 )
 from restgdf.utils._pagination import build_pagination_plan
+from restgdf.utils._prewarm import _prewarm
+from restgdf.utils._resolution import _QuantizedStats, decode_quantized
+from restgdf.utils._template import RequestTemplate
 from restgdf.utils.utils import where_var_in_list
 
 if TYPE_CHECKING:
@@ -95,6 +111,8 @@ async def _get_sub_features(
         **kwargs,
     )
     raw = await response.json(content_type=None)
+    if isinstance(raw, dict):
+        raw = decode_quantized(raw)
     envelope = _parse_response(FeaturesResponse, raw, context=f"{url}/query")
     if envelope.exceeded_transfer_limit:
         raise PaginationError(
@@ -113,54 +131,24 @@ async def _feature_batch_generator(
 ) -> AsyncGenerator[list[dict[str, Any]]]:
     """Yield raw ArcGIS feature batches without requiring pandas/geopandas."""
     query_data_batches = await get_query_data_batches(url, session, **kwargs)
-    max_inflight = get_config().concurrency.max_concurrent_requests
-    batch_iter = iter(enumerate(query_data_batches))
-    tasks: set[asyncio.Task] = set()
-    task_order: dict[asyncio.Task, int] = {}
-
-    def _submit_next() -> asyncio.Task | None:
-        try:
-            idx, query_data = next(batch_iter)
-        except StopIteration:
-            return None
-        task = asyncio.create_task(
-            get_sub_features(
+    async with aclosing(
+        bounded_map(
+            lambda batch: get_sub_features(
                 url,
                 session,
-                query_data=query_data,
-                batch_index=idx,
+                query_data=batch[1],
+                batch_index=batch[0],
                 **kwargs,
             ),
-        )
-        tasks.add(task)
-        task_order[task] = idx
-        return task
-
-    try:
-        for _ in range(max_inflight):
-            task = _submit_next()
-            if task is None:
-                break
-
-        while tasks:
-            done, pending = await asyncio.wait(
-                tasks,
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            tasks = set(pending)
-            completed_batches: list[list[dict[str, Any]]] = []
-            for task in sorted(done, key=task_order.__getitem__):
-                replacement = _submit_next()
-                if replacement is not None:
-                    tasks.add(replacement)
-                completed_batches.append(await task)
-                task_order.pop(task, None)
-            for feature_batch in completed_batches:
-                yield feature_batch
-    finally:
-        for task in tasks:
-            if not task.done():
-                task.cancel()
+            enumerate(query_data_batches),
+            limit=get_config().concurrency.max_concurrent_requests,
+            ordered=False,
+            flow=url,
+            priority=_rank("pages"),
+        ),
+    ) as feature_batches:
+        async for feature_batch in feature_batches:
+            yield feature_batch
 
 
 def get_sub_features(*args, **kwargs):
@@ -277,6 +265,10 @@ async def get_query_data_batches(
     setting ``exceededTransferLimit=true`` are flagged with
     ``PaginationInconsistencyWarning`` (R-73) from the internal page
     resolver; see that helper for details.
+
+    With ``TransportConfig.cache_hint`` every offset page asks for a full
+    page, the last one included, so page queries stay byte-identical (and
+    edge-cacheable) across runs while the layer's count changes.
     """
     request_data = dict(kwargs.get("data") or {})
     feature_count = await get_feature_count(url, session, **kwargs)
@@ -298,13 +290,18 @@ async def get_query_data_batches(
         # remedy for reliable resultOffset paging). Resolved once; skipped when
         # the caller sorted or the OID is unresolvable (see helper).
         order_by = _resolve_order_by_oid(request_data, metadata)
+        aligned = get_config().transport.cache_hint
         if isinstance(requested_page_size, int) and requested_page_size > 0:
             return [
                 {
                     **request_data,
                     **order_by,
                     "resultOffset": offset,
-                    "resultRecordCount": min(page_size, feature_count - offset),
+                    "resultRecordCount": (
+                        page_size
+                        if aligned
+                        else min(page_size, feature_count - offset)
+                    ),
                 }
                 for offset in range(0, feature_count, page_size)
             ]
@@ -315,6 +312,8 @@ async def get_query_data_batches(
         advertised_factor = _advertised_max_record_count_factor(metadata)
         if advertised_factor is not None:
             planner_kwargs["advertised_factor"] = advertised_factor
+        if aligned:
+            planner_kwargs["aligned"] = True
         plan = build_pagination_plan(
             feature_count,
             max_record_count,
@@ -348,13 +347,24 @@ async def get_sub_gdf(
     url: str,
     session: AsyncHTTPSession,
     query_data: dict,
+    *,
+    allow_truncated: bool = False,
     **kwargs,
 ) -> GeoDataFrame:
+    """Fetch one query page as a GeoDataFrame.
+
+    A page the server cut short (``exceededTransferLimit``) raises
+    :class:`~restgdf.errors.PaginationError` unless ``allow_truncated``:
+    a deliberately short read such as ``resultRecordCount=n`` sets the
+    flag whenever more rows match.
+    """
     _require_geo_query_support("get_sub_gdf()")
     data = dict(query_data)
     gdfdriver = "ESRIJSON" if "ESRIJSON" in _get_supported_drivers() else "GeoJSON"
     if gdfdriver == "GeoJSON":
         data["f"] = "GeoJSON"
+        # Quantization is an f=json feature; GeoJSON keeps full coordinates.
+        data.pop("quantizationParameters", None)
     kwargs = {k: v for k, v in kwargs.items() if k != "data"}
     kwargs.setdefault("timeout", default_timeout())
 
@@ -380,7 +390,15 @@ async def get_sub_gdf(
         # read_file, which will surface its own parse error rather than a
         # misleading truncation raise.
         raw = None
-    if isinstance(raw, dict) and raw.get("exceededTransferLimit") is True:
+    if isinstance(raw, dict) and "transform" in raw:
+        # read_file cannot undo quantization; hand it plain coordinates.
+        raw = decode_quantized(raw)
+        text = json.dumps(raw)
+    if (
+        not allow_truncated
+        and isinstance(raw, dict)
+        and raw.get("exceededTransferLimit") is True
+    ):
         raise PaginationError(
             f"{url}/query returned exceededTransferLimit=true; the GeoDataFrame "
             "page is incomplete and rows are missing.",
@@ -394,40 +412,125 @@ async def get_sub_gdf(
     return sub_gdf
 
 
+def _check_on_page_error(on_page_error: str) -> None:
+    if on_page_error not in ("raise", "collect"):
+        raise ValueError(
+            f"on_page_error must be 'raise' or 'collect'; got {on_page_error!r}",
+        )
+
+
+def _record_page_failure(
+    url: str,
+    batch_index: int,
+    query_data: Mapping[str, Any],
+    error: Exception,
+    attempts: int,
+    sink: list[PageFailure] | None,
+) -> PageFailure:
+    """Build a :class:`PageFailure`, log it, and append it to ``sink``."""
+    failure = PageFailure(
+        batch_index=batch_index,
+        url=f"{url}/query",
+        query_data={k: v for k, v in query_data.items() if k != "token"},
+        attempts=attempts,
+        message=str(error) or type(error).__name__,
+        exception=error,
+    )
+    get_logger("pagination").warning(
+        "page %d of url=%s failed after %d attempt(s) and was skipped "
+        "(on_page_error='collect'): %s",
+        batch_index,
+        url,
+        attempts,
+        failure.message,
+        extra=build_log_extra(
+            operation="page_failure",
+            page_index=batch_index,
+            retry_attempt=attempts,
+            exception_type=type(error).__name__,
+        ),
+    )
+    if sink is not None:
+        sink.append(failure)
+    return failure
+
+
 async def get_gdf_list(
     url: str,
     session: AsyncHTTPSession,
+    *,
+    on_page_error: Literal["raise", "collect"] = "raise",
+    page_retry: PageRetryPolicy | None = None,
+    page_failures: list[PageFailure] | None = None,
     **kwargs,
 ) -> list[GeoDataFrame]:
+    """Fetch every page of the layer as a list of GeoDataFrames.
+
+    ``page_retry`` retries each failed page (request, body read and
+    decode) under its own policy. With ``on_page_error="raise"`` (the
+    default) the first page that still fails cancels the remaining pages
+    and raises. With ``"collect"`` the rest of the plan still runs: the
+    successful pages are returned in plan order and each failed page is
+    appended to ``page_failures`` as a :class:`restgdf.PageFailure`.
+    Under a :func:`restgdf.deadline` a raised
+    :class:`~restgdf.errors.DeadlineExceededError` carries the number of
+    pages already fetched in ``completed``; in ``"collect"`` mode the pages
+    cut off by the deadline are reported as failures.
+    """
     _require_geo_query_support("get_gdf_list()")
+    _check_on_page_error(on_page_error)
     query_data_batches = await get_query_data_batches(url, session, **kwargs)
-    sem = asyncio.BoundedSemaphore(get_config().concurrency.max_concurrent_requests)
-    tasks = [
-        asyncio.create_task(
-            _run_get_sub_gdf_bounded(url, session, sem, query_data, **kwargs),
-        )
-        for query_data in query_data_batches
-    ]
-    try:
-        gdf_list = await gather(*tasks)
-        return gdf_list
-    except Exception:
-        for task in tasks:
-            if not task.done():
-                task.cancel()
-        await gather(*tasks, return_exceptions=True)
-        raise
 
+    async def _fetch(
+        batch: tuple[int, dict],
+    ) -> tuple[GeoDataFrame | None, Exception | None, int]:
+        batch_index, query_data = batch
+        return await _run_page_attempts(
+            lambda: get_sub_gdf(url, session, query_data=query_data, **kwargs),
+            page_retry,
+            url=url,
+            batch_index=batch_index,
+        )
 
-async def _run_get_sub_gdf_bounded(
-    url: str,
-    session: AsyncHTTPSession,
-    sem: asyncio.BoundedSemaphore,
-    query_data: dict,
-    **kwargs,
-) -> GeoDataFrame:
-    async with sem:
-        return await get_sub_gdf(url, session, query_data=query_data, **kwargs)
+    outcomes: list[tuple[GeoDataFrame | None, Exception | None, int]] = [
+        (None, None, 0),
+    ] * len(query_data_batches)
+    # Pages are fetched with at most ``max_concurrent_requests`` in flight;
+    # leaving the loop on the first failure cancels the ones still running.
+    async with aclosing(
+        bounded_as_completed(
+            _fetch,
+            enumerate(query_data_batches),
+            limit=get_config().concurrency.max_concurrent_requests,
+            flow=url,
+            priority=_rank("pages"),
+        ),
+    ) as completed:
+        async for batch_index, outcome in completed:
+            error = outcome[1]
+            if on_page_error == "raise" and error is not None:
+                if isinstance(error, DeadlineExceededError) and error.completed is None:
+                    error.completed = sum(
+                        1 for _, err, attempts in outcomes if attempts and err is None
+                    )
+                raise error
+            outcomes[batch_index] = outcome
+    gdf_list: list[GeoDataFrame] = []
+    for batch_index, (query_data, (sub_gdf, error, attempts)) in enumerate(
+        zip(query_data_batches, outcomes),
+    ):
+        if error is None:
+            gdf_list.append(sub_gdf)
+        else:
+            _record_page_failure(
+                url,
+                batch_index,
+                query_data,
+                error,
+                attempts,
+                page_failures,
+            )
+    return gdf_list
 
 
 async def chunk_generator(
@@ -458,54 +561,25 @@ async def chunk_generator(
         raw_sr = None
     else:
         raw_sr = _extract_raw_spatial_reference(metadata)
-    max_inflight = get_config().concurrency.max_concurrent_requests
-    batch_iter = iter(query_data_batches)
-    tasks: set[asyncio.Task] = set()
-    task_order: dict[asyncio.Task, int] = {}
-    next_index = 0
-
-    def _submit_next() -> asyncio.Task | None:
-        nonlocal next_index
-        try:
-            query_data = next(batch_iter)
-        except StopIteration:
-            return None
-        task = asyncio.create_task(
-            get_sub_gdf(url, session, query_data=query_data, **kwargs),
-        )
-        tasks.add(task)
-        task_order[task] = next_index
-        next_index += 1
-        return task
-
-    try:
-        for _ in range(max_inflight):
-            task = _submit_next()
-            if task is None:
-                break
-
-        while tasks:
-            done, pending = await asyncio.wait(
-                tasks,
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            tasks = set(pending)
-            completed_chunks: list[GeoDataFrame] = []
-            for task in sorted(done, key=task_order.__getitem__):
-                replacement = _submit_next()
-                if replacement is not None:
-                    tasks.add(replacement)
-                chunk = await task
-                task_order.pop(task, None)
-                if raw_sr is not None:
-                    chunk.attrs["spatial_reference"] = raw_sr
-                completed_chunks.append(chunk)
-            for chunk in completed_chunks:
-                yield chunk
-    finally:
-        for task in tasks:
-            if not task.done():
-                task.cancel()
+    async with aclosing(
+        bounded_map(
+            lambda query_data: get_sub_gdf(
+                url,
+                session,
+                query_data=query_data,
+                **kwargs,
+            ),
+            query_data_batches,
+            limit=get_config().concurrency.max_concurrent_requests,
+            ordered=False,
+            flow=url,
+            priority=_rank("pages"),
+        ),
+    ) as chunks:
+        async for chunk in chunks:
+            if raw_sr is not None:
+                chunk.attrs["spatial_reference"] = raw_sr
+            yield chunk
 
 
 async def row_dict_generator(
@@ -548,11 +622,33 @@ async def concat_gdfs(gdfs: list[GeoDataFrame]) -> GeoDataFrame:
 async def gdf_by_concat(
     url: str,
     session: AsyncHTTPSession,
+    *,
+    on_page_error: Literal["raise", "collect"] = "raise",
+    page_retry: PageRetryPolicy | None = None,
     **kwargs,
 ) -> GeoDataFrame:
+    """Fetch every page and concatenate them into one GeoDataFrame.
+
+    With ``on_page_error="collect"`` the result carries
+    ``gdf.attrs["failed_batches"]``: one JSON-safe dict per failed page
+    (see :class:`restgdf.PageFailure`), empty when every page succeeded.
+    When no page succeeds at all, the first page's error is raised.
+    """
     _require_geo_query_support("gdf_by_concat()")
-    gdfs = await get_gdf_list(url, session, **kwargs)
+    failures: list[PageFailure] = []
+    gdfs = await get_gdf_list(
+        url,
+        session,
+        on_page_error=on_page_error,
+        page_retry=page_retry,
+        page_failures=failures,
+        **kwargs,
+    )
+    if not gdfs and failures and failures[0].exception is not None:
+        raise failures[0].exception
     result = await concat_gdfs(gdfs)
+    if on_page_error == "collect":
+        result.attrs["failed_batches"] = [failure.model_dump() for failure in failures]
     await _apply_spatial_reference_attr(result, url, session, **kwargs)
     return result
 
@@ -562,10 +658,37 @@ async def get_gdf(
     session: AsyncHTTPSession | None = None,
     where: str | None = None,
     token: str | None = None,
+    *,
+    on_page_error: Literal["raise", "collect"] = "raise",
+    page_retry: PageRetryPolicy | None = None,
+    deadline: float | None = None,
     **kwargs,
 ) -> GeoDataFrame:
+    """Download a whole FeatureLayer query as one GeoDataFrame.
+
+    ``page_retry`` retries individual pages (request, body read and
+    decode). ``on_page_error="collect"`` keeps the pages that succeeded
+    and reports the rest in ``gdf.attrs["failed_batches"]`` instead of
+    discarding the whole download; see :func:`gdf_by_concat`.
+
+    Without a ``session`` a fresh one is built and closed per call, unless
+    ``TransportConfig.pooled_session`` is on: then the shared keep-alive
+    session from :func:`restgdf.pooled_session` is used and left open.
+
+    ``deadline`` bounds the whole download, retries and splits included,
+    to that many seconds (see :func:`restgdf.deadline`). When it runs out
+    :class:`~restgdf.errors.DeadlineExceededError` is raised, or, with
+    ``on_page_error="collect"``, the unfinished pages are reported in
+    ``failed_batches``.
+    """
     _require_geo_query_support("get_gdf()")
+    _check_on_page_error(on_page_error)
     owns_session = session is None
+    if session is None and get_config().transport.pooled_session:
+        # Opt-in process-scoped keep-alive session, shared across calls and
+        # closed by ``restgdf.close_pool()`` or at interpreter exit.
+        session = cast(AsyncHTTPSession, pooled_session())
+        owns_session = False
     if session is None:
         # W4-5 (CONFIG-01/AUTH-03 part C): build the library-owned bare
         # session with a connector whose TLS policy comes from the
@@ -594,8 +717,15 @@ async def get_gdf(
                 "Pass token either via token= or data['token'], not both with different values.",
             )
         datadict["token"] = token
+    # Only non-default page options are forwarded, keeping the historical
+    # gdf_by_concat call shape for the common case.
+    if on_page_error != "raise":
+        kwargs["on_page_error"] = on_page_error
+    if page_retry is not None:
+        kwargs["page_retry"] = page_retry
     try:
-        return await gdf_by_concat(url, session, data=datadict, **kwargs)
+        with _deadline_scope(deadline):
+            return await gdf_by_concat(url, session, data=datadict, **kwargs)
     finally:
         if owns_session:
             await session.close()
@@ -676,18 +806,29 @@ async def _fetch_page_dict(
     url: str,
     session: AsyncHTTPSession,
     query_data: Mapping[str, Any],
+    *,
+    template: RequestTemplate | None = None,
+    quantized_stats: _QuantizedStats | None = None,
     **kwargs,
 ) -> dict[str, Any]:
-    """Fetch one query page and return the raw envelope dict."""
-    kwargs = {k: v for k, v in kwargs.items() if k != "data"}
-    kwargs.setdefault("timeout", default_timeout())
-    response = await _arcgis_request(
-        session,
-        f"{url}/query",
-        dict(query_data),
-        headers=default_headers(kwargs.pop("headers", None)),
-        **kwargs,
-    )
+    """Fetch one query page and return the raw envelope dict.
+
+    With a ``template`` (compiled by the stream for its own pages) the
+    request kwargs come from it and ``kwargs`` is ignored. Quantized
+    geometry is decoded, and counted in ``quantized_stats`` if given.
+    """
+    if template is not None:
+        response = await template.send(query_data)
+    else:
+        kwargs = {k: v for k, v in kwargs.items() if k != "data"}
+        kwargs.setdefault("timeout", default_timeout())
+        response = await _arcgis_request(
+            session,
+            f"{url}/query",
+            dict(query_data),
+            headers=default_headers(kwargs.pop("headers", None)),
+            **kwargs,
+        )
     raw = await response.json(content_type=None)
     if not isinstance(raw, dict):
         raise RestgdfResponseError(
@@ -696,7 +837,7 @@ async def _fetch_page_dict(
             raw=raw,
             url=f"{url}/query",
         )
-    return raw
+    return decode_quantized(raw, quantized_stats)
 
 
 # W4-3 (PAGINATION-03): common ArcGIS backing-store IN-predicate element
@@ -863,6 +1004,12 @@ async def _iter_pages_raw(
     max_concurrent_pages: int | None = None,
     on_truncation: Literal["raise", "ignore", "split"] = "raise",
     max_split_depth: int = 32,
+    hedge: HedgePolicy | None = None,
+    on_page_error: Literal["raise", "collect"] = "raise",
+    page_retry: PageRetryPolicy | None = None,
+    page_failures: list[PageFailure] | None = None,
+    retry_budget: RetryBudget | None = None,
+    prewarm: bool = False,
     span_layer_id: int | None = None,
     span_out_fields: Any = None,
     span_where: str | None = None,
@@ -885,15 +1032,35 @@ async def _iter_pages_raw(
     call issues its own serial, uncounted sub-fetches (``get_object_ids``
     plus one ``_fetch_page_dict`` per bisected half/cap-chunk) *in
     addition to* the ``max_concurrent_pages`` window -- worst-case
-    in-flight is therefore roughly K+1, not a hard K cap. There is no
-    semaphore in this windowing loop (it is a manual
-    ``pending_in_order``/``_submit_next()`` task window), so threading a
-    slot-acquire into ``_resolve_page`` would have the split fetch block
-    on a slot the suspended top-level consumer cannot free -- a
-    re-entrancy deadlock. Do not add one. The public-facing correction
+    in-flight is therefore roughly K+1, not a hard K cap. The window is a
+    :func:`~restgdf.utils._concurrency.bounded_map` over the page plan, with
+    no semaphore, so threading a slot-acquire into ``_resolve_page`` would
+    have the split fetch block on a slot the suspended top-level consumer
+    cannot free -- a re-entrancy deadlock. Do not add one. The public-facing correction
     (:meth:`FeatureLayer.iter_pages`'s docstring, ``docs/recipes/streaming.md``)
     is out of this file's ownership -- see the W4-4 report for the
     handoff.
+
+    ``hedge`` enables tail-latency hedging of the top-level page fetches
+    (see :mod:`restgdf.utils._hedging`). The latency window is scoped to
+    this one stream; split sub-fetches are never hedged.
+
+    ``page_retry`` wraps each top-level page fetch (hedged or not) in a
+    page-granular retry; ``on_page_error="collect"`` turns a page that
+    still fails into a :class:`PageFailure` appended to ``page_failures``
+    and continues with the rest of the plan.
+
+    ``retry_budget`` is shared by every top-level page fetch of this
+    stream: page retries draw from it, and it is made the current stream
+    budget inside each fetch task so a
+    :class:`~restgdf.resilience.ResilientSession` draws its transport
+    retries from it too. A retry it denies fails the page at once.
+
+    ``prewarm`` opens one keep-alive connection per slot of the page window
+    (``max_concurrent_pages``, else the configured
+    ``max_concurrent_requests``) while the count/metadata phase runs, so
+    the first page fetches reuse them instead of all handshaking at once
+    (see :mod:`restgdf.utils._prewarm`).
     """
     if order not in ("request", "completion"):
         raise ValueError(
@@ -908,6 +1075,7 @@ async def _iter_pages_raw(
         raise ValueError(
             f"max_concurrent_pages must be >= 1, got {max_concurrent_pages!r}",
         )
+    _check_on_page_error(on_page_error)
 
     # R-61: open a NON-current INTERNAL span and end it from the outer
     # ``finally:`` block. Using ``start_as_current_span`` here would attach
@@ -922,127 +1090,144 @@ async def _iter_pages_raw(
         where=span_where,
         order=order,
     )
-    tasks: list[asyncio.Task] = []
+    hedge_state = _HedgeState(hedge) if hedge is not None else None
+    # Measuring quantization savings re-serializes geometry; only when logged.
+    quantized_stats = (
+        _QuantizedStats()
+        if get_logger("pagination").isEnabledFor(logging.DEBUG)
+        else None
+    )
+    prewarm_task: asyncio.Task | None = None
     try:
+        if prewarm:
+            request_data = kwargs.get("data") or {}
+            prewarm_task = asyncio.create_task(
+                _prewarm(
+                    session,
+                    url,
+                    max_concurrent_pages
+                    or get_config().concurrency.max_concurrent_requests,
+                    token=(
+                        request_data.get("token")
+                        if isinstance(request_data, Mapping)
+                        else None
+                    ),
+                ),
+            )
         query_data_batches = await get_query_data_batches(url, session, **kwargs)
-        fetch_kwargs = {k: v for k, v in kwargs.items() if k != "data"}
+        if prewarm_task is not None:
+            # Let the pings land in the pool before the page window opens.
+            await prewarm_task
+        # Headers, timeout, verb policy and the body every page shares are
+        # settled once here rather than on each page request.
+        template = RequestTemplate(
+            session,
+            f"{url}/query",
+            query_data_batches,
+            **kwargs,
+        )
 
-        async def _fetch_bounded(query_data: dict) -> tuple[dict, dict[str, Any]]:
-            page = await _fetch_page_dict(
+        async def _fetch_page(query_data: dict) -> dict[str, Any]:
+            if hedge_state is not None:
+                return await _hedged_call(
+                    lambda: _fetch_page_dict(
+                        url,
+                        session,
+                        query_data,
+                        template=template,
+                        quantized_stats=quantized_stats,
+                    ),
+                    hedge_state,
+                )
+            return await _fetch_page_dict(
                 url,
                 session,
                 query_data,
-                **fetch_kwargs,
+                template=template,
+                quantized_stats=quantized_stats,
             )
-            return query_data, page
-
-        if max_concurrent_pages is None:
-            tasks = [
-                asyncio.create_task(_fetch_bounded(qd)) for qd in query_data_batches
-            ]
 
-            if order == "completion":
-                for fut in asyncio.as_completed(tasks):
-                    query_data, page = await fut
-                    async for resolved in _resolve_page(
-                        url,
-                        session,
-                        page,
-                        query_data,
-                        on_truncation=on_truncation,
-                        depth=0,
-                        max_depth=max_split_depth,
-                        request_kwargs=kwargs,
-                    ):
-                        yield resolved
-            else:
-                for task in tasks:
-                    query_data, page = await task
-                    async for resolved in _resolve_page(
-                        url,
-                        session,
-                        page,
-                        query_data,
-                        on_truncation=on_truncation,
-                        depth=0,
-                        max_depth=max_split_depth,
-                        request_kwargs=kwargs,
-                    ):
-                        yield resolved
-            return
-
-        batch_iter = iter(query_data_batches)
-
-        def _submit_next() -> asyncio.Task | None:
-            try:
-                query_data = next(batch_iter)
-            except StopIteration:
-                return None
-            task = asyncio.create_task(_fetch_bounded(query_data))
-            tasks.append(task)
-            return task
-
-        if order == "completion":
-            pending: set[asyncio.Task] = set()
-            for _ in range(max_concurrent_pages):
-                next_task = _submit_next()
-                if next_task is None:
-                    break
-                pending.add(next_task)
-
-            while pending:
-                done, pending = await asyncio.wait(
-                    pending,
-                    return_when=asyncio.FIRST_COMPLETED,
+        async def _fetch_bounded(
+            batch: tuple[int, dict],
+        ) -> tuple[dict, dict[str, Any] | None]:
+            batch_index, query_data = batch
+            with _scoped_retry_budget(retry_budget):
+                page, error, attempts = await _run_page_attempts(
+                    lambda: _fetch_page(query_data),
+                    page_retry,
+                    url=url,
+                    batch_index=batch_index,
+                    budget=retry_budget,
                 )
-                completed_pages: list[tuple[dict, dict[str, Any]]] = []
-                for task in done:
-                    query_data, page = await task
-                    replacement = _submit_next()
-                    if replacement is not None:
-                        pending.add(replacement)
-                    completed_pages.append((query_data, page))
-                for query_data, page in completed_pages:
-                    async for resolved in _resolve_page(
-                        url,
-                        session,
-                        page,
-                        query_data,
-                        on_truncation=on_truncation,
-                        depth=0,
-                        max_depth=max_split_depth,
-                        request_kwargs=kwargs,
-                    ):
-                        yield resolved
-            return
-
-        pending_in_order: list[asyncio.Task] = []
-        for _ in range(max_concurrent_pages):
-            next_task = _submit_next()
-            if next_task is None:
-                break
-            pending_in_order.append(next_task)
-
-        while pending_in_order:
-            task = pending_in_order.pop(0)
-            query_data, page = await task
-            replacement = _submit_next()
-            if replacement is not None:
-                pending_in_order.append(replacement)
-            async for resolved in _resolve_page(
+            if error is None:
+                return query_data, page
+            if on_page_error == "raise":
+                raise error
+            _record_page_failure(
                 url,
-                session,
-                page,
+                batch_index,
                 query_data,
-                on_truncation=on_truncation,
-                depth=0,
-                max_depth=max_split_depth,
-                request_kwargs=kwargs,
-            ):
-                yield resolved
+                error,
+                attempts,
+                page_failures,
+            )
+            return query_data, None
+
+        # ``None`` keeps the documented unbounded window: the whole plan
+        # may be in flight at once.
+        async with aclosing(
+            bounded_map(
+                _fetch_bounded,
+                enumerate(query_data_batches),
+                limit=max_concurrent_pages or max(len(query_data_batches), 1),
+                ordered=order == "request",
+                flow=url,
+                priority=_rank("pages"),
+            ),
+        ) as pages:
+            async for query_data, page in pages:
+                if page is None:
+                    continue
+                async for resolved in _resolve_page(
+                    url,
+                    session,
+                    page,
+                    query_data,
+                    on_truncation=on_truncation,
+                    depth=0,
+                    max_depth=max_split_depth,
+                    request_kwargs=kwargs,
+                ):
+                    yield resolved
     finally:
-        for task in tasks:
-            if not task.done():
-                task.cancel()
+        if prewarm_task is not None and not prewarm_task.done():
+            prewarm_task.cancel()
+        if hedge_state is not None and hedge_state.hedged:
+            get_logger("pagination").debug(
+                "hedged %d of %d page requests (%d hedges won) for url=%s",
+                hedge_state.hedged,
+                hedge_state.requests,
+                hedge_state.hedge_wins,
+                url,
+            )
+        if retry_budget is not None and retry_budget.retries + retry_budget.denied:
+            get_logger("pagination").debug(
+                "retry budget for url=%s: %d retries, %d denied, %d first attempts",
+                url,
+                retry_budget.retries,
+                retry_budget.denied,
+                retry_budget.first_attempts,
+            )
+        if quantized_stats is not None and quantized_stats.pages:
+            get_logger("pagination").debug(
+                "quantized geometry for url=%s: %d pages, %d vertices, %d bytes "
+                "received vs %d at full precision (%.0f%% smaller)",
+                url,
+                quantized_stats.pages,
+                quantized_stats.vertices,
+                quantized_stats.received_bytes,
+                quantized_stats.decoded_bytes,
+                100 * quantized_stats.saved_fraction,
+            )
         if span is not None:
             span.end()
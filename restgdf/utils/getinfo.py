@@ -32,7 +32,7 @@ from restgdf.utils._http import (
     default_data,
     default_headers,
 )
-from restgdf.utils._concurrency import bounded_gather
+from restgdf.utils._concurrency import _scheduled, bounded_as_completed
 from restgdf.utils._metadata import (
     get_fields,
     get_fields_frame,
@@ -41,24 +41,36 @@ from restgdf.utils._metadata import (
     get_object_id_field,
     getfields,
     getfields_df,
+    supports_advanced_queries,
     supports_pagination,
+    supports_statistics,
 )
 from restgdf.utils._geometry import build_spatial_filter_payload
+from restgdf.utils._resolution import (
+    decode_quantized,
+    resolution_params,
+    scale_to_tolerance,
+)
+from restgdf.utils._spatial import GeometryMatches, query_geometries
 from restgdf._models._drift import _parse_response
 from restgdf._config import get_config
 from restgdf._models.responses import LayerMetadata
 from restgdf.utils._query import get_feature_count, get_metadata, get_object_ids
 from restgdf.utils._pagination import PaginationPlan, build_pagination_plan
+from restgdf.utils._local_stats import aggregate_batches
 from restgdf.utils._stats import (
+    aggregate,
     get_unique_values,
     get_value_counts,
     getuniquevalues,
     getvaluecounts,
+    iter_unique_values,
     nested_count,
     nestedcount,
 )
 from restgdf._logging import _scrub_url, build_log_extra, get_logger
 from restgdf.errors import (
+    DeadlineExceededError,
     RestgdfResponseError,
     RestgdfTimeoutError,
     TransportError,
@@ -91,9 +103,13 @@ __all__ = [
     "ClientSession",
     "DEFAULTDICT",
     "DEFAULT_METADATA_HEADERS",
+    "GeometryMatches",
     "PaginationPlan",
+    "aggregate",
+    "aggregate_batches",
     "build_spatial_filter_payload",
     "build_pagination_plan",
+    "decode_quantized",
     "default_data",
     "default_headers",
     "get_feature_count",
@@ -111,10 +127,16 @@ __all__ = [
     "getfields_df",
     "getuniquevalues",
     "getvaluecounts",
+    "iter_unique_values",
     "nested_count",
     "nestedcount",
+    "query_geometries",
+    "resolution_params",
+    "scale_to_tolerance",
     "service_metadata",
+    "supports_advanced_queries",
     "supports_pagination",
+    "supports_statistics",
 ]
 
 
@@ -171,6 +193,8 @@ async def _feature_count_with_timeout(
     for attempt in range(max_attempts):
         try:
             return await get_feature_count(url, session, **kwargs)
+        except DeadlineExceededError:
+            raise
         except (TimeoutError, ServerTimeoutError) as exc:
             last_exc = exc
         if attempt < max_attempts - 1:
@@ -230,8 +254,8 @@ async def service_metadata(
 
     # Service-level metadata is a single HTTP call — gate it explicitly so it
     # participates in the shared cap without being wrapped by the
-    # ``bounded_gather`` below (which would introduce a double-acquire).
-    async with sem:
+    # ``bounded_as_completed`` below (which would introduce a double-acquire).
+    async with sem, _scheduled(service_url):
         _raw = await get_metadata(service_url, session, token=token)
     _service_metadata: dict[str, Any] = (
         _raw.model_dump(by_alias=True) if isinstance(_raw, BaseModel) else dict(_raw)
@@ -241,16 +265,16 @@ async def service_metadata(
         layer_id: Any,
         layer_url: str,
     ) -> dict[str, Any]:
-        # ``bounded_gather`` below acquires ``sem`` once per task, so do NOT
-        # re-acquire here — ``asyncio.Semaphore`` is not re-entrant.
+        # ``bounded_as_completed`` below acquires ``sem`` once per task, so do
+        # NOT re-acquire here — ``asyncio.Semaphore`` is not re-entrant.
         #
         # H2-1: contain a per-layer metadata failure so one bad/secured/slow
         # layer (an ArcGIS ``{"error": ...}`` envelope -> ``RestgdfResponseError``,
         # a dropped/truncated connection -> ``aiohttp.ClientConnectionError`` /
         # ``ClientPayloadError`` / ``TransportError``, or a timeout) does not
-        # propagate out of the ``bounded_gather`` fan-out below (default
-        # ``return_exceptions=False``) and discard every sibling layer of the
-        # service. The failed layer stays VISIBLE in the returned layer list,
+        # propagate out of the ``bounded_as_completed`` fan-out below (which
+        # cancels every call still in flight) and discard every sibling layer
+        # of the service. The failed layer stays VISIBLE in the returned layer list,
         # annotated with a ``layer_error`` marker, instead of the whole service
         # vanishing behind a single generic error. A service-ROOT metadata
         # failure is deliberately NOT contained here (see the un-guarded
@@ -258,6 +282,10 @@ async def service_metadata(
         # ``CrawlError``.
         try:
             layer_raw = await get_metadata(layer_url, session, token=token)
+        except DeadlineExceededError:
+            # Out of time for the whole crawl, not a bad layer: fail the
+            # service so ``safe_crawl`` records it as a ``CrawlError``.
+            raise
         except _CONTAINED_LAYER_ERRORS as exc:
             # V2-M1: the marker lives in returned DATA only, and a contained
             # failure produces no ``CrawlError``, so an operator counting
@@ -296,18 +324,28 @@ async def service_metadata(
                     layer_url,
                     token,
                 )
+            except DeadlineExceededError:
+                raise
             except (KeyError, RestgdfTimeoutError):
                 feature_count = None
             metadata["feature_count"] = feature_count
         return metadata
 
-    tasks = [
-        _comprehensive_metadata(layer["id"], f"{service_url}/{layer['id']}")
-        for layer in _service_metadata.get("layers") or []
-    ]
-    # BL-01: enumerated fan-out site. ``bounded_gather`` holds ``sem`` for
-    # each task (plan.md §3c R-18/R-44, kickoff §10.3). When a shared sem is
-    # passed in by a top-level orchestrator, the cap is truly global.
-    results = await bounded_gather(*tasks, semaphore=sem)
+    layers = _service_metadata.get("layers") or []
+    # BL-01: enumerated fan-out site. ``bounded_as_completed`` holds ``sem``
+    # for each call (plan.md §3c R-18/R-44, kickoff §10.3). When a shared sem
+    # is passed in by a top-level orchestrator, the cap is truly global.
+    results: list[dict[str, Any] | None] = [None] * len(layers)
+    async for index, layer_metadata in bounded_as_completed(
+        lambda layer: _comprehensive_metadata(
+            layer["id"],
+            f"{service_url}/{layer['id']}",
+        ),
+        layers,
+        limit=get_config().concurrency.max_concurrent_requests,
+        semaphore=sem,
+        flow=service_url,
+    ):
+        results[index] = layer_metadata
     _service_metadata["layers"] = results
     return _parse_response(LayerMetadata, _service_metadata, context=service_url)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Benchmark ``FeatureLayer.iter_pages(prewarm=True)`` against a local stand-in.
+
+Dev tooling only — excluded from the wheel like the rest of ``scripts/``.
+
+What it measures
+----------------
+A stream's first page window opens ``max_concurrent_pages`` connections at
+the moment the pagination plan is released, so every one of those fetches
+pays a connection handshake on the critical path. ``prewarm=True`` opens
+them with ``f=json`` pings while the count/metadata phase is still running.
+This script reports the time to the first ``--window`` pages and to the
+whole stream, cold versus pre-warmed, best of ``--repeat`` runs each.
+
+How the latency is simulated
+----------------------------
+An :mod:`aiohttp.web` app plays a paginated FeatureServer layer (metadata,
+``returnCountOnly`` and ``resultOffset`` pages). Clients do not reach it
+directly: a small TCP proxy in front of it sleeps ``--handshake-ms`` before
+relaying each *new* connection, standing in for TCP+TLS setup to a distant
+host. Requests on an already-open keep-alive connection are not delayed.
+``--count-ms`` delays the ``returnCountOnly`` answer, which is the window
+the pre-warm pings overlap with. Each run uses a fresh
+:class:`aiohttp.ClientSession`, so no connection survives between runs.
+
+Usage::
+
+    python scripts/bench_prewarm.py --handshake-ms 150 --window 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from restgdf import FeatureLayer
+
+LAYER_PATH = "/arcgis/rest/services/Bench/FeatureServer/0"
+
+
+def _build_app(total: int, page_size: int, count_s: float) -> web.Application:
+    async def layer(request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "name": "bench",
+                "type": "Feature Layer",
+                "maxRecordCount": page_size,
+                "advancedQueryCapabilities": {"supportsPagination": True},
+                "fields": [{"name": "OBJECTID", "type": "esriFieldTypeOID"}],
+            },
+        )
+
+    async def query(request: web.Request) -> web.Response:
+        params = dict(request.query)
+        params.update(await request.post())
+        if params.get("returnCountOnly") == "true":
+            await asyncio.sleep(count_s)
+            return web.json_response({"count": total})
+        offset = int(params.get("resultOffset", 0))
+        count = int(params.get("resultRecordCount", page_size))
+        features = [
+            {"attributes": {"OBJECTID": oid + 1}}
+            for oid in range(offset, min(offset + count, total))
+        ]
+        return web.json_response({"features": features})
+
+    app = web.Application()
+    for method in ("GET", "POST"):
+        app.router.add_route(method, LAYER_PATH, layer)
+        app.router.add_route(method, f"{LAYER_PATH}/query", query)
+    return app
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while chunk := await reader.read(65536):
+            writer.write(chunk)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _start_proxy(
+    backend_port: int,
+    handshake_s: float,
+) -> asyncio.AbstractServer:
+    async def relay(
+        client_reader: asyncio.StreamReader,
+        client_writer: asyncio.StreamWriter,
+    ) -> None:
+        await asyncio.sleep(handshake_s)
+        upstream_reader, upstream_writer = await asyncio.open_connection(
+            "127.0.0.1",
+            backend_port,
+        )
+        await asyncio.gather(
+            _pipe(client_reader, upstream_writer),
+            _pipe(upstream_reader, client_writer),
+        )
+
+    return await asyncio.start_server(relay, "127.0.0.1", 0)
+
+
+async def _run_once(url: str, window: int, prewarm: bool) -> tuple[float, float]:
+    async with aiohttp.ClientSession() as session:
+        layer = FeatureLayer(url, session=session)
+        layer.fields = ("OBJECTID",)
+        layer.object_id_field = "OBJECTID"
+        started = time.perf_counter()
+        first_window = 0.0
+        pages = 0
+        async for _ in layer.iter_pages(
+            max_concurrent_pages=window,
+            prewarm=prewarm,
+        ):
+            pages += 1
+            if pages == window:
+                first_window = time.perf_counter() - started
+        return first_window, time.perf_counter() - started
+
+
+async def _main(args: argparse.Namespace) -> None:
+    runner = web.AppRunner(
+        _build_app(args.features, args.page_size, args.count_ms / 1000),
+    )
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    backend_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    proxy = await _start_proxy(backend_port, args.handshake_ms / 1000)
+    proxy_port = proxy.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{proxy_port}{LAYER_PATH}"
+    try:
+        print(
+            f"{args.features} features, {args.page_size}/page, "
+            f"window={args.window}, handshake={args.handshake_ms}ms, "
+            f"count={args.count_ms}ms, best of {args.repeat}",
+        )
+        for prewarm in (False, True):
+            runs = [
+                await _run_once(url, args.window, prewarm)
+                for _ in range(args.repeat)
+            ]
+            first = min(r[0] for r in runs)
+            total = min(r[1] for r in runs)
+            spread = statistics.pstdev(r[1] for r in runs)
+            label = "prewarm" if prewarm else "cold   "
+            print(
+                f"  {label}  first {args.window} pages {first * 1000:7.1f} ms"
+                f"   all pages {total * 1000:7.1f} ms (sd {spread * 1000:.1f})",
+            )
+    finally:
+        proxy.close()
+        await proxy.wait_closed()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=4000)
+    parser.add_argument("--page-size", type=int, default=250)
+    parser.add_argument("--window", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=150.0)
+    parser.add_argument("--count-ms", type=float, default=200.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
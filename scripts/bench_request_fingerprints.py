@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Count unique request fingerprints across repeated layer downloads.
+
+Dev tooling only — excluded from the wheel like the rest of ``scripts/``.
+
+What it measures
+----------------
+A CDN in front of ArcGIS Online / Enterprise (or any shared HTTP cache)
+can only answer a request it has seen before, byte for byte. This script
+downloads the same layer ``--runs`` times, the way a nightly job would,
+while the layer grows by ``--growth`` features between runs. Every run
+builds its ``data`` options in a different key order, as independent call
+sites do. For each run it reports the requests sent, how many distinct
+fingerprints (verb + path + query string) they had, and how many of those
+an edge cache would already hold from earlier runs.
+
+It runs once with the defaults and once with
+``RESTGDF_TRANSPORT_CACHE_HINT=true``. Query strings are canonical in both
+(sorted keys, normalized values), so the shuffled ``data`` never changes a
+fingerprint. ``cacheHint`` additionally marks the anonymous queries as
+edge-cacheable and asks for full, aligned pages, so only the page that
+holds the new features changes from one run to the next; without it the
+count request and the tail page change with every run.
+
+How the server is simulated
+---------------------------
+An :mod:`aiohttp.web` app plays a paginated FeatureServer layer (metadata,
+``returnCountOnly`` and ``resultOffset`` pages) and records every request
+it receives. Nothing is cached by the script itself: "reused" counts the
+fingerprints an edge cache *could* have answered.
+
+Usage::
+
+    python scripts/bench_request_fingerprints.py --features 25000 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+
+import aiohttp
+from aiohttp import web
+
+from restgdf import FeatureLayer, reset_config_cache
+
+LAYER_PATH = "/arcgis/rest/services/Bench/FeatureServer/0"
+
+
+class _Layer:
+    def __init__(self, total: int, page_size: int) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.seen: list[str] = []
+
+    async def metadata(self, request: web.Request) -> web.Response:
+        self.seen.append(f"{request.method} {request.path_qs}")
+        return web.json_response(
+            {
+                "name": "bench",
+                "type": "Feature Layer",
+                "maxRecordCount": self.page_size,
+                "advancedQueryCapabilities": {"supportsPagination": True},
+                "objectIdField": "OBJECTID",
+                "fields": [{"name": "OBJECTID", "type": "esriFieldTypeOID"}],
+            },
+        )
+
+    async def query(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        fingerprint = f"{request.method} {request.path_qs}"
+        if form:
+            fingerprint += " " + "&".join(f"{k}={v}" for k, v in sorted(form.items()))
+        self.seen.append(fingerprint)
+        params = {**request.query, **form}
+        if params.get("returnCountOnly") == "true":
+            return web.json_response({"count": self.total})
+        offset = int(params.get("resultOffset", 0))
+        count = int(params.get("resultRecordCount", self.page_size))
+        features = [
+            {"attributes": {"OBJECTID": oid + 1}}
+            for oid in range(offset, min(offset + count, self.total))
+        ]
+        return web.json_response({"features": features})
+
+
+def _shuffled_data(rng: random.Random) -> dict[str, object]:
+    items = [
+        ("outFields", "*"),
+        ("returnGeometry", True),
+        ("outSR", 4326),
+        ("f", "json"),
+    ]
+    rng.shuffle(items)
+    return dict(items)
+
+
+async def _download(url: str, data: dict[str, object]) -> int:
+    async with aiohttp.ClientSession() as session:
+        layer = await FeatureLayer.from_url(url, session=session, data=data)
+        rows = 0
+        async for page in layer.iter_pages(max_concurrent_pages=8):
+            rows += len(page.get("features", ()))
+        return rows
+
+
+async def _series(
+    layer: _Layer,
+    url: str,
+    args: argparse.Namespace,
+    *,
+    cache_hint: bool,
+) -> None:
+    os.environ["RESTGDF_TRANSPORT_CACHE_HINT"] = "true" if cache_hint else "false"
+    reset_config_cache()
+    layer.total = args.features
+    rng = random.Random(args.seed)
+    edge: set[str] = set()
+    total_requests = total_reused = 0
+    print(f"cache_hint={cache_hint}")
+    for run in range(1, args.runs + 1):
+        layer.seen.clear()
+        rows = await _download(url, _shuffled_data(rng))
+        unique = set(layer.seen)
+        reused = sum(1 for fingerprint in layer.seen if fingerprint in edge)
+        edge |= unique
+        total_requests += len(layer.seen)
+        total_reused += reused
+        print(
+            f"  run {run}: {rows:6d} rows  {len(layer.seen):4d} requests  "
+            f"{len(unique):4d} unique  {reused:4d} seen in earlier runs",
+        )
+        layer.total += args.growth
+    share = total_reused / total_requests if total_requests else 0.0
+    print(
+        f"  {len(edge)} distinct fingerprints over {args.runs} runs; "
+        f"{total_reused}/{total_requests} requests edge-cacheable ({share:.0%})",
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    layer = _Layer(args.features, args.page_size)
+    app = web.Application()
+    for method in ("GET", "POST"):
+        app.router.add_route(method, LAYER_PATH, layer.metadata)
+        app.router.add_route(method, f"{LAYER_PATH}/query", layer.query)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    url = f"http://127.0.0.1:{port}{LAYER_PATH}"
+    previous = os.environ.get("RESTGDF_TRANSPORT_CACHE_HINT")
+    try:
+        print(
+            f"{args.features} features (+{args.growth}/run), "
+            f"{args.page_size}/page, {args.runs} runs",
+        )
+        for cache_hint in (False, True):
+            await _series(layer, url, args, cache_hint=cache_hint)
+    finally:
+        if previous is None:
+            os.environ.pop("RESTGDF_TRANSPORT_CACHE_HINT", None)
+        else:
+            os.environ["RESTGDF_TRANSPORT_CACHE_HINT"] = previous
+        reset_config_cache()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=25_000)
+    parser.add_argument("--growth", type=int, default=37)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the per-page CPU cost of compiled request templates.
+
+Dev tooling only — excluded from the wheel like the rest of ``scripts/``.
+
+What it measures
+----------------
+A stream builds one :class:`~restgdf.utils._template.RequestTemplate` for
+its pagination plan and sends every page through it. Without it, each
+page pays for merging default headers (a ``get_config()`` read), building
+a ``ClientTimeout``, walking the session's ``_inner`` chain and canonically
+encoding the whole body twice (for the length check and for the wire).
+
+This script builds a ``--pages`` page plan and sends each page through
+``_fetch_page_dict`` once without and once with a template, against a
+session that answers instantly without any I/O. It reports the CPU time
+(``time.process_time``) per request, best of ``--repeat`` runs. The
+session is ``--depth`` wrappers deep, like a
+``ResilientSession(ArcGISTokenSession(...))`` stack.
+
+Usage::
+
+    python scripts/bench_request_template.py --pages 10000 --depth 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from restgdf.utils._template import RequestTemplate
+from restgdf.utils.getgdf import _fetch_page_dict
+
+LAYER_URL = "https://example.com/arcgis/rest/services/Bench/FeatureServer/0"
+
+
+class _Response:
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return {"features": []}
+
+
+class _Session:
+    _response = _Response()
+
+    async def get(self, url: str, **kwargs: Any) -> _Response:
+        return self._response
+
+    async def post(self, url: str, **kwargs: Any) -> _Response:
+        return self._response
+
+
+class _Wrapper(_Session):
+    def __init__(self, inner: Any) -> None:
+        self._inner = inner
+
+
+def _plan(pages: int, page_size: int) -> list[dict[str, Any]]:
+    base = {
+        "where": "STATUS = 'ACTIVE' AND YEAR >= 2000",
+        "outFields": "OBJECTID,NAME,STATUS,YEAR,OWNER,ADDRESS",
+        "returnGeometry": True,
+        "outSR": 4326,
+        "orderByFields": "OBJECTID",
+        "f": "json",
+    }
+    return [
+        {**base, "resultOffset": offset, "resultRecordCount": page_size}
+        for offset in range(0, pages * page_size, page_size)
+    ]
+
+
+async def _run(
+    session: Any,
+    plan: list[dict[str, Any]],
+    templated: bool,
+) -> float:
+    started = time.process_time()
+    template = (
+        RequestTemplate(session, f"{LAYER_URL}/query", plan) if templated else None
+    )
+    for body in plan:
+        await _fetch_page_dict(LAYER_URL, session, body, template=template)
+    return time.process_time() - started
+
+
+async def _main(args: argparse.Namespace) -> None:
+    session: Any = _Session()
+    for _ in range(args.depth):
+        session = _Wrapper(session)
+    plan = _plan(args.pages, args.page_size)
+    print(f"{args.pages} pages, session depth {args.depth}, best of {args.repeat}")
+    results = {}
+    for templated in (False, True):
+        best = min(
+            [await _run(session, plan, templated) for _ in range(args.repeat)],
+        )
+        results[templated] = best
+        label = "template" if templated else "plain   "
+        print(
+            f"  {label}  {best * 1000:8.1f} ms CPU"
+            f"  {best / args.pages * 1e6:6.1f} us/request",
+        )
+    print(f"  per-request CPU cut by {1 - results[True] / results[False]:.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -148,3 +148,26 @@ def test_defaultdict_is_unchanged_by_queryoptions_usage():
     snapshot = dict(DEFAULTDICT)
     QueryOptions(where="X=1", extra={"a": 1}).to_data()
     assert DEFAULTDICT == snapshot
+
+
+def test_resolution_fields_are_typed_and_json_encoded():
+    opts = QueryOptions(
+        geometry_precision=2,
+        max_allowable_offset=0.5,
+        quantization_parameters={"mode": "view", "tolerance": 0.5},
+        extra={"geometryPrecision": 9},
+    )
+    data = opts.to_data()
+    assert data["geometryPrecision"] == 2
+    assert data["maxAllowableOffset"] == 0.5
+    assert data["quantizationParameters"] == '{"mode":"view","tolerance":0.5}'
+    assert "maxAllowableOffset" not in QueryOptions().to_data()
+
+
+def test_from_legacy_kwargs_maps_resolution_fields():
+    opts = QueryOptions.from_legacy_kwargs(
+        {"data": {"geometryPrecision": 3, "quantizationParameters": '{"a":1}'}},
+    )
+    assert opts.geometry_precision == 3
+    assert opts.quantization_parameters == '{"a":1}'
+    assert opts.extra == {}
@@ -298,7 +298,7 @@ async def test_featurelayer_from_url_calls_prep():
 
 
 @pytest.mark.asyncio
-async def test_featurelayer_samplegdf_uses_random_subset():
+async def test_featurelayer_samplegdf_draws_without_listing_ids():
     layer = FeatureLayer(
         "https://example.com/arcgis/rest/services/Secured/FeatureServer/0",
         session=MockArcGISSession(),
@@ -306,29 +306,23 @@ async def test_featurelayer_samplegdf_uses_random_subset():
     layer.object_id_field = "OBJECTID"
     layer.fields = ("OBJECTID",)
 
-    sampled_layer = AsyncMock()
-    sampled_layer.get_gdf = AsyncMock(return_value="sampled-gdf")
-
     with patch(
         "restgdf.featurelayer.featurelayer.get_unique_values",
-        new=AsyncMock(return_value=[1, 2, 3]),
+        new=AsyncMock(side_effect=AssertionError("should not list every id")),
     ), patch(
-        "restgdf.featurelayer.featurelayer.random.sample",
-        return_value=[3, 1],
-    ) as mock_sample, patch.object(
-        layer,
-        "where",
-        new=AsyncMock(return_value=sampled_layer),
-    ) as mock_where:
-        result = await layer.sample_gdf(10)
+        "restgdf.featurelayer.featurelayer.preview_sample_gdf",
+        new=AsyncMock(return_value="sampled-gdf"),
+    ) as mock_sample:
+        result = await layer.sample_gdf(10, seed=7)
 
     assert result == "sampled-gdf"
-    mock_sample.assert_called_once_with([1, 2, 3], 3)
-    mock_where.assert_awaited_once_with(where_var_in_list("OBJECTID", [3, 1]))
+    assert mock_sample.await_args.args[2] == 10
+    assert mock_sample.await_args.kwargs["object_id_field"] == "OBJECTID"
+    assert mock_sample.await_args.kwargs["seed"] == 7
 
 
 @pytest.mark.asyncio
-async def test_featurelayer_headgdf_uses_first_ids():
+async def test_featurelayer_headgdf_reads_one_ordered_page():
     layer = FeatureLayer(
         "https://example.com/arcgis/rest/services/Secured/FeatureServer/0",
         session=MockArcGISSession(),
@@ -336,21 +330,26 @@ async def test_featurelayer_headgdf_uses_first_ids():
     layer.object_id_field = "OBJECTID"
     layer.fields = ("OBJECTID",)
 
-    head_layer = AsyncMock()
-    head_layer.get_gdf = AsyncMock(return_value="head-gdf")
-
     with patch(
         "restgdf.featurelayer.featurelayer.get_unique_values",
-        new=AsyncMock(return_value=[1, 2, 3, 4]),
-    ), patch.object(
-        layer,
-        "where",
-        new=AsyncMock(return_value=head_layer),
-    ) as mock_where:
+        new=AsyncMock(side_effect=AssertionError("should not list every id")),
+    ), patch(
+        "restgdf.utils._preview.get_sub_gdf",
+        new=AsyncMock(
+            return_value=GeoDataFrame(
+                {"OBJECTID": [1, 2, 3], "geometry": [Point(i, i) for i in range(3)]},
+                crs="EPSG:4326",
+            ),
+        ),
+    ) as mock_sub_gdf:
         result = await layer.head_gdf(2)
 
-    assert result == "head-gdf"
-    mock_where.assert_awaited_once_with(where_var_in_list("OBJECTID", [1, 2]))
+    assert len(result) == 2
+    mock_sub_gdf.assert_awaited_once()
+    query_data = mock_sub_gdf.await_args.args[2]
+    assert query_data["resultRecordCount"] == 2
+    assert query_data["orderByFields"] == "OBJECTID ASC"
+    assert mock_sub_gdf.await_args.kwargs["allow_truncated"] is True
 
 
 @pytest.mark.asyncio
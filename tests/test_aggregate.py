@@ -0,0 +1,235 @@
+"""Server-side grouped statistics (``aggregate`` / ``Statistic``)."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from restgdf import FeatureLayer, Statistic
+from restgdf.errors import FieldDoesNotExistError, PaginationInconsistencyWarning
+from restgdf.utils.getinfo import aggregate, get_value_counts
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+
+class _GroupedLayer:
+    """Answers statistics queries from ``groups``, ``page_size`` at a time.
+
+    Without ``orderByFields`` the first page comes back in storage order
+    (reversed here), not in ``groups`` order.
+    """
+
+    def __init__(self, groups: list[dict[str, Any]], page_size: int) -> None:
+        self.groups = groups
+        self.page_size = page_size
+        self.sent: list[dict[str, Any]] = []
+        self.stall_at: int | None = None
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(params or {}))
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(data or {}))
+
+    def _answer(self, params: dict[str, Any]) -> _Response:
+        self.sent.append(params)
+        if "resultOffset" in params:
+            offset = int(params["resultOffset"])
+            count = int(params["resultRecordCount"])
+            rows = self.groups[offset : offset + count]
+            more = offset + count < len(self.groups)
+            if offset == self.stall_at:
+                rows = []
+        else:
+            ordered = "orderByFields" in params
+            rows = (self.groups if ordered else self.groups[::-1])[: self.page_size]
+            more = len(self.groups) > self.page_size
+        payload: dict[str, Any] = {"features": [{"attributes": r} for r in rows]}
+        if more:
+            payload["exceededTransferLimit"] = True
+        return _Response(payload)
+
+
+def _groups(count: int) -> list[dict[str, Any]]:
+    return [{"CITY": f"C{i:02d}", "total": i * 10} for i in range(count)]
+
+
+@pytest.mark.parametrize(
+    ("args", "kwargs"),
+    [
+        (("median", "POP"), {}),
+        (("sum", ""), {}),
+        (("percentile_cont", "POP"), {}),
+        (("percentile_disc", "POP"), {"percentile": 1.5}),
+        (("sum", "POP"), {"percentile": 0.5}),
+    ],
+)
+def test_statistic_rejects_malformed_specs(
+    args: tuple[str, str],
+    kwargs: dict[str, Any],
+) -> None:
+    with pytest.raises(ValueError):
+        Statistic(*args, **kwargs)  # type: ignore[arg-type]
+
+
+def test_statistic_to_dict() -> None:
+    assert Statistic("sum", "POP").to_dict() == {
+        "statisticType": "sum",
+        "onStatisticField": "POP",
+        "outStatisticFieldName": "POP_sum",
+    }
+    assert Statistic(
+        "percentile_cont",
+        "INCOME",
+        percentile=0.9,
+        descending=True,
+    ).to_dict() == {
+        "statisticType": "percentile_cont",
+        "onStatisticField": "INCOME",
+        "outStatisticFieldName": "INCOME_p90",
+        "statisticParameters": {"value": 0.9, "orderBy": "DESC"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_page_request_body() -> None:
+    session = _GroupedLayer(_groups(2), page_size=10)
+
+    rows = await aggregate(
+        LAYER,
+        {"total": ("sum", "POP"), "p50": ("percentile_disc", "POP", 0.5)},
+        session,  # type: ignore[arg-type]
+        ("CITY", "STATE"),
+        having="SUM(POP) > 0",
+        order_by="total DESC",
+        data={"where": "STATE = 'FL'", "outFields": "*", "returnGeometry": True},
+    )
+
+    (params,) = session.sent
+    assert params["where"] == "STATE = 'FL'"
+    assert params["returnGeometry"] == "false"
+    assert params["outFields"] == "CITY,STATE"
+    assert params["groupByFieldsForStatistics"] == "CITY,STATE"
+    assert params["havingClause"] == "SUM(POP) > 0"
+    assert params["orderByFields"] == "total DESC"
+    statistics = json.loads(params["outStatistics"])
+    assert [s["outStatisticFieldName"] for s in statistics] == ["total", "p50"]
+    assert len(rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_statistic_names_must_be_unique() -> None:
+    with pytest.raises(ValueError, match="unique"):
+        await aggregate(
+            LAYER,
+            [Statistic("sum", "POP", name="x"), Statistic("max", "POP", name="X")],
+            _GroupedLayer([], 10),  # type: ignore[arg-type]
+        )
+
+
+@pytest.mark.asyncio
+async def test_unordered_results_are_paged_again_in_group_order() -> None:
+    groups = _groups(11)
+    session = _GroupedLayer(groups, page_size=3)
+
+    rows = await aggregate(
+        LAYER,
+        {"total": ("sum", "POP")},
+        session,  # type: ignore[arg-type]
+        "CITY",
+        max_concurrent_pages=2,
+    )
+
+    assert rows == groups
+    first, *pages = session.sent
+    assert "orderByFields" not in first
+    assert {page["orderByFields"] for page in pages} == {"CITY"}
+    assert [int(page["resultOffset"]) for page in pages][:4] == [0, 3, 6, 9]
+    assert {page["resultRecordCount"] for page in pages} == {"3"}
+
+
+@pytest.mark.asyncio
+async def test_ordered_results_continue_after_the_first_page() -> None:
+    groups = _groups(7)
+    session = _GroupedLayer(list(reversed(groups)), page_size=3)
+
+    rows = await aggregate(
+        LAYER,
+        {"total": ("sum", "POP")},
+        session,  # type: ignore[arg-type]
+        "CITY",
+        order_by="total DESC",
+    )
+
+    assert rows == groups[::-1]
+    assert int(session.sent[1]["resultOffset"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_empty_exceeded_page_warns() -> None:
+    session = _GroupedLayer(_groups(9), page_size=3)
+    session.stall_at = 3
+
+    with pytest.warns(PaginationInconsistencyWarning):
+        rows = await aggregate(
+            LAYER,
+            {"total": ("sum", "POP")},
+            session,  # type: ignore[arg-type]
+            "CITY",
+            max_concurrent_pages=1,
+        )
+
+    assert len(rows) == 3
+
+
+@pytest.mark.asyncio
+async def test_as_frame_orders_columns_and_restores_case() -> None:
+    session = _GroupedLayer([{"city": "A", "TOTAL": 5}], page_size=10)
+
+    frame = await aggregate(
+        LAYER,
+        {"total": ("sum", "POP")},
+        session,  # type: ignore[arg-type]
+        "CITY",
+        as_frame=True,
+    )
+
+    assert list(frame.columns) == ["CITY", "total"]
+    assert frame.to_dict("records") == [{"CITY": "A", "total": 5}]
+
+
+@pytest.mark.asyncio
+async def test_value_counts_include_groups_past_the_first_page() -> None:
+    groups = [{"CITY": f"C{i:02d}", "CITY_count": i + 1} for i in range(8)]
+    session = _GroupedLayer(groups, page_size=3)
+
+    counts = await get_value_counts(LAYER, "CITY", session)  # type: ignore[arg-type]
+
+    assert len(counts) == 8
+    assert counts["CITY_count"].sum() == sum(range(1, 9))
+
+
+@pytest.mark.asyncio
+async def test_featurelayer_aggregate_validates_fields() -> None:
+    session = _GroupedLayer(_groups(2), page_size=10)
+    layer = FeatureLayer(LAYER, session=session)  # type: ignore[arg-type]
+    layer.fields = ("CITY", "POP")
+
+    with pytest.raises(FieldDoesNotExistError):
+        await layer.aggregate({"total": ("sum", "INCOME")}, "CITY")
+    with pytest.raises(FieldDoesNotExistError):
+        await layer.aggregate({"total": ("sum", "POP")}, "STATE")
+    assert session.sent == []
+
+    rows = await layer.aggregate({"total": ("sum", "POP")}, "CITY")
+    assert len(rows) == 2
@@ -0,0 +1,198 @@
+"""Canonical GET encoding and the opt-in ``cacheHint`` mode."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+from urllib.parse import urlencode
+
+import pytest
+from yarl import URL
+
+from restgdf import reset_config_cache
+from restgdf.utils._canonical import _canonical_query, _canonical_query_string
+from restgdf.utils._http import _arcgis_request, _choose_verb
+from restgdf.utils._pagination import build_pagination_plan
+from restgdf.utils.getgdf import get_query_data_batches
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+QUERY = f"{LAYER}/query"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.delenv("RESTGDF_TRANSPORT_CACHE_HINT", raising=False)
+    reset_config_cache()
+    yield
+    reset_config_cache()
+
+
+@pytest.fixture
+def cache_hint(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_TRANSPORT_CACHE_HINT", "true")
+    reset_config_cache()
+
+
+class _Session:
+    """Records the URL each request would put on the wire."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, str, Any]] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> None:
+        self.sent.append(("GET", str(URL(url).with_query(params or {})), params))
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> None:
+        self.sent.append(("POST", url, data))
+
+
+class _CredentialSession(_Session):
+    credentials = type("Credentials", (), {"username": "alice"})()
+    token_url = "https://example.com/portal/sharing/rest/generateToken"
+
+
+def test_values_are_normalized() -> None:
+    query = _canonical_query(
+        {
+            "where": "1=1",
+            "returnGeometry": True,
+            "returnM": False,
+            "gdbVersion": None,
+            "resultOffset": 2000,
+            "maxAllowableOffset": 10.0,
+            "geometryPrecision": 0.5,
+            "outFields": ["OBJECTID", "NAME"],
+            "geometry": {"y": 2, "x": 1, "spatialReference": {"wkid": 4326}},
+        },
+    )
+
+    assert list(query) == sorted(query)
+    assert query == {
+        "where": "1=1",
+        "returnGeometry": "true",
+        "returnM": "false",
+        "gdbVersion": "",
+        "resultOffset": "2000",
+        "maxAllowableOffset": "10",
+        "geometryPrecision": "0.5",
+        "outFields": "OBJECTID,NAME",
+        "geometry": '{"spatialReference":{"wkid":4326},"x":1,"y":2}',
+    }
+
+
+def test_equivalent_bodies_encode_identically() -> None:
+    first = {"f": "json", "where": "1=1", "returnGeometry": True, "resultOffset": 0}
+    second = {
+        "resultOffset": 0.0,
+        "returnGeometry": "true",
+        "where": "1=1",
+        "f": "json",
+    }
+
+    assert _canonical_query_string(first) == _canonical_query_string(second)
+    assert _canonical_query_string(None) == ""
+
+
+@pytest.mark.asyncio
+async def test_get_query_string_ignores_key_order() -> None:
+    session = _Session()
+    await _arcgis_request(session, QUERY, {"where": "1=1", "f": "json", "x": True})
+    await _arcgis_request(session, QUERY, {"x": True, "f": "json", "where": "1=1"})
+
+    (verb_a, url_a, _), (verb_b, url_b, _) = session.sent
+    assert verb_a == verb_b == "GET"
+    assert url_a == url_b == f"{QUERY}?f=json&where=1%3D1&x=true"
+
+
+@pytest.mark.asyncio
+async def test_mapping_values_travel_as_compact_json() -> None:
+    session = _Session()
+    geometry = {"x": 1.5, "y": 2, "spatialReference": {"wkid": 4326}}
+    await _arcgis_request(session, QUERY, {"geometry": geometry, "f": "json"})
+
+    verb, _, params = session.sent[0]
+    assert verb == "GET"
+    assert params["geometry"] == '{"spatialReference":{"wkid":4326},"x":1.5,"y":2}'
+
+
+def test_choose_verb_measures_the_canonical_encoding() -> None:
+    ids = list(range(1000))
+    canonical = len(QUERY) + 1 + len(_canonical_query_string({"objectIds": ids}))
+    repeated = len(QUERY) + 1 + len(urlencode({"objectIds": ids}, doseq=True))
+
+    assert canonical <= 8192 < repeated
+    assert _choose_verb(QUERY, {"objectIds": ids}) == "GET"
+
+
+@pytest.mark.asyncio
+async def test_cache_hint_is_off_by_default() -> None:
+    session = _Session()
+    await _arcgis_request(session, QUERY, {"where": "1=1"})
+
+    assert "cacheHint" not in session.sent[0][2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("cache_hint")
+async def test_cache_hint_marks_anonymous_queries_only() -> None:
+    session = _Session()
+    await _arcgis_request(session, QUERY, {"where": "1=1"})
+    await _arcgis_request(session, LAYER, {"f": "json"})
+    await _arcgis_request(session, QUERY, {"where": "1=1", "token": "secret"})
+    await _arcgis_request(session, QUERY, {"where": "1=1", "cacheHint": False})
+    authenticated = _CredentialSession()
+    await _arcgis_request(authenticated, QUERY, {"where": "1=1"})
+
+    query, metadata, token, explicit = session.sent
+    assert query[2]["cacheHint"] == "true"
+    assert "cacheHint" not in metadata[2]
+    assert token[0] == "POST" and "cacheHint" not in token[2]
+    assert explicit[2]["cacheHint"] == "false"
+    assert "cacheHint" not in authenticated.sent[0][2]
+
+
+def test_aligned_plan_requests_full_pages() -> None:
+    plan = build_pagination_plan(2503, 1000, aligned=True)
+
+    assert plan.batches == ((0, 1000), (1000, 1000), (2000, 1000))
+    assert build_pagination_plan(2503, 1000).batches[-1] == (2000, 503)
+
+
+async def _page_bodies(feature_count: int) -> list[dict[str, Any]]:
+    metadata = {
+        "maxRecordCount": 1000,
+        "advancedQueryCapabilities": {"supportsPagination": True},
+        "objectIdField": "OBJECTID",
+    }
+    with patch(
+        "restgdf.utils.getgdf.get_feature_count",
+        new=AsyncMock(return_value=feature_count),
+    ), patch(
+        "restgdf.utils.getgdf.get_metadata",
+        new=AsyncMock(return_value=metadata),
+    ):
+        return await get_query_data_batches(
+            LAYER,
+            object(),  # type: ignore[arg-type]
+            data={"where": "1=1"},
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("cache_hint")
+async def test_cache_hint_keeps_page_queries_stable_as_a_layer_grows() -> None:
+    before = await _page_bodies(2503)
+    after = await _page_bodies(2517)
+
+    assert before == after
+    assert {body["resultRecordCount"] for body in before} == {1000}
+
+
+@pytest.mark.asyncio
+async def test_tail_page_tracks_the_count_without_cache_hint() -> None:
+    before = await _page_bodies(2503)
+    after = await _page_bodies(2517)
+
+    assert before[:-1] == after[:-1]
+    assert before[-1] != after[-1]
@@ -15,7 +15,7 @@ W1-9 (TESTS-02) verb separation
 The GET-vs-POST choice for every ArcGIS call in this module is made by
 ``restgdf.utils._http._arcgis_request``/``_choose_verb``: short, tokenless
 bodies ride a length-based ``GET`` (params coerced to ArcGIS wire strings
-by ``_coerce_params_for_get`` -- booleans become ``"true"``/``"false"``,
+by ``_canonical_query`` -- booleans become ``"true"``/``"false"``,
 ``None`` becomes ``""``); a body carrying a ``token`` key is ALWAYS forced
 onto ``POST`` regardless of length (AUTH-01/W2-1), and ``POST`` forwards
 the body untouched -- raw ``bool``/``None`` values ride through as-is. This
@@ -0,0 +1,172 @@
+"""Single-flight coalescing of identical in-flight ArcGIS reads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from restgdf import deadline, reset_config_cache
+from restgdf.utils import _coalesce
+from restgdf.utils._coalesce import _coalesced_json
+from restgdf.utils._query import get_feature_count, get_metadata
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.delenv("RESTGDF_TRANSPORT_COALESCE_REQUESTS", raising=False)
+    reset_config_cache()
+    yield
+    reset_config_cache()
+    assert not _coalesce._in_flight
+
+
+class _Session:
+    def __init__(self, payload: Any = None, delay: float = 0.02) -> None:
+        self.payload = payload if payload is not None else {"name": "layer"}
+        self.delay = delay
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.error: BaseException | None = None
+
+    async def _send(self, url: str, body: Any) -> Any:
+        self.calls.append((url, dict(body or {})))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        return await self._send(url, kwargs.get("params"))
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        return await self._send(url, kwargs.get("data"))
+
+    async def json(self, content_type: Any = None) -> Any:
+        return self.payload
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_request() -> None:
+    session = _Session()
+    first, second, third = await asyncio.gather(
+        get_metadata(URL, session),
+        get_metadata(URL, session),
+        get_metadata(URL, session),
+    )
+    assert len(session.calls) == 1
+    assert first.name == second.name == third.name == "layer"
+
+
+@pytest.mark.asyncio
+async def test_finished_requests_are_not_cached() -> None:
+    session = _Session(payload={"count": 3})
+    assert await get_feature_count(URL, session) == 3
+    assert await get_feature_count(URL, session) == 3
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_equivalent_bodies_share_one_request() -> None:
+    session = _Session(payload={"count": 3})
+    await asyncio.gather(
+        _coalesced_json(session, f"{URL}/query", {"returnCountOnly": True}),
+        _coalesced_json(session, f"{URL}/query", {"returnCountOnly": "true"}),
+    )
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_merged() -> None:
+    session = _Session(payload={"count": 3})
+    await asyncio.gather(
+        get_feature_count(URL, session),
+        get_feature_count(URL, session, data={"where": "POP > 10"}),
+        get_feature_count(URL, _Session(payload={"count": 3})),
+    )
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_part_of_the_identity() -> None:
+    session = _Session()
+    await asyncio.gather(
+        get_metadata(URL, session, token="alice"),
+        get_metadata(URL, session, token="alice"),
+        get_metadata(URL, session, token="bob"),
+    )
+    assert sorted(body["token"] for _, body in session.calls) == ["alice", "bob"]
+
+
+@pytest.mark.asyncio
+async def test_token_bodies_need_to_be_marked_safe() -> None:
+    session = _Session()
+    body = {"f": "json", "token": "secret"}
+    await asyncio.gather(
+        _coalesced_json(session, URL, body),
+        _coalesced_json(session, URL, body),
+    )
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_scopes_do_not_share_a_flight() -> None:
+    session = _Session()
+
+    async def scoped() -> Any:
+        with deadline(30):
+            return await get_metadata(URL, session)
+
+    await asyncio.gather(scoped(), scoped(), get_metadata(URL, session))
+    assert len(session.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_can_be_turned_off(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_TRANSPORT_COALESCE_REQUESTS", "false")
+    reset_config_cache()
+    session = _Session()
+    await asyncio.gather(get_metadata(URL, session), get_metadata(URL, session))
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter() -> None:
+    session = _Session()
+    session.error = ConnectionResetError("reset")
+    results = await asyncio.gather(
+        get_metadata(URL, session),
+        get_metadata(URL, session),
+        return_exceptions=True,
+    )
+    assert len(session.calls) == 1
+    assert all(isinstance(r, ConnectionResetError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_a_cancelled_waiter_does_not_cancel_the_others() -> None:
+    session = _Session(delay=0.05)
+    leader = asyncio.ensure_future(get_metadata(URL, session))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(get_metadata(URL, session))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert (await follower).name == "layer"
+    assert leader.cancelled()
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_is_cancelled_once_every_waiter_has_gone() -> None:
+    session = _Session(delay=1.0)
+    waiters = [asyncio.ensure_future(get_metadata(URL, session)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    (flight,) = _coalesce._in_flight._flights.values()
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert flight.task.cancelled()
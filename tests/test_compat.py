@@ -152,11 +152,17 @@ def test_featurelayer_patch_targets():
         "get_value_counts",
         "nested_count",
         "row_dict_generator",
-        "random",
     ):
         assert hasattr(mod, name)
 
 
+def test_preview_patch_targets():
+    # Sampling moved out of FeatureLayer; its RNG is patched here now.
+    mod = importlib.import_module("restgdf.utils._preview")
+    for name in ("random", "get_object_ids", "get_sub_gdf"):
+        assert hasattr(mod, name)
+
+
 def test_token_patch_targets():
     mod = importlib.import_module("restgdf.utils.token")
     for name in ("AGOLUserPass", "ArcGISTokenSession", "get_token", "requests"):
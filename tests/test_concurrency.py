@@ -133,54 +133,12 @@ def test_settings_max_concurrent_requests_rejects_zero():
 @pytest.mark.asyncio
 async def test_bounded_semaphore_caps_concurrency_at_fanout_sites(monkeypatch):
     """Per kickoff §10.3 red test: schedule N mock tasks through one of
-    the three enumerated gather sites and assert the in-flight counter
+    the enumerated fan-out sites and assert the in-flight counter
     never exceeds ``max_concurrent_requests``."""
-    from restgdf.utils import _concurrency
+    import restgdf.utils.getinfo as getinfo_mod
 
     inflight = 0
     peak = 0
-    original_bounded_gather = _concurrency.bounded_gather
-
-    async def counting_bounded_gather(*aws, semaphore, **kwargs):
-        nonlocal inflight, peak
-
-        async def _count(aw):
-            nonlocal inflight, peak
-            async with semaphore:
-                inflight += 1
-                peak = max(peak, inflight)
-                try:
-                    return await aw
-                finally:
-                    inflight -= 1
-
-        wrapped = [_count(aw) for aw in aws]
-        # Bypass the outer semaphore in the real helper to avoid double
-        # counting — the inner counter already enforces the cap.
-        unbounded_sem = asyncio.BoundedSemaphore(10_000)
-        return await original_bounded_gather(
-            *wrapped,
-            semaphore=unbounded_sem,
-            **kwargs,
-        )
-
-    monkeypatch.setattr(_concurrency, "bounded_gather", counting_bounded_gather)
-    # Also patch the re-export at the call sites.
-    import restgdf.utils.getinfo as getinfo_mod
-    import restgdf.utils.crawl as crawl_mod
-
-    monkeypatch.setattr(
-        getinfo_mod,
-        "bounded_gather",
-        counting_bounded_gather,
-        raising=False,
-    )
-    monkeypatch.setattr(
-        crawl_mod,
-        "bounded_gather",
-        counting_bounded_gather,
-        raising=False,
-    )
 
     monkeypatch.setenv("RESTGDF_CONCURRENCY_MAX_CONCURRENT_REQUESTS", "4")
     reset_settings_cache()
@@ -191,9 +149,15 @@ async def test_bounded_semaphore_caps_concurrency_at_fanout_sites(monkeypatch):
         layers = [{"id": i} for i in range(N)]
 
         async def fake_get_metadata(url, session, token=None):
+            nonlocal inflight, peak
             if url.count("/") > 7:
                 # Leaf layer call (service_url + "/<layer_id>").
-                await asyncio.sleep(0)
+                inflight += 1
+                peak = max(peak, inflight)
+                try:
+                    await asyncio.sleep(0)
+                finally:
+                    inflight -= 1
                 return {"type": "Table"}
             # Top-level service call returns N layers.
             return {"layers": layers}
@@ -208,3 +172,132 @@ async def test_bounded_semaphore_caps_concurrency_at_fanout_sites(monkeypatch):
         assert peak > 0, "fan-out site never exercised"
     finally:
         reset_settings_cache()
+
+
+@pytest.mark.asyncio
+async def test_bounded_as_completed_pulls_work_lazily_and_streams_results():
+    """Only ``limit`` items are pulled ahead of the consumer, and a fast
+    result is yielded while slow calls are still running."""
+    from restgdf.utils._concurrency import bounded_as_completed
+
+    pulled = 0
+    inflight = peak = 0
+
+    def items():
+        nonlocal pulled
+        for i in range(10_000):
+            pulled += 1
+            yield i
+
+    async def work(i):
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        try:
+            await asyncio.sleep(0 if i == 1 else 0.01)
+            return i * 2
+        finally:
+            inflight -= 1
+
+    stream = bounded_as_completed(work, items(), limit=3)
+    first = await stream.__anext__()
+    assert first == (1, 2)
+    assert pulled == 4  # three initial calls plus one replacement
+    await stream.aclose()
+    assert peak == 3
+    assert inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_ordered_and_unordered():
+    from restgdf.utils._concurrency import bounded_map
+
+    done_order = []
+
+    async def work(i):
+        await gates[i].wait()
+        done_order.append(i)
+        finished[i].set()
+        return i
+
+    async def finish_in_reverse():
+        # One call at a time, last item first.
+        for i in reversed(range(5)):
+            gates[i].set()
+            await finished[i].wait()
+
+    gates = [asyncio.Event() for _ in range(5)]
+    finished = [asyncio.Event() for _ in range(5)]
+    releaser = asyncio.create_task(finish_in_reverse())
+    ordered = [r async for r in bounded_map(work, range(5), limit=5)]
+    await releaser
+    assert done_order == [4, 3, 2, 1, 0]
+    assert ordered == [0, 1, 2, 3, 4]
+
+    # Unordered: open the next gate only once the previous result is out.
+    gates = [asyncio.Event() for _ in range(5)]
+    finished = [asyncio.Event() for _ in range(5)]
+    gates[4].set()
+    unordered = []
+    async for r in bounded_map(work, range(5), limit=5, ordered=False):
+        unordered.append(r)
+        if r:
+            gates[r - 1].set()
+    assert unordered == [4, 3, 2, 1, 0]
+    with pytest.raises(ValueError, match="limit"):
+        bounded_map(work, range(5), limit=0)
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_failure_cancels_in_flight_calls():
+    from restgdf.utils._concurrency import bounded_map
+
+    cancelled = []
+
+    async def work(i):
+        if i == 0:
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+
+    with pytest.raises(RuntimeError, match="boom"):
+        async for _ in bounded_map(work, range(100), limit=4, ordered=False):
+            pass
+    assert sorted(cancelled) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_gdf_list_keeps_at_most_the_cap_of_tasks(monkeypatch):
+    """A large page plan never materialises one task per page."""
+    from unittest.mock import AsyncMock
+
+    from restgdf.utils import getgdf as getgdf_mod
+
+    inflight = peak = 0
+
+    async def fake_get_sub_gdf(url, session, query_data, **kwargs):
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        await asyncio.sleep(0)
+        inflight -= 1
+        return query_data["resultOffset"]
+
+    monkeypatch.setenv("RESTGDF_CONCURRENCY_MAX_CONCURRENT_REQUESTS", "4")
+    reset_settings_cache()
+    monkeypatch.setattr(
+        getgdf_mod,
+        "get_query_data_batches",
+        AsyncMock(return_value=[{"resultOffset": i} for i in range(500)]),
+    )
+    monkeypatch.setattr(getgdf_mod, "get_sub_gdf", fake_get_sub_gdf)
+    monkeypatch.setattr(getgdf_mod, "_require_geo_query_support", lambda _f: None)
+    try:
+        result = await getgdf_mod.get_gdf_list("https://example.com/layer/0", object())
+    finally:
+        reset_settings_cache()
+    assert result == list(range(500))
+    assert peak == 4
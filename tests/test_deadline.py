@@ -0,0 +1,316 @@
+"""End-to-end deadlines across requests, retries, streams and crawls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from restgdf import PageFailure, PageRetryPolicy, deadline
+from restgdf._config import ResilienceConfig
+from restgdf.directory.directory import Directory
+from restgdf.errors import DeadlineExceededError, TransportError
+from restgdf.featurelayer.featurelayer import FeatureLayer
+from restgdf.resilience import ResilientSession
+from restgdf.utils import crawl as crawl_mod
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._deadline import _clamped_timeout, _remaining
+from restgdf.utils._http import _arcgis_request
+from restgdf.utils._page_retry import _run_page_attempts
+from restgdf.utils.getgdf import get_gdf_list
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+ROOT = "https://example.com/arcgis/rest/services"
+
+
+class TestScope:
+    def test_nested_deadline_only_shortens(self) -> None:
+        assert _remaining() is None
+        with deadline(10):
+            outer = _remaining()
+            with deadline(60):
+                assert _remaining() <= outer  # type: ignore[operator]
+            with deadline(1):
+                assert _remaining() <= 1  # type: ignore[operator]
+        assert _remaining() is None
+
+    def test_none_is_unbounded(self) -> None:
+        with deadline(None):
+            assert _remaining() is None
+
+    @pytest.mark.parametrize("seconds", [0, -1.5])
+    def test_rejects_non_positive_budget(self, seconds: float) -> None:
+        with pytest.raises(ValueError, match="deadline must be > 0"):
+            with deadline(seconds):
+                pass
+
+    def test_clamps_request_timeouts(self) -> None:
+        long = aiohttp.ClientTimeout(total=300, connect=5)
+        assert _clamped_timeout(long) is long
+        with deadline(2):
+            clamped = _clamped_timeout(long)
+            assert clamped.total <= 2 and clamped.connect == 5
+            short = aiohttp.ClientTimeout(total=1)
+            assert _clamped_timeout(short) is short
+            assert _clamped_timeout(None).total <= 2
+            assert _clamped_timeout(30.0) <= 2
+
+
+class _Session:
+    """Honors ``timeout.total`` the way aiohttp does."""
+
+    status = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, delay: float = 0.0, payload: Any = None) -> None:
+        self.delay = delay
+        self.payload = payload if payload is not None else {"features": []}
+        self.timeouts: list[Any] = []
+
+    async def close(self) -> None:
+        pass
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        timeout = kwargs.get("timeout")
+        self.timeouts.append(timeout)
+        total = timeout.total if isinstance(timeout, aiohttp.ClientTimeout) else None
+        await asyncio.wait_for(asyncio.sleep(self.delay), total)
+        return self
+
+    get = post
+
+    async def json(self, content_type: Any = None) -> Any:
+        return self.payload
+
+
+@pytest.mark.asyncio
+async def test_request_gets_remaining_budget_and_fails_at_deadline() -> None:
+    session = _Session(delay=1.0)
+    started = time.monotonic()
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceededError) as info:
+            await _arcgis_request(
+                session,
+                f"{URL}/query",
+                {"where": "1=1"},
+                timeout=aiohttp.ClientTimeout(total=300),
+            )
+        # Once expired, nothing more is sent.
+        with pytest.raises(DeadlineExceededError):
+            await _arcgis_request(session, f"{URL}/query", {"where": "1=1"})
+    assert time.monotonic() - started < 0.5
+    assert len(session.timeouts) == 1
+    assert session.timeouts[0].total <= 0.05
+    assert info.value.budget_s == 0.05
+    assert info.value.url == f"{URL}/query"
+
+
+class _Down:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def close(self) -> None:
+        pass
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        self.calls += 1
+        raise aiohttp.ServerDisconnectedError()
+
+    post = get
+
+
+@pytest.mark.asyncio
+async def test_session_does_not_retry_past_the_deadline() -> None:
+    inner = _Down()
+    session = ResilientSession(
+        inner,
+        ResilienceConfig(
+            enabled=True,
+            max_attempts=5,
+            wait_initial_s=0.5,
+            wait_jitter_s=0,
+        ),
+    )
+    started = time.monotonic()
+    with deadline(0.2):
+        with pytest.raises(TransportError):
+            await session.get(f"{URL}/query")
+    assert time.monotonic() - started < 0.5
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_session_maps_deadline_timeout_without_tripping_breaker() -> None:
+    inner = _Session(delay=1.0)
+    session = ResilientSession(
+        inner,
+        ResilienceConfig(enabled=True, breaker_failure_threshold=1),
+    )
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            await session.get(f"{URL}/query")
+    assert inner.timeouts[0].total <= 0.05
+    # The caller's deadline says nothing about the host.
+    inner.delay = 0
+    await session.get(f"{URL}/query")
+
+
+@pytest.mark.asyncio
+async def test_page_retry_is_not_started_past_the_deadline() -> None:
+    calls = 0
+
+    async def call() -> None:
+        nonlocal calls
+        calls += 1
+        raise TransportError("reset")
+
+    policy = PageRetryPolicy(max_attempts=5, wait_initial_s=1.0, wait_jitter_s=0)
+    with deadline(0.5):
+        _, error, attempts = await _run_page_attempts(
+            call,
+            policy,
+            url=URL,
+            batch_index=0,
+        )
+    assert isinstance(error, TransportError)
+    assert calls == attempts == 1
+
+
+def _layer(session: Any) -> FeatureLayer:
+    layer = FeatureLayer(URL, session=session)
+    layer.fields = ("OBJECTID",)
+    layer.object_id_field = "OBJECTID"
+    return layer
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_reports_pages_completed_at_the_deadline() -> None:
+    layer = _layer(_Session(delay=0.03))
+    batches = [{"resultOffset": i} for i in range(10)]
+    seen = 0
+    with patch.object(
+        getgdf_mod,
+        "get_query_data_batches",
+        AsyncMock(return_value=batches),
+    ):
+        with pytest.raises(DeadlineExceededError) as info:
+            async for _ in layer.iter_pages(max_concurrent_pages=1, deadline=0.1):
+                seen += 1
+    assert 1 <= seen < 10
+    assert info.value.completed == seen
+    assert _remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_collect_reports_cut_off_pages() -> None:
+    layer = _layer(_Session(delay=0.03))
+    batches = [{"resultOffset": i} for i in range(10)]
+    failures: list[PageFailure] = []
+    with patch.object(
+        getgdf_mod,
+        "get_query_data_batches",
+        AsyncMock(return_value=batches),
+    ):
+        pages = [
+            page
+            async for page in layer.iter_pages(
+                max_concurrent_pages=1,
+                on_page_error="collect",
+                page_failures=failures,
+                deadline=0.1,
+            )
+        ]
+    assert len(pages) + len(failures) == 10
+    assert failures
+    assert all(isinstance(f.exception, DeadlineExceededError) for f in failures)
+
+
+@pytest.mark.asyncio
+async def test_get_gdf_list_counts_finished_pages(sample_feature_gdf) -> None:
+    async def fake_get_sub_gdf(url, session, query_data, **kwargs):
+        if query_data["where"] == "late":
+            raise DeadlineExceededError("late", budget_s=1.0)
+        return sample_feature_gdf
+
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(
+                return_value=[{"where": "a"}, {"where": "b"}, {"where": "late"}],
+            ),
+        ),
+        patch.object(getgdf_mod, "get_sub_gdf", new=fake_get_sub_gdf),
+    ):
+        with pytest.raises(DeadlineExceededError) as info:
+            await get_gdf_list(URL, object())  # type: ignore[arg-type]
+    assert info.value.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_feature_layer_get_gdf_forwards_deadline_only_when_set() -> None:
+    layer = _layer(object())
+    fake = AsyncMock(side_effect=RuntimeError("stop"))
+    with patch("restgdf.featurelayer.featurelayer.get_gdf", fake):
+        for kwargs in ({}, {"deadline": 30.0}):
+            with pytest.raises(RuntimeError):
+                await layer.get_gdf(**kwargs)
+    assert "deadline" not in fake.await_args_list[0].kwargs
+    assert fake.await_args_list[1].kwargs["deadline"] == 30.0
+
+
+class _Server(_Session):
+    """Answers the root at once, service ``S0`` at once, the rest slowly."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        self.delay = 0.0 if url in (ROOT, f"{ROOT}/S0/FeatureServer") else 5.0
+        await super().post(url, **kwargs)
+        resp = _Session()
+        resp.payload = (
+            {
+                "services": [
+                    {"name": f"S{i}", "type": "FeatureServer"} for i in range(4)
+                ],
+                "folders": [],
+            }
+            if url == ROOT
+            else {"layers": []}
+        )
+        return resp
+
+    get = post
+
+
+@pytest.mark.asyncio
+async def test_safe_crawl_keeps_finished_services_at_the_deadline() -> None:
+    started = time.monotonic()
+    report = await crawl_mod.safe_crawl(
+        _Server(),  # type: ignore[arg-type]
+        ROOT,
+        deadline=0.2,
+    )
+    assert time.monotonic() - started < 1.0
+    assert [s.metadata is not None for s in report.services] == [
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert {e.stage for e in report.errors} == {"service_metadata"}
+    assert all(isinstance(e.exception, DeadlineExceededError) for e in report.errors)
+
+
+@pytest.mark.asyncio
+async def test_directory_does_not_cache_a_crawl_cut_short() -> None:
+    directory = Directory(ROOT, session=_Server())  # type: ignore[arg-type]
+    services = await directory.crawl(deadline=0.2)
+    assert len(services) == 4
+    assert directory.report is not None and len(directory.report.errors) == 3
+    assert directory.services is None
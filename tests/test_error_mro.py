@@ -14,7 +14,9 @@ import pytest
 from restgdf.errors import (
     ArcGISServiceError,
     AuthenticationError,
+    CircuitOpenError,
     ConfigurationError,
+    DeadlineExceededError,
     OptionalDependencyError,
     OutputConversionError,
     PaginationError,
@@ -220,6 +222,38 @@ def test_rate_limit_error_mro_and_retry_after() -> None:
     assert default.retry_after is None
 
 
+def test_circuit_open_error_mro_and_attributes() -> None:
+    assert CircuitOpenError.__mro__ == (
+        CircuitOpenError,
+        TransportError,
+        RestgdfError,
+        Exception,
+        BaseException,
+        object,
+    )
+    err = CircuitOpenError("open", breaker_key="https://h", retry_after=3.0, url="u")
+    assert (err.breaker_key, err.retry_after, err.url) == ("https://h", 3.0, "u")
+    assert err.status_code is None
+
+
+def test_deadline_exceeded_error_mro_and_attributes() -> None:
+    assert DeadlineExceededError.__mro__ == (
+        DeadlineExceededError,
+        RestgdfTimeoutError,
+        TransportError,
+        RestgdfError,
+        TimeoutError,
+        OSError,
+        Exception,
+        BaseException,
+        object,
+    )
+    err = DeadlineExceededError("late", url="u", budget_s=60.0, completed=12)
+    assert (err.url, err.budget_s, err.completed) == ("u", 60.0, 12)
+    assert err.timeout_kind == "deadline"
+    assert err.status_code is None
+
+
 def test_output_conversion_error_mro() -> None:
     assert issubclass(OutputConversionError, RestgdfError)
     assert OutputConversionError.__mro__ == (
@@ -239,7 +273,9 @@ def test_module_lists_full_public_api() -> None:
         "ArcGISServiceError",
         "AuthNotAttachedError",
         "AuthenticationError",
+        "CircuitOpenError",
         "ConfigurationError",
+        "DeadlineExceededError",
         "FieldDoesNotExistError",
         "InvalidCredentialsError",
         "OptionalDependencyError",
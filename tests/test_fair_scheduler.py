@@ -0,0 +1,190 @@
+"""FairScheduler: global cap with per-layer round-robin and per-host caps."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from restgdf import FairScheduler
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._concurrency import bounded_gather
+from restgdf.utils.getgdf import _iter_pages_raw
+
+HOST_A = "https://a.example.com/arcgis/rest/services"
+HOST_B = "https://b.example.com/arcgis/rest/services"
+
+
+async def _hold(scheduler: FairScheduler, flow: str, order: list[str], **kw) -> None:
+    async with scheduler.slot(flow, **kw):
+        order.append(flow)
+        await asyncio.sleep(0.01)
+
+
+class TestFairScheduler:
+    def test_rejects_bad_limits(self) -> None:
+        with pytest.raises(ValueError, match="max_concurrent"):
+            FairScheduler(0)
+        with pytest.raises(ValueError, match="max_per_host"):
+            FairScheduler(1, max_per_host=0)
+        with pytest.raises(ValueError, match="weight"):
+            FairScheduler(1, weights={"x": 0})
+
+    @pytest.mark.asyncio
+    async def test_round_robins_between_flows(self) -> None:
+        scheduler = FairScheduler(1)
+        big, small = f"{HOST_A}/Big/FeatureServer/0", f"{HOST_A}/Small/FeatureServer/0"
+        order: list[str] = []
+        # The big layer queues all its work first; the small one still
+        # gets every other slot instead of waiting behind it.
+        tasks = [asyncio.create_task(_hold(scheduler, big, order)) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(_hold(scheduler, small, order)) for _ in range(2)]
+        await asyncio.gather(*tasks)
+        assert order == [big, big, small, big, small, big]
+        assert scheduler.snapshot()["active"] == 0
+        assert scheduler.snapshot()["flows"] == {}
+
+    @pytest.mark.asyncio
+    async def test_weights_grant_consecutive_slots(self) -> None:
+        heavy, light = f"{HOST_A}/H/FeatureServer/0", f"{HOST_A}/L/FeatureServer/0"
+        scheduler = FairScheduler(1, weights={heavy: 2})
+        order: list[str] = []
+        blocker = asyncio.create_task(_hold(scheduler, "blocker", order))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(_hold(scheduler, heavy, order)) for _ in range(4)]
+        tasks += [asyncio.create_task(_hold(scheduler, light, order)) for _ in range(2)]
+        await asyncio.gather(blocker, *tasks)
+        assert order[1:] == [heavy, heavy, light, heavy, heavy, light]
+
+    @pytest.mark.asyncio
+    async def test_lower_priority_value_is_served_first(self) -> None:
+        scheduler = FairScheduler(1)
+        order: list[str] = []
+        blocker = asyncio.create_task(_hold(scheduler, "blocker", order))
+        await asyncio.sleep(0)
+        bulk = [asyncio.create_task(_hold(scheduler, "bulk", order, priority=10))]
+        urgent = [asyncio.create_task(_hold(scheduler, "urgent", order, priority=0))]
+        await asyncio.gather(blocker, *bulk, *urgent)
+        assert order == ["blocker", "urgent", "bulk"]
+
+    @pytest.mark.asyncio
+    async def test_per_host_cap(self) -> None:
+        scheduler = FairScheduler(4, max_per_host=1)
+        peak: dict[str, int] = {}
+
+        async def work(flow: str) -> None:
+            async with scheduler.slot(flow):
+                hosts = scheduler.snapshot()["hosts"]
+                for host, held in hosts.items():
+                    peak[host] = max(peak.get(host, 0), held)
+                await asyncio.sleep(0.01)
+
+        flows = [f"{HOST_A}/S{i}/FeatureServer/0" for i in range(3)]
+        flows += [f"{HOST_B}/S{i}/FeatureServer/0" for i in range(3)]
+        await asyncio.gather(*(work(flow) for flow in flows))
+        assert peak == {"https://a.example.com": 1, "https://b.example.com": 1}
+
+    @pytest.mark.asyncio
+    async def test_nested_slot_is_reentrant(self) -> None:
+        scheduler = FairScheduler(1)
+
+        async def inner() -> str:
+            async with scheduler.slot("inner"):
+                return "ok"
+
+        async with scheduler.slot("outer"):
+            # A nested fan-out under a held slot must not deadlock.
+            assert await asyncio.wait_for(asyncio.gather(inner(), inner()), 1) == [
+                "ok",
+                "ok",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self) -> None:
+        scheduler = FairScheduler(1)
+        order: list[str] = []
+        holder = asyncio.create_task(_hold(scheduler, "a", order))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(scheduler, "b", order))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await _hold(scheduler, "c", order)
+        assert order == ["a", "c"]
+        assert scheduler.active == 0
+        assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_gather_takes_scheduler_slots_when_active() -> None:
+    scheduler = FairScheduler(2)
+    peak = 0
+
+    async def work() -> None:
+        nonlocal peak
+        peak = max(peak, scheduler.active)
+        await asyncio.sleep(0.005)
+
+    with scheduler.activate():
+        await asyncio.gather(
+            *(
+                bounded_gather(
+                    *(work() for _ in range(5)),
+                    semaphore=asyncio.BoundedSemaphore(8),
+                    flow=f"{HOST_A}/S{i}/FeatureServer",
+                )
+                for i in range(3)
+            ),
+        )
+    assert peak == 2
+    assert scheduler.granted == 15
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_share_one_global_cap() -> None:
+    scheduler = FairScheduler(3)
+    in_flight = peak = 0
+
+    async def fake_fetch(_url, _session, query_data, **_kw):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return {"features": []}
+
+    async def drain(layer: str) -> int:
+        return len([page async for page in _iter_pages_raw(layer, object())])
+
+    batches = [{"where": "1=1", "resultOffset": i} for i in range(6)]
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", side_effect=fake_fetch),
+        scheduler.activate(),
+    ):
+        counts = await asyncio.gather(
+            *(drain(f"{HOST_A}/L{i}/FeatureServer/0") for i in range(4)),
+        )
+
+    assert counts == [6, 6, 6, 6]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_no_scheduler_means_no_global_cap() -> None:
+    scheduler = FairScheduler(1)
+    results = await bounded_gather(
+        *(asyncio.sleep(0, result=i) for i in range(3)),
+        semaphore=asyncio.BoundedSemaphore(3),
+        flow="ignored",
+    )
+    assert results == [0, 1, 2]
+    assert scheduler.granted == 0
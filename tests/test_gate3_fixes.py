@@ -28,7 +28,6 @@ from __future__ import annotations
 
 import math
 import re
-from urllib.parse import urlencode
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
@@ -241,51 +240,6 @@ async def test_arcgis_request_forces_post_for_resilient_wrapped_token_session():
     assert inner.get.await_count == 0
 
 
-def test_coerce_params_for_get_normalizes_bool_none_and_preserves_other_values():
-    """Direct unit coverage for the GET-param normalization helper.
-
-    ArcGIS request bodies can include bools from DEFAULTDICT and explicit
-    ``None`` values. The helper must only normalize those two cases and
-    leave all other scalar / sequence values untouched.
-    """
-    from restgdf.utils._http import _coerce_params_for_get
-
-    result = _coerce_params_for_get(
-        {
-            "where": "1=1",
-            "returnGeometry": True,
-            "returnCountOnly": False,
-            "outFields": None,
-            "resultRecordCount": 1000,
-            "objectIds": [1, 2, 3],
-        },
-    )
-
-    assert result == {
-        "where": "1=1",
-        "returnGeometry": "true",
-        "returnCountOnly": "false",
-        "outFields": "",
-        "resultRecordCount": 1000,
-        "objectIds": [1, 2, 3],
-    }
-
-
-def test_encoded_body_length_matches_urlencode_doseq_behavior():
-    """The length helper must mirror ``urlencode(..., doseq=True)`` exactly."""
-    from restgdf.utils._http import _encoded_body_length
-
-    body = {
-        "where": "NAME IN ('A', 'B')",
-        "objectIds": [1, 2, 3],
-        "returnGeometry": True,
-    }
-
-    assert _encoded_body_length(None) == 0
-    assert _encoded_body_length({}) == 0
-    assert _encoded_body_length(body) == len(urlencode(body, doseq=True))
-
-
 def test_safe_static_attr_value_handles_descriptor_and_attributeerror():
     """Static attr reads must resolve properties without fabricating values."""
     from restgdf.utils._http import _safe_static_attr_value
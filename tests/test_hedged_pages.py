@@ -0,0 +1,194 @@
+"""Hedged page requests for ``_iter_pages_raw`` / ``FeatureLayer.iter_pages``."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from restgdf import HedgePolicy
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._hedging import _hedged_call, _HedgeState
+from restgdf.utils.getgdf import _iter_pages_raw
+
+
+def _warm_state(policy: HedgePolicy, latency: float, n: int) -> _HedgeState:
+    state = _HedgeState(policy)
+    for _ in range(n):
+        state.record(latency)
+    state.requests = n
+    return state
+
+
+class TestHedgePolicyValidation:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"percentile": 0},
+            {"percentile": 1},
+            {"max_hedge_ratio": 0},
+            {"max_hedge_ratio": 1.5},
+            {"min_samples": 0},
+            {"window": 5, "min_samples": 10},
+            {"min_delay_s": -1},
+        ],
+    )
+    def test_rejects_out_of_range(self, kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            HedgePolicy(**kwargs)
+
+    def test_delay_is_none_until_min_samples(self) -> None:
+        state = _HedgeState(HedgePolicy(min_samples=3, min_delay_s=0))
+        state.record(0.1)
+        state.record(0.2)
+        assert state.hedge_delay() is None
+        state.record(0.3)
+        assert state.hedge_delay() == pytest.approx(0.3)
+
+    def test_delay_respects_floor(self) -> None:
+        state = _warm_state(HedgePolicy(min_samples=2, min_delay_s=0.5), 0.01, 2)
+        assert state.hedge_delay() == 0.5
+
+
+class TestHedgedCall:
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_hedge_wins(self) -> None:
+        policy = HedgePolicy(min_samples=5, min_delay_s=0, max_hedge_ratio=1.0)
+        state = _warm_state(policy, 0.01, 5)
+        calls = 0
+        cancelled = asyncio.Event()
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                return "primary"
+            return "hedge"
+
+        assert await _hedged_call(call, state) == "hedge"
+        assert calls == 2
+        assert state.hedged == 1
+        assert state.hedge_wins == 1
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self) -> None:
+        policy = HedgePolicy(min_samples=5, min_delay_s=0.5, max_hedge_ratio=1.0)
+        state = _warm_state(policy, 0.01, 5)
+        fn = AsyncMock(return_value="ok")
+
+        assert await _hedged_call(fn, state) == "ok"
+        assert fn.await_count == 1
+        assert state.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_ratio_cap_blocks_hedge(self) -> None:
+        policy = HedgePolicy(min_samples=5, min_delay_s=0, max_hedge_ratio=0.01)
+        state = _warm_state(policy, 0.001, 5)
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "primary"
+
+        assert await _hedged_call(call, state) == "primary"
+        assert calls == 1
+        assert state.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self) -> None:
+        policy = HedgePolicy(min_samples=5, min_delay_s=0, max_hedge_ratio=1.0)
+        state = _warm_state(policy, 0.001, 5)
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                return "primary"
+            raise ConnectionError("hedge failed")
+
+        assert await _hedged_call(call, state) == "primary"
+        assert state.hedge_wins == 0
+
+    @pytest.mark.asyncio
+    async def test_both_fail_raises_primary_error(self) -> None:
+        policy = HedgePolicy(min_samples=5, min_delay_s=0, max_hedge_ratio=1.0)
+        state = _warm_state(policy, 0.001, 5)
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                raise ValueError("primary")
+            raise ConnectionError("hedge")
+
+        with pytest.raises(ValueError, match="primary"):
+            await _hedged_call(call, state)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_raw_hedges_straggler_page() -> None:
+    """A straggler page after warm-up is duplicated; output is unchanged."""
+    url = "https://x/FeatureServer/0"
+    batches = [{"where": "1=1", "resultOffset": i} for i in range(8)]
+    calls: dict[int, int] = {}
+
+    async def fake_fetch(_url, _session, query_data, **_kw):
+        offset = query_data["resultOffset"]
+        calls[offset] = calls.get(offset, 0) + 1
+        if offset == 6 and calls[offset] == 1:
+            await asyncio.sleep(10)
+        return {"features": [{"attributes": {"i": offset}}]}
+
+    policy = HedgePolicy(min_samples=4, min_delay_s=0.01, max_hedge_ratio=0.5)
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", side_effect=fake_fetch),
+    ):
+        pages = [
+            page
+            async for page in _iter_pages_raw(
+                url,
+                object(),  # type: ignore[arg-type]
+                max_concurrent_pages=1,
+                hedge=policy,
+            )
+        ]
+
+    assert [p["features"][0]["attributes"]["i"] for p in pages] == list(range(8))
+    assert calls[6] == 2
+    assert all(n == 1 for offset, n in calls.items() if offset != 6)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_raw_without_hedge_never_duplicates() -> None:
+    url = "https://x/FeatureServer/0"
+    batches = [{"where": "1=1", "resultOffset": i} for i in range(3)]
+    fetch = AsyncMock(return_value={"features": []})
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", fetch),
+    ):
+        async for _ in _iter_pages_raw(url, object()):  # type: ignore[arg-type]
+            pass
+    assert fetch.await_count == 3
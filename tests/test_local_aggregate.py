@@ -0,0 +1,242 @@
+"""Streaming local aggregation and its sketches."""
+
+from __future__ import annotations
+
+import random
+import statistics
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from restgdf import FeatureLayer, Statistic
+from restgdf._models.responses import LayerMetadata
+from restgdf.errors import RestgdfResponseError
+from restgdf.utils._sketches import HyperLogLog, TDigest, _hash64
+from restgdf.utils.getinfo import aggregate, aggregate_batches, supports_statistics
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+ROWS = [
+    {"CITY": "A", "POP": 10, "NAME": "x"},
+    {"CITY": "B", "POP": 5, "NAME": "y"},
+    {"CITY": "A", "POP": 30, "NAME": "z"},
+    {"CITY": "A", "POP": None, "NAME": "x"},
+    {"CITY": "B", "POP": 7, "NAME": "y"},
+    {"CITY": "A", "POP": 20, "NAME": None},
+]
+
+
+def test_tdigest_is_exact_for_small_inputs() -> None:
+    values = [3.0, 1.0, 4.0, 1.5, 9.0, 2.6, 5.0]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+
+    ordered = sorted(values)
+    assert digest.quantile(0.5) == statistics.median(values)
+    # Rank 0.25 * 6 = 1.5: halfway between 1.5 and 2.6.
+    assert digest.quantile(0.25) == pytest.approx(2.05)
+    assert digest.quantile(0.0) == ordered[0]
+    assert digest.quantile(1.0) == ordered[-1]
+    assert digest.quantile(0.5, discrete=True) == ordered[3]
+    assert digest.quantile(0.3, discrete=True) == ordered[2]
+    assert TDigest().quantile(0.5) is None
+
+
+def test_tdigest_stays_small_and_close_on_large_inputs() -> None:
+    rng = random.Random(0)
+    values = [rng.gauss(0, 1) for _ in range(20_000)]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+
+    digest.quantile(0.5)
+    assert len(digest._means) <= digest.compression
+    ordered = sorted(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        estimate = digest.quantile(q)
+        rank = sum(1 for value in ordered if value <= estimate)
+        assert abs(rank / len(values) - q) < 0.005
+
+
+def test_hyperloglog_estimates_distinct_counts() -> None:
+    for count in (10, 1_000, 30_000):
+        sketch = HyperLogLog()
+        for value in range(count):
+            sketch.add(value)
+            sketch.add(f"v{value % 7}")
+        # Small counts carry a bias of a value or two.
+        assert sketch.estimate() == pytest.approx(count + 7, rel=0.05, abs=2)
+    # Unsalted: the same hash in every process, whatever PYTHONHASHSEED.
+    assert _hash64("v1") == 0xAF1BA7F340FA2151
+    assert _hash64(1) == _hash64(1.0) == _hash64(True)
+    assert _hash64("1") != _hash64(b"1") != _hash64(1)
+
+
+@pytest.mark.asyncio
+async def test_grouped_statistics_match_exact_values() -> None:
+    async def batches() -> AsyncIterator[list[dict[str, Any]]]:
+        for start in range(0, len(ROWS), 4):
+            yield [{"attributes": row} for row in ROWS[start : start + 4]]
+
+    rows = await aggregate_batches(
+        batches(),
+        {
+            "n": ("count", "POP"),
+            "total": ("sum", "POP"),
+            "low": ("min", "POP"),
+            "high": ("max", "POP"),
+            "mean": ("avg", "POP"),
+            "sd": ("stddev", "POP"),
+            "variance": ("var", "POP"),
+            "median": ("percentile_cont", "POP", 0.5),
+            "names": ("count_distinct", "NAME"),
+        },
+        "CITY",
+    )
+
+    a, b = rows
+    assert a == {
+        "CITY": "A",
+        "n": 3,
+        "total": 60,
+        "low": 10,
+        "high": 30,
+        "mean": 20,
+        "sd": pytest.approx(statistics.stdev([10, 30, 20])),
+        "variance": pytest.approx(statistics.variance([10, 30, 20])),
+        "median": 20,
+        "names": 2,
+    }
+    assert (b["CITY"], b["n"], b["total"], b["median"], b["names"]) == (
+        "B",
+        2,
+        12,
+        6,
+        1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_order_by_and_ungrouped_results() -> None:
+    ordered = await aggregate_batches(
+        [ROWS],
+        {"total": ("sum", "POP")},
+        "CITY",
+        order_by="total ASC",
+    )
+    overall = await aggregate_batches(
+        [],
+        [Statistic("count", "POP"), Statistic("avg", "POP")],
+    )
+
+    assert [row["CITY"] for row in ordered] == ["B", "A"]
+    assert overall == [{"POP_count": 0, "POP_avg": None}]
+    with pytest.raises(ValueError, match="order_by"):
+        await aggregate_batches([ROWS], {"total": ("sum", "POP")}, order_by="x")
+
+
+def test_supports_statistics_reads_capability_flags() -> None:
+    assert supports_statistics({})
+    assert not supports_statistics(
+        {"advancedQueryCapabilities": {"supportsStatistics": False}},
+    )
+    assert not supports_statistics({"supportsStatistics": False})
+    flags = {"supportsStatistics": True, "supportsPercentileStatistics": False}
+    assert supports_statistics({"advancedQueryCapabilities": flags})
+    assert not supports_statistics(
+        {"advancedQueryCapabilities": flags},
+        percentiles=True,
+    )
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+
+class _FailingStatsSession:
+    def __init__(self) -> None:
+        self.sent: list[Any] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        self.sent.append(params)
+        return _Response({"error": {"code": 400, "message": "Unable to perform"}})
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return await self.get(url, data)
+
+
+def _layer(session: Any, **capabilities: bool) -> FeatureLayer:
+    layer = FeatureLayer(LAYER, session=session)
+    layer.fields = ("CITY", "POP", "NAME")
+    layer.metadata = LayerMetadata.model_validate(
+        {"name": "S", "advancedQueryCapabilities": capabilities},
+    )
+    streamed: list[dict[str, Any]] = []
+
+    async def stream_feature_batches(
+        **kwargs: Any,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        streamed.append(kwargs)
+        yield [{"attributes": row} for row in ROWS]
+
+    layer.stream_feature_batches = stream_feature_batches  # type: ignore
+    layer.streamed = streamed  # type: ignore[attr-defined]
+    return layer
+
+
+@pytest.mark.asyncio
+async def test_auto_engine_skips_servers_without_statistics() -> None:
+    session = _FailingStatsSession()
+    layer = _layer(session, supportsStatistics=False)
+
+    rows = await layer.aggregate({"total": ("sum", "POP")}, "CITY")
+
+    assert session.sent == []
+    assert layer.streamed[0]["data"] == {  # type: ignore[attr-defined]
+        "outFields": "CITY,POP",
+        "returnGeometry": False,
+    }
+    assert {row["CITY"]: row["total"] for row in rows} == {"A": 60, "B": 12}
+
+
+@pytest.mark.asyncio
+async def test_auto_engine_falls_back_when_the_statistics_query_fails() -> None:
+    session = _FailingStatsSession()
+    layer = _layer(session, supportsStatistics=True)
+
+    rows = await layer.aggregate({"total": ("sum", "POP")}, "CITY")
+
+    assert len(session.sent) == 1
+    assert len(rows) == 2
+    with pytest.raises(RestgdfResponseError, match="Unable to perform"):
+        await layer.aggregate({"total": ("sum", "POP")}, "CITY", engine="server")
+    with pytest.raises(ValueError, match="having"):
+        await layer.aggregate(
+            {"total": ("sum", "POP")},
+            "CITY",
+            having="SUM(POP) > 1",
+            engine="local",
+        )
+
+
+@pytest.mark.asyncio
+async def test_local_only_statistics_never_reach_the_server() -> None:
+    session = _FailingStatsSession()
+    layer = _layer(session, supportsStatistics=True)
+
+    rows = await layer.aggregate({"names": ("count_distinct", "NAME")})
+
+    assert session.sent == []
+    assert rows == [{"names": 3}]
+    with pytest.raises(ValueError, match="no server-side equivalent"):
+        await aggregate(
+            LAYER,
+            {"names": ("count_distinct", "NAME")},
+            session,  # type: ignore[arg-type]
+        )
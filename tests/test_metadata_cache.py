@@ -0,0 +1,305 @@
+"""Shared metadata/count/stats cache (``restgdf.MetadataCache``)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from restgdf import AGOLUserPass, FeatureLayer, MetadataCache
+from restgdf.utils import _cache
+from restgdf.featurelayer import featurelayer as featurelayer_mod
+from restgdf.utils._cache import _auth_scope, _LRUDict
+from restgdf.utils._query import get_feature_count, get_metadata
+from restgdf.utils._stats import get_value_counts
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+_METADATA = {
+    "name": "Parcels",
+    "type": "Feature Layer",
+    "fields": [
+        {"name": "OBJECTID", "type": "esriFieldTypeOID"},
+        {"name": "CITY", "type": "esriFieldTypeString"},
+    ],
+    "maxRecordCount": 1000,
+}
+
+
+class _Server:
+    """Answers layer metadata, counts and CITY value counts."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[dict[str, Any]] = []
+        self.metadata: Any = _METADATA
+
+    async def _send(self, url: str, body: Any) -> Any:
+        body = dict(body or {})
+        self.calls.append(body)
+        await asyncio.sleep(self.delay)
+        if not url.endswith("/query"):
+            payload = self.metadata
+        elif str(body.get("returnCountOnly")).lower() == "true":
+            payload = {"count": 42}
+        else:
+            payload = {
+                "features": [
+                    {"attributes": {"CITY": "A", "CITY_count": 2}},
+                    {"attributes": {"CITY": "B", "CITY_count": 1}},
+                ],
+            }
+        return _Response(payload)
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        return await self._send(url, kwargs.get("params"))
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        return await self._send(url, kwargs.get("data"))
+
+    async def close(self) -> None:
+        pass
+
+
+class _Response:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+
+    async def json(self, content_type: Any = None) -> Any:
+        return self.payload
+
+
+@pytest.mark.asyncio
+async def test_layers_share_metadata_and_counts() -> None:
+    server = _Server()
+    cache = MetadataCache()
+    with cache.activate():
+        first = await FeatureLayer.from_url(URL, session=server)
+        second = await FeatureLayer.from_url(URL, session=server)
+        refined = await first.where("CITY = 'A'")
+        again = await second.where("CITY = 'A'")
+    assert first.count == second.count == refined.count == again.count == 42
+    assert second.name == "Parcels"
+    # metadata, the 1=1 count and the refined count, once each
+    assert len(server.calls) == 3
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 3,
+        "evictions": 0,
+        "entries": 3,
+        "bytes": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_helpers_are_cached_and_copied() -> None:
+    server = _Server()
+    with MetadataCache().activate():
+        first = await get_value_counts(URL, "CITY", server)
+        first.loc[0, "CITY_count"] = 99
+        second = await get_value_counts(URL, "CITY", server)
+    assert second["CITY_count"].tolist() == [2, 1]
+    assert len(server.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_cached_without_an_active_cache() -> None:
+    server = _Server()
+    await get_metadata(URL, server)
+    await get_metadata(URL, server)
+    assert len(server.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_equivalent_bodies_share_an_entry() -> None:
+    server = _Server()
+    with MetadataCache().activate():
+        for flag in (True, "true"):
+            payload = await _cache._cached_json(
+                "count",
+                server,
+                f"{URL}/query",
+                {"where": "1=1", "returnCountOnly": flag},
+            )
+            assert payload == {"count": 42}
+    assert len(server.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_send_one_request() -> None:
+    server = _Server(delay=0.02)
+    cache = MetadataCache()
+    with cache.activate():
+        counts = await asyncio.gather(
+            *(get_feature_count(URL, server) for _ in range(5)),
+        )
+    assert counts == [42] * 5
+    assert len(server.calls) == 1
+    assert cache.misses == 5 and len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(_cache.time, "monotonic", lambda: now[0])
+    server = _Server()
+    with MetadataCache(ttl_s=60).activate():
+        await get_metadata(URL, server)
+        now[0] += 59
+        await get_metadata(URL, server)
+        now[0] += 2
+        await get_metadata(URL, server)
+    assert len(server.calls) == 2
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    cache = MetadataCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+    sized = MetadataCache(max_bytes=20)
+    sized.put("a", "x" * 8)  # 10 bytes encoded
+    sized.put("b", "y" * 8)
+    sized.put("c", "z" * 8)
+    assert sized.get("a") is None and len(sized) == 2
+    sized.put("huge", "w" * 100)
+    assert sized.get("huge") is None
+    assert sized.stats()["bytes"] == 20
+
+
+@pytest.mark.asyncio
+async def test_error_envelopes_are_not_cached() -> None:
+    server = _Server()
+    server.metadata = {"error": {"code": 498, "message": "Invalid token"}}
+    with MetadataCache().activate():
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await get_metadata(URL, server)
+    assert len(server.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_auth_scopes_are_kept_apart() -> None:
+    server = _Server()
+    with MetadataCache().activate():
+        await get_metadata(URL, server, token="alice")
+        await get_metadata(URL, server, token="alice")
+        await get_metadata(URL, server, token="bob")
+        await get_metadata(URL, server)
+    assert len(server.calls) == 3
+
+
+def test_auth_scope_identifies_token_sessions_without_secrets() -> None:
+    class _TokenSession:
+        token_url = "https://portal.example.com/sharing/rest/generateToken"
+
+        def __init__(self, username: str) -> None:
+            self.credentials = AGOLUserPass(username=username, password="pw")
+
+    class _Wrapper:
+        def __init__(self, inner: Any) -> None:
+            self._inner = inner
+
+    alice = _auth_scope(_Wrapper(_TokenSession("alice")), None)
+    assert alice == _auth_scope(_TokenSession("alice"), None)
+    assert alice != _auth_scope(_TokenSession("bob"), None)
+    assert "pw" not in str(alice)
+    assert "secret" not in str(_auth_scope(object(), "secret"))
+    assert _auth_scope(object(), None) is None
+
+
+@pytest.mark.asyncio
+async def test_kinds_limit_what_is_cached() -> None:
+    server = _Server()
+    with MetadataCache(kinds=("metadata",)).activate():
+        await get_metadata(URL, server)
+        await get_metadata(URL, server)
+        await get_feature_count(URL, server)
+        await get_feature_count(URL, server)
+    assert len(server.calls) == 3
+
+
+def test_invalidate_by_url_prefix() -> None:
+    cache = MetadataCache()
+    cache.put(("metadata", f"{URL}", "{}", None), {"name": "a"})
+    cache.put(("metadata", "https://other.example.com/0", "{}", None), {})
+    assert cache.invalidate("https://example.com/") == 1
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hits"] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_entries": 0}, {"ttl_s": 0}, {"max_bytes": 0}, {"kinds": ("pages",)}],
+)
+def test_rejects_bad_arguments(kwargs: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        MetadataCache(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_gdf_downloads_once(sample_feature_gdf) -> None:
+    layer = FeatureLayer(URL, session=_Server())
+    calls = 0
+
+    async def fake_get_gdf(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return sample_feature_gdf
+
+    with patch("restgdf.featurelayer.featurelayer.get_gdf", new=fake_get_gdf):
+        frames = await asyncio.gather(layer.get_gdf(), layer.get_gdf())
+    assert calls == 1
+    assert frames[0] is not frames[1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_value_counts_on_one_layer_fetch_once() -> None:
+    server = _Server(delay=0.02)
+    layer = await FeatureLayer.from_url(URL, session=server)
+    server.calls.clear()
+    await asyncio.gather(
+        layer.get_value_counts("CITY"),
+        layer.get_value_counts("CITY"),
+    )
+    assert len(server.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_layer_result_caches_are_bounded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(featurelayer_mod, "_INSTANCE_CACHE_ENTRIES", 1)
+    server = _Server()
+    layer = await FeatureLayer.from_url(URL, session=server)
+    server.calls.clear()
+
+    await layer.get_unique_values("CITY")
+    await layer.get_unique_values("CITY")
+    await layer.get_unique_values("CITY", sortby="CITY")
+    assert await layer.get_unique_values("CITY") == ["A", "B"]
+
+    # The unsorted entry was evicted by the sorted one and fetched again.
+    assert len(server.calls) == 3
+    assert list(layer.uniquevalues) == [("CITY", None)]
+    assert layer.valuecounts.max_entries == layer.nestedcount.max_entries == 1
+
+
+def test_lru_dict_evicts_the_least_recently_used_entry() -> None:
+    cache: _LRUDict[str, int] = _LRUDict(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now least recently used
+    cache["c"] = 3
+    assert dict(cache) == {"a": 1, "c": 3}
+    with pytest.raises(ValueError, match="max_entries"):
+        _LRUDict(0)
@@ -0,0 +1,232 @@
+"""Page-granular retry and ``on_page_error="collect"`` salvage."""
+
+from __future__ import annotations
+
+import json
+import logging
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+from geopandas import GeoDataFrame
+
+from restgdf import PageFailure, PageRetryPolicy
+from restgdf.errors import AuthenticationError, RestgdfResponseError, TransportError
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._page_retry import _is_retryable_page_error, _run_page_attempts
+from restgdf.utils.getgdf import _iter_pages_raw, gdf_by_concat, get_gdf_list
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+_NO_WAIT = PageRetryPolicy(max_attempts=3, wait_initial_s=0, wait_jitter_s=0)
+
+
+class TestPolicy:
+    def test_rejects_zero_attempts(self) -> None:
+        with pytest.raises(ValueError, match="max_attempts"):
+            PageRetryPolicy(max_attempts=0)
+
+    def test_rejects_negative_budget(self) -> None:
+        with pytest.raises(ValueError, match="budget_s"):
+            PageRetryPolicy(budget_s=-1)
+
+    def test_backoff_doubles_and_caps(self) -> None:
+        policy = PageRetryPolicy(wait_initial_s=1, wait_max_s=3, wait_jitter_s=0)
+        assert [policy.backoff(n) for n in (1, 2, 3)] == [1, 2, 3]
+
+    @pytest.mark.parametrize(
+        ("exc", "expected"),
+        [
+            (aiohttp.ClientPayloadError("cut"), True),
+            (TransportError("reset"), True),
+            (TimeoutError(), True),
+            (json.JSONDecodeError("bad", "<html>", 0), True),
+            (RestgdfResponseError("502", status_code=502), True),
+            (RestgdfResponseError("bad shape"), False),
+            (AuthenticationError("denied", status_code=500), False),
+            (RuntimeError("bug"), False),
+        ],
+    )
+    def test_retryable_classification(self, exc: Exception, expected: bool) -> None:
+        assert _is_retryable_page_error(exc) is expected
+
+
+@pytest.mark.asyncio
+async def test_run_page_attempts_retries_then_succeeds() -> None:
+    fn = AsyncMock(side_effect=[aiohttp.ClientPayloadError("cut"), "page"])
+    result, error, attempts = await _run_page_attempts(
+        fn,
+        _NO_WAIT,
+        url=URL,
+        batch_index=0,
+    )
+    assert (result, error, attempts) == ("page", None, 2)
+
+
+@pytest.mark.asyncio
+async def test_run_page_attempts_does_not_retry_fatal_errors() -> None:
+    fn = AsyncMock(side_effect=RuntimeError("bug"))
+    _, error, attempts = await _run_page_attempts(fn, _NO_WAIT, url=URL, batch_index=0)
+    assert isinstance(error, RuntimeError)
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_run_page_attempts_stops_at_budget() -> None:
+    policy = PageRetryPolicy(max_attempts=10, budget_s=0.5, wait_initial_s=1)
+    fn = AsyncMock(side_effect=TransportError("reset"))
+    _, error, attempts = await _run_page_attempts(fn, policy, url=URL, batch_index=0)
+    assert isinstance(error, TransportError)
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_collect_skips_failed_page_and_reports_it(caplog) -> None:
+    batches = [{"where": "1=1", "resultOffset": i, "token": "secret"} for i in range(3)]
+
+    async def fake_fetch(_url, _session, query_data, **_kw):
+        if query_data["resultOffset"] == 1:
+            raise TransportError("502 Bad Gateway", status_code=502)
+        return {"features": [{"attributes": {"i": query_data["resultOffset"]}}]}
+
+    failures: list[PageFailure] = []
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", side_effect=fake_fetch),
+        caplog.at_level(logging.WARNING, logger="restgdf.pagination"),
+    ):
+        pages = [
+            page
+            async for page in _iter_pages_raw(
+                URL,
+                object(),  # type: ignore[arg-type]
+                on_page_error="collect",
+                page_retry=_NO_WAIT,
+                page_failures=failures,
+            )
+        ]
+
+    assert [p["features"][0]["attributes"]["i"] for p in pages] == [0, 2]
+    assert len(failures) == 1
+    failure = failures[0]
+    assert failure.batch_index == 1
+    assert failure.attempts == 3
+    assert failure.query_data == {"where": "1=1", "resultOffset": 1}
+    assert isinstance(failure.exception, TransportError)
+    assert "exception" not in failure.model_dump()
+    assert any("failed after 3 attempt" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_raise_mode_retries_transient_page() -> None:
+    fetch = AsyncMock(
+        side_effect=[aiohttp.ClientPayloadError("cut"), {"features": []}],
+    )
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=[{"where": "1=1"}]),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", fetch),
+    ):
+        pages = [
+            page
+            async for page in _iter_pages_raw(
+                URL,
+                object(),  # type: ignore[arg-type]
+                page_retry=_NO_WAIT,
+            )
+        ]
+    assert pages == [{"features": []}]
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_rejects_invalid_on_page_error() -> None:
+    agen = _iter_pages_raw(URL, object(), on_page_error="skip")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="on_page_error"):
+        await agen.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_get_gdf_list_collect_keeps_successful_pages(sample_feature_gdf) -> None:
+    async def fake_get_sub_gdf(url, session, query_data, **kwargs):
+        if query_data["where"] == "bad":
+            raise aiohttp.ClientPayloadError("cut")
+        return sample_feature_gdf
+
+    failures: list[PageFailure] = []
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=[{"where": "a"}, {"where": "bad"}, {"where": "b"}]),
+        ),
+        patch.object(getgdf_mod, "get_sub_gdf", new=fake_get_sub_gdf),
+    ):
+        gdfs = await get_gdf_list(
+            URL,
+            object(),  # type: ignore[arg-type]
+            on_page_error="collect",
+            page_failures=failures,
+        )
+
+    assert len(gdfs) == 2
+    assert [f.batch_index for f in failures] == [1]
+    assert failures[0].attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_gdf_by_concat_collect_stamps_failed_batches(sample_feature_gdf) -> None:
+    async def fake_get_sub_gdf(url, session, query_data, **kwargs):
+        if query_data["where"] == "bad":
+            raise TransportError("reset")
+        return sample_feature_gdf
+
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=[{"where": "ok"}, {"where": "bad"}]),
+        ),
+        patch.object(getgdf_mod, "get_sub_gdf", new=fake_get_sub_gdf),
+        patch.object(getgdf_mod, "_apply_spatial_reference_attr", AsyncMock()),
+    ):
+        gdf = await gdf_by_concat(
+            URL,
+            object(),  # type: ignore[arg-type]
+            on_page_error="collect",
+        )
+
+    assert isinstance(gdf, GeoDataFrame)
+    assert len(gdf) == len(sample_feature_gdf)
+    [failed] = gdf.attrs["failed_batches"]
+    assert failed["batch_index"] == 1
+    assert failed["query_data"] == {"where": "bad"}
+    assert "exception" not in failed
+
+
+@pytest.mark.asyncio
+async def test_gdf_by_concat_collect_raises_when_every_page_fails() -> None:
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=[{"where": "a"}]),
+        ),
+        patch.object(
+            getgdf_mod,
+            "get_sub_gdf",
+            new=AsyncMock(side_effect=TransportError("down")),
+        ),
+    ):
+        with pytest.raises(TransportError, match="down"):
+            await gdf_by_concat(
+                URL,
+                object(),  # type: ignore[arg-type]
+                on_page_error="collect",
+            )
@@ -0,0 +1,164 @@
+"""Process-scoped pooled session (``restgdf.pooled_session`` / ``close_pool``)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from restgdf import close_pool, pooled_session, reset_config_cache
+from restgdf._config import TransportConfig
+from restgdf._client import _pool
+from restgdf.utils.getgdf import get_gdf
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    for name in (
+        "RESTGDF_TRANSPORT_POOLED_SESSION",
+        "RESTGDF_TRANSPORT_POOL_LIMIT_PER_HOST",
+        "RESTGDF_TRANSPORT_DNS_CACHE_TTL_S",
+        "RESTGDF_TRANSPORT_KEEPALIVE_TIMEOUT_S",
+        "RESTGDF_TRANSPORT_VERIFY_SSL",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    reset_config_cache()
+    yield
+    reset_config_cache()
+
+
+@pytest.mark.asyncio
+async def test_connector_is_tuned_from_transport_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("RESTGDF_TRANSPORT_POOL_LIMIT_PER_HOST", "6")
+    monkeypatch.setenv("RESTGDF_TRANSPORT_DNS_CACHE_TTL_S", "120")
+    monkeypatch.setenv("RESTGDF_TRANSPORT_KEEPALIVE_TIMEOUT_S", "45")
+    monkeypatch.setenv("RESTGDF_TRANSPORT_VERIFY_SSL", "false")
+    reset_config_cache()
+    try:
+        connector = pooled_session().connector
+        assert connector is not None
+        assert connector.limit == 100
+        assert connector.limit_per_host == 6
+        assert connector._ssl is False
+        assert connector._keepalive_timeout == 45
+        assert connector.use_dns_cache
+        assert connector._cached_hosts._ttl == 120
+    finally:
+        await close_pool()
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_until_close_pool() -> None:
+    first = pooled_session()
+    assert pooled_session() is first
+    await close_pool()
+    assert first.closed
+    second = pooled_session()
+    assert second is not first and not second.closed
+    await close_pool()
+    await close_pool()  # idempotent
+
+
+@pytest.mark.parametrize("supported", [True, False])
+def test_happy_eyeballs_delay_is_passed_only_when_supported(
+    monkeypatch: pytest.MonkeyPatch,
+    supported: bool,
+) -> None:
+    monkeypatch.setattr(_pool, "_HAS_HAPPY_EYEBALLS", supported)
+
+    with patch.object(_pool.aiohttp, "TCPConnector") as connector:
+        _pool._build_connector(TransportConfig())
+
+    options = connector.call_args.kwargs
+    assert ("happy_eyeballs_delay" in options) is supported
+    assert options["keepalive_timeout"] == TransportConfig().keepalive_timeout_s
+
+
+def test_requires_a_running_loop() -> None:
+    with pytest.raises(RuntimeError):
+        pooled_session()
+
+
+def test_pool_of_a_finished_loop_is_discarded() -> None:
+    async def grab() -> Any:
+        return pooled_session()
+
+    stale = asyncio.run(grab())
+    assert not stale.closed
+
+    async def grab_again() -> Any:
+        session = pooled_session()
+        await close_pool()
+        return session
+
+    fresh = asyncio.run(grab_again())
+    assert fresh is not stale
+    assert stale.closed
+    assert not _pool._pools
+
+
+def test_close_at_exit_closes_idle_loops() -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        session = loop.run_until_complete(_acquire())
+        _pool._close_at_exit()
+        assert session.closed
+        assert not _pool._pools
+    finally:
+        loop.close()
+
+
+def test_close_at_exit_closes_pools_of_closed_loops() -> None:
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(_acquire())
+    loop.close()
+
+    _pool._close_at_exit()
+
+    assert session.closed
+    assert not _pool._pools
+
+
+async def _acquire() -> Any:
+    return pooled_session()
+
+
+@pytest.mark.asyncio
+async def test_get_gdf_uses_the_pool_when_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    seen: list[Any] = []
+
+    async def capture(url: str, session: Any, **kwargs: Any) -> str:
+        seen.append(session)
+        return "sentinel"
+
+    monkeypatch.setenv("RESTGDF_TRANSPORT_POOLED_SESSION", "true")
+    reset_config_cache()
+    try:
+        with patch("restgdf.utils.getgdf.gdf_by_concat", new=capture):
+            await get_gdf("https://example.com/layer/0")
+            await get_gdf("https://example.com/layer/1")
+        assert seen[0] is seen[1] is pooled_session()
+        assert not seen[0].closed
+    finally:
+        await close_pool()
+
+
+@pytest.mark.asyncio
+async def test_get_gdf_keeps_per_call_sessions_by_default() -> None:
+    seen: list[Any] = []
+
+    async def capture(url: str, session: Any, **kwargs: Any) -> str:
+        seen.append(session)
+        return "sentinel"
+
+    with patch("restgdf.utils.getgdf.gdf_by_concat", new=capture):
+        await get_gdf("https://example.com/layer/0")
+    assert seen[0].closed
+    assert asyncio.get_running_loop() not in _pool._pools
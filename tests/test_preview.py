@@ -0,0 +1,299 @@
+"""``head_gdf`` / ``sample_gdf`` previews without listing every object id."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from restgdf import FeatureLayer
+from restgdf._models.responses import LayerMetadata
+from restgdf.utils._preview import head_gdf
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+    async def text(self) -> str:
+        return json.dumps(self._payload)
+
+
+class _Layer:
+    """Serves GeoJSON pages, object id statistics and ``returnIdsOnly``."""
+
+    def __init__(
+        self,
+        oids: list[int],
+        max_record_count: int = 1000,
+        *,
+        stats_error: bool = False,
+    ) -> None:
+        self.oids = oids
+        self.max_record_count = max_record_count
+        self.stats_error = stats_error
+        self.sent: list[dict[str, Any]] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(params or {}))
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(data or {}))
+
+    def kind(self, params: dict[str, Any]) -> str:
+        if "outStatistics" in params:
+            return "stats"
+        if str(params.get("returnIdsOnly")).lower() == "true":
+            return "ids"
+        return "features"
+
+    def _answer(self, params: dict[str, Any]) -> _Response:
+        self.sent.append(params)
+        kind = self.kind(params)
+        if kind == "stats" and self.stats_error:
+            return _Response({"error": {"code": 400, "message": "Unable to query"}})
+        if kind == "stats" and not self.oids:
+            attributes = {"low": None, "high": None, "count": 0}
+            return _Response({"features": [{"attributes": attributes}]})
+        if kind == "stats":
+            return _Response(
+                {
+                    "features": [
+                        {
+                            "attributes": {
+                                "low": min(self.oids),
+                                "high": max(self.oids),
+                                "count": len(self.oids),
+                            },
+                        },
+                    ],
+                },
+            )
+        if kind == "ids":
+            return _Response(
+                {"objectIdFieldName": "OBJECTID", "objectIds": self.oids},
+            )
+        match = re.search(r"OBJECTID In \(([^)]*)\)", params.get("where", ""))
+        rows = sorted(self.oids)
+        if match:
+            wanted = {int(oid) for oid in match.group(1).split(",")}
+            rows = [oid for oid in rows if oid in wanted]
+        offset = int(params.get("resultOffset", 0))
+        count = min(
+            int(params.get("resultRecordCount", self.max_record_count)),
+            self.max_record_count,
+        )
+        page = rows[offset : offset + count]
+        return _Response(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "properties": {"OBJECTID": oid},
+                        "geometry": {"type": "Point", "coordinates": [oid, 0]},
+                    }
+                    for oid in page
+                ],
+                "exceededTransferLimit": offset + count < len(rows),
+            },
+        )
+
+    def count(self, kind: str) -> int:
+        return sum(1 for params in self.sent if self.kind(params) == kind)
+
+
+def _layer(session: _Layer, **metadata: Any) -> FeatureLayer:
+    layer = FeatureLayer(LAYER, session=session)  # type: ignore[arg-type]
+    layer.object_id_field = "OBJECTID"
+    layer.fields = ("OBJECTID",)
+    layer.metadata = LayerMetadata.model_validate(
+        {
+            "name": "S",
+            "maxRecordCount": session.max_record_count,
+            "extent": {"spatialReference": {"wkid": 4326}},
+            **metadata,
+        },
+    )
+    return layer
+
+
+@pytest.fixture(autouse=True)
+def _geojson_driver():
+    with patch("restgdf.utils.getgdf.supported_drivers", new={"GeoJSON": "rw"}):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_head_is_one_ordered_query() -> None:
+    session = _Layer(list(range(1, 5001)))
+
+    gdf = await _layer(session).head_gdf(10)
+
+    assert list(gdf["OBJECTID"]) == list(range(1, 11))
+    assert gdf.attrs["spatial_reference"] == {"wkid": 4326}
+    assert len(session.sent) == 1
+    assert session.sent[0]["resultRecordCount"] == "10"
+    assert session.sent[0]["orderByFields"] == "OBJECTID ASC"
+
+
+@pytest.mark.asyncio
+async def test_head_beyond_max_record_count_reads_offset_pages() -> None:
+    session = _Layer(list(range(1, 101)), max_record_count=20)
+
+    gdf = await _layer(session).head_gdf(45)
+
+    assert list(gdf["OBJECTID"]) == list(range(1, 46))
+    assert [params["resultOffset"] for params in session.sent] == ["0", "20", "40"]
+    assert [params["resultRecordCount"] for params in session.sent] == [
+        "20",
+        "20",
+        "5",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sample_probes_the_object_id_range() -> None:
+    session = _Layer(list(range(1, 400_001)))
+
+    gdf = await _layer(session).sample_gdf(10, seed=3)
+
+    assert len(gdf) == 10
+    assert gdf["OBJECTID"].is_unique
+    assert (session.count("stats"), session.count("features")) == (1, 1)
+    assert session.count("ids") == 0
+
+
+@pytest.mark.asyncio
+async def test_sample_is_reproducible_with_a_seed() -> None:
+    oids = list(range(1, 2001, 3))
+
+    first = await _layer(_Layer(oids)).sample_gdf(25, seed=11)
+    second = await _layer(_Layer(oids)).sample_gdf(25, seed=11)
+    other = await _layer(_Layer(oids)).sample_gdf(25, seed=12)
+
+    assert len(first) == 25
+    assert set(first["OBJECTID"]) <= set(oids)
+    assert list(first["OBJECTID"]) == list(second["OBJECTID"])
+    assert list(first["OBJECTID"]) != list(other["OBJECTID"])
+
+
+@pytest.mark.asyncio
+async def test_sparse_ids_fall_back_to_the_id_list() -> None:
+    # Five features spread over a million ids: probes rarely hit.
+    oids = [1, 250_000, 500_000, 750_000, 1_000_000]
+    session = _Layer([*oids, *range(2_000_000, 2_000_006)])
+
+    gdf = await _layer(session).sample_gdf(8, seed=0)
+
+    assert len(gdf) == 8
+    assert gdf["OBJECTID"].is_unique
+    assert session.count("ids") == 1
+
+
+@pytest.mark.asyncio
+async def test_sample_without_statistics_uses_the_id_list() -> None:
+    session = _Layer(list(range(1, 51)))
+    layer = _layer(
+        session,
+        advancedQueryCapabilities={"supportsStatistics": False},
+    )
+
+    gdf = await layer.sample_gdf(5, seed=1)
+    everything = await layer.sample_gdf(80)
+
+    assert len(gdf) == 5
+    assert session.count("stats") == 0
+    assert len(everything) == 50
+    with pytest.raises(ValueError, match="positive integer"):
+        await layer.sample_gdf(0)
+
+
+@pytest.mark.asyncio
+async def test_head_without_pagination_reads_the_first_ids() -> None:
+    session = _Layer(list(range(100, 0, -1)), max_record_count=20)
+    layer = _layer(session, advancedQueryCapabilities={"supportsPagination": False})
+
+    gdf = await layer.head_gdf(30)
+
+    assert list(gdf["OBJECTID"]) == list(range(1, 31))
+    assert session.count("ids") == 1
+    assert all("resultOffset" not in params for params in session.sent)
+
+
+@pytest.mark.asyncio
+async def test_head_keeps_a_caller_order_and_plain_metadata() -> None:
+    session = _Layer(list(range(1, 11)))
+
+    # No maxRecordCount and no spatial reference in the mapping.
+    gdf = await head_gdf(
+        LAYER,
+        session,  # type: ignore[arg-type]
+        3,
+        object_id_field="OBJECTID",
+        metadata={"name": "S"},
+        data={"orderByFields": "OBJECTID DESC"},
+    )
+
+    assert len(gdf) == 3
+    assert session.sent[0]["orderByFields"] == "OBJECTID DESC"
+    assert "spatial_reference" not in gdf.attrs
+    # Without metadata the layer is asked for its spatial reference.
+    session.sent.clear()
+    await head_gdf(
+        LAYER,
+        session,  # type: ignore[arg-type]
+        3,
+        object_id_field="OBJECTID",
+    )
+    assert len(session.sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_statistics_fall_back_to_the_id_list(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    session = _Layer(list(range(1, 201)), stats_error=True)
+
+    with caplog.at_level("WARNING", logger="restgdf.pagination"):
+        gdf = await _layer(session).sample_gdf(5, seed=2)
+
+    assert len(gdf) == 5
+    assert (session.count("stats"), session.count("ids")) == (1, 1)
+    assert caplog.records[0].operation == "sample_fallback"
+
+
+@pytest.mark.asyncio
+async def test_small_dense_ranges_are_drawn_without_retries() -> None:
+    session = _Layer(list(range(1, 21)))
+
+    gdf = await _layer(session).sample_gdf(15, seed=4)
+
+    assert len(gdf) == 15
+    assert gdf["OBJECTID"].is_unique
+    assert session.count("features") == 1
+    assert session.count("ids") == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_selections_return_the_schema() -> None:
+    with_stats = _Layer([])
+    without_stats = _Layer([])
+
+    counted = await _layer(with_stats).sample_gdf(3)
+    listed = await _layer(
+        without_stats,
+        advancedQueryCapabilities={"supportsStatistics": False},
+    ).sample_gdf(3)
+
+    assert len(counted) == len(listed) == 0
+    assert (with_stats.count("ids"), with_stats.count("features")) == (0, 1)
+    assert (without_stats.count("ids"), without_stats.count("features")) == (1, 1)
@@ -0,0 +1,105 @@
+"""Connection pre-warming before a stream's page window opens."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from restgdf.featurelayer.featurelayer import FeatureLayer
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._prewarm import _prewarm
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Session:
+    """Records pings (non-query requests) and how many were in flight at once."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.pings: list[tuple[str, dict[str, Any]]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.released = 0
+
+    async def close(self) -> None:
+        pass
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        if "/query" not in url:
+            self.pings.append((url, dict(kwargs["data"])))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if self.fail:
+                raise ConnectionResetError("reset")
+        return self
+
+    get = post
+
+    async def read(self) -> bytes:
+        return b"{}"
+
+    def release(self) -> None:
+        self.released += 1
+
+    async def json(self, content_type: Any = None) -> Any:
+        return {"features": []}
+
+
+def _layer(session: Any) -> FeatureLayer:
+    layer = FeatureLayer(URL, session=session)
+    layer.fields = ("OBJECTID",)
+    layer.object_id_field = "OBJECTID"
+    return layer
+
+
+async def _drain(layer: FeatureLayer, **kwargs: Any) -> int:
+    batches = [{"resultOffset": i} for i in range(6)]
+    with patch.object(
+        getgdf_mod,
+        "get_query_data_batches",
+        AsyncMock(return_value=batches),
+    ):
+        return len([page async for page in layer.iter_pages(**kwargs)])
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_one_connection_per_window_slot() -> None:
+    session = _Session()
+    pages = await _drain(_layer(session), max_concurrent_pages=4, prewarm=True)
+    assert pages == 6
+    assert len(session.pings) == 4
+    assert session.peak == 4
+    assert all(url == URL and data == {"f": "json"} for url, data in session.pings)
+    assert session.released == 4
+
+
+@pytest.mark.asyncio
+async def test_no_pings_by_default() -> None:
+    session = _Session()
+    assert await _drain(_layer(session), max_concurrent_pages=4) == 6
+    assert session.pings == []
+
+
+@pytest.mark.asyncio
+async def test_failed_pings_do_not_fail_the_stream() -> None:
+    session = _Session(fail=True)
+    pages = await _drain(_layer(session), max_concurrent_pages=3, prewarm=True)
+    assert pages == 6
+    assert len(session.pings) == 3
+    assert await _prewarm(session, URL, 2) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_goes_in_the_body_not_the_url() -> None:
+    session = _Session()
+    assert await _prewarm(session, URL, 2, token="secret") == 2
+    assert session.pings == [
+        (URL, {"f": "json", "token": "secret"}),
+        (URL, {"f": "json", "token": "secret"}),
+    ]
@@ -22,6 +22,7 @@ _EXPECTED_CLASSES = {
     "AuthConfig",
     "AuthNotAttachedError",
     "AuthenticationError",
+    "CircuitOpenError",
     "ConcurrencyConfig",
     "Config",
     "ConfigurationError",
@@ -29,31 +30,40 @@ _EXPECTED_CLASSES = {
     "CrawlError",
     "CrawlReport",
     "CrawlServiceEntry",
+    "DeadlineExceededError",
     "Directory",
     "ErrorInfo",
     "ErrorResponse",
+    "FairScheduler",
     "Feature",
     "FeatureLayer",
     "FeaturesResponse",
     "FieldDoesNotExistError",
     "FieldSpec",
+    "HedgePolicy",
     "InvalidCredentialsError",
     "LayerMetadata",
     "LimiterConfig",
+    "MetadataCache",
     "ObjectIdsResponse",
     "OptionalDependencyError",
     "OutputConversionError",
+    "PageFailure",
+    "PageRetryPolicy",
     "PaginationInconsistencyWarning",
     "PaginationError",
     "RateLimitError",
     "ResilienceConfig",
+    "ResponseCache",
     "RestgdfError",
     "RestgdfResponseError",
     "RestgdfTimeoutError",
+    "RetryBudget",
     "RetryConfig",
     "SchemaValidationError",
     "ServiceInfo",
     "Settings",
+    "Statistic",
     "TelemetryConfig",
     "TimeoutConfig",
     "TokenExpiredError",
@@ -66,8 +76,12 @@ _EXPECTED_CLASSES = {
 }
 
 _EXPECTED_CALLABLES = {
+    "close_pool",
+    "deadline",
     "get_config",
     "get_settings",
+    "pooled_session",
+    "request_priority",
     "reset_config_cache",
     "reset_settings_cache",
 }
@@ -154,6 +168,7 @@ def test_models_are_pydantic_basemodels() -> None:
         "FieldSpec",
         "LayerMetadata",
         "ObjectIdsResponse",
+        "PageFailure",
         "ServiceInfo",
         "Settings",
         "TokenResponse",
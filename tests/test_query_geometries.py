@@ -0,0 +1,423 @@
+"""Batched multi-geometry queries (``FeatureLayer.query_geometries``)."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+import pytest
+import shapely
+from shapely.geometry import Point, box
+
+from restgdf import FeatureLayer
+from restgdf.errors import RestgdfResponseError
+from restgdf.utils._spatial import _arcgis_to_shape, _to_shape
+from restgdf.utils.getinfo import query_geometries, supports_advanced_queries
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+
+class _GridLayer:
+    """A 10 x 10 grid of unit squares, OBJECTID = 1 + 10 * row + col."""
+
+    def __init__(self, max_record_count: int = 1000) -> None:
+        self.max_record_count = max_record_count
+        self.cells = {
+            1 + 10 * row + col: box(col, row, col + 1, row + 1)
+            for row in range(10)
+            for col in range(10)
+        }
+        self.sent: list[dict[str, Any]] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(params or {}))
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(data or {}))
+
+    def _answer(self, params: dict[str, Any]) -> _Response:
+        self.sent.append(params)
+        query = (
+            _arcgis_to_shape(json.loads(params["geometry"]))
+            if "geometry" in params
+            else None
+        )
+        relation = params.get("spatialRel")
+        match = re.search(r"OBJECTID > (\d+)", params.get("where", ""))
+        after = int(match.group(1)) if match else 0
+        listed = re.search(r"OBJECTID In \(([\d, ]+)\)", params.get("where", ""))
+        hits = []
+        for oid, cell in sorted(self.cells.items()):
+            if oid <= after:
+                continue
+            if listed:
+                ok = str(oid) in listed.group(1).split(", ")
+            elif relation == "esriSpatialRelIntersects":
+                ok = query.intersects(cell)
+            elif relation == "esriSpatialRelContains":
+                ok = query.contains(cell)
+            elif relation == "esriSpatialRelEnvelopeIntersects":
+                ok = box(*query.bounds).intersects(cell)
+            else:  # pragma: no cover - not used by these tests
+                raise AssertionError(relation)
+            if ok:
+                hits.append(oid)
+        if params.get("returnIdsOnly"):
+            return _Response({"objectIdFieldName": "OBJECTID", "objectIds": hits})
+        if "orderByFields" not in params:
+            # Without advanced queries the page order is the server's own.
+            hits.reverse()
+        page = hits[: self.max_record_count]
+        features = [
+            {
+                "attributes": {"OBJECTID": oid},
+                "geometry": {
+                    "rings": [
+                        [list(xy) for xy in self.cells[oid].exterior.coords[::-1]],
+                    ],
+                },
+            }
+            for oid in page
+        ]
+        return _Response(
+            {
+                "objectIdFieldName": "OBJECTID",
+                "features": features,
+                "exceededTransferLimit": len(hits) > len(page),
+            },
+        )
+
+
+def _expected(layer: _GridLayer, shapes: list[Any]) -> list[list[int]]:
+    return [
+        sorted(oid for oid, cell in layer.cells.items() if shape.intersects(cell))
+        for shape in shapes
+    ]
+
+
+@pytest.mark.asyncio
+async def test_points_share_one_multipoint_query() -> None:
+    session = _GridLayer()
+    points = [Point(col + 0.5, row + 0.5) for row in range(10) for col in range(10)]
+
+    result = await query_geometries(
+        LAYER,
+        points,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+    )
+
+    assert result.batches == 1
+    assert len(session.sent) == 1
+    assert session.sent[0]["geometryType"] == "esriGeometryMultipoint"
+    assert result.matches == _expected(session, points)
+    assert sorted(result.features) == list(range(1, 101))
+
+
+@pytest.mark.asyncio
+async def test_batches_page_by_object_id_and_deduplicate() -> None:
+    session = _GridLayer(max_record_count=7)
+    squares = [box(x + 0.5, 0.5, x + 1.5, 1.5) for x in range(8)]
+
+    result = await query_geometries(
+        LAYER,
+        squares,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        max_batch_size=3,
+    )
+
+    assert result.batches == 3
+    assert result.matches == _expected(session, squares)
+    # Neighbouring squares share cells; each is kept once.
+    assert sorted(result.features) == sorted(
+        {oid for oids in result.matches for oid in oids},
+    )
+    assert any("OBJECTID > " in params["where"] for params in session.sent)
+    assert {params["orderByFields"] for params in session.sent} == {"OBJECTID"}
+
+
+@pytest.mark.asyncio
+async def test_superset_candidates_are_filtered_locally() -> None:
+    session = _GridLayer()
+    corners = [box(0.2, 0.2, 0.4, 0.4), box(8.2, 8.2, 8.4, 8.4)]
+
+    result = await query_geometries(
+        LAYER,
+        corners,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        batch_geometry="envelope",
+    )
+
+    # The envelope covers 81 cells; only the two under the inputs match.
+    assert session.sent[0]["geometryType"] == "esriGeometryEnvelope"
+    assert result.matches == [[1], [89]]
+    assert sorted(result.features) == [1, 89]
+
+
+@pytest.mark.asyncio
+async def test_single_input_batches_send_the_exact_relation() -> None:
+    session = _GridLayer()
+    layer = FeatureLayer(LAYER, session=session)  # type: ignore[arg-type]
+    layer.object_id_field = "OBJECTID"
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": shapely.geometry.mapping(shape)}
+            for shape in (box(0, 0, 2, 1), box(5, 5, 6.5, 6.5))
+        ],
+    }
+
+    result = await layer.query_geometries(
+        collection,
+        spatial_rel="esriSpatialRelContains",
+        max_batch_size=1,
+        in_sr=3857,
+    )
+
+    assert [params["spatialRel"] for params in session.sent] == [
+        "esriSpatialRelContains",
+    ] * 2
+    assert {params["inSR"] for params in session.sent} == {"3857"}
+    assert {params["outSR"] for params in session.sent} == {"3857"}
+    assert result.matches == [[1, 2], [56]]
+    pairs = [(index, feature["attributes"]["OBJECTID"]) for index, feature in result.pairs()]
+    assert pairs == [(0, 1), (0, 2), (1, 56)]
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_relations_and_single_geometries() -> None:
+    session = _GridLayer()
+
+    with pytest.raises(ValueError, match="spatial_rel"):
+        await query_geometries(
+            LAYER,
+            [Point(0, 0)],
+            session,  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+            spatial_rel="esriSpatialRelRelation",
+        )
+    with pytest.raises(TypeError, match="FeatureCollection"):
+        await query_geometries(
+            LAYER,
+            {"type": "Point", "coordinates": [0, 0]},
+            session,  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+        )
+    empty = await query_geometries(
+        LAYER,
+        [],
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+    )
+    assert (empty.matches, empty.batches, session.sent) == ([], 0, [])
+
+
+@pytest.mark.asyncio
+async def test_lines_share_one_polyline_query() -> None:
+    geopandas = pytest.importorskip("geopandas")
+    session = _GridLayer()
+    lines = geopandas.GeoSeries(
+        [shapely.LineString([(0.5, y + 0.5), (2.5, y + 0.5)]) for y in range(3)],
+        crs=3857,
+    )
+
+    result = await query_geometries(
+        LAYER,
+        lines,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        data={"outFields": "NAME"},
+    )
+    envelopes = await query_geometries(
+        LAYER,
+        list(lines),
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        spatial_rel="esriSpatialRelEnvelopeIntersects",
+    )
+
+    assert session.sent[0]["geometryType"] == "esriGeometryPolyline"
+    assert session.sent[0]["outFields"] == "NAME,OBJECTID"
+    assert result.matches == _expected(session, list(lines))
+    assert session.sent[1]["geometryType"] == "esriGeometryEnvelope"
+    assert envelopes.matches == result.matches
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        ({"batch_geometry": "hull"}, "batch_geometry"),
+        ({"max_batch_size": 0}, "max_batch_bytes"),
+        ({"prefilter": "buffer"}, "prefilter"),
+        ({"tolerance": 0}, "tolerance"),
+    ],
+)
+async def test_rejects_invalid_options(options: dict[str, Any], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        await query_geometries(
+            LAYER,
+            [Point(0, 0)],
+            _GridLayer(),  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+            **options,
+        )
+
+
+@pytest.mark.asyncio
+async def test_prefiltered_points_send_their_hull_or_envelope() -> None:
+    session = _GridLayer()
+    diagonal = [Point(i + 0.5, i + 0.5) for i in range(4)]
+
+    result = await query_geometries(
+        LAYER,
+        diagonal,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        prefilter="simplify",
+    )
+    boxed = await query_geometries(
+        LAYER,
+        diagonal,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        batch_geometry="envelope",
+        prefilter="convex_hull",
+    )
+
+    # Collinear points have no polygon hull; their envelope is sent.
+    assert session.sent[0]["geometryType"] == "esriGeometryEnvelope"
+    assert result.matches == _expected(session, diagonal)
+    # An envelope is already as small as a cover gets.
+    assert session.sent[1]["geometry"] == session.sent[0]["geometry"]
+    assert boxed.matches == result.matches
+
+
+@pytest.mark.asyncio
+async def test_prefilter_sends_a_small_cover_and_filters_locally(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    session = _GridLayer()
+    # ~20,000 vertices: a detailed boundary.
+    disc = Point(5, 5).buffer(3.2, quad_segs=5000)
+    ring = box(2, 2, 8, 8)
+
+    with caplog.at_level("INFO", logger="restgdf.normalization"):
+        result = await query_geometries(
+            LAYER,
+            [disc],
+            session,  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+            prefilter="simplify",
+        )
+        touching = await query_geometries(
+            LAYER,
+            [ring],
+            session,  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+            spatial_rel="esriSpatialRelTouches",
+            prefilter="convex_hull",
+        )
+
+    assert len(session.sent[0]["geometry"]) < 5_000
+    assert session.sent[0]["spatialRel"] == "esriSpatialRelIntersects"
+    assert result.matches == _expected(session, [disc])
+    # Touches cannot be sent for a cover; intersects candidates are trimmed.
+    assert session.sent[1]["spatialRel"] == "esriSpatialRelIntersects"
+    assert touching.matches == [
+        sorted(oid for oid, cell in session.cells.items() if ring.touches(cell)),
+    ]
+    record = caplog.records[0]
+    assert record.operation == "spatial_prefilter"
+    assert "from 20001 vertices" in record.getMessage()
+
+
+@pytest.mark.asyncio
+async def test_layers_without_advanced_queries_page_by_id_chunks() -> None:
+    session = _GridLayer(max_record_count=7)
+    squares = [box(x + 0.5, 0.5, x + 1.5, 1.5) for x in range(8)]
+    metadata = {"advancedQueryCapabilities": {"supportsAdvancedQueries": False}}
+
+    result = await query_geometries(
+        LAYER,
+        squares,
+        session,  # type: ignore[arg-type]
+        object_id_field="OBJECTID",
+        max_batch_size=3,
+        metadata=metadata,
+    )
+
+    assert result.matches == _expected(session, squares)
+    assert not any("orderByFields" in params for params in session.sent)
+    assert not any("OBJECTID >" in params.get("where", "") for params in session.sent)
+    chunks = [params for params in session.sent if "geometry" not in params]
+    assert chunks
+    assert all(params["where"].startswith("OBJECTID In (") for params in chunks)
+    assert any(params.get("returnIdsOnly") for params in session.sent)
+    assert supports_advanced_queries({})
+    assert not supports_advanced_queries({"supportsAdvancedQueries": False})
+
+
+def test_arcgis_geometries_convert_to_shapes() -> None:
+    assert _arcgis_to_shape(None) is None
+    assert _arcgis_to_shape({"x": None, "y": None}) is None
+    assert _arcgis_to_shape({"points": [[0, 0, 5], [1, 1, 5]]}).equals(
+        shapely.MultiPoint([(0, 0), (1, 1)]),
+    )
+    assert _arcgis_to_shape({"paths": [[[0, 0], [1, 1]], [[2, 2], [3, 3]]]}).equals(
+        shapely.MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3)]]),
+    )
+    envelope = {"xmin": 0, "ymin": 0, "xmax": 2, "ymax": 1}
+    assert _arcgis_to_shape(envelope).equals(box(0, 0, 2, 1))
+    assert _arcgis_to_shape({**envelope, "xmin": None}) is None
+    # Counter-clockwise rings alone are read as outer rings.
+    ccw = [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]]
+    assert _arcgis_to_shape({"rings": [ccw]}).equals(box(0, 0, 4, 4))
+    hole = [[1, 1], [2, 1], [2, 2], [1, 2], [1, 1]]
+    assert _arcgis_to_shape({"rings": [ccw[::-1], hole]}).area == 15
+    with pytest.raises(ValueError, match="curve"):
+        _arcgis_to_shape({"curveRings": [[[0, 0], {"c": [[1, 1], [0.5, 0.5]]}]]})
+
+
+def test_inputs_coerce_from_features_geojson_and_arcgis() -> None:
+    class _Shape:
+        __geo_interface__ = {"type": "Point", "coordinates": [1.0, 2.0]}
+
+    feature = {"type": "Feature", "geometry": {"type": "Point", "coordinates": [3, 4]}}
+
+    assert _to_shape(None).is_empty
+    assert _to_shape(feature).equals(Point(3, 4))
+    assert _to_shape({"type": "Feature", "geometry": None}).is_empty
+    assert _to_shape(_Shape()).equals(Point(1, 2))
+    assert _to_shape({"x": 5, "y": 6}).equals(Point(5, 6))
+    assert _to_shape({"x": None, "y": None}).is_empty
+    with pytest.raises(TypeError, match="__geo_interface__"):
+        _to_shape([0, 0])
+
+
+class _NoObjectIdLayer(_GridLayer):
+    def _answer(self, params: dict[str, Any]) -> _Response:
+        self.sent.append(params)
+        return _Response({"features": [{"attributes": {}, "geometry": None}]})
+
+
+@pytest.mark.asyncio
+async def test_features_without_object_ids_are_rejected() -> None:
+    with pytest.raises(RestgdfResponseError, match="without 'OBJECTID'"):
+        await query_geometries(
+            LAYER,
+            [Point(0.5, 0.5)],
+            _NoObjectIdLayer(),  # type: ignore[arg-type]
+            object_id_field="OBJECTID",
+        )
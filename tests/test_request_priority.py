@@ -0,0 +1,244 @@
+"""Request priority classes: control-plane calls ahead of bulk page fetches."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from restgdf import FairScheduler, request_priority
+from restgdf._client._priority import _RANKS, _classify, _rank
+from restgdf._config import ResilienceConfig
+from restgdf.resilience import ResilientSession
+from restgdf.resilience._limiter import (
+    InFlightRegistry,
+    PrioritySemaphore,
+    _service_root,
+)
+from restgdf.utils import crawl as crawl_mod
+from restgdf.utils._concurrency import _scheduled
+from restgdf.utils._http import _arcgis_request
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class TestClassify:
+    @pytest.mark.parametrize(
+        ("url", "body", "expected"),
+        [
+            (LAYER, {"f": "json"}, "metadata"),
+            (f"{LAYER}/query", {"where": "1=1", "returnCountOnly": True}, "count"),
+            (f"{LAYER}/query", {"returnIdsOnly": "true"}, "count"),
+            (f"{LAYER}/query", {"outStatistics": "[{...}]"}, "count"),
+            (f"{LAYER}/query", {"where": "1=1", "returnCountOnly": False}, "pages"),
+            (f"{LAYER}/query/", None, "pages"),
+        ],
+    )
+    def test_infers_class_from_request(
+        self,
+        url: str,
+        body: dict[str, Any] | None,
+        expected: str,
+    ) -> None:
+        assert _classify(url, body) == expected
+
+    def test_pinned_class_wins(self) -> None:
+        with request_priority("crawl"):
+            assert _rank(url=LAYER) == _RANKS["crawl"]
+        assert _rank(url=LAYER) == _RANKS["metadata"]
+
+    def test_rejects_unknown_class(self) -> None:
+        with pytest.raises(ValueError, match="priority must be one of"):
+            with request_priority("urgent"):  # type: ignore[arg-type]
+                pass
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_the_pinned_class(self) -> None:
+        async def rank() -> int:
+            return _rank(url=f"{LAYER}/query")
+
+        with request_priority("metadata"):
+            task = asyncio.create_task(rank())
+        assert await task == _RANKS["metadata"]
+
+
+class TestPrioritySemaphore:
+    @pytest.mark.asyncio
+    async def test_admits_lowest_priority_first(self) -> None:
+        sem = PrioritySemaphore(1)
+        order: list[str] = []
+        await sem.acquire()
+
+        async def take(name: str, priority: int) -> None:
+            await sem.acquire(priority)
+            order.append(name)
+            sem.release()
+
+        tasks = [asyncio.create_task(take(f"page{i}", 2)) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(take("count", 1)))
+        await asyncio.sleep(0)
+        assert sem.waiting == 4
+        sem.release()
+        await asyncio.gather(*tasks)
+        assert order == ["count", "page0", "page1", "page2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_permit(self) -> None:
+        sem = PrioritySemaphore(1)
+        await sem.acquire()
+        waiter = asyncio.create_task(sem.acquire(0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert sem.waiting == 0
+        sem.release()
+        await asyncio.wait_for(sem.acquire(), 1)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_slot_serves_urgent_waiters_first() -> None:
+    registry = InFlightRegistry(1)
+    order: list[int] = []
+
+    async def work(priority: int) -> None:
+        async with registry.slot("k", priority=priority):
+            order.append(priority)
+            await asyncio.sleep(0.005)
+
+    tasks = [asyncio.create_task(work(2)) for _ in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(work(0)))
+    await asyncio.gather(*tasks)
+    assert order == [2, 0, 2, 2]
+    assert registry.in_flight("k") == 0
+
+
+class _Resp:
+    status = 200
+    headers = {"Content-Type": "application/json"}
+
+    async def __aenter__(self) -> _Resp:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class _Recorder:
+    """Inner session that records which request reached the wire."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sent: list[str] = []
+
+    async def close(self) -> None:
+        pass
+
+    async def get(self, url: str, **kwargs: Any) -> _Resp:
+        params = kwargs.get("params") or {}
+        self.sent.append("count" if params.get("returnCountOnly") else url)
+        await asyncio.sleep(self.delay)
+        return _Resp()
+
+    post = get
+
+
+def _session(inner: _Recorder, **overrides: Any) -> ResilientSession:
+    return ResilientSession(inner, ResilienceConfig(enabled=True, **overrides))
+
+
+@pytest.mark.asyncio
+async def test_count_jumps_queued_pages_under_in_flight_cap() -> None:
+    inner = _Recorder(delay=0.01)
+    session = _session(inner, max_in_flight_per_key=1)
+    pages = [
+        asyncio.create_task(_arcgis_request(session, f"{LAYER}/query", {"page": i}))
+        for i in range(4)
+    ]
+    await asyncio.sleep(0)
+    count = asyncio.create_task(
+        _arcgis_request(session, f"{LAYER}/query", {"returnCountOnly": True}),
+    )
+    await asyncio.gather(*pages, count)
+    # The first page was already on the wire; the count goes next.
+    assert inner.sent.index("count") == 1
+
+
+class _GatedLimiter:
+    """Token bucket stand-in that grants one token per ``release()``."""
+
+    def __init__(self) -> None:
+        self.tokens = asyncio.Semaphore(0)
+
+    async def acquire(self) -> None:
+        await self.tokens.acquire()
+
+
+@pytest.mark.asyncio
+async def test_metadata_jumps_queued_pages_at_the_token_bucket() -> None:
+    inner = _Recorder()
+    session = _session(inner, rate_per_service_root_per_second=50)
+    bucket = _GatedLimiter()
+    turnstile = session._turnstile
+    assert session._limiter is not None and turnstile is not None
+    key = _service_root(LAYER)
+    with patch.object(session._limiter, "get", return_value=bucket):
+        pages = [
+            asyncio.create_task(_arcgis_request(session, f"{LAYER}/query", None))
+            for _ in range(3)
+        ]
+        while turnstile.in_flight(key) < 3:
+            await asyncio.sleep(0)
+        meta = asyncio.create_task(_arcgis_request(session, LAYER, {"f": "json"}))
+        while turnstile.in_flight(key) < 4:
+            await asyncio.sleep(0)
+        # The first page holds the turnstile waiting for a token; the rest
+        # queue behind it, and the metadata call goes to the front.
+        for _ in range(4):
+            bucket.tokens.release()
+        await asyncio.gather(*pages, meta)
+    assert inner.sent.index(LAYER) == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_slots_follow_request_priority() -> None:
+    scheduler = FairScheduler(1)
+    inner = _Recorder()
+
+    async def page_fetch(i: int) -> None:
+        async with _scheduled(LAYER, priority=_rank("pages")):
+            inner.sent.append(f"page{i}")
+            await asyncio.sleep(0.005)
+
+    with scheduler.activate():
+        pages = [asyncio.create_task(page_fetch(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        count = asyncio.create_task(
+            _arcgis_request(inner, f"{LAYER}/query", {"returnCountOnly": True}),
+        )
+        await asyncio.gather(*pages, count)
+
+    # page0 held the only slot; the count request was granted the next one.
+    assert inner.sent == ["page0", "count", "page1", "page2"]
+    assert scheduler.granted == 4
+
+
+@pytest.mark.asyncio
+async def test_crawls_run_in_the_crawl_class_unless_pinned() -> None:
+    seen: list[int] = []
+
+    async def fake_get_metadata(url: str, *_args: Any, **_kw: Any) -> dict:
+        seen.append(_rank(url=url))
+        return {"services": [], "folders": []}
+
+    root = "https://example.com/arcgis/rest/services"
+    with patch.object(crawl_mod, "get_metadata", side_effect=fake_get_metadata):
+        await crawl_mod.safe_crawl(object(), root)  # type: ignore[arg-type]
+        with request_priority("metadata"):
+            await crawl_mod.fetch_all_data(object(), root)  # type: ignore[arg-type]
+
+    assert seen == [_RANKS["crawl"], _RANKS["metadata"]]
@@ -0,0 +1,168 @@
+"""Compiled per-stream request templates (``restgdf.utils._template``)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from restgdf import reset_config_cache
+from restgdf._client._priority import _RANKS, request_priority
+from restgdf.utils._canonical import _canonical_query, _canonical_query_string
+from restgdf.utils._http import _ARCGIS_URL_BODY_LIMIT, _request_verb
+from restgdf.utils._template import RequestTemplate
+from restgdf.utils.getgdf import _iter_pages_raw
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+QUERY = f"{LAYER}/query"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.delenv("RESTGDF_TRANSPORT_CACHE_HINT", raising=False)
+    reset_config_cache()
+    yield
+    reset_config_cache()
+
+
+class _Response:
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return {"features": []}
+
+
+def _params(target: str | None) -> dict[str, str]:
+    assert target is not None
+    return dict(parse_qsl(urlsplit(target).query, keep_blank_values=True))
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, Any, dict[str, Any]]] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        if params is None:
+            params = _params(url)
+        self.sent.append(("GET", params, kwargs))
+        return _Response()
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        self.sent.append(("POST", data, kwargs))
+        return _Response()
+
+
+class _BodyTransportSession(_Session):
+    _transport = "body"
+
+
+def _pages(count: int, **shared: Any) -> list[dict[str, Any]]:
+    base = {"where": "1=1", "outFields": "*", "returnGeometry": True, "f": "json"}
+    return [
+        {**base, **shared, "resultOffset": offset, "resultRecordCount": 1000}
+        for offset in range(0, count * 1000, 1000)
+    ]
+
+
+def test_pages_append_their_keys_to_the_encoded_shared_part() -> None:
+    pages = _pages(5, orderByFields="OBJECTID")
+    template = RequestTemplate(_Session(), QUERY, pages)
+    shared = _canonical_query_string(
+        {"where": "1=1", "outFields": "*", "returnGeometry": True, "f": "json"}
+        | {"orderByFields": "OBJECTID", "resultRecordCount": 1000},
+    )
+
+    for page in pages:
+        verb, target = template._prepare(page)
+        assert verb == "GET"
+        assert target == f"{QUERY}?{shared}&resultOffset={page['resultOffset']}"
+        assert _params(target) == _canonical_query(page)
+
+
+def test_predicate_pages_override_shared_keys() -> None:
+    pages = [
+        {"where": f"OBJECTID IN ({','.join(map(str, chunk))})", "f": "json"}
+        for chunk in (range(1, 4), range(4, 7))
+    ]
+    template = RequestTemplate(_Session(), QUERY, pages)
+
+    verb, target = template._prepare(pages[1])
+    assert verb == "GET"
+    assert _params(target) == _canonical_query(pages[1])
+
+
+@pytest.mark.parametrize("slack", [-1, 0, 1])
+def test_length_check_matches_choose_verb_at_the_limit(slack: int) -> None:
+    pages = _pages(2)
+    pages[1]["where"] = ""
+    fixed = len(QUERY) + 1 + len(_canonical_query_string(pages[1]))
+    pages[1]["where"] = "x" * (_ARCGIS_URL_BODY_LIMIT - fixed + slack)
+    template = RequestTemplate(_Session(), QUERY, pages)
+
+    verb, _ = template._prepare(pages[1])
+    assert verb == _request_verb(_Session(), QUERY, pages[1])
+    assert verb == ("POST" if slack > 0 else "GET")
+
+
+def test_tokens_and_body_transport_force_post() -> None:
+    pages = _pages(2, token="secret")
+    assert RequestTemplate(_Session(), QUERY, pages)._prepare(pages[0])[0] == "POST"
+
+    pages = _pages(2)
+    session = _BodyTransportSession()
+    assert RequestTemplate(session, QUERY, pages)._prepare(pages[0])[0] == "POST"
+
+
+def test_foreign_bodies_are_encoded_in_full() -> None:
+    template = RequestTemplate(_Session(), QUERY, _pages(2))
+    body = {"where": "1=1", "f": "json"}
+
+    assert template._prepare(body) == (
+        "GET",
+        f"{QUERY}?{_canonical_query_string(body)}",
+    )
+
+
+def test_pinned_priority_wins_over_the_template() -> None:
+    template = RequestTemplate(_Session(), QUERY, _pages(2))
+
+    assert template.priority == _RANKS["pages"]
+    with request_priority("metadata"):
+        assert template.priority == _RANKS["metadata"]
+
+
+@pytest.mark.asyncio
+async def test_stream_pages_share_one_snapshot(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("RESTGDF_TRANSPORT_CACHE_HINT", "true")
+    reset_config_cache()
+    session = _Session()
+    pages = _pages(3)
+
+    async def _batches(*_args: Any, **_kwargs: Any) -> list[dict[str, Any]]:
+        return pages
+
+    monkeypatch.setattr(
+        "restgdf.utils.getgdf.get_query_data_batches",
+        _batches,
+    )
+    async for _ in _iter_pages_raw(
+        LAYER,
+        session,  # type: ignore[arg-type]
+        max_concurrent_pages=2,
+        headers={"X-Trace": "1"},
+    ):
+        pass
+
+    assert [verb for verb, _, _ in session.sent] == ["GET"] * 3
+    assert [params["resultOffset"] for _, params, _ in session.sent] == [
+        "0",
+        "1000",
+        "2000",
+    ]
+    assert all(params["cacheHint"] == "true" for _, params, _ in session.sent)
+    first = session.sent[0][2]
+    assert first["headers"]["X-Trace"] == "1"
+    assert all(kw["headers"] is first["headers"] for _, _, kw in session.sent)
+    assert all(kw["timeout"] is first["timeout"] for _, _, kw in session.sent)
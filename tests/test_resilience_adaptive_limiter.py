@@ -0,0 +1,187 @@
+"""AIMD adaptive limiter mode (limiter_mode="adaptive")."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from restgdf._config import Config, ResilienceConfig
+from restgdf.resilience import ResilientSession
+from restgdf.resilience._limiter import AdaptiveLimiter, AdaptiveLimiterRegistry
+
+ROOT = "https://example.com/arcgis/rest/services/S/FeatureServer"
+URL = f"{ROOT}/0/query"
+
+
+def _limiter(rate: float = 10.0, **kw: Any) -> AdaptiveLimiter:
+    params: dict[str, Any] = {
+        "floor": 1.0,
+        "ceiling": 20.0,
+        "increase": 1.0,
+        "decrease_factor": 0.5,
+    }
+    params.update(kw)
+    return AdaptiveLimiter(rate, **params)
+
+
+class TestAdaptiveLimiter:
+    def test_additive_increase_is_capped_at_ceiling(self) -> None:
+        lim = _limiter(rate=10.0)
+        for _ in range(10):
+            lim.on_success()
+        # ~ +1 req/s per 10 successes at 10 req/s
+        assert 10.9 < lim.rate < 11.0
+        for _ in range(10_000):
+            lim.on_success()
+        assert lim.rate == 20.0
+
+    def test_multiplicative_decrease_respects_floor(self) -> None:
+        lim = _limiter(rate=10.0)
+        assert lim.on_throttle() is True
+        assert lim.rate == 5.0
+        lim._last_decrease = float("-inf")
+        lim.on_throttle()
+        lim._last_decrease = float("-inf")
+        lim.on_throttle()
+        lim._last_decrease = float("-inf")
+        lim.on_throttle()
+        assert lim.rate == 1.0
+
+    def test_burst_of_throttles_decreases_once(self) -> None:
+        lim = _limiter(rate=16.0)
+        results = [lim.on_throttle() for _ in range(8)]
+        assert results.count(True) == 1
+        assert lim.rate == 8.0
+        assert lim.throttles == 8
+
+    def test_initial_rate_is_clamped(self) -> None:
+        assert _limiter(rate=500.0).rate == 20.0
+        assert _limiter(rate=0.01).rate == 1.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_paces_at_rate(self) -> None:
+        lim = _limiter(rate=20.0, ceiling=20.0)
+        t0 = time.monotonic()
+        for _ in range(4):
+            await lim.acquire()
+        # first slot is immediate, then 3 x 50ms
+        assert time.monotonic() - t0 >= 0.14
+
+
+class TestRegistry:
+    def test_seed_snapshot_and_export(self) -> None:
+        registry = AdaptiveLimiterRegistry(
+            initial_rate=2.0,
+            floor=0.5,
+            ceiling=10.0,
+            increase=0.5,
+            decrease_factor=0.5,
+            seed={ROOT: 8.0, "https://other.example.com": 3.0},
+        )
+        assert registry.get(ROOT).rate == 8.0
+        assert registry.get("https://new.example.com").rate == 2.0
+        registry.get(ROOT).on_throttle()
+
+        snap = registry.snapshot()
+        assert snap[ROOT] == {"rate": 4.0, "successes": 0, "throttles": 1}
+        assert "https://other.example.com" not in snap
+
+        state = registry.export_state()
+        assert state == {
+            ROOT: 4.0,
+            "https://other.example.com": 3.0,
+            "https://new.example.com": 2.0,
+        }
+        assert json.loads(json.dumps(state)) == state
+
+
+class _Resp:
+    def __init__(self, status: int) -> None:
+        self.status = status
+        self.headers: dict[str, str] = {}
+
+    async def __aenter__(self) -> _Resp:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class _Inner:
+    def __init__(self, statuses: list[int]) -> None:
+        self._statuses = list(statuses)
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def get(self, url: str, **kwargs: Any) -> _Resp:
+        return _Resp(self._statuses.pop(0))
+
+    post = get
+
+
+def _adaptive_config(**overrides: Any) -> ResilienceConfig:
+    base: dict[str, Any] = {
+        "enabled": True,
+        "limiter_mode": "adaptive",
+        "rate_per_service_root_per_second": 40.0,
+        "adaptive_ceiling_per_second": 100.0,
+        "fallback_retry_after_seconds": 0.01,
+        "wait_initial_s": 0,
+        "wait_max_s": 0.01,
+        "wait_jitter_s": 0,
+    }
+    base.update(overrides)
+    return ResilienceConfig(**base)
+
+
+@pytest.mark.asyncio
+async def test_session_learns_from_429_then_success() -> None:
+    session = ResilientSession(_Inner([429, 200]), _adaptive_config())
+
+    resp = await session.get(URL)
+
+    assert resp.status == 200
+    snap = session.limiter_snapshot()[ROOT]
+    assert snap["throttles"] == 1
+    assert snap["successes"] == 1
+    assert 20.0 < snap["rate"] < 21.0
+    assert session.export_limiter_state() == {ROOT: snap["rate"]}
+
+
+@pytest.mark.asyncio
+async def test_session_is_seeded_from_previous_state() -> None:
+    session = ResilientSession(
+        _Inner([200]),
+        _adaptive_config(),
+        limiter_state={ROOT: 7.0},
+    )
+    await session.get(URL)
+    assert 7.0 < session.limiter_snapshot()[ROOT]["rate"] < 7.1
+
+
+def test_static_mode_has_no_adaptive_state() -> None:
+    session = ResilientSession(
+        _Inner([]),
+        ResilienceConfig(enabled=True, rate_per_service_root_per_second=5.0),
+    )
+    assert session.limiter_snapshot() == {}
+    assert session.export_limiter_state() == {}
+
+
+def test_floor_above_ceiling_is_rejected() -> None:
+    with pytest.raises(ValidationError, match="adaptive_floor_per_second"):
+        ResilienceConfig(adaptive_floor_per_second=5, adaptive_ceiling_per_second=1)
+
+
+def test_limiter_mode_env_var(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_RESILIENCE_LIMITER_MODE", "adaptive")
+    monkeypatch.setenv("RESTGDF_RESILIENCE_ADAPTIVE_CEILING_PER_SECOND", "12.5")
+    cfg = Config.from_env().resilience
+    assert cfg.limiter_mode == "adaptive"
+    assert cfg.adaptive_ceiling_per_second == 12.5
@@ -0,0 +1,203 @@
+"""ResilientSession retry across response-body consumption (buffer_responses)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import aiohttp
+import pytest
+
+from restgdf import deadline
+from restgdf._client._buffered import BufferedResponse
+from restgdf._config import ResilienceConfig
+from restgdf.errors import DeadlineExceededError, TransportError
+from restgdf.resilience import ResilientSession
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0/query"
+
+
+class _BodyResponse:
+    """Response stub whose body read can fail like a truncated stream."""
+
+    def __init__(
+        self,
+        body: bytes | Exception,
+        *,
+        status: int = 200,
+        content_type: str = "application/json; charset=utf-8",
+        delay: float = 0,
+    ) -> None:
+        self.status = status
+        self.headers = {"Content-Type": content_type}
+        self._body = body
+        self._delay = delay
+        self.exited = False
+
+    async def read(self) -> bytes:
+        await asyncio.sleep(self._delay)
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+    async def json(self, **kw: Any) -> Any:
+        return json.loads(await self.read())
+
+    async def __aenter__(self) -> _BodyResponse:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.exited = True
+
+
+class _Session:
+    def __init__(self, responses: list[_BodyResponse]) -> None:
+        self._responses = list(responses)
+        self.calls = 0
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def get(self, url: str, **kwargs: Any) -> _BodyResponse:
+        self.calls += 1
+        return self._responses.pop(0)
+
+    post = get
+
+
+def _config(**overrides: Any) -> ResilienceConfig:
+    base: dict[str, Any] = {
+        "enabled": True,
+        "buffer_responses": True,
+        "max_attempts": 3,
+        "wait_initial_s": 0,
+        "wait_max_s": 0.01,
+        "wait_jitter_s": 0,
+    }
+    base.update(overrides)
+    return ResilienceConfig(**base)
+
+
+@pytest.mark.asyncio
+async def test_truncated_body_is_retried_and_buffered() -> None:
+    first = _BodyResponse(aiohttp.ClientPayloadError("Response payload is not completed"))
+    second = _BodyResponse(b'{"features": []}')
+    inner = _Session([first, second])
+    session = ResilientSession(inner, _config())
+
+    resp = await session.get(URL)
+
+    assert inner.calls == 2
+    assert first.exited and second.exited
+    assert isinstance(resp, BufferedResponse)
+    assert await resp.json(content_type=None) == {"features": []}
+    assert await resp.text() == '{"features": []}'
+
+
+@pytest.mark.asyncio
+async def test_json_body_cut_mid_document_is_retried() -> None:
+    inner = _Session(
+        [_BodyResponse(b'{"features": [{"attr'), _BodyResponse(b'{"ok": true}')],
+    )
+    session = ResilientSession(inner, _config())
+
+    async with session.post(URL, data={}) as resp:
+        assert await resp.json() == {"ok": True}
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exhausted_body_failures_map_to_transport_error() -> None:
+    inner = _Session(
+        [_BodyResponse(aiohttp.ClientPayloadError("cut")) for _ in range(2)],
+    )
+    session = ResilientSession(inner, _config(max_attempts=2))
+
+    with pytest.raises(TransportError, match="Truncated or incomplete"):
+        await session.get(URL)
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_body_read_timeout_exits_the_response_context() -> None:
+    stalled = _BodyResponse(asyncio.TimeoutError())
+    inner = _Session([stalled])
+    session = ResilientSession(inner, _config())
+
+    # Like a connect timeout: not retried, but the connection is released.
+    with pytest.raises(asyncio.TimeoutError):
+        await session.get(URL)
+    assert inner.calls == 1
+    assert stalled.exited
+
+    late = _BodyResponse(asyncio.TimeoutError(), delay=0.1)
+    session = ResilientSession(_Session([late]), _config())
+    with deadline(0.02):
+        with pytest.raises(DeadlineExceededError):
+            await session.get(URL)
+    assert late.exited
+
+
+@pytest.mark.asyncio
+async def test_other_body_failures_exit_the_response_context() -> None:
+    slow = _BodyResponse(aiohttp.ServerTimeoutError("read"))
+    inner = _Session([slow, _BodyResponse(b"{}")])
+    session = ResilientSession(inner, _config())
+
+    assert await (await session.get(URL)).json() == {}
+    assert inner.calls == 2
+    assert slow.exited
+
+    cut = _BodyResponse(aiohttp.ClientPayloadError("cut"), delay=0.1)
+    session = ResilientSession(_Session([cut]), _config())
+    with deadline(0.02):
+        with pytest.raises(DeadlineExceededError):
+            await session.get(URL)
+    assert cut.exited
+
+    broken = _BodyResponse(RuntimeError("boom"))
+    session = ResilientSession(_Session([broken]), _config())
+    with pytest.raises(RuntimeError, match="boom"):
+        await session.get(URL)
+    assert broken.exited
+
+
+@pytest.mark.asyncio
+async def test_non_json_body_is_buffered_without_decoding() -> None:
+    inner = _Session([_BodyResponse(b"<html>", content_type="text/html")])
+    session = ResilientSession(inner, _config())
+
+    resp = await session.get(URL)
+
+    assert inner.calls == 1
+    assert await resp.text() == "<html>"
+    with pytest.raises(aiohttp.ContentTypeError):
+        await resp.json()
+
+
+@pytest.mark.asyncio
+async def test_buffering_is_off_by_default() -> None:
+    live = _BodyResponse(b"{}")
+    session = ResilientSession(_Session([live]), _config(buffer_responses=False))
+
+    assert await session.get(URL) is live
+
+
+def test_buffer_responses_env_var(monkeypatch: pytest.MonkeyPatch) -> None:
+    from restgdf._config import Config
+
+    monkeypatch.setenv("RESTGDF_RESILIENCE_BUFFER_RESPONSES", "true")
+    assert Config.from_env().resilience.buffer_responses is True
+
+
+@pytest.mark.asyncio
+async def test_buffered_response_json_decodes_fresh_copy_after_first_call() -> None:
+    resp = await BufferedResponse.from_response(
+        _BodyResponse(b'{"a": [1]}'),
+        decode_json=True,
+    )
+    first = await resp.json()
+    first["a"].append(2)
+    assert await resp.json() == {"a": [1]}
@@ -0,0 +1,216 @@
+"""Per-key circuit breaker for ResilientSession (breaker_failure_threshold)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+import pytest
+
+from restgdf._config import Config, ResilienceConfig
+from restgdf.errors import CircuitOpenError, RestgdfResponseError, TransportError
+from restgdf.resilience import ResilientSession
+from restgdf.resilience._breaker import CircuitBreaker, CircuitBreakerRegistry
+from restgdf.utils._page_retry import _is_retryable_page_error
+from restgdf.utils.crawl import safe_crawl
+
+ROOT = "https://down.example.com/arcgis/rest/services/S/FeatureServer"
+URL = f"{ROOT}/0/query"
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_consecutive_failures(self) -> None:
+        breaker = CircuitBreaker(ROOT, threshold=3, cooldown_s=60)
+        for _ in range(2):
+            breaker.before_request(URL)
+            breaker.record_failure("status=502")
+        assert breaker.state == "closed"
+        breaker.before_request(URL)
+        breaker.record_failure("status=502")
+        assert breaker.state == "open"
+
+        with pytest.raises(CircuitOpenError) as info:
+            breaker.before_request(URL)
+        assert info.value.breaker_key == ROOT
+        assert 0 < info.value.retry_after <= 60
+        assert isinstance(info.value, TransportError)
+        assert breaker.rejected == 1
+
+    def test_success_resets_failure_count(self) -> None:
+        breaker = CircuitBreaker(ROOT, threshold=2, cooldown_s=60)
+        breaker.record_failure("status=500")
+        breaker.record_success()
+        breaker.record_failure("status=500")
+        assert breaker.state == "closed"
+
+    def test_half_open_admits_one_probe(self) -> None:
+        breaker = CircuitBreaker(ROOT, threshold=1, cooldown_s=0.01)
+        breaker.record_failure("ServerDisconnectedError")
+        time.sleep(0.02)
+
+        breaker.before_request(URL)  # the probe
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request(URL)
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        breaker.before_request(URL)
+
+    def test_failed_probe_reopens(self) -> None:
+        breaker = CircuitBreaker(ROOT, threshold=1, cooldown_s=0.01)
+        breaker.record_failure("status=503")
+        time.sleep(0.02)
+        breaker.before_request(URL)
+        breaker.record_failure("status=503")
+        assert breaker.state == "open"
+        assert breaker.trips == 2
+
+    def test_released_probe_lets_next_request_probe(self) -> None:
+        breaker = CircuitBreaker(ROOT, threshold=1, cooldown_s=0.01)
+        breaker.record_failure("status=503")
+        time.sleep(0.02)
+        breaker.before_request(URL)
+        breaker.release()
+        breaker.before_request(URL)
+        assert breaker.state == "half_open"
+
+    def test_registry_never_evicts_a_tripped_breaker(self) -> None:
+        registry = CircuitBreakerRegistry(1, 60, max_keys=1)
+        registry.get(ROOT).record_failure("status=500")
+        registry.get("https://other.example.com")
+        assert registry.snapshot()[ROOT]["state"] == "open"
+
+
+class _Resp:
+    def __init__(self, status: int, body: Any = None) -> None:
+        self.status = status
+        self.headers = {"Content-Type": "application/json"}
+        self._body = body
+
+    async def json(self, **kwargs: Any) -> Any:
+        return self._body
+
+    async def read(self) -> bytes:
+        return json.dumps(self._body).encode()
+
+    async def __aenter__(self) -> _Resp:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class _Inner:
+    """Serves ``routes`` by exact URL; anything else is a dead host."""
+
+    def __init__(self, routes: dict[str, Any] | None = None) -> None:
+        self.routes = routes or {}
+        self.calls: list[str] = []
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        self.calls.append(url)
+        if url in self.routes:
+            return _Resp(200, self.routes[url])
+        raise aiohttp.ServerDisconnectedError()
+
+    post = get
+
+
+def _config(**overrides: Any) -> ResilienceConfig:
+    base: dict[str, Any] = {
+        "enabled": True,
+        "breaker_failure_threshold": 2,
+        "breaker_cooldown_s": 60,
+        "max_attempts": 5,
+        "wait_initial_s": 0,
+        "wait_max_s": 0.01,
+        "wait_jitter_s": 0,
+    }
+    base.update(overrides)
+    return ResilienceConfig(**base)
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_cuts_the_retry_schedule_short(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    inner = _Inner()
+    session = ResilientSession(inner, _config())
+
+    with caplog.at_level(logging.WARNING, logger="restgdf.retry"):
+        with pytest.raises(CircuitOpenError):
+            await session.get(URL)
+
+    # Two failed attempts open the breaker; attempt three is rejected unsent.
+    assert len(inner.calls) == 2
+    assert any("circuit opened" in r.getMessage() for r in caplog.records)
+
+    with pytest.raises(CircuitOpenError):
+        await session.get(URL)
+    assert len(inner.calls) == 2
+    assert session.breaker_snapshot()[ROOT] == {
+        "state": "open",
+        "consecutive_failures": 2,
+        "trips": 1,
+        "rejected": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_errors_count_as_reachable() -> None:
+    class _Client4xx(_Inner):
+        def get(self, url: str, **kwargs: Any) -> Any:
+            self.calls.append(url)
+            return _Resp(404)
+
+    session = ResilientSession(_Client4xx(), _config(breaker_failure_threshold=1))
+    with pytest.raises(RestgdfResponseError):
+        await session.get(URL)
+    assert session.breaker_snapshot()[ROOT]["state"] == "closed"
+
+
+def test_breaker_is_off_by_default() -> None:
+    session = ResilientSession(_Inner(), ResilienceConfig(enabled=True))
+    assert session._breaker is None
+    assert session.breaker_snapshot() == {}
+
+
+def test_circuit_open_pages_are_not_retried() -> None:
+    assert not _is_retryable_page_error(CircuitOpenError("open", breaker_key=ROOT))
+
+
+@pytest.mark.asyncio
+async def test_safe_crawl_records_circuit_open_as_crawl_errors() -> None:
+    base = "https://ok.example.com/arcgis/rest/services"
+    services = [{"name": f"Svc{i}", "type": "FeatureServer"} for i in range(5)]
+    inner = _Inner({base: {"services": services, "folders": []}})
+    # One host for every service so a single breaker covers them all.
+    session = ResilientSession(
+        inner,
+        _config(limiter_key="host", breaker_failure_threshold=3),
+    )
+
+    report = await safe_crawl(session, base)
+
+    assert len(report.errors) == 5
+    assert {e.stage for e in report.errors} == {"service_metadata"}
+    assert any(isinstance(e.exception, CircuitOpenError) for e in report.errors)
+    # The root call plus one attempt per service at most; never the
+    # 5 services x 5 attempts a crawl without the breaker would send.
+    assert len(inner.calls) <= 1 + len(services)
+
+
+def test_breaker_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_RESILIENCE_BREAKER_FAILURE_THRESHOLD", "4")
+    monkeypatch.setenv("RESTGDF_RESILIENCE_BREAKER_COOLDOWN_S", "12.5")
+    cfg = Config.from_env().resilience
+    assert cfg.breaker_failure_threshold == 4
+    assert cfg.breaker_cooldown_s == 12.5
@@ -0,0 +1,185 @@
+"""Per-key in-flight caps and LRU/TTL-bounded resilience registries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from restgdf._config import Config, ResilienceConfig
+from restgdf.resilience import ResilientSession
+from restgdf.resilience._limiter import (
+    AdaptiveLimiterRegistry,
+    CooldownRegistry,
+    InFlightRegistry,
+    LimiterRegistry,
+)
+
+
+def _root(i: int) -> str:
+    return f"https://h{i}.example.com/arcgis/rest/services/S/FeatureServer"
+
+
+class TestInFlightRegistry:
+    @pytest.mark.asyncio
+    async def test_caps_concurrency_per_key(self) -> None:
+        registry = InFlightRegistry(2)
+        active = peak = 0
+
+        async def work(key: str) -> None:
+            nonlocal active, peak
+            async with registry.slot(key):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(work(_root(0)) for _ in range(6)))
+        assert peak == 2
+        assert registry.in_flight(_root(0)) == 0
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self) -> None:
+        registry = InFlightRegistry(1)
+        async with registry.slot(_root(0)):
+            await asyncio.wait_for(self._enter(registry, _root(1)), 0.5)
+
+    @staticmethod
+    async def _enter(registry: InFlightRegistry, key: str) -> None:
+        async with registry.slot(key):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_busy_slot_is_never_evicted(self) -> None:
+        registry = InFlightRegistry(1, max_keys=1)
+        async with registry.slot(_root(0)):
+            async with registry.slot(_root(1)):
+                assert set(registry._slots) == {_root(0), _root(1)}
+            async with registry.slot(_root(2)):
+                pass
+        assert _root(0) in registry._slots
+        assert _root(1) not in registry._slots
+
+
+class TestBoundedRegistries:
+    def test_limiter_registry_is_lru_bounded(self) -> None:
+        registry = LimiterRegistry(5.0, max_keys=3)
+        for i in range(10):
+            registry.get(_root(i))
+        assert list(registry._limiters) == [_root(7), _root(8), _root(9)]
+
+    def test_limiter_registry_recently_used_key_survives(self) -> None:
+        registry = LimiterRegistry(5.0, max_keys=2)
+        keep = registry.get(_root(0))
+        registry.get(_root(1))
+        assert registry.get(_root(0)) is keep
+        registry.get(_root(2))
+        assert set(registry._limiters) == {_root(0), _root(2)}
+
+    def test_limiter_registry_drops_idle_keys(self) -> None:
+        registry = LimiterRegistry(5.0, idle_ttl_s=0.01)
+        registry.get(_root(0))
+        time.sleep(0.02)
+        registry.get(_root(1))
+        assert list(registry._limiters) == [_root(1)]
+
+    def test_cooldown_registry_purges_expired_deadlines(self) -> None:
+        registry = CooldownRegistry()
+        for i in range(50):
+            registry.set_cooldown(_root(i), 0)
+        registry.set_cooldown(_root(99), 60)
+        assert list(registry._deadlines) == [_root(99)]
+        assert list(registry._eviction._touched) == [_root(99)]
+
+    @pytest.mark.asyncio
+    async def test_cooldown_registry_forgets_waited_out_keys(self) -> None:
+        registry = CooldownRegistry()
+        for i in range(3):
+            registry.set_cooldown(_root(i), 0.001)
+        for i in range(3):
+            await registry.wait_if_cooling(_root(i))
+        assert registry._deadlines == {}
+        assert registry._eviction._touched == {}
+
+    def test_cooldown_registry_keeps_live_cooldowns_over_cap(self) -> None:
+        registry = CooldownRegistry(max_keys=2)
+        for i in range(4):
+            registry.set_cooldown(_root(i), 60)
+        # All four are still in force; none may be dropped.
+        assert len(registry._deadlines) == 4
+
+    def test_adaptive_registry_remembers_evicted_rates(self) -> None:
+        registry = AdaptiveLimiterRegistry(
+            initial_rate=1.0,
+            floor=0.1,
+            ceiling=10.0,
+            increase=0.5,
+            decrease_factor=0.5,
+            max_keys=1,
+        )
+        registry.get(_root(0)).rate = 7.0
+        registry.get(_root(1))
+        assert list(registry._limiters) == [_root(1)]
+        assert registry.export_state()[_root(0)] == 7.0
+        assert registry.get(_root(0)).rate == 7.0
+
+
+class _SlowResp:
+    status = 200
+    headers: dict[str, str] = {}
+
+    async def __aenter__(self) -> _SlowResp:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class _CountingInner:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def _request(self) -> _SlowResp:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return _SlowResp()
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self._request()
+
+    post = get
+
+
+@pytest.mark.asyncio
+async def test_session_caps_in_flight_per_host() -> None:
+    inner = _CountingInner()
+    session = ResilientSession(
+        inner,
+        ResilienceConfig(enabled=True, limiter_key="host", max_in_flight_per_key=3),
+    )
+    urls = [f"{_root(0)}/{i}/query" for i in range(12)]
+
+    await asyncio.gather(*(session.get(url) for url in urls))
+
+    assert inner.peak == 3
+    assert session._in_flight is not None
+    assert session._in_flight.in_flight("https://h0.example.com") == 0
+
+
+def test_in_flight_and_bounds_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_RESILIENCE_MAX_IN_FLIGHT_PER_KEY", "4")
+    monkeypatch.setenv("RESTGDF_RESILIENCE_REGISTRY_MAX_KEYS", "100")
+    monkeypatch.setenv("RESTGDF_RESILIENCE_REGISTRY_IDLE_TTL_S", "30")
+    cfg = Config.from_env().resilience
+    assert cfg.max_in_flight_per_key == 4
+    assert cfg.registry_max_keys == 100
+    assert cfg.registry_idle_ttl_s == 30.0
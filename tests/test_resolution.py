@@ -0,0 +1,244 @@
+"""Resolution query options and quantized geometry decoding."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from restgdf import FeatureLayer
+from restgdf._models.responses import LayerMetadata
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._resolution import _QuantizedStats
+from restgdf.utils.getgdf import _iter_pages_raw
+from restgdf.utils.getinfo import (
+    decode_quantized,
+    resolution_params,
+    scale_to_tolerance,
+)
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+TRANSFORM = {
+    "originPosition": "upperLeft",
+    "scale": [0.5, 0.25],
+    "translate": [100.0, 50.0],
+}
+QUANTIZED = {
+    "objectIdFieldName": "OBJECTID",
+    "transform": TRANSFORM,
+    "features": [
+        {"attributes": {"OBJECTID": 1}, "geometry": {"x": 4, "y": 8}},
+        {
+            "attributes": {"OBJECTID": 2},
+            "geometry": {"paths": [[[2, 4], [2, 0], [0, 4]], [[10, 10], [-2, -2]]]},
+        },
+        {
+            "attributes": {"OBJECTID": 3},
+            "geometry": {"rings": [[[0, 0, 7], [4, 0, 7], [0, 4, 7], [-4, -4, 7]]]},
+        },
+        {"attributes": {"OBJECTID": 4}, "geometry": None},
+    ],
+}
+
+
+def test_decode_quantized_undoes_the_grid_and_deltas() -> None:
+    decoded = decode_quantized(QUANTIZED)
+
+    assert "transform" not in decoded
+    point, line, ring, empty = (feature["geometry"] for feature in decoded["features"])
+    assert point == {"x": 102.0, "y": 48.0}
+    assert line["paths"] == [
+        [[101.0, 49.0], [102.0, 49.0], [102.0, 48.0]],
+        [[105.0, 47.5], [104.0, 48.0]],
+    ]
+    # Extra ordinates (z) are not delta-encoded.
+    assert ring["rings"] == [
+        [[100.0, 50.0, 7], [102.0, 50.0, 7], [102.0, 49.0, 7], [100.0, 50.0, 7]],
+    ]
+    assert empty is None
+    lower_left = decode_quantized(
+        {**QUANTIZED, "transform": {**TRANSFORM, "originPosition": "lowerLeft"}},
+    )
+    assert lower_left["features"][0]["geometry"] == {"x": 102.0, "y": 52.0}
+    plain = {"features": [{"geometry": {"x": 1, "y": 2}}]}
+    assert decode_quantized(plain) is plain
+
+
+def test_decode_quantized_multipoints_and_unknown_geometries() -> None:
+    stats = _QuantizedStats()
+    assert stats.saved_fraction == 0.0
+    raw = {
+        "transform": TRANSFORM,
+        "features": [
+            {"geometry": {"points": [[2, 4], [2, -4]]}},
+            {"geometry": {"curvePaths": [[[0, 0]]]}},
+        ],
+    }
+
+    decoded = decode_quantized(raw, stats)
+
+    multipoint, curve = (feature["geometry"] for feature in decoded["features"])
+    assert multipoint == {"points": [[101.0, 49.0], [102.0, 50.0]]}
+    # Geometries it cannot decode pass through.
+    assert curve == {"curvePaths": [[[0, 0]]]}
+    assert (stats.pages, stats.vertices) == (1, 2)
+    assert 0 < stats.saved_fraction < 1
+    assert decode_quantized({"transform": TRANSFORM, "count": 3}) == {"count": 3}
+
+
+def test_resolution_params_follow_the_tolerance() -> None:
+    extent = {
+        "xmin": 0,
+        "ymin": 0,
+        "xmax": 10,
+        "ymax": 10,
+        "spatialReference": {"wkid": 3857},
+    }
+
+    params = resolution_params(19.1, extent=extent)
+    degrees = resolution_params(scale_to_tolerance(72_224, 4326), quantize=False)
+
+    assert params["maxAllowableOffset"] == 19.1
+    assert params["geometryPrecision"] == 0
+    assert json.loads(params["quantizationParameters"]) == {
+        "mode": "view",
+        "originPosition": "upperLeft",
+        "tolerance": 19.1,
+        "extent": extent,
+    }
+    assert scale_to_tolerance(72_224, {"wkid": 3857}) == pytest.approx(19.11, 1e-3)
+    assert degrees["maxAllowableOffset"] == pytest.approx(1.717e-4, 1e-3)
+    assert degrees["geometryPrecision"] == 5
+    assert "quantizationParameters" not in degrees
+    assert "quantizationParameters" not in resolution_params(1.0, extent={})
+    with pytest.raises(ValueError, match="tolerance"):
+        resolution_params(0)
+    with pytest.raises(ValueError, match="scale"):
+        scale_to_tolerance(0)
+
+
+def test_scale_to_tolerance_reads_geographic_wkt() -> None:
+    geographic = {"wkt": 'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984"]]'}
+    projected = {"wkt": 'PROJCS["Local",GEOGCS["GCS_WGS_1984"]]'}
+
+    assert scale_to_tolerance(72_224, geographic) < 1e-3
+    assert scale_to_tolerance(72_224, projected) == pytest.approx(19.11, 1e-3)
+
+
+def _layer(**data: Any) -> FeatureLayer:
+    layer = FeatureLayer(LAYER, session=object(), where="A = 1", data=data)  # type: ignore[arg-type]
+    layer.metadata = LayerMetadata.model_validate(
+        {
+            "name": "S",
+            "extent": {
+                "xmin": 0,
+                "ymin": 0,
+                "xmax": 1000,
+                "ymax": 1000,
+                "spatialReference": {"wkid": 3857},
+            },
+        },
+    )
+    layer.name = "S"
+    layer.fields = ("OBJECTID",)
+    layer.object_id_field = "OBJECTID"
+    layer.count = 12
+    return layer
+
+
+@pytest.mark.asyncio
+async def test_with_resolution_sets_the_query_parameters() -> None:
+    layer = _layer(outFields="OBJECTID", maxAllowableOffset=99)
+
+    coarse = await layer.with_resolution(scale=72_224)
+    fine = await coarse.with_resolution(tolerance=0.05, quantize=False)
+    projected = await _layer(outSR=4326).with_resolution(scale=72_224)
+
+    data = coarse.kwargs["data"]
+    assert data["where"] == "A = 1"
+    assert data["outFields"] == "OBJECTID"
+    assert data["maxAllowableOffset"] == pytest.approx(19.11, 1e-3)
+    assert json.loads(data["quantizationParameters"])["extent"]["xmax"] == 1000
+    assert (coarse.count, coarse.object_id_field) == (12, "OBJECTID")
+    assert fine.kwargs["data"]["geometryPrecision"] == 3
+    assert "quantizationParameters" not in fine.kwargs["data"]
+    # An outSR gives degrees and no layer-extent quantization.
+    assert projected.kwargs["data"]["maxAllowableOffset"] < 1e-3
+    assert "quantizationParameters" not in projected.kwargs["data"]
+    with pytest.raises(ValueError, match="exactly one"):
+        await layer.with_resolution()
+
+
+@pytest.mark.asyncio
+async def test_with_resolution_preps_the_layer_first() -> None:
+    layer = FeatureLayer(LAYER, session=object())  # type: ignore[arg-type]
+    prepped = _layer()
+    prepped.metadata = LayerMetadata.model_validate({"name": "S", "extent": None})
+
+    async def prep() -> None:
+        layer.metadata = prepped.metadata
+        layer.name = prepped.name
+        layer.fields = prepped.fields
+        layer.object_id_field = prepped.object_id_field
+        layer.count = prepped.count
+
+    with patch.object(layer, "prep", AsyncMock(side_effect=prep)) as mock:
+        refined = await layer.with_resolution(scale=72_224)
+
+    mock.assert_awaited_once()
+    # No usable extent: meters, and no quantization.
+    assert refined.kwargs["data"]["maxAllowableOffset"] == pytest.approx(19.11, 1e-3)
+    assert "quantizationParameters" not in refined.kwargs["data"]
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+
+class _QuantizedSession:
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        return _Response(QUANTIZED)
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return _Response(QUANTIZED)
+
+
+@pytest.mark.asyncio
+async def test_stream_decodes_pages_and_reports_savings(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    batches = [{"where": "1=1", "resultOffset": 0}, {"where": "1=1", "resultOffset": 3}]
+
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        caplog.at_level(logging.DEBUG, logger="restgdf.pagination"),
+    ):
+        pages = [
+            page
+            async for page in _iter_pages_raw(
+                LAYER,
+                _QuantizedSession(),  # type: ignore[arg-type]
+            )
+        ]
+
+    assert len(pages) == 2
+    assert all("transform" not in page for page in pages)
+    assert pages[0]["features"][0]["geometry"] == {"x": 102.0, "y": 48.0}
+    message = next(
+        record.getMessage()
+        for record in caplog.records
+        if "quantized geometry" in record.getMessage()
+    )
+    assert "2 pages, 20 vertices" in message
@@ -0,0 +1,221 @@
+"""On-disk HTTP response cache (``restgdf.ResponseCache``)."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from restgdf import ResponseCache
+from restgdf.utils._query import get_feature_count, get_metadata
+from restgdf.utils.getgdf import _fetch_page_dict
+
+LAYER = "/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Layer:
+    """A layer endpoint with an ETag, a cacheable count and plain pages."""
+
+    def __init__(self) -> None:
+        self.hits: Counter[str] = Counter()
+        self.not_modified = 0
+        self.etag = '"v1"'
+        self.count_cache_control = "max-age=60"
+        self.fail_metadata = False
+
+    async def metadata(self, request: web.Request) -> web.Response:
+        self.hits["metadata"] += 1
+        if self.fail_metadata:
+            return web.json_response({"error": {"code": 500, "message": "down"}})
+        if request.headers.get("If-None-Match") == self.etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": self.etag})
+        return web.json_response(
+            {"name": "Parcels", "type": "Feature Layer", "etag": self.etag},
+            headers={"ETag": self.etag},
+        )
+
+    async def query(self, request: web.Request) -> web.Response:
+        params = dict(request.query)
+        params.update(await request.post())
+        if params.get("returnCountOnly") == "true":
+            self.hits["count"] += 1
+            return web.json_response(
+                {"count": 7},
+                headers={"Cache-Control": self.count_cache_control},
+            )
+        self.hits["pages"] += 1
+        return web.json_response(
+            {"features": [{"attributes": {"OBJECTID": 1}}]},
+            headers={"Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"},
+        )
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[tuple[_Layer, str]]:
+    layer = _Layer()
+    app = web.Application()
+    for method in ("GET", "POST"):
+        app.router.add_route(method, LAYER, layer.metadata)
+        app.router.add_route(method, f"{LAYER}/query", layer.query)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    try:
+        yield layer, str(test_server.make_url(LAYER))
+    finally:
+        await test_server.close()
+
+
+@pytest.mark.asyncio
+async def test_etag_is_revalidated_across_runs(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    path = tmp_path / "cache" / "http.sqlite"
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(path) as cache, cache.activate():
+            first = await get_metadata(url, session)
+        # A fresh cache object on the same file: a re-run of the job.
+        with ResponseCache(path) as cache, cache.activate():
+            second = await get_metadata(url, session)
+            assert cache.stats()["revalidated"] == 1
+    assert first.name == second.name == "Parcels"
+    assert layer.hits["metadata"] == 2
+    assert layer.not_modified == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_replaces_the_entry(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(tmp_path / "c.sqlite") as cache, cache.activate():
+            await get_metadata(url, session)
+            layer.etag = '"v2"'
+            changed = await get_metadata(url, session)
+            again = await get_metadata(url, session)
+    assert changed.model_extra["etag"] == again.model_extra["etag"] == '"v2"'
+    assert layer.not_modified == 1
+    assert cache.stats()["stored"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fresh_responses_are_served_locally(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(tmp_path / "c.sqlite") as cache, cache.activate():
+            counts = [await get_feature_count(url, session) for _ in range(3)]
+            stats = cache.stats()
+    assert counts == [7, 7, 7]
+    assert layer.hits["count"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_max_age_overrides_a_revalidation(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(tmp_path / "c.sqlite", max_age_s=60) as cache:
+            with cache.activate():
+                await get_metadata(url, session)
+                await get_metadata(url, session)
+    assert layer.hits["metadata"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pages_are_opt_in(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    query = {"where": "1=1", "f": "json", "resultOffset": 0}
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(tmp_path / "a.sqlite") as cache, cache.activate():
+            await _fetch_page_dict(url, session, query)
+            await _fetch_page_dict(url, session, query)
+            assert cache.stats()["entries"] == 0
+        with ResponseCache(
+            tmp_path / "b.sqlite",
+            kinds=("pages",),
+        ) as cache, cache.activate():
+            await _fetch_page_dict(url, session, query)
+            page = await _fetch_page_dict(url, session, query)
+            assert cache.stats()["entries"] == 1
+    assert page["features"] == [{"attributes": {"OBJECTID": 1}}]
+    assert layer.hits["pages"] == 4
+
+
+@pytest.mark.asyncio
+async def test_errors_and_no_store_are_not_kept(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    layer.fail_metadata = True
+    layer.count_cache_control = "no-store"
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(tmp_path / "c.sqlite") as cache, cache.activate():
+            with pytest.raises(Exception):
+                await get_metadata(url, session)
+            await get_feature_count(url, session)
+            assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_keyed_apart_and_not_stored(
+    server: tuple[_Layer, str],
+    tmp_path: Path,
+) -> None:
+    layer, url = server
+    path = tmp_path / "c.sqlite"
+    async with aiohttp.ClientSession() as session:
+        with ResponseCache(path) as cache, cache.activate():
+            await get_metadata(url, session, token="alice-secret")
+            await get_metadata(url, session, token="bob-secret")
+            assert cache.stats()["entries"] == 2
+    assert layer.not_modified == 0
+    assert b"secret" not in path.read_bytes()
+
+
+def test_eviction_keeps_the_store_under_budget(tmp_path: Path) -> None:
+    from restgdf._client._buffered import BufferedResponse
+
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=300)
+    resp = BufferedResponse(
+        status=200,
+        headers={"Content-Type": "application/json"},
+        body=b"x" * 100,
+    )
+    for index in range(5):
+        cache._store(f"k{index}", f"https://h/{index}", "metadata", resp, index)
+    stats = cache.stats()
+    assert stats["bytes"] <= 300
+    assert stats["evictions"] == 5 - stats["entries"]
+    assert cache._load("k4") is not None and cache._load("k0") is None
+    assert cache.invalidate("https://h/4") == 1
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_bytes": 0}, {"max_age_s": 0}, {"kinds": ("crawl",)}],
+)
+def test_rejects_bad_arguments(kwargs: dict[str, Any], tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ResponseCache(tmp_path / "c.sqlite", **kwargs)
@@ -0,0 +1,209 @@
+"""Shared retry budget across a stream or a ResilientSession."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from restgdf import PageFailure, PageRetryPolicy, RetryBudget
+from restgdf._config import Config, ResilienceConfig
+from restgdf.errors import TransportError
+from restgdf.resilience import ResilientSession
+from restgdf.utils import getgdf as getgdf_mod
+from restgdf.utils._retry_budget import _stream_retry_budget
+from restgdf.utils.getgdf import _iter_pages_raw
+
+URL = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+_NO_WAIT = PageRetryPolicy(max_attempts=5, wait_initial_s=0, wait_jitter_s=0)
+
+
+class TestRetryBudget:
+    def test_reserve_then_ratio_of_first_attempts(self) -> None:
+        budget = RetryBudget(0.5, min_retries=2)
+        assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+        budget.record_attempt()
+        assert budget.try_retry() is False
+        budget.record_attempt()
+        assert budget.try_retry() is True
+        assert budget.snapshot() == {
+            "first_attempts": 2,
+            "retries": 3,
+            "denied": 2,
+            "available": 0.0,
+        }
+
+    def test_healthy_run_cannot_bank_unbounded_retries(self) -> None:
+        budget = RetryBudget(0.2, min_retries=3)
+        for _ in range(1000):
+            budget.record_attempt()
+        assert budget.available == 3.0
+
+    def test_zero_reserve_still_allows_whole_retries(self) -> None:
+        budget = RetryBudget(0.5, min_retries=0)
+        assert budget.try_retry() is False
+        budget.record_attempt()
+        budget.record_attempt()
+        assert budget.try_retry() is True
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [({"ratio": -0.1}, "ratio"), ({"min_retries": -1}, "min_retries")],
+    )
+    def test_rejects_negative_parameters(
+        self,
+        kwargs: dict[str, Any],
+        match: str,
+    ) -> None:
+        with pytest.raises(ValueError, match=match):
+            RetryBudget(**kwargs)
+
+    def test_warns_once_per_exhaustion_episode(
+        self,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        budget = RetryBudget(1.0, min_retries=0)
+        with caplog.at_level(logging.DEBUG, logger="restgdf.retry"):
+            budget.try_retry(cause="status=503")
+            budget.try_retry(cause="status=503")
+            budget.record_attempt()
+            budget.try_retry()
+            budget.try_retry(cause="status=503")
+        levels = [r.levelno for r in caplog.records]
+        assert levels == [logging.WARNING, logging.DEBUG, logging.WARNING]
+        assert "caused_by=status=503" in caplog.records[0].getMessage()
+
+
+class _Down:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        self.calls += 1
+        raise aiohttp.ServerDisconnectedError()
+
+    post = get
+
+
+def _config(**overrides: Any) -> ResilienceConfig:
+    base: dict[str, Any] = {
+        "enabled": True,
+        "max_attempts": 5,
+        "wait_initial_s": 0,
+        "wait_max_s": 0.01,
+        "wait_jitter_s": 0,
+    }
+    base.update(overrides)
+    return ResilienceConfig(**base)
+
+
+@pytest.mark.asyncio
+async def test_session_budget_stops_retries_across_requests() -> None:
+    inner = _Down()
+    session = ResilientSession(
+        inner,
+        _config(retry_budget_ratio=0.0, retry_budget_min_retries=3),
+    )
+
+    for _ in range(3):
+        with pytest.raises(TransportError, match="Connection failed"):
+            await session.get(f"{URL}/query")
+
+    # 3 first attempts + the 3 reserved retries, not 3 x 5 attempts.
+    assert inner.calls == 6
+    assert session.retry_budget is not None
+    assert session.retry_budget.denied == 3
+
+
+def test_session_budget_is_off_by_default() -> None:
+    assert ResilientSession(_Down(), _config()).retry_budget is None
+
+
+@pytest.mark.asyncio
+async def test_stream_budget_caps_page_retries_and_feeds_collect() -> None:
+    batches = [{"where": "1=1", "resultOffset": i} for i in range(4)]
+    budget = RetryBudget(0.0, min_retries=2)
+    seen_budgets: list[RetryBudget | None] = []
+
+    async def fake_fetch(_url, _session, query_data, **_kw):
+        seen_budgets.append(_stream_retry_budget())
+        raise TransportError("503", status_code=503)
+
+    failures: list[PageFailure] = []
+    fetch = AsyncMock(side_effect=fake_fetch)
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=batches),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", fetch),
+    ):
+        pages = [
+            page
+            async for page in _iter_pages_raw(
+                URL,
+                object(),  # type: ignore[arg-type]
+                on_page_error="collect",
+                page_retry=_NO_WAIT,
+                page_failures=failures,
+                retry_budget=budget,
+            )
+        ]
+
+    assert pages == []
+    assert len(failures) == 4
+    # 4 first attempts + 2 budgeted retries instead of 4 x 5 attempts.
+    assert fetch.await_count == 6
+    assert budget.first_attempts == 4
+    assert set(seen_budgets) == {budget}
+    assert _stream_retry_budget() is None
+
+
+@pytest.mark.asyncio
+async def test_stream_budget_governs_transport_retries() -> None:
+    inner = _Down()
+    session = ResilientSession(inner, _config())
+    budget = RetryBudget(0.0, min_retries=1)
+
+    async def fetch_through_session(_url, session, _query_data, **_kw):
+        return await session.get(f"{URL}/query")
+
+    failures: list[PageFailure] = []
+    with (
+        patch.object(
+            getgdf_mod,
+            "get_query_data_batches",
+            AsyncMock(return_value=[{"where": "1=1"}, {"where": "2=2"}]),
+        ),
+        patch.object(getgdf_mod, "_fetch_page_dict", side_effect=fetch_through_session),
+    ):
+        async for _ in _iter_pages_raw(
+            URL,
+            session,  # type: ignore[arg-type]
+            order="request",
+            max_concurrent_pages=1,
+            on_page_error="collect",
+            page_failures=failures,
+            retry_budget=budget,
+        ):
+            pass
+
+    assert len(failures) == 2
+    assert inner.calls == 3
+    assert budget.retries == 1
+
+
+def test_retry_budget_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RESTGDF_RESILIENCE_RETRY_BUDGET_RATIO", "0.2")
+    monkeypatch.setenv("RESTGDF_RESILIENCE_RETRY_BUDGET_MIN_RETRIES", "5")
+    cfg = Config.from_env().resilience
+    assert cfg.retry_budget_ratio == 0.2
+    assert cfg.retry_budget_min_retries == 5
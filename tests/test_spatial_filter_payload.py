@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import math
 
 from aiohttp import ClientResponseError
 import pytest
@@ -507,3 +508,51 @@ def test_apply_dimension_flags_is_noop_when_flags_unsupported() -> None:
 def test_iter_coordinate_lists_ignores_scalar_leaves() -> None:
     # Defensive guard: a bare scalar (not a coordinate sequence) yields nothing.
     assert list(_iter_coordinate_lists(34.05)) == []
+
+
+def test_build_spatial_filter_payload_prefilter_covers_the_geometry() -> None:
+    shapely = pytest.importorskip("shapely")
+    from restgdf.utils._spatial import _arcgis_to_shape
+
+    # A finely jagged 2,000-vertex outline, like a digitized boundary.
+    radii = [10 + 0.01 * (i % 2) for i in range(2000)]
+    star = shapely.Polygon(
+        [
+            (r * math.cos(i * math.pi / 1000), r * math.sin(i * math.pi / 1000))
+            for i, r in enumerate(radii)
+        ],
+    )
+
+    simplified = build_spatial_filter_payload(star, prefilter="simplify")
+    hull = build_spatial_filter_payload(
+        star,
+        prefilter="convex_hull",
+        spatial_rel="esriSpatialRelWithin",
+    )
+    envelope = build_spatial_filter_payload(
+        star,
+        prefilter="envelope",
+        spatial_rel="esriSpatialRelEnvelopeIntersects",
+    )
+
+    coarse = _arcgis_to_shape(simplified["geometry"])
+    assert coarse.covers(star)
+    assert shapely.get_num_coordinates(coarse) < 200
+    assert simplified["spatialRel"] == "esriSpatialRelIntersects"
+    # A cover cannot answer "within"; it is relaxed to intersects.
+    assert hull["spatialRel"] == "esriSpatialRelIntersects"
+    assert _arcgis_to_shape(hull["geometry"]).covers(star)
+    assert envelope["geometryType"] == "esriGeometryEnvelope"
+    assert envelope["spatialRel"] == "esriSpatialRelEnvelopeIntersects"
+
+
+def test_build_spatial_filter_payload_prefilter_validation() -> None:
+    point = {"x": 1.0, "y": 2.0}
+
+    assert build_spatial_filter_payload(point, prefilter="simplify") == (
+        build_spatial_filter_payload(point)
+    )
+    with pytest.raises(ValueError, match="prefilter"):
+        build_spatial_filter_payload(point, prefilter="hull")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="tolerance"):
+        build_spatial_filter_payload(point, prefilter="simplify", tolerance=0)
@@ -0,0 +1,199 @@
+"""Paged distinct values (``get_unique_values``) and the object-id path."""
+
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Any
+
+import pytest
+
+from restgdf import FeatureLayer
+from restgdf.utils.getinfo import (
+    get_object_ids,
+    get_unique_values,
+    iter_unique_values,
+)
+
+LAYER = "https://example.com/arcgis/rest/services/S/FeatureServer/0"
+
+
+class _Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def json(self, content_type: Any = None) -> dict[str, Any]:
+        return self._payload
+
+
+class _Layer:
+    """Serves distinct ``CITY`` values and capped ``returnIdsOnly`` answers."""
+
+    def __init__(self, cities: list[Any], oids: list[int], page_size: int) -> None:
+        self.cities = cities
+        self.oids = oids
+        self.page_size = page_size
+        self.sent: list[dict[str, Any]] = []
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(params or {}))
+
+    async def post(self, url: str, data: Any = None, **kwargs: Any) -> _Response:
+        return self._answer(dict(data or {}))
+
+    def _answer(self, params: dict[str, Any]) -> _Response:
+        self.sent.append(params)
+        if params.get("returnIdsOnly") == "true":
+            match = re.search(r"OBJECTID > (\d+)", params["where"])
+            after = int(match.group(1)) if match else 0
+            ids = [oid for oid in self.oids if oid > after]
+            payload: dict[str, Any] = {
+                "objectIdFieldName": "OBJECTID",
+                "objectIds": ids[: self.page_size],
+            }
+            if len(ids) > self.page_size:
+                payload["exceededTransferLimit"] = True
+            return _Response(payload)
+        offset = int(params.get("resultOffset", 0))
+        count = int(params.get("resultRecordCount", self.page_size))
+        rows = self.cities[offset : offset + count]
+        payload = {"features": [{"attributes": {"CITY": city}} for city in rows]}
+        if offset + count < len(self.cities):
+            payload["exceededTransferLimit"] = True
+        return _Response(payload)
+
+
+@pytest.mark.asyncio
+async def test_distinct_values_page_past_max_record_count() -> None:
+    cities = [f"C{i:02d}" for i in range(10)]
+    session = _Layer(cities, [], page_size=4)
+
+    values = await get_unique_values(
+        LAYER,
+        "CITY",
+        session,  # type: ignore[arg-type]
+        max_concurrent_pages=2,
+    )
+
+    assert values == cities
+    assert all(params["returnDistinctValues"] == "true" for params in session.sent)
+    assert {params.get("orderByFields") for params in session.sent[1:]} == {"CITY"}
+    assert [params["resultOffset"] for params in session.sent[1:4]] == [
+        "0",
+        "4",
+        "8",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_short_results_send_few_requests_past_the_end() -> None:
+    session = _Layer(["A", "B", "C"], [], page_size=2)
+
+    values = await get_unique_values(
+        LAYER,
+        "CITY",
+        session,  # type: ignore[arg-type]
+        max_concurrent_pages=10,
+    )
+
+    assert values == ["A", "B", "C"]
+    # The first page, then rounds of 1 and 2 offsets; only offset 4 is
+    # past the end, where a full window would have sent ten.
+    assert [params.get("resultOffset") for params in session.sent] == [
+        None,
+        "0",
+        "2",
+        "4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_unique_values_yields_one_list_per_page() -> None:
+    session = _Layer(["A", "B", "C", "D", "E"], [], page_size=2)
+
+    pages = [
+        page
+        async for page in iter_unique_values(
+            LAYER,
+            "CITY",
+            session,  # type: ignore[arg-type]
+            max_concurrent_pages=1,
+        )
+    ]
+
+    assert pages == [["A", "B"], ["C", "D"], ["E"]]
+
+
+@pytest.mark.asyncio
+async def test_as_array_packs_numeric_values() -> None:
+    ints = await get_unique_values(
+        LAYER,
+        "CITY",
+        _Layer([3, 1, 2], [], page_size=10),  # type: ignore[arg-type]
+        as_array=True,
+    )
+    floats = await get_unique_values(
+        LAYER,
+        "CITY",
+        _Layer([1, 2.5], [], page_size=10),  # type: ignore[arg-type]
+        as_array=True,
+    )
+
+    assert ints == array("q", [3, 1, 2])
+    assert floats == array("d", [1.0, 2.5])
+    with pytest.raises(TypeError, match="as_array"):
+        await get_unique_values(
+            LAYER,
+            "CITY",
+            _Layer(["A", None], [], page_size=10),  # type: ignore[arg-type]
+            as_array=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_capped_object_ids_continue_past_the_largest_id() -> None:
+    session = _Layer([], list(range(1, 11)), page_size=4)
+
+    field, oids = await get_object_ids(
+        LAYER,
+        session,  # type: ignore[arg-type]
+        data={"where": "STATUS = 1"},
+    )
+
+    assert field == "OBJECTID"
+    assert oids == list(range(1, 11))
+    assert [params["where"] for params in session.sent] == [
+        "STATUS = 1",
+        "(STATUS = 1) AND OBJECTID > 4",
+        "(STATUS = 1) AND OBJECTID > 8",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_featurelayer_reads_object_ids_with_return_ids_only() -> None:
+    session = _Layer([], [5, 3, 9, 1], page_size=10)
+    layer = FeatureLayer(LAYER, session=session)  # type: ignore[arg-type]
+    layer.fields = ("OBJECTID", "CITY")
+    layer.object_id_field = "OBJECTID"
+
+    assert await layer.get_oids() == [1, 3, 5, 9]
+    assert await layer.get_oids(as_array=True) == array("q", [1, 3, 5, 9])
+    assert len(session.sent) == 1
+    assert "returnDistinctValues" not in session.sent[0]
+    with pytest.raises(ValueError, match="single field"):
+        await layer.get_unique_values(("OBJECTID", "CITY"), as_array=True)
+    # Rejected before any request is sent.
+    assert len(session.sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_featurelayer_streams_unique_values() -> None:
+    session = _Layer(["A", "B", "C"], [], page_size=2)
+    layer = FeatureLayer(LAYER, session=session)  # type: ignore[arg-type]
+    layer.fields = ("OBJECTID", "CITY")
+
+    assert [value async for value in layer.stream_unique_values("CITY")] == [
+        "A",
+        "B",
+        "C",
+    ]